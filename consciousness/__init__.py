@@ -19,8 +19,23 @@ The LLM has FULL AUTONOMY to:
 Components:
 - daemon.py: Autonomous orchestrator (ConsciousnessDaemon, AutonomousExecutor)
 - watcher.py: File system observer (ConsciousnessWatcher)
+- manifest.py: Offline change reconciliation (FileManifest)
+- roots.py: Multi-root watching and fair scheduling (RootScheduler)
+- file_access.py: Size-aware shared file reader (FileAccessService)
 - watcher_git.py: Git repository observer (GitWatcher)
+- git_batch.py: Persistent git cat-file object reader (GitBatchPool)
+- git_diffstat.py: Incremental per-file diff statistics (DiffStatCache)
 - thinker.py: Autonomous LM Studio reasoning (ConsciousnessThinker)
+- llm_metrics.py: LLM token and latency accounting (LLMMetrics)
+- llm_clients.py: Shared LM Studio connection pools (LLMClientRegistry)
+- llm_scheduler.py: Priority scheduling of LLM requests (RequestScheduler)
+- health_monitor.py: Background LM Studio availability probing (HealthMonitor)
+- gemini_gateway.py: Shared Gemini SDK access (GeminiGateway)
+- observation.py: Concurrent observation assembly (ObservationPipeline)
+- action_pipeline.py: Background action execution (ActionPipeline)
+- output_capture.py: Bounded streaming subprocess output (BoundedOutput)
+- python_workers.py: Warm interpreters for Python snippets (PythonWorkerPool)
+- resource_usage.py: CPU, memory and I/O accounting of action processes
 - executor.py: Claude Code/Flow execution (ClaudeCodeExecutor)
 - state.py: SQLite persistence (StateManager)
 - config.py: Configuration management (ConsciousnessConfig)
@@ -67,6 +82,76 @@ from .watcher import (
     create_combined_watcher,
 )
 
+# Manifest exports
+from .manifest import (
+    FileManifest,
+    ManifestEntry,
+    ReconcileResult,
+)
+
+# Multi-root exports
+from .roots import (
+    WatchRoot,
+    RootScheduler,
+)
+
+# File access exports
+from .file_access import (
+    FileAccessService,
+    FileContent,
+    get_file_access_service,
+)
+
+# LLM usage exports
+from .llm_metrics import (
+    LLMCallTimer,
+    LLMMetrics,
+    LLMUsage,
+    get_llm_metrics,
+)
+
+# Shared LLM client exports
+from .llm_clients import (
+    LLMClientRegistry,
+    get_llm_client_registry,
+)
+from .llm_scheduler import (
+    REQUEST_CLASSES,
+    RequestScheduler,
+    RequestSuperseded,
+)
+from .health_monitor import (
+    CircuitState,
+    HealthMonitor,
+    HealthSnapshot,
+    get_health_monitor,
+)
+from .gemini_gateway import (
+    FakeGeminiBackend,
+    GeminiGateway,
+    GeminiResponse,
+    GeminiUnavailable,
+    get_gemini_gateway,
+)
+
+# Observation assembly exports
+from .observation import (
+    ObservationBundle,
+    ObservationPipeline,
+)
+
+# Action pipelining exports
+from .action_pipeline import ActionPipeline
+from .output_capture import BoundedOutput, capture_process
+from .python_workers import PythonWorkerPool, SnippetResult, get_python_worker_pool
+from .resource_usage import (
+    ResourceLimits,
+    ResourceSampler,
+    ResourceUsage,
+    spawn_process,
+    track_resources,
+)
+
 # Git watcher exports
 from .watcher_git import (
     GitWatcher,
@@ -76,6 +161,15 @@ from .watcher_git import (
     Commit,
     create_git_watcher,
 )
+from .git_batch import (
+    GitBatchPool,
+    GitBatchError,
+    GitObject,
+)
+from .git_diffstat import (
+    DiffStatCache,
+    FileDiffStat,
+)
 
 # Thinker exports
 from .thinker import (
@@ -85,6 +179,9 @@ from .thinker import (
     Action,
     ActionType,
     Priority,
+    DecisionStreamParser,
+    EarlyExit,
+    decision_json_schema,
     quick_think,
 )
 
@@ -232,6 +329,52 @@ __all__ = [
     "CombinedWatcher",
     "CombinedObservation",
     "create_combined_watcher",
+    # Manifest
+    "FileManifest",
+    "ManifestEntry",
+    "ReconcileResult",
+    # Multi-root
+    "WatchRoot",
+    "RootScheduler",
+    # File access
+    "FileAccessService",
+    "FileContent",
+    "get_file_access_service",
+    # LLM usage
+    "LLMCallTimer",
+    "LLMMetrics",
+    "LLMUsage",
+    "get_llm_metrics",
+    # Shared LLM clients
+    "LLMClientRegistry",
+    "get_llm_client_registry",
+    "REQUEST_CLASSES",
+    "RequestScheduler",
+    "RequestSuperseded",
+    "CircuitState",
+    "HealthMonitor",
+    "HealthSnapshot",
+    "get_health_monitor",
+    "FakeGeminiBackend",
+    "GeminiGateway",
+    "GeminiResponse",
+    "GeminiUnavailable",
+    "get_gemini_gateway",
+    # Observation assembly
+    "ObservationBundle",
+    "ObservationPipeline",
+    # Action pipelining
+    "ActionPipeline",
+    "BoundedOutput",
+    "capture_process",
+    "PythonWorkerPool",
+    "SnippetResult",
+    "get_python_worker_pool",
+    "ResourceLimits",
+    "ResourceSampler",
+    "ResourceUsage",
+    "spawn_process",
+    "track_resources",
     # Git Watcher
     "GitWatcher",
     "GitStatus",
@@ -239,6 +382,11 @@ __all__ = [
     "GitObservation",
     "Commit",
     "create_git_watcher",
+    "GitBatchPool",
+    "GitBatchError",
+    "GitObject",
+    "DiffStatCache",
+    "FileDiffStat",
     # Thinker
     "ConsciousnessThinker",
     "Decision",
@@ -246,6 +394,9 @@ __all__ = [
     "Action",
     "ActionType",
     "Priority",
+    "DecisionStreamParser",
+    "EarlyExit",
+    "decision_json_schema",
     "quick_think",
     # Executor
     "ExpandedExecutor",
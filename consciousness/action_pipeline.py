@@ -0,0 +1,251 @@
+"""
+Pipelined Action Execution
+
+Executing a decision can take minutes (Claude Code), and the OIDA loop
+used to wait for it before observing again. The daemon now hands each
+action to an ActionPipeline and goes on to observe and decide about the
+next batch while the action runs:
+- At most `max_in_flight` actions run at a time; submitting more waits
+  for a slot (backpressure on the loop)
+- Actions touching the same paths run one after another, in submission
+  order, and a decision about paths an action is still working on waits
+  for that action first (see wait_for_paths)
+- At most `max_actions_per_cycle` actions are started per loop cycle
+
+Usage:
+    pipeline = ActionPipeline(max_in_flight=2, max_actions_per_cycle=3)
+    pipeline.begin_cycle()
+    await pipeline.wait_for_paths(paths)       # before deciding about paths
+    await pipeline.submit(paths, act())        # returns once the action started
+    await pipeline.drain()
+"""
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Coroutine, Iterable, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def normalize_path(path: str | Path) -> str:
+    """Absolute, resolved form used to compare action paths."""
+    return str(Path(path).resolve())
+
+
+def paths_overlap(first: frozenset[str], second: frozenset[str]) -> bool:
+    """Check if two path sets share a path, or one contains the other's directory."""
+    for a in first:
+        for b in second:
+            if a == b or a.startswith(b + "/") or b.startswith(a + "/"):
+                return True
+    return False
+
+
+@dataclass
+class _InFlight:
+    """An action that was submitted and has not finished."""
+
+    id: int
+    paths: frozenset[str]
+    label: str
+    cycle: int
+    task: Optional[asyncio.Task] = None
+    started: float = field(default_factory=time.monotonic)
+
+
+class ActionPipeline:
+    """
+    Runs actions in the background with bounded depth and path conflicts.
+
+    The pipeline only schedules; what an action does (execute, record,
+    learn) is the coroutine that is submitted.
+    """
+
+    def __init__(self, max_in_flight: int = 2, max_actions_per_cycle: int = 3):
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_in_flight: Actions allowed to run at once (1 runs them one at a time)
+            max_actions_per_cycle: Actions started per loop cycle
+        """
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_actions_per_cycle = max(1, max_actions_per_cycle)
+
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._in_flight: dict[int, _InFlight] = {}
+        self._ids = itertools.count(1)
+        self._cycle = 0
+        self._started_this_cycle = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.conflicts = 0  # Actions or decisions that waited for a conflicting action
+        self.slot_waits = 0  # Submissions that waited for a free slot
+
+    @property
+    def in_flight(self) -> int:
+        """Number of actions submitted and not finished."""
+        return len(self._in_flight)
+
+    @property
+    def cycle_budget(self) -> int:
+        """Actions that may still be started in the current cycle."""
+        return max(0, self.max_actions_per_cycle - self._started_this_cycle)
+
+    def begin_cycle(self) -> None:
+        """Start a new loop cycle with a fresh action budget."""
+        self._cycle += 1
+        self._started_this_cycle = 0
+
+    def conflicting(self, paths: Iterable[str | Path]) -> list[asyncio.Task]:
+        """Tasks of in-flight actions touching any of `paths`."""
+        wanted = frozenset(normalize_path(p) for p in paths)
+        return [
+            job.task for job in self._in_flight.values()
+            if job.task and not job.task.done() and paths_overlap(wanted, job.paths)
+        ]
+
+    async def wait_for_paths(self, paths: Iterable[str | Path]) -> bool:
+        """
+        Wait for in-flight actions touching `paths` to finish.
+
+        Returns:
+            True if there was anything to wait for
+        """
+        tasks = self.conflicting(paths)
+        if not tasks:
+            return False
+        self.conflicts += 1
+        logger.debug("action_pipeline.waiting_for_paths", actions=len(tasks))
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return True
+
+    async def submit(
+        self,
+        paths: Iterable[str | Path],
+        work: Coroutine[Any, Any, Any],
+        label: str = "",
+    ) -> Optional[asyncio.Task]:
+        """
+        Start an action in the background.
+
+        Waits for a free slot if `max_in_flight` actions are running. The
+        action itself waits for earlier actions touching the same paths.
+
+        Args:
+            paths: Files and directories the action reads or writes
+            work: Coroutine performing the action
+            label: Short description for logs
+
+        Returns:
+            The action's task, or None if the cycle's budget is used up
+            (the coroutine is closed without running)
+        """
+        if self.cycle_budget <= 0:
+            work.close()
+            logger.info(
+                "action_pipeline.cycle_budget_exhausted",
+                label=label,
+                max_actions_per_cycle=self.max_actions_per_cycle,
+            )
+            return None
+
+        if self._slots.locked():
+            self.slot_waits += 1
+        await self._slots.acquire()
+
+        job = _InFlight(
+            id=next(self._ids),
+            paths=frozenset(normalize_path(p) for p in paths),
+            label=label,
+            cycle=self._cycle,
+        )
+        # Earlier actions on the same paths go first
+        blockers = self.conflicting(job.paths)
+        if blockers:
+            self.conflicts += 1
+
+        self._in_flight[job.id] = job
+        self._started_this_cycle += 1
+        self.submitted += 1
+        job.task = asyncio.create_task(self._run(job, work, blockers))
+        # Release the slot even if the task is cancelled before it starts
+        job.task.add_done_callback(lambda task: self._finished(job, work))
+        logger.debug(
+            "action_pipeline.submitted",
+            label=label,
+            in_flight=self.in_flight,
+            waiting_for=len(blockers),
+        )
+        return job.task
+
+    async def _run(
+        self,
+        job: _InFlight,
+        work: Coroutine[Any, Any, Any],
+        blockers: list[asyncio.Task],
+    ) -> Any:
+        try:
+            if blockers:
+                await asyncio.gather(*blockers, return_exceptions=True)
+            result = await work
+            self.completed += 1
+            return result
+        except Exception as e:
+            self.failed += 1
+            logger.warning("action_pipeline.action_failed", label=job.label, error=str(e))
+
+    def _finished(self, job: _InFlight, work: Coroutine[Any, Any, Any]) -> None:
+        work.close()  # No-op once it ran; never started if cancelled early
+        self._in_flight.pop(job.id, None)
+        self._slots.release()
+        logger.debug(
+            "action_pipeline.finished",
+            label=job.label,
+            duration=round(time.monotonic() - job.started, 3),
+        )
+
+    async def drain(self) -> None:
+        """Wait until all in-flight actions have finished."""
+        while self._in_flight:
+            tasks = [job.task for job in self._in_flight.values() if job.task]
+            if not tasks:
+                break
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel all in-flight actions."""
+        tasks = [job.task for job in self._in_flight.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._in_flight.clear()
+
+    def get_stats(self) -> dict:
+        """Depth, budget and conflict statistics."""
+        now = time.monotonic()
+        return {
+            "in_flight": [
+                {
+                    "label": job.label,
+                    "cycle": job.cycle,
+                    "running_seconds": round(now - job.started, 1),
+                }
+                for job in self._in_flight.values()
+            ],
+            "max_in_flight": self.max_in_flight,
+            "max_actions_per_cycle": self.max_actions_per_cycle,
+            "started_this_cycle": self._started_this_cycle,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "conflicts": self.conflicts,
+            "slot_waits": self.slot_waits,
+        }
@@ -16,12 +16,39 @@ class LMStudioConfig(BaseModel):
     temperature: float = 0.7
     max_tokens: int = 4096
     timeout_seconds: int = 60
+    structured_output: bool = True  # Request schema-constrained JSON decisions
+
+    # Connection pool shared by all LM Studio clients (per base_url and timeout class)
+    max_connections: int = 8
+    max_keepalive_connections: int = 4
+    keepalive_expiry_seconds: float = 60.0
+
+    # Completions admitted by priority (user_message > decision > evaluation > dream)
+    max_concurrent_requests: int = 1
+    priority_aging_seconds: float = 30.0  # Waiting this long raises a request by one class
+
+    # Background health monitor (availability reads never wait for a probe)
+    health_probe_interval_seconds: float = 30.0
+    health_failure_threshold: int = 3  # Failed probes before the circuit opens
+    health_backoff_max_seconds: float = 60.0  # Longest jittered backoff while failing
+
+
+class WatchRootConfig(BaseModel):
+    """A single watched directory (see WatcherConfig.roots)."""
+
+    path: str
+    name: str = ""
+    # None inherits watcher.ignore_patterns; extra patterns are added on top
+    ignore_patterns: list[str] | None = None
+    extra_ignore_patterns: list[str] = Field(default_factory=list)
+    git: bool = True
 
 
 class WatcherConfig(BaseModel):
     """File system watcher configuration."""
 
     root_path: str = "."
+    roots: list[WatchRootConfig] = Field(default_factory=list)
     ignore_patterns: list[str] = Field(
         default_factory=lambda: [
             ".git",
@@ -39,6 +66,38 @@ class WatcherConfig(BaseModel):
     )
     debounce_ms: int = 500
     max_file_size_kb: int = 1024
+    reconcile_on_startup: bool = True
+    scan_workers: int = 8
+    max_changes_per_cycle: int = 500
+
+    def resolved_roots(self) -> list[WatchRootConfig]:
+        """
+        Get the effective list of roots with names and ignore patterns filled in.
+
+        Falls back to a single root at root_path when no roots are configured.
+        Names default to the directory name and are made unique.
+        """
+        roots = self.roots or [WatchRootConfig(path=self.root_path)]
+        resolved: list[WatchRootConfig] = []
+        seen: set[str] = set()
+        for root in roots:
+            name = root.name or Path(root.path).resolve().name or "root"
+            unique, n = name, 2
+            while unique in seen:
+                unique, n = f"{name}-{n}", n + 1
+            seen.add(unique)
+
+            patterns = list(
+                root.ignore_patterns if root.ignore_patterns is not None
+                else self.ignore_patterns
+            )
+            patterns += [p for p in root.extra_ignore_patterns if p not in patterns]
+
+            resolved.append(root.model_copy(update={
+                "name": unique,
+                "ignore_patterns": patterns,
+            }))
+        return resolved
 
 
 class ExecutorConfig(BaseModel):
@@ -64,6 +123,25 @@ class ExecutorConfig(BaseModel):
         default_factory=lambda: ["rm -rf /", "sudo", "> /dev"]
     )
 
+    # Subprocess output is streamed: the first and last KB of each stream
+    # are kept, the rest is dropped (or spilled to a .gz log in output_log_dir)
+    output_head_kb: int = 768
+    output_tail_kb: int = 256
+    output_log_dir: str | None = None
+    progress_interval_seconds: float = 2.0  # Live progress lines while running
+
+    # Warm interpreters for run_python snippets (0 runs each in a new process)
+    python_workers: int = 2
+    python_worker_max_jobs: int = 100  # Jobs before a worker is replaced
+    python_worker_memory_mb: int = 512  # Address space limit per worker
+
+    # Spawned processes are sampled for CPU, memory and I/O; rlimits stop
+    # runaway commands (0 = unlimited; Node CLIs need a large memory limit)
+    resource_sample_interval_seconds: float = 0.5
+    rlimit_cpu_seconds: int = 0
+    rlimit_memory_mb: int = 0
+    rlimit_file_size_mb: int = 0
+
 
 class DecisionConfig(BaseModel):
     """Decision-making configuration."""
@@ -73,6 +151,34 @@ class DecisionConfig(BaseModel):
     max_actions_per_cycle: int = 3
     require_confirmation_above: float = 0.9
 
+    # Actions run in the background while the next batch is observed and decided
+    max_in_flight_actions: int = 2
+
+    # Changes in unrelated categories get their own decision, up to
+    # max_actions_per_cycle decisions per batch, executed side by side
+    parallel_decisions: bool = True
+    # Concurrent runs per executor type (other types: max_in_flight_actions)
+    executor_limits: dict[str, int] = Field(
+        default_factory=lambda: {"claude_flow": 1, "claude_code": 2}
+    )
+
+    # Reuse decisions for identical observations, git status and patterns
+    cache_enabled: bool = True
+    cache_ttl_seconds: float = 600.0
+    cache_max_entries: int = 128
+
+    # Stop generating once a decision is known to be "wait" or below min_confidence
+    early_exit: bool = True
+
+
+class ObservationConfig(BaseModel):
+    """Assembling the observations for each decision."""
+
+    stage_timeout_seconds: float = 5.0  # Per stage; a slow stage is skipped
+    max_knowledge_snippets: int = 3  # Matching knowledge/ sections (0 disables)
+    max_file_excerpts: int = 3  # Changed files quoted in the prompt (0 disables)
+    file_excerpt_bytes: int = 1500  # Per file, head/tail windowed
+
 
 class StateConfig(BaseModel):
     """State persistence configuration."""
@@ -104,6 +210,20 @@ class DisplayConfig(BaseModel):
     panel_width: int = 100  # Width of display panels
 
 
+class UserMessageConfig(BaseModel):
+    """Responding to messages addressed to the consciousness."""
+
+    # Concurrent responses per tool tier, across all files and roots
+    max_concurrent_per_tool: dict[str, int] = Field(
+        default_factory=lambda: {"claude_code": 2, "gemini": 2, "claude_flow": 1}
+    )
+    default_max_concurrent: int = 1  # For tools not listed above
+
+    # Write responses into the file while they are generated
+    stream_responses: bool = True
+    stream_write_interval: float = 0.5  # Minimum seconds between writes
+
+
 class LoopConfig(BaseModel):
     """Main loop configuration."""
 
@@ -135,6 +255,11 @@ class FallbackConfig(BaseModel):
     gemini_timeout: float = 30.0  # Timeout for Gemini API calls
     gemini_enabled: bool = True  # Whether Gemini fallback is available
 
+    # Shared Gemini gateway (every Gemini SDK call in the process)
+    gemini_max_workers: int = 4  # Threads for blocking SDK calls
+    gemini_requests_per_minute: float = 60.0  # Rate limit (0 disables it)
+    gemini_burst: int = 5  # Requests allowed at once before the rate applies
+
     # Claude Code settings
     claude_timeout: float = 120.0  # Timeout for Claude Code operations
     auto_execute_threshold: float = 0.8  # Confidence threshold for auto-execution
@@ -157,10 +282,12 @@ class ConsciousnessConfig(BaseSettings):
     watcher: WatcherConfig = Field(default_factory=WatcherConfig)
     executor: ExecutorConfig = Field(default_factory=ExecutorConfig)
     decision: DecisionConfig = Field(default_factory=DecisionConfig)
+    observation: ObservationConfig = Field(default_factory=ObservationConfig)
     state: StateConfig = Field(default_factory=StateConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     loop: LoopConfig = Field(default_factory=LoopConfig)
     display: DisplayConfig = Field(default_factory=DisplayConfig)
+    user_messages: UserMessageConfig = Field(default_factory=UserMessageConfig)
     fallback: FallbackConfig = Field(default_factory=FallbackConfig)
 
     @classmethod
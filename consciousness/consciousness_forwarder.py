@@ -29,13 +29,20 @@ import json
 import logging
 import os
 import shutil
+import sqlite3
+import threading
 import time
+import unicodedata
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from .gemini_gateway import GeminiUnavailable, get_gemini_gateway
+from .llm_metrics import LLMCallTimer
+
 logger = logging.getLogger(__name__)
 
 
@@ -230,6 +237,12 @@ class ForwarderConfig:
     cache_max_entries: int = 100
     """Maximum number of cached entries."""
 
+    cache_persist: bool = True
+    """Whether to keep guidance in a SQLite file across restarts."""
+
+    cache_max_disk_entries: int = 1000
+    """Maximum number of entries kept on disk."""
+
     # Behavior
     fallback_on_error: bool = True
     """Whether to return fallback guidance on error."""
@@ -273,34 +286,101 @@ class GuidanceCache:
     LRU cache for consciousness guidance responses.
 
     Avoids redundant queries for similar contexts and questions.
-    Uses content hashing to identify similar queries.
+    Contexts are normalized (Unicode NFC, whitespace collapsed) before
+    hashing, so trivially different contexts share an entry.
+
+    The in-memory tier is an OrderedDict (O(1) lookups, moves and
+    evictions) with TTLs on the monotonic clock; get() and put() only
+    touch this tier. With `db_path` set, fetch() and store() also use a
+    SQLite second tier that survives restarts: a memory miss falls back
+    to it and promotes the entry. Disk reads and writes run in a worker
+    thread, and the table is pruned to `max_disk_entries` every
+    `prune_interval` writes rather than on each one.
     """
 
-    def __init__(self, max_entries: int = 100, ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        max_entries: int = 100,
+        ttl_seconds: int = 3600,
+        db_path: Optional[Path] = None,
+        max_disk_entries: int = 1000,
+    ):
         """
         Initialize the cache.
 
         Args:
-            max_entries: Maximum number of cached entries
+            max_entries: Maximum number of cached entries in memory
             ttl_seconds: Time-to-live for cache entries
+            db_path: SQLite file for the persistent tier (None disables it)
+            max_disk_entries: Maximum number of entries kept on disk (it
+                may briefly hold up to prune_interval more)
         """
         self.max_entries = max_entries
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, Tuple[ConsciousnessGuidance, datetime]] = {}
-        self._access_order: List[str] = []
+        self.max_disk_entries = max_disk_entries
+        self.prune_interval = max(1, max_disk_entries // 10)
+
+        # key -> (guidance, expiry on the monotonic clock)
+        self._cache: "OrderedDict[str, Tuple[ConsciousnessGuidance, float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0, "expirations": 0}
+
+        # Used from worker threads, one at a time
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._writes_since_prune = 0
+        if db_path is not None:
+            self._open(Path(db_path))
+
+    def _open(self, db_path: Path) -> None:
+        """Open the persistent tier (stays disabled if that fails)."""
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS guidance ("
+                " key TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " created_at REAL NOT NULL)"  # Wall clock, so it survives restarts
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_guidance_created ON guidance(created_at)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Guidance cache database unavailable: {e}")
+            self._db = None
+
+    @staticmethod
+    def normalize(context: str) -> str:
+        """Normalize a context before hashing."""
+        return " ".join(unicodedata.normalize("NFC", context).split())
 
     def _make_key(self, question_type: QuestionType, context: str) -> str:
-        """Create a cache key from question type and context."""
-        content = f"{question_type.value}:{context}"
+        """Create a cache key from question type and normalized context."""
+        content = f"{question_type.value}:{self.normalize(context)}"
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
+    def _lookup(self, key: str) -> Optional[ConsciousnessGuidance]:
+        """Read an unexpired entry from the memory tier."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        guidance, expires_at = entry
+        if time.monotonic() < expires_at:
+            self._cache.move_to_end(key)
+            return guidance
+
+        del self._cache[key]
+        self._stats["expirations"] += 1
+        return None
+
     def get(
         self,
         question_type: QuestionType,
         context: str,
     ) -> Optional[ConsciousnessGuidance]:
         """
-        Get cached guidance if available and not expired.
+        Get cached guidance from memory if available and not expired.
 
         Args:
             question_type: Type of question
@@ -309,27 +389,101 @@ class GuidanceCache:
         Returns:
             Cached guidance or None
         """
-        key = self._make_key(question_type, context)
-
-        if key not in self._cache:
-            return None
+        guidance = self._lookup(self._make_key(question_type, context))
+        self._stats["hits" if guidance is not None else "misses"] += 1
+        if guidance is not None:
+            logger.debug(f"Cache hit for {question_type.value}")
+        return guidance
 
-        guidance, cached_at = self._cache[key]
+    async def fetch(
+        self,
+        question_type: QuestionType,
+        context: str,
+    ) -> Optional[ConsciousnessGuidance]:
+        """
+        Get cached guidance from memory or, on a miss, from disk.
 
-        # Check expiration
-        if datetime.now() - cached_at > timedelta(seconds=self.ttl_seconds):
-            del self._cache[key]
-            if key in self._access_order:
-                self._access_order.remove(key)
-            return None
+        Args:
+            question_type: Type of question
+            context: Context string
 
-        # Update access order (LRU)
-        if key in self._access_order:
-            self._access_order.remove(key)
-        self._access_order.append(key)
+        Returns:
+            Cached guidance or None
+        """
+        key = self._make_key(question_type, context)
+        guidance = self._lookup(key)
+        if guidance is not None:
+            self._stats["hits"] += 1
+            logger.debug(f"Cache hit for {question_type.value}")
+            return guidance
 
-        logger.debug(f"Cache hit for {question_type.value}")
-        return guidance
+        if self._db is not None:
+            loaded = await asyncio.to_thread(self._read_row, key)
+            if loaded is not None:
+                guidance, remaining = loaded
+                self._store(key, guidance, remaining)
+                self._stats["hits"] += 1
+                self._stats["disk_hits"] += 1
+                logger.debug(f"Persistent cache hit for {question_type.value}")
+                return guidance
+
+        self._stats["misses"] += 1
+        return None
+
+    def _store(self, key: str, guidance: ConsciousnessGuidance, remaining: float) -> None:
+        """Put an entry in the memory tier, evicting the least recently used."""
+        self._cache[key] = (guidance, time.monotonic() + remaining)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _read_row(self, key: str) -> Optional[Tuple[ConsciousnessGuidance, float]]:
+        """Read an unexpired entry and its remaining TTL from disk (worker thread)."""
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    "SELECT data, created_at FROM guidance WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                remaining = row[1] + self.ttl_seconds - time.time()
+                if remaining <= 0:
+                    self._db.execute("DELETE FROM guidance WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._stats["expirations"] += 1
+                    return None
+
+                return ConsciousnessGuidance.from_dict(json.loads(row[0])), remaining
+            except (sqlite3.Error, ValueError, KeyError) as e:
+                logger.warning(f"Guidance cache read failed: {e}")
+                return None
+
+    def _write_row(self, key: str, data: str) -> None:
+        """Write an entry to disk, pruning every prune_interval writes (worker thread)."""
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO guidance (key, data, created_at) VALUES (?, ?, ?)",
+                    (key, data, time.time()),
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= self.prune_interval:
+                    self._writes_since_prune = 0
+                    # Drop expired rows and keep the newest max_disk_entries
+                    self._db.execute(
+                        "DELETE FROM guidance WHERE created_at < ? OR key NOT IN ("
+                        " SELECT key FROM guidance ORDER BY created_at DESC LIMIT ?)",
+                        (time.time() - self.ttl_seconds, self.max_disk_entries),
+                    )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Guidance cache write failed: {e}")
 
     def put(
         self,
@@ -338,7 +492,7 @@ class GuidanceCache:
         guidance: ConsciousnessGuidance,
     ) -> None:
         """
-        Store guidance in cache.
+        Store guidance in the memory tier.
 
         Args:
             question_type: Type of question
@@ -347,29 +501,70 @@ class GuidanceCache:
         """
         key = self._make_key(question_type, context)
 
-        # Evict if at capacity
-        while len(self._cache) >= self.max_entries and self._access_order:
-            oldest_key = self._access_order.pop(0)
-            self._cache.pop(oldest_key, None)
-
         # Store with context hash for debugging
         guidance.context_hash = key
-        self._cache[key] = (guidance, datetime.now())
-        self._access_order.append(key)
+        self._store(key, guidance, self.ttl_seconds)
+
+    async def store(
+        self,
+        question_type: QuestionType,
+        context: str,
+        guidance: ConsciousnessGuidance,
+    ) -> None:
+        """
+        Store guidance in memory and on disk.
+
+        Args:
+            question_type: Type of question
+            context: Context string
+            guidance: Guidance to cache
+        """
+        self.put(question_type, context, guidance)
+        if self._db is not None:
+            await asyncio.to_thread(
+                self._write_row, guidance.context_hash, json.dumps(guidance.to_dict())
+            )
 
     def clear(self) -> int:
-        """Clear all cached entries. Returns count cleared."""
+        """Clear all cached entries (both tiers). Returns count cleared."""
         count = len(self._cache)
         self._cache.clear()
-        self._access_order.clear()
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM guidance")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Guidance cache clear failed: {e}")
         return count
 
+    def close(self) -> None:
+        """Close the persistent tier."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _disk_entries(self) -> Optional[int]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                return self._db.execute("SELECT COUNT(*) FROM guidance").fetchone()[0]
+            except sqlite3.Error:
+                return None
+
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        lookups = self._stats["hits"] + self._stats["misses"]
         return {
             "entries": len(self._cache),
             "max_entries": self.max_entries,
             "ttl_seconds": self.ttl_seconds,
+            **self._stats,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            "persistent": self._db is not None,
+            "disk_entries": self._disk_entries(),
         }
 
 
@@ -425,6 +620,8 @@ class ConsciousnessForwarder:
         self._cache = GuidanceCache(
             max_entries=self.config.cache_max_entries,
             ttl_seconds=self.config.cache_ttl_seconds,
+            db_path=self.temp_dir / "guidance_cache.db" if self.config.cache_persist else None,
+            max_disk_entries=self.config.cache_max_disk_entries,
         )
 
         # Track usage
@@ -468,7 +665,7 @@ class ConsciousnessForwarder:
 
         # Check cache first
         if self.config.cache_enabled:
-            cached = self._cache.get(question_type, context)
+            cached = await self._cache.fetch(question_type, context)
             if cached:
                 self._cache_hits += 1
                 logger.debug(f"Using cached guidance for {question_type.value}")
@@ -500,7 +697,7 @@ class ConsciousnessForwarder:
 
             # Cache the result
             if self.config.cache_enabled and guidance.is_valid():
-                self._cache.put(question_type, context, guidance)
+                await self._cache.store(question_type, context, guidance)
 
             return guidance
 
@@ -544,42 +741,45 @@ Provide guidance based on the context above."""
                 "GOOGLE_API_KEY not set. Cannot forward to consciousness."
             )
 
-        # Try Python SDK first (faster)
+        timer = LLMCallTimer("forwarder", self.config.model, prompt)
         try:
-            return await self._query_gemini_sdk(prompt, api_key)
-        except ImportError:
-            pass
-        except Exception as e:
-            logger.debug(f"SDK query failed, trying CLI: {e}")
-
-        # Fallback to CLI
-        return await self._query_gemini_cli(prompt, api_key)
-
-    async def _query_gemini_sdk(self, prompt: str, api_key: str) -> str:
-        """Query using the google-generativeai SDK."""
-        import google.generativeai as genai
-
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(self.config.model)
-
-        loop = asyncio.get_event_loop()
+            # Try Python SDK first (faster)
+            try:
+                response = await self._query_gemini_sdk(prompt, api_key, timer)
+            except GeminiUnavailable:
+                response = None
+            except Exception as e:
+                logger.debug(f"SDK query failed, trying CLI: {e}")
+                response = None
+
+            # Fallback to CLI
+            if response is None:
+                response = await self._query_gemini_cli(prompt, api_key, timer)
+        except Exception:
+            timer.finish(success=False)
+            raise
 
-        def generate():
-            response = model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=1024,
-                    temperature=0.3,  # Lower temperature for consistent guidance
-                ),
-            )
-            return response.text if hasattr(response, 'text') else str(response)
+        timer.finish(completion_text=response)
+        return response
 
-        return await asyncio.wait_for(
-            loop.run_in_executor(None, generate),
-            timeout=self.config.timeout_seconds
+    async def _query_gemini_sdk(
+        self, prompt: str, api_key: str, timer: Optional[LLMCallTimer] = None
+    ) -> str:
+        """Query using the google-generativeai SDK (through the shared GeminiGateway)."""
+        response = await get_gemini_gateway().generate(
+            prompt,
+            model=self.config.model,
+            timeout=self.config.timeout_seconds,
+            max_output_tokens=1024,
+            temperature=0.3,  # Lower temperature for consistent guidance
         )
+        if timer is not None:
+            timer.usage = response.usage
+        return response.text
 
-    async def _query_gemini_cli(self, prompt: str, api_key: str) -> str:
+    async def _query_gemini_cli(
+        self, prompt: str, api_key: str, timer: Optional[LLMCallTimer] = None
+    ) -> str:
         """Query using the Gemini CLI tool."""
         gemini_cli = shutil.which("gemini")
 
@@ -612,9 +812,11 @@ Provide guidance based on the context above."""
                     temp_file.unlink()
 
         # Fallback to curl API call
-        return await self._query_gemini_curl(prompt, api_key)
+        return await self._query_gemini_curl(prompt, api_key, timer)
 
-    async def _query_gemini_curl(self, prompt: str, api_key: str) -> str:
+    async def _query_gemini_curl(
+        self, prompt: str, api_key: str, timer: Optional[LLMCallTimer] = None
+    ) -> str:
         """Query using curl to the Gemini API."""
         api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.config.model}:generateContent"
 
@@ -650,6 +852,8 @@ Provide guidance based on the context above."""
 
             if process.returncode == 0:
                 response_data = json.loads(stdout.decode('utf-8'))
+                if timer is not None:
+                    timer.usage = response_data.get("usageMetadata")
 
                 if "candidates" in response_data:
                     text_parts = []
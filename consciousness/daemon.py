@@ -21,31 +21,46 @@ you are your neurons.
 """
 
 import asyncio
+import itertools
 import signal
 import logging
 import logging.handlers
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Coroutine, Optional
 import json
 
 import structlog
 
 # Import existing modules
-from .config import ConsciousnessConfig, load_config
+from .config import ConsciousnessConfig, WatchRootConfig, load_config
 from .watcher import ConsciousnessWatcher, FileChange
 from .watcher_git import GitWatcher, GitStatus, GitObservation
+from .manifest import FileManifest, ManifestEntry, chunk_changes
+from .roots import RootScheduler, WatchRoot
 from .thinker import ConsciousnessThinker, Decision, DecisionType, ActionType
-from .executor import ClaudeCodeExecutor, ExecutionResult, ExecutionMode
+from .executor import ClaudeCodeExecutor, ExecutionResult, ExecutionMode, ExecutorPool
 from .state import StateManager, Event, EventType, ThoughtRecord, ActionRecord
-from .learning import PatternLearner
+from .learning import PatternLearner, SemanticMemoryWriter
 from .learning.integration import LearningIntegration, LearningConfig
 from .learning.dreamer import Dreamer, DreamerConfig
 from .decision.engine import AutonomousEngine, EngineDecision
+from .decision.cache import DecisionCache
+from .decision.categories import split_by_category
 from .display import ThinkingDisplay, create_display
-from .user_message import UserMessageDetector, MessagePriority, UserMessage
+from .user_message import UserMessageDetector, MessagePriority, UserMessage, get_message_scanner
 from .responder import ConsciousnessResponder, ResponderConfig
+from .responder_scheduler import ResponderScheduler
 from .self_write_tracker import get_self_write_tracker
+from .file_access import get_file_access_service
+from .llm_metrics import get_llm_metrics
+from .gemini_gateway import get_gemini_gateway
+from .python_workers import get_python_worker_pool
+from .resource_usage import record_usage, track_resources
+from .health_monitor import get_health_monitor
+from .llm_clients import get_llm_client_registry
+from .observation import ObservationPipeline
+from .action_pipeline import ActionPipeline
 
 # Create logs directory at project root
 _project_root = Path(__file__).parent.parent
@@ -105,6 +120,15 @@ class AutonomousExecutor:
     - custom: Custom actions
     """
 
+    # Executor type each action runs on, for ExecutorPool's per-type limits
+    # (other actions run directly and are named by their own type)
+    EXECUTOR_TYPES = {
+        ActionType.CLAUDE_CODE: "claude_code",
+        ActionType.CLAUDE_FLOW: "claude_flow",
+        ActionType.RESEARCH: "claude_flow",
+        ActionType.CUSTOM: "claude_code",
+    }
+
     def __init__(
         self,
         working_dir: Path,
@@ -123,6 +147,13 @@ class AutonomousExecutor:
         self.timeout = timeout
         self.claude_executor = claude_executor or ClaudeCodeExecutor(working_dir, timeout)
 
+    def executor_type(self, decision: EngineDecision) -> str:
+        """Executor type the decision's action runs on (see EXECUTOR_TYPES)."""
+        if not decision.action:
+            return decision.executor_type
+        action_type = decision.action.type
+        return self.EXECUTOR_TYPES.get(action_type, action_type.value)
+
     async def execute(self, decision: EngineDecision) -> ExecutionResult:
         """
         Execute any decision the LLM makes.
@@ -150,6 +181,16 @@ class AutonomousExecutor:
             priority=action.priority.value,
         )
 
+        # Totals over every process the action starts, recorded with its outcome
+        with track_resources() as usage:
+            result = await self._execute_action(action, decision)
+        if usage.processes and result.resources is None:
+            result.resources = usage.to_dict()
+        return result
+
+    async def _execute_action(self, action, decision: EngineDecision) -> ExecutionResult:
+        """Dispatch an action to its handler."""
+        action_type = action.type
         try:
             if action_type == ActionType.WRITE_FILE:
                 return await self._execute_write_file(action)
@@ -228,23 +269,36 @@ class AutonomousExecutor:
             )
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                "python3", "-c", code,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.working_dir),
-            )
+            if self.claude_executor.config.use_python_workers:
+                # Warm interpreter from the shared worker pool
+                snippet = await get_python_worker_pool().run(
+                    code, cwd=self.working_dir, timeout=self.timeout
+                )
+                if snippet.timed_out:
+                    raise asyncio.TimeoutError()
+                if snippet.resources is not None:
+                    record_usage(snippet.resources)
+                return ExecutionResult(
+                    success=snippet.success,
+                    output=snippet.stdout,
+                    error=snippet.stderr if not snippet.success else None,
+                    mode=ExecutionMode.SIMPLE,
+                    metadata={"worker_pid": snippet.worker_pid, "worker_ms": snippet.duration_ms},
+                )
+
+            process = await self.claude_executor.spawn(["python3", "-c", code])
 
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=self.timeout,
+            # Streamed into bounded buffers; killed on timeout
+            result = await self.claude_executor.capture_output(
+                process, self.timeout, label="python3"
             )
 
             return ExecutionResult(
-                success=process.returncode == 0,
-                output=stdout.decode("utf-8", errors="replace"),
-                error=stderr.decode("utf-8", errors="replace") if process.returncode != 0 else None,
+                success=result["returncode"] == 0,
+                output=result["stdout"],
+                error=result["stderr"] if result["returncode"] != 0 else None,
                 mode=ExecutionMode.SIMPLE,
+                metadata={"output": result["output"]},
             )
         except asyncio.TimeoutError:
             return ExecutionResult(
@@ -271,23 +325,18 @@ class AutonomousExecutor:
             )
 
         try:
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.working_dir),
-            )
+            process = await self.claude_executor.spawn(command, shell=True)
 
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=self.timeout,
+            result = await self.claude_executor.capture_output(
+                process, self.timeout, label="bash"
             )
 
             return ExecutionResult(
-                success=process.returncode == 0,
-                output=stdout.decode("utf-8", errors="replace"),
-                error=stderr.decode("utf-8", errors="replace") if process.returncode != 0 else None,
+                success=result["returncode"] == 0,
+                output=result["stdout"],
+                error=result["stderr"] if result["returncode"] != 0 else None,
                 mode=ExecutionMode.SIMPLE,
+                metadata={"output": result["output"]},
             )
         except asyncio.TimeoutError:
             return ExecutionResult(
@@ -418,17 +467,65 @@ class ConsciousnessDaemon:
         self.mode = mode
         self.running = False
 
-        # Get root path
-        self.root_path = Path(self.config.watcher.root_path).resolve()
+        # Connection pool limits shared by every LM Studio client (set
+        # before any component creates one)
+        lm_config = self.config.lm_studio
+        self.llm_clients = get_llm_client_registry()
+        self.llm_clients.configure(
+            max_connections=lm_config.max_connections,
+            max_keepalive_connections=lm_config.max_keepalive_connections,
+            keepalive_expiry=lm_config.keepalive_expiry_seconds,
+            max_concurrent_requests=lm_config.max_concurrent_requests,
+            aging_seconds=lm_config.priority_aging_seconds,
+        )
+
+        # Every Gemini SDK call shares one gateway (thread pool, rate limit)
+        fallback_config = self.config.fallback
+        self.gemini_gateway = get_gemini_gateway()
+        self.gemini_gateway.configure(
+            max_workers=fallback_config.gemini_max_workers,
+            requests_per_minute=fallback_config.gemini_requests_per_minute,
+            burst=fallback_config.gemini_burst,
+        )
+
+        # Warm interpreters for run_python snippets
+        executor_config = self.config.executor
+        self.python_workers = get_python_worker_pool()
+        self.python_workers.configure(
+            size=executor_config.python_workers,
+            max_jobs_per_worker=executor_config.python_worker_max_jobs,
+            memory_limit_mb=executor_config.python_worker_memory_mb,
+        )
 
-        # Initialize watchers
-        self.file_watcher = ConsciousnessWatcher(
-            root_path=self.root_path,
-            ignore_patterns=self.config.watcher.ignore_patterns,
-            debounce_ms=self.config.watcher.debounce_ms,
+        # Background LM Studio availability (detectors and routers read its state)
+        self.health_monitor = get_health_monitor(
+            lm_config.base_url,
+            probe_interval=lm_config.health_probe_interval_seconds,
+            failure_threshold=lm_config.health_failure_threshold,
+            backoff_max=lm_config.health_backoff_max_seconds,
         )
 
-        self.git_watcher = GitWatcher(repo_path=self.root_path)
+        # Initialize display for CLI output (executors report progress to it)
+        self.display = create_display(self.config.display)
+
+        # Initialize watched roots (each with its own watchers and executors,
+        # sharing the thinker, state and learning below). The first root is
+        # the primary one and is also exposed through the single-root
+        # attributes (root_path, file_watcher, git_watcher, ...).
+        self.roots: list[WatchRoot] = [
+            self._create_root(root_config)
+            for root_config in self.config.watcher.resolved_roots()
+        ]
+        self.scheduler = RootScheduler(
+            self.roots,
+            max_changes_per_turn=self.config.watcher.max_changes_per_cycle,
+        )
+
+        primary = self.roots[0]
+        self.root_path = primary.path
+        self.file_watcher = primary.file_watcher
+        self.git_watcher = primary.git_watcher
+        self.manifest = primary.manifest
 
         # Initialize thinker (AUTONOMOUS MODE)
         self.thinker = ConsciousnessThinker(
@@ -437,25 +534,29 @@ class ConsciousnessDaemon:
             temperature=self.config.lm_studio.temperature,
             max_tokens=self.config.lm_studio.max_tokens,
             autonomous=True,
+            early_exit=self.config.decision.early_exit,
+            min_confidence=self.config.decision.min_confidence,
+            structured_output=self.config.lm_studio.structured_output,
         )
 
-        # Initialize executors
-        self.claude_executor = ClaudeCodeExecutor(
-            working_dir=self.root_path,
-            timeout=self.config.executor.timeout_seconds,
-        )
+        # Executors of the primary root
+        self.executor = primary.executor
+        self.claude_executor = primary.executor.claude_executor
 
-        self.executor = AutonomousExecutor(
-            working_dir=self.root_path,
-            timeout=self.config.executor.timeout_seconds,
-            claude_executor=self.claude_executor,
+        # Initialize autonomous engine (reusing decisions for repeated situations)
+        decision_config = self.config.decision
+        self.decision_cache = (
+            DecisionCache(
+                ttl_seconds=decision_config.cache_ttl_seconds,
+                max_entries=decision_config.cache_max_entries,
+            )
+            if decision_config.cache_enabled else None
         )
-
-        # Initialize autonomous engine
         self.engine = AutonomousEngine(
             thinker=self.thinker,
-            confidence_threshold=self.config.decision.min_confidence,
+            confidence_threshold=decision_config.min_confidence,
             working_dir=self.root_path,
+            decision_cache=self.decision_cache,
         )
 
         # Initialize state and learning
@@ -484,20 +585,48 @@ class ConsciousnessDaemon:
             pattern_learner=self.learning.pattern_learner,  # Share learner
         )
 
-        # Initialize display for CLI output
-        self.display = create_display(self.config.display)
+        # Gathers git state, learned patterns, knowledge and file excerpts
+        # concurrently for each decision
+        observation_config = self.config.observation
+        # (knowledge is searched in each root's own knowledge/)
+        self.observation_pipeline = ObservationPipeline(
+            learning=self.learning,
+            stage_timeout=observation_config.stage_timeout_seconds,
+            max_knowledge_snippets=observation_config.max_knowledge_snippets,
+            max_file_excerpts=observation_config.max_file_excerpts,
+            file_excerpt_bytes=observation_config.file_excerpt_bytes,
+        )
 
-        # Initialize user message detection and response
+        # Runs actions in the background so the next batch is observed and
+        # decided meanwhile; actions on the same paths are serialized
+        self.action_pipeline = ActionPipeline(
+            max_in_flight=self.config.decision.max_in_flight_actions,
+            max_actions_per_cycle=self.config.decision.max_actions_per_cycle,
+        )
+
+        # Runs the started actions with per executor type limits (e.g. one
+        # Claude Flow swarm at a time) and path locks
+        self.executor_pool = ExecutorPool(
+            self.root_path,
+            max_concurrent=self.config.decision.max_in_flight_actions,
+            limits=self.config.decision.executor_limits,
+        )
+        self._action_ids = itertools.count(1)
+
+        # Shared size-capped file reader (watcher.max_file_size_kb)
+        self.file_access = get_file_access_service()
+        self.file_access.configure(max_file_size_kb=self.config.watcher.max_file_size_kb)
+
+        # Initialize user message detection (responders are per root)
         self.user_message_detector = UserMessageDetector()
-        self.responder = ConsciousnessResponder(
-            working_dir=self.root_path,
-            # Don't pass executor - let responder create its own ExpandedExecutor
-            # ClaudeCodeExecutor has different execute() signature (legacy)
-            config=ResponderConfig(
-                critical_tool="claude_code",
-                high_tool="claude_code",
-                medium_tool="gemini",
-            ),
+        self.message_scanner = get_message_scanner()
+        self.responder = primary.responder
+        self.responder_scheduler = ResponderScheduler(
+            scanner=self.message_scanner,
+            max_concurrent_per_tool=self.config.user_messages.max_concurrent_per_tool,
+            default_max_concurrent=self.config.user_messages.default_max_concurrent,
+            dry_run=(self.mode == "dry-run"),
+            on_response=self._on_user_message_response,
         )
 
         # Statistics
@@ -511,23 +640,167 @@ class ConsciousnessDaemon:
         self._last_activity_time: datetime = datetime.now(timezone.utc)
         self._dream_action_count: int = 0
 
-        # Background watcher queue
-        self._change_queue: asyncio.Queue[list[FileChange]] = asyncio.Queue()
-        self._watcher_task: Optional[asyncio.Task] = None
+        # Learned patterns version the cached decisions were made with
+        self._cached_patterns_version = 0
+
+        # Writes kept off the critical path of the cycle (e.g. event records)
+        self._background_writes: set[asyncio.Task] = set()
+
+    def _create_claude_executor(self, path: Path, timeout: int) -> ClaudeCodeExecutor:
+        """Executor for one root, with the configured output capture and rlimits."""
+        executor_config = self.config.executor
+        executor = ClaudeCodeExecutor(working_dir=path, timeout=timeout)
+        executor.config.output_head_bytes = executor_config.output_head_kb * 1024
+        executor.config.output_tail_bytes = executor_config.output_tail_kb * 1024
+        if executor_config.output_log_dir:
+            executor.config.output_log_dir = path / executor_config.output_log_dir
+        executor.config.progress_interval = executor_config.progress_interval_seconds
+        executor.config.use_python_workers = executor_config.python_workers > 0
+        executor.config.resource_sample_interval = executor_config.resource_sample_interval_seconds
+        executor.config.rlimit_cpu_seconds = executor_config.rlimit_cpu_seconds
+        executor.config.rlimit_memory_mb = executor_config.rlimit_memory_mb
+        executor.config.rlimit_file_size_mb = executor_config.rlimit_file_size_mb
+        executor.on_progress = self.display.show_action_progress
+        return executor
+
+    def _create_root(self, root_config: WatchRootConfig) -> WatchRoot:
+        """Build the per-root components for one configured root."""
+        path = Path(root_config.path).resolve()
+        timeout = self.config.executor.timeout_seconds
+
+        return WatchRoot(
+            name=root_config.name,
+            path=path,
+            file_watcher=ConsciousnessWatcher(
+                root_path=path,
+                ignore_patterns=root_config.ignore_patterns,
+                debounce_ms=self.config.watcher.debounce_ms,
+            ),
+            # Manifest for detecting changes made while the daemon was stopped
+            manifest=FileManifest(
+                root_path=path,
+                ignore_patterns=root_config.ignore_patterns,
+                max_workers=self.config.watcher.scan_workers,
+            ),
+            git_watcher=GitWatcher(repo_path=path) if root_config.git else None,
+            knowledge=(
+                SemanticMemoryWriter(base_path=path)
+                if SemanticMemoryWriter is not None else None
+            ),
+            executor=AutonomousExecutor(
+                working_dir=path,
+                timeout=timeout,
+                claude_executor=self._create_claude_executor(path, timeout),
+            ),
+            responder=ConsciousnessResponder(
+                working_dir=path,
+                # Don't pass executor - let responder create its own ExpandedExecutor
+                # ClaudeCodeExecutor has different execute() signature (legacy)
+                config=ResponderConfig(
+                    critical_tool="claude_code",
+                    high_tool="claude_code",
+                    medium_tool="gemini",
+                    stream_responses=self.config.user_messages.stream_responses,
+                    stream_write_interval=self.config.user_messages.stream_write_interval,
+                ),
+            ),
+        )
+
+    def _on_user_message_response(
+        self, path: str, message: UserMessage, response: Optional[str]
+    ) -> None:
+        """Report a background user-message response."""
+        relative = self._relative_to_root(path)
+        if response:
+            logger.info(
+                "daemon.user_message_responded",
+                file=relative,
+                line=message.line_number,
+                response_length=len(response),
+            )
+            self.display.show_action_result(
+                success=True,
+                output=f"Responded to user message in {relative}",
+                duration=0.0,
+            )
+        else:
+            logger.warning("daemon.user_message_response_failed", file=relative)
 
-    async def _background_watcher(self) -> None:
-        """Background task that continuously watches for file changes."""
-        logger.info("daemon.watcher.started")
+    def _relative_to_root(self, path: str) -> str:
+        """Path relative to the root containing it (for display)."""
+        resolved = Path(path)
+        for root in self.roots:
+            try:
+                return str(resolved.relative_to(root.path))
+            except ValueError:
+                continue
+        return path
+
+    async def _background_watcher(self, root: WatchRoot) -> None:
+        """Background task that continuously watches one root for file changes."""
+        logger.info("daemon.watcher.started", root=root.name)
         try:
-            async for batch in self.file_watcher.watch():
+            async for batch in root.file_watcher.watch():
                 if not self.running:
                     break
-                await self._change_queue.put(batch)
-                logger.debug("daemon.watcher.queued", count=len(batch))
+                self.scheduler.put(root.name, batch)
+                logger.debug("daemon.watcher.queued", root=root.name, count=len(batch))
         except asyncio.CancelledError:
-            logger.info("daemon.watcher.cancelled")
+            logger.info("daemon.watcher.cancelled", root=root.name)
+        except Exception as e:
+            logger.exception("daemon.watcher.error", root=root.name, error=str(e))
+
+    async def _reconcile_offline_changes(self, root: WatchRoot) -> None:
+        """
+        Queue changes made while the daemon was not running.
+
+        Scans the root against the persisted manifest and injects the
+        differences as synthetic FileChange batches. Files reported as
+        changes are recorded in the manifest once their batch has been
+        processed (see _update_manifest), so a shutdown before that
+        reports them again on the next start.
+        """
+        try:
+            rows = await self.state.load_manifest(str(root.path))
+            previous = {row[0]: ManifestEntry.from_row(row) for row in rows}
+
+            result = await asyncio.to_thread(root.manifest.reconcile, previous)
+
+            changed = {change.relative_path for change in result.changes}
+            await self.state.save_manifest(
+                str(root.path),
+                [entry.to_row() for entry in result.upserts if entry.path not in changed],
+            )
+            for batch in chunk_changes(result.changes):
+                self.scheduler.put(root.name, batch)
+
+            logger.info(
+                "daemon.reconcile.complete",
+                root=root.name,
+                baseline=result.baseline,
+                files_scanned=result.files_scanned,
+                files_hashed=result.files_hashed,
+                changes=len(result.changes),
+                duration=round(result.duration, 3),
+            )
         except Exception as e:
-            logger.exception("daemon.watcher.error", error=str(e))
+            logger.warning("daemon.reconcile.error", root=root.name, error=str(e))
+
+    async def _update_manifest(self, root: WatchRoot, batch: list[FileChange]) -> None:
+        """Record a processed batch of changes in the root's manifest."""
+        if not self.config.watcher.reconcile_on_startup:
+            return
+        try:
+            upserts, deletions = await asyncio.to_thread(
+                root.manifest.entries_for_changes, batch
+            )
+            await self.state.save_manifest(
+                str(root.path),
+                [entry.to_row() for entry in upserts],
+                deletions,
+            )
+        except Exception as e:
+            logger.debug("daemon.manifest.update_error", error=str(e))
 
     async def _should_dream(self) -> bool:
         """Check if it's time for a Dream Cycle."""
@@ -553,6 +826,10 @@ class ConsciousnessDaemon:
             self._dream_action_count = 0
             self._last_activity_time = datetime.now(timezone.utc)
 
+            # Dreaming consolidates knowledge and patterns
+            if self.decision_cache is not None:
+                self.decision_cache.invalidate("dream_cycle")
+
             logger.info(
                 "daemon.dream_cycle.complete",
                 insights=len(result.insights) if result else 0,
@@ -562,12 +839,41 @@ class ConsciousnessDaemon:
         except Exception as e:
             logger.exception("daemon.dream_cycle.error", error=str(e))
 
+    def _invalidate_decision_cache(self, root: WatchRoot, changes: list[FileChange]) -> None:
+        """Drop cached decisions if the knowledge base or learned patterns changed."""
+        if self.decision_cache is None:
+            return
+
+        if self.learning.patterns_version != self._cached_patterns_version:
+            self._cached_patterns_version = self.learning.patterns_version
+            self.decision_cache.invalidate("patterns_updated")
+            return
+
+        knowledge_path = root.path / "knowledge"
+        for change in changes:
+            if Path(change.path).is_relative_to(knowledge_path):
+                self.decision_cache.invalidate("knowledge_changed")
+                return
+
+    def _write_in_background(self, write: Coroutine[Any, Any, Any]) -> None:
+        """Run a state write without waiting for it (awaited at shutdown)."""
+        task = asyncio.create_task(write)
+        self._background_writes.add(task)
+
+        def done(task: asyncio.Task) -> None:
+            self._background_writes.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning("daemon.background_write_failed", error=str(task.exception()))
+
+        task.add_done_callback(done)
+
     def request_shutdown(self) -> None:
         """Request graceful shutdown."""
         self.running = False
-        self.file_watcher.stop()
-        if self._watcher_task:
-            self._watcher_task.cancel()
+        for root in self.roots:
+            root.file_watcher.stop()
+            if root.watcher_task:
+                root.watcher_task.cancel()
         logger.info("daemon.shutdown_requested")
 
     async def run(self) -> None:
@@ -575,6 +881,10 @@ class ConsciousnessDaemon:
         Main run loop - Autonomous OIDA cycle.
 
         Observe -> Infer -> Decide -> Act -> Learn -> repeat
+
+        Acting runs in the background: after an action was started the
+        next batch is observed and decided right away, up to
+        max_actions_per_cycle actions before sleeping.
         """
         logger.info("daemon.starting", config={
             "lm_studio_url": self.config.lm_studio.base_url,
@@ -583,6 +893,7 @@ class ConsciousnessDaemon:
             "confidence_threshold": self.config.decision.min_confidence,
             "thinking_interval": self.config.decision.thinking_interval_seconds,
             "root_path": str(self.root_path),
+            "roots": {root.name: str(root.path) for root in self.roots},
         })
 
         self.running = True
@@ -591,26 +902,46 @@ class ConsciousnessDaemon:
         await self.state.initialize()
         await self.learning.initialize()
 
-        # Check LM Studio connection
-        connected = await self.thinker.check_connection()
-        if not connected:
+        # Start background LM Studio health probing (waits for the first probe)
+        health = await self.health_monitor.start()
+        if not health.available:
             logger.warning(
                 "daemon.lm_studio_not_connected",
                 url=self.config.lm_studio.base_url,
             )
 
-        # Check git
-        is_git_repo = await self.git_watcher.is_git_repo()
-        if is_git_repo:
-            logger.info("daemon.git_integration_enabled")
-
-        # Start background file watcher
-        self._watcher_task = asyncio.create_task(self._background_watcher())
-        logger.info("daemon.background_watcher_started")
+        if self.config.executor.python_workers > 0:
+            await self.python_workers.start()
+
+        # Check git (roots that aren't repositories just skip git context)
+        for root in self.roots:
+            if root.git_watcher and not await root.git_watcher.is_git_repo():
+                root.git_watcher = None
+            if root.git_watcher:
+                logger.info("daemon.git_integration_enabled", root=root.name)
+        self.git_watcher = self.roots[0].git_watcher
+
+        # Start one background file watcher per root
+        for root in self.roots:
+            root.watcher_task = asyncio.create_task(self._background_watcher(root))
+        logger.info("daemon.background_watcher_started", roots=len(self.roots))
+
+        # Pick up edits made while we were stopped (after the watchers are
+        # running, so nothing slips through between scan and watch)
+        if self.config.watcher.reconcile_on_startup:
+            await asyncio.gather(
+                *(self._reconcile_offline_changes(root) for root in self.roots)
+            )
 
         try:
             while self.running:
-                await self._autonomous_cycle()
+                self.action_pipeline.begin_cycle()
+                while (
+                    await self._autonomous_cycle()
+                    and self.running
+                    and self.action_pipeline.cycle_budget > 0
+                ):
+                    pass
                 await asyncio.sleep(self.config.decision.thinking_interval_seconds)
 
         except Exception as e:
@@ -620,44 +951,48 @@ class ConsciousnessDaemon:
         finally:
             await self._shutdown()
 
-    async def _autonomous_cycle(self) -> None:
+    async def _autonomous_cycle(self) -> bool:
         """
         Single autonomous OIDA cycle.
 
         1. OBSERVE: Gather file changes and git status
         2. Get learned patterns
         3. INFER & DECIDE: Let LLM think autonomously
-        4. ACT: Execute without confirmation
+        4. ACT: Execute without confirmation (in the background)
         5. LEARN: Record outcome for future improvement
+
+        Returns:
+            True if an action was started
         """
         self._cycle_count += 1
         cycle_start = datetime.now(timezone.utc)
 
         logger.info("daemon.cycle.start", cycle=self._cycle_count, mode=self.mode)
 
-        # 1. OBSERVE: Get file changes from background queue
+        # 1. OBSERVE: Get file changes of the next root with pending work
+        # (roots are served round-robin so a busy root can't starve others)
         changes: list[FileChange] = []
+        root = self.roots[0]
         try:
-            # Check queue with timeout - collect all pending changes
-            while True:
-                try:
-                    batch = await asyncio.wait_for(
-                        self._change_queue.get(),
-                        timeout=0.5 if not changes else 0.1
-                    )
-                    changes.extend(batch)
-                except asyncio.TimeoutError:
-                    break
+            picked = await self.scheduler.next_batch(timeout=0.5, settle=0.1)
+            if picked is not None:
+                root, changes = picked
         except Exception as e:
             logger.warning("daemon.cycle.queue_error", error=str(e))
 
         if not changes:
             # No changes - check if we should dream
             if await self._should_dream():
+                # Consolidate once the running actions have recorded their outcomes
+                await self.action_pipeline.drain()
                 self.display.show_dream_cycle("starting", 0)
                 await self._execute_dream_cycle()
             logger.debug("daemon.cycle.no_changes")
-            return
+            return False
+
+        # The batch is recorded in the manifest once it has been handled, so
+        # changes lost to a shutdown are reconciled again on the next start
+        batch = changes
 
         # Filter out self-writes to prevent infinite loops
         # When the consciousness writes to a file (e.g., responding to user),
@@ -679,12 +1014,15 @@ class ConsciousnessDaemon:
         if not changes:
             # All changes were self-writes, skip this cycle
             logger.debug("daemon.cycle.all_self_writes_filtered")
-            return
+            await self._update_manifest(root, batch)
+            return False
 
         # Update activity time when changes are detected
         self._last_activity_time = datetime.now(timezone.utc)
 
-        logger.info("daemon.cycle.changes_detected", count=len(changes))
+        self._invalidate_decision_cache(root, changes)
+
+        logger.info("daemon.cycle.changes_detected", root=root.name, count=len(changes))
 
         # Display cycle start
         self.display.show_cycle_start(self._cycle_count)
@@ -694,7 +1032,7 @@ class ConsciousnessDaemon:
         # User messages (Hey consciousness, Hey Stoffy) take priority over
         # maintenance tasks and are handled with Claude Code or Gemini
         # =====================================================================
-        user_messages_handled = False
+        user_messages_queued = False
         for change in changes:
             try:
                 file_path = Path(change.path)
@@ -712,93 +1050,129 @@ class ConsciousnessDaemon:
                 if file_path.suffix.lower() not in ('.md', '.txt', '.rst', '.py', '.js', '.ts'):
                     continue
 
-                # Process messages ONE AT A TIME to handle line number shifts
-                # After each response is written, re-read the file and re-detect messages
-                # This ensures we always have accurate line numbers
-                while True:
-                    content = file_path.read_text(encoding='utf-8')
-                    messages = self.user_message_detector.detect_in_content(content, str(file_path))
-
-                    # Filter for high priority messages that haven't been responded to
-                    high_priority = [m for m in messages if m.priority in (MessagePriority.CRITICAL, MessagePriority.HIGH)]
-
+                # Incremental: only the edited lines are rescanned
+                messages = await self.message_scanner.scan_file(file_path)
+                if messages is None:
+                    # Unreadable, or over max_file_size_kb (line numbers in a
+                    # windowed view wouldn't match the file)
                     logger.debug(
-                        "daemon.user_message.detection_result",
+                        "daemon.user_message.file_skipped",
                         file=change.relative_path,
-                        messages_found=len(messages),
-                        high_priority_count=len(high_priority),
+                        max_file_size_kb=self.config.watcher.max_file_size_kb,
                     )
+                    continue
 
-                    if not high_priority:
-                        # No more unresponded high-priority messages
-                        break
+                # Filter for high priority messages that haven't been responded to
+                high_priority = [m for m in messages if m.priority in (MessagePriority.CRITICAL, MessagePriority.HIGH)]
 
-                    # Process only the FIRST unresponded message
-                    user_msg = high_priority[0]
-                    logger.info(
-                        "daemon.user_message_detected",
-                        priority=user_msg.priority.value,
-                        file=change.relative_path,
-                        line=user_msg.line_number,
-                    )
+                logger.debug(
+                    "daemon.user_message.detection_result",
+                    file=change.relative_path,
+                    messages_found=len(messages),
+                    high_priority_count=len(high_priority),
+                )
 
-                    # Display that we're responding to user
-                    self.display.show_thinking(
-                        reasoning=f"User addressed me directly with: '{user_msg.message[:100]}...'",
-                        observation_summary=f"Detected {user_msg.priority.value} priority message in {change.relative_path}",
-                        expected_outcome="I will respond to the user's message in the same file",
-                        confidence=0.95,
-                    )
+                if not high_priority:
+                    continue
 
-                    # Respond using Claude Code or Gemini based on priority
-                    response = await self.responder.respond_to_message(
-                        user_msg,
-                        dry_run=(self.mode == "dry-run"),
-                    )
+                # Respond in the background; the file's worker answers one
+                # message at a time so line numbers stay accurate
+                queued = self.responder_scheduler.submit(file_path, root.responder, high_priority)
+                user_messages_queued = True
+                if not queued:
+                    # Already being answered
+                    continue
+
+                user_msg = high_priority[0]
+                logger.info(
+                    "daemon.user_message_detected",
+                    priority=user_msg.priority.value,
+                    file=change.relative_path,
+                    line=user_msg.line_number,
+                    queued=queued,
+                )
 
-                    if response:
-                        logger.info(
-                            "daemon.user_message_responded",
-                            file=change.relative_path,
-                            response_length=len(response),
-                        )
-                        self.display.show_action_result(
-                            success=True,
-                            output=f"Responded to user message in {change.relative_path}",
-                            duration=0.0,
-                        )
-                        user_messages_handled = True
-                        # Continue loop to check for more messages (file was re-read)
-                    else:
-                        logger.warning(
-                            "daemon.user_message_response_failed",
-                            file=change.relative_path,
-                        )
-                        # Break to avoid infinite loop on persistent failure
-                        break
+                # Display that we're responding to user
+                self.display.show_thinking(
+                    reasoning=f"User addressed me directly with: '{user_msg.message[:100]}...'",
+                    observation_summary=f"Detected {user_msg.priority.value} priority message in {change.relative_path}",
+                    expected_outcome="I will respond to the user's message in the same file",
+                    confidence=0.95,
+                )
 
             except Exception as e:
                 logger.warning(f"daemon.user_message_check_error: {change.relative_path}: {e}")
 
-        # If we handled user messages, skip the normal cycle for this batch
-        # User messages take absolute priority
-        if user_messages_handled:
-            logger.info("daemon.cycle.user_messages_handled")
-            return
+        # If user messages are pending, skip the normal cycle for this batch
+        # User messages take absolute priority (responses continue in the background)
+        if user_messages_queued:
+            logger.info("daemon.cycle.user_messages_queued")
+            await self._update_manifest(root, batch)
+            return False
 
         # =====================================================================
         # Normal OIDA cycle continues if no user messages were handled
         # =====================================================================
 
-        # Get git observation
-        git_status_str = ""
-        if await self.git_watcher.is_git_repo():
-            git_observation = await self.git_watcher.get_observation()
-            git_status_str = self.git_watcher.format_for_llm(git_observation)
-            self._last_git_observation = git_observation
+        # Decide about files an action is still working on once it is done
+        if await self.action_pipeline.wait_for_paths([c.path for c in changes]):
+            logger.info("daemon.cycle.waited_for_action", root=root.name)
+
+        # 2-4. Unrelated change categories get a decision each (up to the
+        # cycle's action budget), decided concurrently; their actions run
+        # side by side in the executor pool
+        groups = [changes]
+        if self.config.decision.parallel_decisions:
+            groups = split_by_category(changes, self.action_pipeline.cycle_budget)
+        if len(groups) > 1:
+            logger.info("daemon.cycle.parallel_decisions", root=root.name, groups=len(groups))
+        results = await asyncio.gather(*(self._decide_and_submit(root, group) for group in groups))
+        started = any(results)
+        await self._update_manifest(root, batch)
+
+        cycle_duration = (datetime.now(timezone.utc) - cycle_start).total_seconds()
+        logger.info(
+            "daemon.cycle.complete",
+            cycle=self._cycle_count,
+            duration=cycle_duration,
+            decisions_total=self._decisions_made,
+            actions_total=self._actions_executed,
+            actions_in_flight=self.action_pipeline.in_flight,
+        )
+        return started
+
+    async def _decide_and_submit(self, root: WatchRoot, changes: list[FileChange]) -> bool:
+        """
+        Observe, decide and start the action for one group of changes.
 
-        # Log observations
-        await self.state.record_event(Event(
+        Returns:
+            True if an action was started
+        """
+        # 2. Gather git state, learned patterns, knowledge and file excerpts
+        # concurrently (each stage has its own timeout)
+        bundle = await self.observation_pipeline.gather(
+            root,
+            changes,
+            header=f"Root: {root.name} ({root.path})" if len(self.roots) > 1 else "",
+        )
+        git_status_str = bundle.git_status
+        learned_patterns = bundle.learned_patterns
+        observations = bundle.prompt_observations()
+        if bundle.git_observation is not None:
+            root.last_git_observation = bundle.git_observation
+            self._last_git_observation = bundle.git_observation
+
+        logger.debug(
+            "daemon.cycle.observation_timings",
+            timings_ms=bundle.timings_ms,
+            skipped=bundle.skipped_stages,
+            learned_patterns=len(learned_patterns),
+            knowledge=len(bundle.knowledge),
+            file_excerpts=len(bundle.file_excerpts),
+        )
+
+        # Log observations (off the critical path)
+        self._write_in_background(self.state.record_event(Event(
             event_type=EventType.OBSERVATION,
             data={
                 "changes": [
@@ -807,24 +1181,26 @@ class ConsciousnessDaemon:
                 ],
                 "count": len(changes),
                 "has_git_context": bool(git_status_str),
+                "timings_ms": bundle.timings_ms,
             },
-        ))
-
-        # 2. Get learned patterns/suggestions
-        observations = self.file_watcher.format_for_llm(changes)
-        suggestions = await self.learning.get_suggestions(observations)
-        learned_patterns = [
-            f"{s.action_type}: {s.reasoning} (confidence: {s.confidence:.2f})"
-            for s in suggestions
-        ]
-
-        if learned_patterns:
-            logger.debug("daemon.cycle.learned_patterns", count=len(learned_patterns))
+            root=root.name,
+        )))
 
         # Display observations
-        self.display.show_observations(observations, change_count=len(changes))
+        self.display.show_observations(bundle.observations, change_count=len(changes))
 
         # 3. INFER & DECIDE: Autonomous thinking
+        decide_start = datetime.now(timezone.utc)
+
+        def on_action_type(action_type: ActionType) -> None:
+            # The action type streams in before the rest of the decision
+            logger.info(
+                "daemon.cycle.action_type_known",
+                action_type=action_type.value,
+                root=root.name,
+                elapsed_ms=round((datetime.now(timezone.utc) - decide_start).total_seconds() * 1000, 1),
+            )
+
         decision = await self.engine.decide(
             observations=observations,
             git_status=git_status_str,
@@ -833,7 +1209,10 @@ class ConsciousnessDaemon:
                 "cycle": self._cycle_count,
                 "mode": self.mode,
                 "total_actions": self._actions_executed,
+                "root": root.name,
+                "working_dir": str(root.path),
             },
+            on_action_type=on_action_type,
         )
 
         self._decisions_made += 1
@@ -845,6 +1224,8 @@ class ConsciousnessDaemon:
             confidence=decision.confidence,
             executor_type=decision.executor_type,
             reasoning_preview=decision.reasoning[:100] if decision.reasoning else "",
+            cached=decision.cached,
+            early_exit=decision.early_exit.to_dict() if decision.early_exit else None,
         )
 
         # Display the thinking/reasoning process
@@ -867,127 +1248,172 @@ class ConsciousnessDaemon:
             priority=priority,
         )
 
-        # Record thought
+        # Record thought (cached decisions made no LLM call)
+        usage = decision.usage
         await self.state.record_thought(ThoughtRecord(
             prompt=observations,
             response=json.dumps(decision.to_dict()),
             confidence=decision.confidence,
+            tokens_used=usage.total_tokens if usage else 0,
+            latency_ms=usage.latency_ms if usage else 0.0,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            first_token_ms=usage.first_token_ms if usage else None,
+            cached=decision.cached,
+            root=root.name,
         ))
 
-        # 4. ACT: Execute if decided
+        # 4. ACT in the background; the loop moves on to the next batch
+        if not decision.should_act:
+            return False
+        paths = [c.path for c in changes]
+        if decision.action and decision.action.file_path:
+            paths.append(str(root.path / decision.action.file_path))
+        return await self.action_pipeline.submit(
+            paths,
+            self._act(root, decision, observations, self._cycle_count, paths),
+            label=f"{root.name}:{action_type or decision.executor_type}",
+        ) is not None
+
+    async def _act(
+        self,
+        root: WatchRoot,
+        decision: EngineDecision,
+        observations: str,
+        cycle: int,
+        paths: Optional[list[str]] = None,
+    ) -> None:
+        """Execute a decision and learn from the result (runs in the background)."""
+        action_type = decision.action.type.value if decision.action else ""
+        action_description = decision.action.description if decision.action else ""
+
         result: Optional[ExecutionResult] = None
         action_start = datetime.now(timezone.utc)
 
-        if decision.should_act:
-            # Display action start
-            self.display.show_action_start(
-                action_type=action_type,
-                description=action_description,
+        # Display action start
+        self.display.show_action_start(
+            action_type=action_type,
+            description=action_description,
+        )
+
+        if self.mode == "dry-run":
+            # Dry run - log but don't execute
+            logger.info(
+                "daemon.cycle.dry_run",
+                action_type=decision.action.type.value if decision.action else "none",
+                description=decision.action.description if decision.action else "",
+            )
+            result = ExecutionResult(
+                success=True,
+                output="[DRY RUN] Action would be executed",
+                mode=ExecutionMode.SIMPLE,
+            )
+        elif self.mode == "supervised":
+            # Supervised - would ask for confirmation (not implemented in daemon)
+            logger.info("daemon.cycle.supervised_mode", action=decision.action)
+            result = ExecutionResult(
+                success=True,
+                output="[SUPERVISED] Confirmation required",
+                mode=ExecutionMode.SIMPLE,
+            )
+        else:
+            # Autonomous - execute without confirmation
+            logger.info(
+                "daemon.cycle.executing",
+                action_type=decision.action.type.value if decision.action else "none",
+                priority=decision.priority,
+            )
+            executor_type = root.executor.executor_type(decision)
+            result = await self.executor_pool.run(
+                f"{root.name}:{executor_type}:{next(self._action_ids)}",
+                root.executor.execute(decision),
+                executor_type=executor_type,
+                paths=paths or (),
             )
+            self._actions_executed += 1
+            self._dream_action_count += 1
 
-            if self.mode == "dry-run":
-                # Dry run - log but don't execute
-                logger.info(
-                    "daemon.cycle.dry_run",
-                    action_type=decision.action.type.value if decision.action else "none",
-                    description=decision.action.description if decision.action else "",
-                )
-                result = ExecutionResult(
-                    success=True,
-                    output="[DRY RUN] Action would be executed",
-                    mode=ExecutionMode.SIMPLE,
-                )
-            elif self.mode == "supervised":
-                # Supervised - would ask for confirmation (not implemented in daemon)
-                logger.info("daemon.cycle.supervised_mode", action=decision.action)
-                result = ExecutionResult(
-                    success=True,
-                    output="[SUPERVISED] Confirmation required",
-                    mode=ExecutionMode.SIMPLE,
-                )
-            else:
-                # Autonomous - execute without confirmation
-                logger.info(
-                    "daemon.cycle.executing",
-                    action_type=decision.action.type.value if decision.action else "none",
-                    priority=decision.priority,
-                )
-                result = await self.executor.execute(decision)
-                self._actions_executed += 1
-                self._dream_action_count += 1
+        # Log result and display
+        if result:
+            action_duration = (datetime.now(timezone.utc) - action_start).total_seconds()
 
-            # Log result and display
-            if result:
-                action_duration = (datetime.now(timezone.utc) - action_start).total_seconds()
+            logger.info(
+                "daemon.cycle.executed",
+                success=result.success,
+                output_preview=result.output[:200] if result.output else "",
+                error=result.error,
+            )
 
-                logger.info(
-                    "daemon.cycle.executed",
-                    success=result.success,
-                    output_preview=result.output[:200] if result.output else "",
-                    error=result.error,
-                )
+            # Display action result
+            self.display.show_action_result(
+                success=result.success,
+                output=result.output,
+                error=result.error or "",
+                duration=action_duration,
+            )
 
-                # Display action result
-                self.display.show_action_result(
-                    success=result.success,
-                    output=result.output,
-                    error=result.error or "",
-                    duration=action_duration,
+            # Record action
+            await self.state.record_action(ActionRecord(
+                action_type=decision.executor_type,
+                command=decision.prompt or (decision.action.description if decision.action else ""),
+                result=result.output,
+                success=result.success,
+                root=root.name,
+            ))
+
+            # 5. LEARN: Record outcome for pattern learning
+            if decision.action:
+                await self.learning.record_outcome(
+                    observation=decision.observation_summary or observations[:200],
+                    action_type=decision.action.type.value,
+                    action_details=decision.action.description,
+                    result=result,
+                    confidence_used=decision.confidence,
+                    context={
+                        "cycle": cycle,
+                        "root": root.name,
+                        "reasoning": decision.reasoning[:500],
+                        "git_branch": (
+                            root.last_git_observation.status.branch
+                            if root.last_git_observation else ""
+                        ),
+                    },
                 )
 
-                # Record action
-                await self.state.record_action(ActionRecord(
-                    action_type=decision.executor_type,
-                    command=decision.prompt or (decision.action.description if decision.action else ""),
-                    result=result.output,
-                    success=result.success,
-                ))
-
-                # 5. LEARN: Record outcome for pattern learning
-                if decision.action:
-                    await self.learning.record_outcome(
-                        observation=decision.observation_summary or observations[:200],
-                        action_type=decision.action.type.value,
-                        action_details=decision.action.description,
-                        result=result,
-                        confidence_used=decision.confidence,
-                        context={
-                            "cycle": self._cycle_count,
-                            "reasoning": decision.reasoning[:500],
-                            "git_branch": (
-                                self._last_git_observation.status.branch
-                                if self._last_git_observation else ""
-                            ),
-                        },
-                    )
-
-        cycle_duration = (datetime.now(timezone.utc) - cycle_start).total_seconds()
-        logger.info(
-            "daemon.cycle.complete",
-            cycle=self._cycle_count,
-            duration=cycle_duration,
-            decisions_total=self._decisions_made,
-            actions_total=self._actions_executed,
-        )
-
     async def _shutdown(self) -> None:
         """Graceful shutdown of all components."""
         logger.info("daemon.shutting_down")
 
-        self.file_watcher.stop()
-        self.git_watcher.stop()
+        for root in self.roots:
+            root.file_watcher.stop()
+            if root.git_watcher:
+                await root.git_watcher.close()
 
-        # Cancel background watcher
-        if self._watcher_task:
-            self._watcher_task.cancel()
-            try:
-                await self._watcher_task
-            except asyncio.CancelledError:
-                pass
+            # Cancel background watcher
+            if root.watcher_task:
+                root.watcher_task.cancel()
+                try:
+                    await root.watcher_task
+                except asyncio.CancelledError:
+                    pass
+
+        # Let running actions finish and record their outcomes
+        await self.action_pipeline.drain()
+
+        # Cancel in-flight user message responses
+        await self.responder_scheduler.close()
+
+        # Let pending state writes finish before the database is closed
+        if self._background_writes:
+            await asyncio.gather(*self._background_writes, return_exceptions=True)
 
         await self.dreamer.close()
         await self.learning.close()
         await self.state.close()
+        await self.health_monitor.stop()
+        await self.gemini_gateway.close()
+        await self.python_workers.close()
+        await self.llm_clients.close()
 
         # Get final learning stats
         learning_status = await self.learning.get_learning_status()
@@ -1005,6 +1431,7 @@ class ConsciousnessDaemon:
         stats = await self.state.get_statistics()
         learning_status = await self.learning.get_learning_status()
         engine_stats = self.engine.get_statistics()
+        scheduler_stats = self.scheduler.get_stats()
 
         return {
             "running": self.running,
@@ -1015,8 +1442,21 @@ class ConsciousnessDaemon:
             "last_decision": self._last_decision.to_dict() if self._last_decision else None,
             "last_git_observation": (
                 self.git_watcher.format_for_llm_compact(self._last_git_observation)
-                if self._last_git_observation else None
+                if self.git_watcher and self._last_git_observation else None
             ),
+            "roots": {
+                root.name: {
+                    "path": str(root.path),
+                    "git": (
+                        root.git_watcher.format_for_llm_compact(root.last_git_observation)
+                        if root.git_watcher and root.last_git_observation else None
+                    ),
+                    "responses": root.responder.get_stats(),
+                    **scheduler_stats[root.name],
+                }
+                for root in self.roots
+            },
+            "user_messages": self.responder_scheduler.get_stats(),
             "dream_status": {
                 "actions_since_dream": self._dream_action_count,
                 "last_activity": self._last_activity_time.isoformat(),
@@ -1026,6 +1466,19 @@ class ConsciousnessDaemon:
             "database_stats": stats,
             "learning_status": learning_status,
             "engine_stats": engine_stats,
+            "llm_usage": {
+                "recent": get_llm_metrics().get_stats(),
+                "thoughts": await self.state.get_thought_usage_stats(),
+                "early_exit": self.thinker.get_early_exit_stats(),
+                "parsing": self.thinker.get_parse_stats(),
+                "clients": self.llm_clients.get_stats(),
+                "lm_studio_health": self.health_monitor.get_stats(),
+                "gemini": self.gemini_gateway.get_stats(),
+            },
+            "observation": self.observation_pipeline.get_stats(),
+            "actions": self.action_pipeline.get_stats(),
+            "executor_pool": self.executor_pool.get_stats(),
+            "python_workers": self.python_workers.get_stats(),
         }
 
 
@@ -10,6 +10,7 @@ Components:
 - actions.py: Action templates and definitions (ActionTemplate, BUILT_IN_ACTIONS)
 - evaluator.py: LLM-based action evaluation (ActionEvaluator)
 - engine.py: Main decision engine (DecisionEngine)
+- cache.py: Decision reuse for repeated observations (DecisionCache)
 
 Usage:
     from consciousness.decision import DecisionEngine, ActionTemplate
@@ -23,6 +24,7 @@ from .categories import (
     CategorizedChanges,
     categorize_changes,
     categorize_single_change,
+    split_by_category,
 )
 
 from .actions import (
@@ -39,6 +41,11 @@ from .evaluator import (
     MultiActionEvaluation,
 )
 
+from .cache import (
+    DecisionCache,
+    normalize_observation,
+)
+
 from .engine import (
     DecisionEngine,
     AutonomousEngine,
@@ -53,6 +60,7 @@ __all__ = [
     "CategorizedChanges",
     "categorize_changes",
     "categorize_single_change",
+    "split_by_category",
     # Actions
     "ActionTemplate",
     "ActionMatch",
@@ -63,6 +71,9 @@ __all__ = [
     "ActionEvaluator",
     "EvaluationResult",
     "MultiActionEvaluation",
+    # Cache
+    "DecisionCache",
+    "normalize_observation",
     # Engine
     "DecisionEngine",
     "AutonomousEngine",
@@ -0,0 +1,195 @@
+"""
+Decision Cache
+
+Recurring situations (the same index file regenerated, the same test file
+saved again) would otherwise cost a full think_autonomous round trip each
+time. The cache remembers recent decisions by a fingerprint of their inputs:
+- Observations, git status, learned patterns and the stable part of the
+  context, normalized so that timestamps, relative commit times and
+  per-cycle counters don't change the fingerprint
+- Entries expire after ttl_seconds; at most max_entries are kept (LRU)
+- invalidate() drops everything, e.g. when the knowledge base or the
+  learned patterns change
+
+Usage:
+    cache = DecisionCache(ttl_seconds=600, max_entries=128)
+    key = cache.fingerprint(observations, git_status, learned_patterns, context)
+    decision = cache.get(key)
+    if decision is None:
+        decision = await thinker.think_autonomous(...)
+        cache.put(key, decision)
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from consciousness.thinker import Decision
+
+logger = logging.getLogger(__name__)
+
+# Context keys that change every cycle without changing the situation
+VOLATILE_CONTEXT_KEYS = frozenset({
+    "cycle",
+    "decision_number",
+    "actions_taken_so_far",
+    "total_actions",
+})
+
+_TIMESTAMP_LINE = re.compile(r"^\s*Timestamp:.*$", re.MULTILINE)
+_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?")
+_RELATIVE_TIME = re.compile(r"\(\d+ \w+ ago\)")
+_TRAILING_SPACE = re.compile(r"[ \t]+$", re.MULTILINE)
+
+
+def normalize_observation(text: str) -> str:
+    """Strip the parts of an observation that differ between identical situations."""
+    text = _TIMESTAMP_LINE.sub("", text)
+    text = _DATETIME.sub("<time>", text)
+    text = _RELATIVE_TIME.sub("(<ago>)", text)
+    return _TRAILING_SPACE.sub("", text).strip()
+
+
+@dataclass
+class CacheEntry:
+    """A cached decision and when it was stored."""
+
+    decision: "Decision"
+    created_at: float
+    hits: int = 0
+
+
+class DecisionCache:
+    """
+    TTL- and size-bounded cache of autonomous decisions.
+
+    Keys are fingerprints from fingerprint(); values are thinker Decisions.
+    Only decisions that came from a successful LLM call should be stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 128):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long a decision stays valid
+            max_entries: Maximum number of cached decisions
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+        self.last_invalidation_reason = ""
+
+    @staticmethod
+    def fingerprint(
+        observations: str,
+        git_status: Optional[str] = None,
+        learned_patterns: Optional[list[str]] = None,
+        context: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """
+        Fingerprint the inputs of a decision.
+
+        Args:
+            observations: Formatted observations
+            git_status: Formatted git status
+            learned_patterns: Learned pattern descriptions (order is ignored)
+            context: Decision context (volatile keys are ignored)
+
+        Returns:
+            Hex digest identifying the situation
+        """
+        stable_context = {
+            key: value for key, value in (context or {}).items()
+            if key not in VOLATILE_CONTEXT_KEYS
+        }
+        payload = json.dumps(
+            [
+                normalize_observation(observations),
+                normalize_observation(git_status or ""),
+                sorted(learned_patterns or []),
+                stable_context,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional["Decision"]:
+        """
+        Look up a decision.
+
+        Returns:
+            The cached decision, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if time.monotonic() - entry.created_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.hits += 1
+        return entry.decision
+
+    def put(self, key: str, decision: "Decision") -> None:
+        """Store a decision, evicting the least recently used beyond max_entries."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = CacheEntry(decision=decision, created_at=time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, reason: str = "") -> int:
+        """
+        Drop all cached decisions.
+
+        Args:
+            reason: Why (for logging and stats)
+
+        Returns:
+            Number of entries dropped
+        """
+        dropped = len(self._entries)
+        self._entries.clear()
+        self.invalidations += 1
+        self.last_invalidation_reason = reason
+        if dropped:
+            logger.debug(f"Decision cache invalidated ({reason}): {dropped} entries dropped")
+        return dropped
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "invalidations": self.invalidations,
+            "last_invalidation_reason": self.last_invalidation_reason,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+        }
@@ -44,11 +44,11 @@ class CategorizedChanges:
 
     def __getitem__(self, category: ObservationCategory) -> list["FileChange"]:
         """Get changes by category."""
-        return getattr(self, category.value)
+        return getattr(self, category.name.lower())
 
     def add(self, category: ObservationCategory, change: "FileChange") -> None:
         """Add a change to a category."""
-        getattr(self, category.value).append(change)
+        self[category].append(change)
 
     def all_actionable(self) -> list["FileChange"]:
         """Get all non-noise changes."""
@@ -271,6 +271,40 @@ def categorize_changes(changes: list["FileChange"]) -> CategorizedChanges:
     return result
 
 
+def split_by_category(
+    changes: list["FileChange"],
+    max_groups: int,
+) -> list[list["FileChange"]]:
+    """
+    Split changes into at most `max_groups` groups of related changes.
+
+    Each actionable category becomes a group (in ObservationCategory
+    order); categories beyond `max_groups` join the last group and noise
+    joins the first, so no change is dropped.
+
+    Args:
+        changes: List of file changes to split
+        max_groups: Largest number of groups to return
+
+    Returns:
+        Non-empty groups; a single group if there is nothing to split
+    """
+    categorized = categorize_changes(changes)
+    groups = [
+        list(categorized[category])
+        for category in ObservationCategory
+        if category != ObservationCategory.NOISE and categorized[category]
+    ]
+    if len(groups) <= 1 or max_groups <= 1:
+        return [list(changes)] if changes else []
+
+    groups, overflow = groups[:max_groups], groups[max_groups:]
+    for group in overflow:
+        groups[-1].extend(group)
+    groups[0].extend(categorized.noise)
+    return groups
+
+
 def get_category_description(category: ObservationCategory) -> str:
     """Get a human-readable description of a category."""
     descriptions = {
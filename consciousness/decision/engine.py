@@ -13,12 +13,15 @@ import logging
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING, Any
+from typing import Callable, Optional, TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from consciousness.thinker import ConsciousnessThinker, Decision, Action
+    from consciousness.thinker import ConsciousnessThinker, Decision, Action, ActionType, EarlyExit
+    from consciousness.llm_metrics import LLMUsage
     from consciousness.watcher import FileChange
 
+from consciousness.file_access import FileAccessService, get_file_access_service
+
 from .categories import (
     ObservationCategory,
     CategorizedChanges,
@@ -36,6 +39,7 @@ from .evaluator import (
     EvaluationResult,
     MultiActionEvaluation,
 )
+from .cache import DecisionCache
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +86,9 @@ class EngineDecision:
     executor_type: str = "claude_code"
     priority: int = 5
     timestamp: float = field(default_factory=time.time)
+    usage: Optional["LLMUsage"] = None  # Tokens and latency of the LLM call
+    cached: bool = False  # Reused from the decision cache (no LLM call)
+    early_exit: Optional["EarlyExit"] = None  # Generation stopped once the outcome was known
 
     # For backward compatibility with template-based system
     action_match: Optional[ActionMatch] = None
@@ -99,6 +106,8 @@ class EngineDecision:
             "executor_type": self.executor_type,
             "priority": self.priority,
             "timestamp": self.timestamp,
+            "cached": self.cached,
+            "early_exit": self.early_exit.to_dict() if self.early_exit else None,
             "context": self.context.to_dict() if self.context else None,
         }
 
@@ -133,6 +142,7 @@ class AutonomousEngine:
         confidence_threshold: float = 0.5,  # Lower threshold for autonomous mode
         working_dir: Optional[Path] = None,
         enable_learning: bool = True,
+        decision_cache: Optional[DecisionCache] = None,
     ):
         """
         Initialize the autonomous decision engine.
@@ -142,11 +152,13 @@ class AutonomousEngine:
             confidence_threshold: Minimum confidence to execute
             working_dir: Working directory for file operations
             enable_learning: Whether to use learned patterns
+            decision_cache: Reuse decisions for identical inputs (no cache if None)
         """
         self.thinker = thinker
         self.confidence_threshold = confidence_threshold
         self.working_dir = working_dir or Path.cwd()
         self.enable_learning = enable_learning
+        self.decision_cache = decision_cache
 
         # For building few-shot examples
         self.example_templates = BUILT_IN_ACTIONS[:3]  # Just a few examples
@@ -161,6 +173,7 @@ class AutonomousEngine:
         git_status: Optional[str] = None,
         learned_patterns: Optional[list[str]] = None,
         additional_context: Optional[dict] = None,
+        on_action_type: Optional[Callable[["ActionType"], None]] = None,
     ) -> EngineDecision:
         """
         Make a fully autonomous decision about what to do.
@@ -172,6 +185,8 @@ class AutonomousEngine:
             git_status: Current git status output
             learned_patterns: Patterns learned from successful past actions
             additional_context: Any additional context
+            on_action_type: Called with the action type as soon as the LLM
+                has generated it (not called for cached decisions)
 
         Returns:
             EngineDecision with freely-generated action
@@ -187,15 +202,33 @@ class AutonomousEngine:
             **(additional_context or {})
         }
 
-        # Let the LLM think autonomously
-        logger.debug("Autonomous thinking about observations...")
+        # Reuse the decision of an identical recent situation
+        cache_key = None
+        decision = None
+        if self.decision_cache is not None:
+            cache_key = self.decision_cache.fingerprint(
+                observations, git_status, learned_patterns, context
+            )
+            decision = self.decision_cache.get(cache_key)
 
-        decision = await self.thinker.think_autonomous(
-            observations=observations,
-            git_status=git_status,
-            learned_patterns=learned_patterns or [],
-            context=context,
-        )
+        cached = decision is not None
+        if cached:
+            logger.debug("Decision cache hit, skipping LLM call")
+        else:
+            # Let the LLM think autonomously
+            logger.debug("Autonomous thinking about observations...")
+
+            decision = await self.thinker.think_autonomous(
+                observations=observations,
+                git_status=git_status,
+                learned_patterns=learned_patterns or [],
+                context=context,
+                on_action_type=on_action_type,
+            )
+
+            # Only decisions from a successful LLM call are worth reusing
+            if cache_key is not None and decision.usage is not None and decision.usage.success:
+                self.decision_cache.put(cache_key, decision)
 
         # Convert thinker Decision to EngineDecision
         from consciousness.thinker import DecisionType, ActionType
@@ -247,7 +280,8 @@ class AutonomousEngine:
 
         logger.info(
             f"Autonomous decision: {'ACT' if should_act else 'WAIT'} "
-            f"(confidence: {decision.confidence:.2f}, duration: {duration:.2f}s)"
+            f"(confidence: {decision.confidence:.2f}, duration: {duration:.2f}s"
+            f"{', cached' if cached else ''})"
         )
 
         return EngineDecision(
@@ -260,6 +294,9 @@ class AutonomousEngine:
             expected_outcome=decision.expected_outcome,
             executor_type=executor_type,
             priority=priority,
+            usage=None if cached else decision.usage,
+            cached=cached,
+            early_exit=None if cached else decision.early_exit,
         )
 
     def get_statistics(self) -> dict:
@@ -270,6 +307,7 @@ class AutonomousEngine:
             "action_rate": self._actions_taken / max(self._decisions_made, 1),
             "confidence_threshold": self.confidence_threshold,
             "learning_enabled": self.enable_learning,
+            "decision_cache": self.decision_cache.get_stats() if self.decision_cache else None,
         }
 
 
@@ -293,6 +331,8 @@ class DecisionEngine:
         read_file_contents: bool = True,
         working_dir: Optional[Path] = None,
         mode: str = "autonomous",  # "autonomous", "template", "hybrid"
+        max_content_bytes: int = 50_000,
+        file_access: Optional[FileAccessService] = None,
     ):
         """
         Initialize the decision engine.
@@ -306,6 +346,9 @@ class DecisionEngine:
             read_file_contents: Whether to read file contents for prompts
             working_dir: Working directory for file operations
             mode: Operating mode ("autonomous", "template", "hybrid")
+            max_content_bytes: Per-file budget for prompt content; larger
+                files are included as head/tail windows
+            file_access: Shared file reader (uses the global service if None)
         """
         self.thinker = thinker
         self.actions = actions or BUILT_IN_ACTIONS
@@ -315,6 +358,8 @@ class DecisionEngine:
         self.read_file_contents = read_file_contents
         self.working_dir = working_dir or Path.cwd()
         self.mode = mode
+        self.max_content_bytes = max_content_bytes
+        self.file_access = file_access or get_file_access_service()
 
         # Autonomous engine for autonomous/hybrid modes
         self.autonomous_engine = AutonomousEngine(
@@ -347,14 +392,14 @@ class DecisionEngine:
         self._action_last_executed[action_name] = time.time()
 
     async def _read_file_content(self, path: str) -> Optional[str]:
-        """Read content of a file if it exists."""
+        """Read content of a file if it exists (windowed to max_content_bytes)."""
         try:
             full_path = self.working_dir / path
-            if full_path.exists() and full_path.is_file():
-                size = full_path.stat().st_size
-                if size > 50000:
-                    return f"[File too large: {size} bytes]"
-                return full_path.read_text(encoding="utf-8", errors="replace")
+            content = await self.file_access.read_text(
+                full_path, max_bytes=self.max_content_bytes
+            )
+            if content is not None:
+                return content.text
         except Exception as e:
             logger.warning(f"Failed to read {path}: {e}")
         return None
@@ -602,16 +647,12 @@ class DecisionEngine:
                 if cat_changes:
                     category_groups[category] = cat_changes
 
-        decisions = []
-        for category, cat_changes in category_groups.items():
-            if len(decisions) >= max_decisions:
-                break
-
-            decision = await self.process(cat_changes)
-            if decision.should_act:
-                decisions.append(decision)
-
-        return decisions
+        # Categories are independent: evaluate them concurrently, keeping
+        # category order when picking the first max_decisions
+        results = await asyncio.gather(
+            *(self.process(cat_changes) for cat_changes in category_groups.values())
+        )
+        return [decision for decision in results if decision.should_act][:max_decisions]
 
     def add_action(self, action: ActionTemplate) -> None:
         """Add a new action template."""
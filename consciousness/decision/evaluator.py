@@ -243,7 +243,10 @@ class ActionEvaluator:
         )
 
         try:
-            decision = await self.thinker.think(prompt, context)
+            # A re-evaluation of the same action replaces one still queued
+            decision = await self.thinker.think(
+                prompt, context, request_class="evaluation", key=f"evaluation:{template.name}"
+            )
 
             # Parse the response
             if decision.raw_response:
@@ -345,7 +348,9 @@ class ActionEvaluator:
         )
 
         try:
-            decision = await self.thinker.think(prompt, context)
+            decision = await self.thinker.think(
+                prompt, context, request_class="evaluation", key="evaluation:batch"
+            )
 
             if decision.raw_response:
                 try:
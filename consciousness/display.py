@@ -19,6 +19,7 @@ try:
     from rich.table import Table
     from rich.text import Text
     from rich.markdown import Markdown
+    from rich.markup import escape
     from rich.syntax import Syntax
     from rich.live import Live
     from rich.spinner import Spinner
@@ -258,6 +259,17 @@ class ThinkingDisplay:
             f"[cyan]{action_type}[/cyan] - {description[:80]}..."
         )
 
+    def show_action_progress(self, source: str, line: str) -> None:
+        """Display a line of output from a running action."""
+        if not self.config.show_actions:
+            return
+
+        if not HAS_RICH or not self.console:
+            print(f"... {source}: {line[:120]}")
+            return
+
+        self.console.print(f"[dim]  ⋯ {source}: {escape(line[:120])}[/dim]")
+
     def show_action_result(
         self,
         success: bool,
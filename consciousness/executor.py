@@ -31,13 +31,27 @@ import shutil
 import tempfile
 import os
 import stat
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Callable, Awaitable, Iterable
 from pathlib import Path
 from enum import Enum
 import logging
 import hashlib
 
+from .action_pipeline import normalize_path, paths_overlap
+from .gemini_gateway import GeminiUnavailable, get_gemini_gateway
+from .output_capture import READ_CHUNK, BoundedOutput, capture_process
+from .python_workers import get_python_worker_pool
+from .resource_usage import (
+    AccountedProcess,
+    ResourceLimits,
+    ResourceSampler,
+    record_usage,
+    spawn_process,
+    track_resources,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -122,6 +136,7 @@ class ExecutionResult:
     files_modified: List[str] = field(default_factory=list)
     files_deleted: List[str] = field(default_factory=list)
     return_code: Optional[int] = None
+    resources: Optional[Dict[str, Any]] = None  # Subprocess usage (see resource_usage.py)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert result to dictionary."""
@@ -137,6 +152,7 @@ class ExecutionResult:
             "files_modified": self.files_modified,
             "files_deleted": self.files_deleted,
             "return_code": self.return_code,
+            "resources": self.resources,
         }
 
     @classmethod
@@ -308,6 +324,23 @@ class ExecutionConfig:
     max_output_size: int = 1_000_000  # 1MB
     max_file_size: int = 10_000_000   # 10MB
 
+    # Subprocess output is streamed: the first/last bytes of each stream are
+    # kept, the middle is dropped (and spilled to a .gz log if output_log_dir)
+    output_head_bytes: int = 768_000
+    output_tail_bytes: int = 256_000
+    output_log_dir: Optional[Path] = None
+    progress_interval: float = 2.0    # Seconds between live progress lines
+
+    # Run Python snippets in the shared warm worker pool (python_workers.py);
+    # the daemon turns this on and owns the pool's lifecycle
+    use_python_workers: bool = False
+
+    # Resource accounting and rlimits for spawned processes (0 = unlimited)
+    resource_sample_interval: float = 0.5
+    rlimit_cpu_seconds: int = 0
+    rlimit_memory_mb: int = 0         # Address space; Node CLIs reserve a lot
+    rlimit_file_size_mb: int = 0
+
     # Security
     allow_delete: bool = False        # Require explicit enable
     allow_shell: bool = True
@@ -328,6 +361,89 @@ class ExecutionConfig:
     ])
 
 
+# =============================================================================
+# CLAUDE STREAM-JSON PARSING
+# =============================================================================
+
+# stream-json lines carry whole tool results; allow long lines
+STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+
+class ClaudeStreamParser:
+    """
+    Incremental parser for `claude --output-format stream-json` output.
+
+    Each line is one JSON event. With --include-partial-messages the text
+    arrives as content_block_delta events; otherwise as whole assistant
+    messages. The final `result` event carries the complete response.
+
+    Streamed text is kept in a BoundedOutput (its head and tail), so a long
+    session can't grow memory without bound.
+    """
+
+    def __init__(self, head_bytes: int = 768_000, tail_bytes: int = 256_000):
+        self.result: Optional[str] = None
+        self.is_error = False
+        self.streamed_chars = 0
+        self._text = BoundedOutput(head_bytes, tail_bytes)
+        self._partial = False
+
+    def feed(self, line: bytes | str) -> Optional[str]:
+        """
+        Parse one line of output.
+
+        Returns:
+            New response text from this line, if any
+        """
+        try:
+            event = json.loads(line)
+        except (ValueError, TypeError):
+            return None
+        if not isinstance(event, dict):
+            return None
+
+        event_type = event.get("type")
+        text: Optional[str] = None
+
+        if event_type == "stream_event":
+            inner = event.get("event") or {}
+            if inner.get("type") == "content_block_delta":
+                delta = inner.get("delta") or {}
+                if delta.get("type") == "text_delta":
+                    self._partial = True
+                    text = delta.get("text") or None
+            elif inner.get("type") == "content_block_start":
+                block = inner.get("content_block") or {}
+                if block.get("type") == "text" and self.streamed_chars:
+                    text = "\n\n"
+
+        elif event_type == "assistant" and not self._partial:
+            content = (event.get("message") or {}).get("content") or []
+            blocks = [
+                b.get("text", "") for b in content
+                if isinstance(b, dict) and b.get("type") == "text"
+            ]
+            if any(blocks):
+                text = ("\n\n" if self.streamed_chars else "") + "".join(blocks)
+
+        elif event_type == "result":
+            result = event.get("result")
+            self.result = result if isinstance(result, str) else None
+            self.is_error = bool(event.get("is_error")) or event.get("subtype", "success") != "success"
+
+        if text:
+            self._text.feed(text.encode("utf-8"))
+            self.streamed_chars += len(text)
+        return text
+
+    @property
+    def output(self) -> str:
+        """The final response, or everything streamed if there was no result event."""
+        if self.result is not None:
+            return self.result
+        return self._text.text()
+
+
 # =============================================================================
 # MAIN EXECUTOR CLASS
 # =============================================================================
@@ -363,6 +479,9 @@ class ExpandedExecutor:
         self.node_path = self._find_executable("node")
         self.ts_node_path = self._find_executable("ts-node") or self._find_executable("npx")
 
+        # Called with (label, line) while a subprocess runs (e.g. the display)
+        self.on_progress: Optional[Callable[[str, str], None]] = None
+
         # Ensure working directory exists
         if not self.working_dir.exists():
             self.working_dir.mkdir(parents=True, exist_ok=True)
@@ -373,6 +492,12 @@ class ExpandedExecutor:
             self.config.temp_dir = self.working_dir / ".consciousness" / "temp"
         self.config.temp_dir.mkdir(parents=True, exist_ok=True)
 
+    def _temp_file(self, prefix: str, suffix: str) -> Path:
+        """Create a uniquely named file in the temp directory."""
+        fd, name = tempfile.mkstemp(prefix=prefix, suffix=suffix, dir=self.config.temp_dir)
+        os.close(fd)
+        return Path(name)
+
     def _find_executable(self, name: str) -> Optional[str]:
         """Find executable in PATH."""
         path = shutil.which(name)
@@ -454,27 +579,77 @@ class ExpandedExecutor:
 
         logger.info(f"Executing action: {action.type.value} (priority: {action.priority.value})")
 
-        try:
-            # Route to appropriate handler
-            result = await self._route_action(action)
+        with track_resources() as usage:
+            try:
+                # Route to appropriate handler
+                result = await self._route_action(action)
 
-        except ValueError as e:
-            # Validation errors
-            result = ExecutionResult.failure(f"Validation error: {e}", action.type)
+            except ValueError as e:
+                # Validation errors
+                result = ExecutionResult.failure(f"Validation error: {e}", action.type)
 
-        except asyncio.TimeoutError:
-            result = ExecutionResult.failure(
-                f"Action timed out after {action.timeout or self.config.default_timeout}s",
-                action.type
-            )
+            except asyncio.TimeoutError:
+                result = ExecutionResult.failure(
+                    f"Action timed out after {action.timeout or self.config.default_timeout}s",
+                    action.type
+                )
 
-        except Exception as e:
-            logger.exception(f"Action execution failed: {e}")
-            result = ExecutionResult.failure(str(e), action.type)
+            except Exception as e:
+                logger.exception(f"Action execution failed: {e}")
+                result = ExecutionResult.failure(str(e), action.type)
 
-        # Set duration
+        # Set duration and what the action's processes used
         result.duration = time.time() - start_time
+        if usage.processes:
+            result.resources = usage.to_dict()
+
+        return result
+
+    async def execute_streaming(
+        self,
+        action: Action,
+        on_text: Callable[[str], Awaitable[None]],
+    ) -> ExecutionResult:
+        """
+        Execute an action, passing output text to on_text as it arrives.
+
+        Claude Code is run with --output-format stream-json and on_text
+        receives each text delta. Other action types run as in execute()
+        and on_text is not called.
+
+        Args:
+            action: The action to execute
+            on_text: Awaited with each piece of output text
+
+        Returns:
+            ExecutionResult whose output is the final (complete) response
+        """
+        if action.type != ActionType.CLAUDE_CODE:
+            return await self.execute(action)
+
+        start_time = time.time()
+        logger.info(f"Executing action (streaming): {action.type.value}")
+
+        with track_resources() as usage:
+            try:
+                result = await self._claude_code_stream(action, on_text)
+
+            except ValueError as e:
+                result = ExecutionResult.failure(f"Validation error: {e}", action.type)
+
+            except asyncio.TimeoutError:
+                result = ExecutionResult.failure(
+                    f"Action timed out after {action.timeout or self.config.claude_timeout}s",
+                    action.type
+                )
+
+            except Exception as e:
+                logger.exception(f"Streaming execution failed: {e}")
+                result = ExecutionResult.failure(str(e), action.type)
 
+        result.duration = time.time() - start_time
+        if usage.processes:
+            result.resources = usage.to_dict()
         return result
 
     async def _route_action(self, action: Action) -> ExecutionResult:
@@ -748,9 +923,34 @@ class ExpandedExecutor:
             if venv_python.exists():
                 python_cmd = str(venv_python)
 
+        timeout = action.timeout or self.config.code_execution_timeout
+
+        if code and self.config.use_python_workers and not venv:
+            # Warm interpreter: no process start or temp file per snippet
+            snippet = await get_python_worker_pool().run(
+                code, cwd=self.working_dir, args=args, timeout=timeout
+            )
+            if snippet.timed_out:
+                raise asyncio.TimeoutError()
+            if snippet.resources is not None:
+                record_usage(snippet.resources)
+            return ExecutionResult(
+                success=snippet.success,
+                output=snippet.stdout,
+                error=snippet.stderr if not snippet.success else None,
+                action_type=ActionType.RUN_PYTHON,
+                return_code=snippet.returncode,
+                mode=ExecutionMode.DIRECT,
+                metadata={
+                    "command": "python worker",
+                    "worker_pid": snippet.worker_pid,
+                    "worker_ms": snippet.duration_ms,
+                },
+            )
+
         if code:
             # Write code to temp file and execute
-            temp_file = self.config.temp_dir / f"script_{int(time.time())}.py"
+            temp_file = self._temp_file("script_", ".py")
             temp_file.write_text(code)
 
             cmd = [python_cmd, str(temp_file)] + args
@@ -763,14 +963,12 @@ class ExpandedExecutor:
                 ActionType.RUN_PYTHON
             )
 
-        result = await self._run_subprocess(
-            cmd,
-            timeout=action.timeout or self.config.code_execution_timeout
-        )
-
-        # Cleanup temp file
-        if code and temp_file.exists():
-            temp_file.unlink()
+        try:
+            result = await self._run_subprocess(cmd, timeout=timeout)
+        finally:
+            # Cleanup temp file
+            if code and temp_file.exists():
+                temp_file.unlink()
 
         return ExecutionResult(
             success=result["returncode"] == 0,
@@ -809,7 +1007,7 @@ class ExpandedExecutor:
             )
 
         if code:
-            temp_file = self.config.temp_dir / f"script_{int(time.time())}.ts"
+            temp_file = self._temp_file("script_", ".ts")
             temp_file.write_text(code)
             cmd = ts_runner + [str(temp_file)] + args
         elif file_path:
@@ -858,7 +1056,7 @@ class ExpandedExecutor:
         bash_path = shutil.which("bash") or "/bin/bash"
 
         if script:
-            temp_file = self.config.temp_dir / f"script_{int(time.time())}.sh"
+            temp_file = self._temp_file("script_", ".sh")
             temp_file.write_text(script)
             temp_file.chmod(temp_file.stat().st_mode | stat.S_IEXEC)
 
@@ -911,7 +1109,7 @@ class ExpandedExecutor:
             )
 
         if code:
-            temp_file = self.config.temp_dir / f"script_{int(time.time())}.js"
+            temp_file = self._temp_file("script_", ".js")
             temp_file.write_text(code)
             cmd = [self.node_path, str(temp_file)] + args
         elif file_path:
@@ -1094,6 +1292,102 @@ class ExpandedExecutor:
             }
         )
 
+    async def _claude_code_stream(
+        self,
+        action: Action,
+        on_text: Callable[[str], Awaitable[None]],
+    ) -> ExecutionResult:
+        """
+        Execute a Claude Code prompt, streaming text deltas to on_text.
+
+        Details:
+            - prompt: The prompt for Claude Code
+            - allowedTools: Optional list of allowed tools
+        """
+        details = action.details
+        prompt = details.get("prompt", action.prompt)
+        allowed_tools = details.get("allowedTools", [])
+
+        if not prompt:
+            return ExecutionResult.failure(
+                "Prompt is required for Claude Code",
+                ActionType.CLAUDE_CODE
+            )
+
+        if not self.claude_path:
+            return ExecutionResult.failure(
+                "Claude CLI not found. Ensure 'claude' is installed.",
+                ActionType.CLAUDE_CODE
+            )
+
+        cmd = [
+            self.claude_path, "--print", "--permission-mode", "acceptEdits",
+            "--output-format", "stream-json", "--verbose", "--include-partial-messages",
+        ]
+        if allowed_tools:
+            cmd.extend(["--allowedTools", ",".join(allowed_tools)])
+        cmd.append(prompt)
+
+        process = await self.spawn(cmd, limit=STREAM_LINE_LIMIT)
+        head_bytes, tail_bytes = self.config.output_head_bytes, self.config.output_tail_bytes
+        stream = ClaudeStreamParser(head_bytes, tail_bytes)
+        stderr = BoundedOutput(head_bytes, tail_bytes)
+        sampler = ResourceSampler(process.pid, self.config.resource_sample_interval).start()
+
+        async def drain_stderr() -> None:
+            while True:
+                chunk = await process.stderr.read(READ_CHUNK)
+                if not chunk:
+                    return
+                stderr.feed(chunk)
+
+        async def pump() -> None:
+            # Drain stderr alongside stdout so a chatty process can't block
+            stderr_task = asyncio.create_task(drain_stderr())
+            try:
+                async for line in process.stdout:
+                    text = stream.feed(line)
+                    if text:
+                        await on_text(text)
+                await process.wait()
+                await stderr_task
+            finally:
+                stderr_task.cancel()
+
+        try:
+            await asyncio.wait_for(
+                pump(),
+                timeout=action.timeout or self.config.claude_timeout
+            )
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        finally:
+            record_usage(await sampler.stop(process.rusage))
+
+        output = stream.output
+        if len(output) > self.config.max_output_size:
+            output = output[:self.config.max_output_size] + "\n... (truncated)"
+        success = process.returncode == 0 and not stream.is_error
+
+        return ExecutionResult(
+            success=success,
+            output=output,
+            error=None if success else (
+                stderr.text() or stream.output or "Claude Code failed"
+            ),
+            action_type=ActionType.CLAUDE_CODE,
+            return_code=process.returncode,
+            mode=ExecutionMode.SIMPLE,
+            metadata={
+                "command": "claude --print",
+                "output_format": "stream-json",
+                "streamed_chars": stream.streamed_chars,
+            }
+        )
+
     async def _claude_flow(self, action: Action) -> ExecutionResult:
         """
         Execute a Claude Flow swarm for complex tasks.
@@ -1303,72 +1597,49 @@ class ExpandedExecutor:
         timeout: Optional[int]
     ) -> Optional[ExecutionResult]:
         """
-        Execute Gemini using the google-generativeai Python SDK.
+        Execute Gemini using the google-generativeai Python SDK (through the
+        shared GeminiGateway).
 
         Returns None if SDK is not available or fails to initialize.
         """
-        try:
-            import google.generativeai as genai
-        except ImportError:
-            logger.debug("google-generativeai package not installed")
-            return None
-
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
-            logger.debug("GOOGLE_API_KEY not set for SDK")
+        gateway = get_gemini_gateway()
+        if not gateway.available:
+            logger.debug("Gemini SDK unavailable (package or GOOGLE_API_KEY missing)")
             return None
 
+        timeout_seconds = timeout or self.config.gemini_timeout
         try:
-            # Configure the SDK
-            genai.configure(api_key=api_key)
-
-            # Get the model
-            gemini_model = genai.GenerativeModel(model)
-
-            # Generate content with timeout
-            timeout_seconds = timeout or self.config.gemini_timeout
-
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-
-            def generate():
-                response = gemini_model.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=8192,
-                        temperature=0.3,  # Lower temperature for analysis
-                    ),
-                    safety_settings={
-                        "HARM_CATEGORY_HARASSMENT": "BLOCK_NONE",
-                        "HARM_CATEGORY_HATE_SPEECH": "BLOCK_NONE",
-                        "HARM_CATEGORY_SEXUALLY_EXPLICIT": "BLOCK_NONE",
-                        "HARM_CATEGORY_DANGEROUS_CONTENT": "BLOCK_NONE",
-                    }
-                )
-                return response
-
-            try:
-                response = await asyncio.wait_for(
-                    loop.run_in_executor(None, generate),
-                    timeout=timeout_seconds
-                )
+            response = await gateway.generate(
+                prompt,
+                model=model,
+                timeout=timeout_seconds,
+                max_output_tokens=8192,
+                temperature=0.3,  # Lower temperature for analysis
+                safety_settings={
+                    "HARM_CATEGORY_HARASSMENT": "BLOCK_NONE",
+                    "HARM_CATEGORY_HATE_SPEECH": "BLOCK_NONE",
+                    "HARM_CATEGORY_SEXUALLY_EXPLICIT": "BLOCK_NONE",
+                    "HARM_CATEGORY_DANGEROUS_CONTENT": "BLOCK_NONE",
+                },
+            )
 
-                # Extract text from response
-                output = response.text if hasattr(response, 'text') else str(response)
+            return ExecutionResult(
+                success=True,
+                output=response.text,
+                action_type=ActionType.GEMINI_ANALYZE,
+                mode=ExecutionMode.SIMPLE,
+                metadata={"method": "sdk"}
+            )
 
-                return ExecutionResult(
-                    success=True,
-                    output=output,
-                    action_type=ActionType.GEMINI_ANALYZE,
-                    mode=ExecutionMode.SIMPLE,
-                    metadata={"method": "sdk"}
-                )
+        except asyncio.TimeoutError:
+            return ExecutionResult.failure(
+                f"Gemini SDK timed out after {timeout_seconds}s",
+                ActionType.GEMINI_ANALYZE
+            )
 
-            except asyncio.TimeoutError:
-                return ExecutionResult.failure(
-                    f"Gemini SDK timed out after {timeout_seconds}s",
-                    ActionType.GEMINI_ANALYZE
-                )
+        except GeminiUnavailable as e:
+            logger.debug(f"Gemini SDK unavailable: {e}")
+            return None
 
         except Exception as e:
             logger.warning(f"Gemini SDK execution failed: {e}")
@@ -1397,7 +1668,7 @@ class ExpandedExecutor:
         gemini_cli = shutil.which("gemini")
         if gemini_cli:
             # Write prompt to temp file for large context
-            temp_file = self.config.temp_dir / f"gemini_prompt_{int(time.time())}.txt"
+            temp_file = self._temp_file("gemini_prompt_", ".txt")
             temp_file.write_text(prompt)
 
             try:
@@ -1437,7 +1708,7 @@ class ExpandedExecutor:
             }
 
             # Write request body to temp file
-            temp_request = self.config.temp_dir / f"gemini_request_{int(time.time())}.json"
+            temp_request = self._temp_file("gemini_request_", ".json")
             temp_request.write_text(json_module.dumps(request_body))
 
             try:
@@ -1794,6 +2065,8 @@ Conclude with a synthesis that integrates insights from all perspectives.
         """
         Run a subprocess asynchronously with timeout.
 
+        Output is streamed into bounded buffers (see capture_output).
+
         Args:
             cmd: Command and arguments (list) or command string (if shell=True)
             timeout: Timeout in seconds
@@ -1801,7 +2074,7 @@ Conclude with a synthesis that integrates insights from all perspectives.
             env: Optional environment variables
 
         Returns:
-            Dict with stdout, stderr, and returncode
+            Dict with stdout, stderr, returncode and per-stream byte counts
         """
         # Merge environment
         full_env = os.environ.copy()
@@ -1809,47 +2082,121 @@ Conclude with a synthesis that integrates insights from all perspectives.
             full_env.update(env)
 
         if shell:
-            process = await asyncio.create_subprocess_shell(
-                cmd if isinstance(cmd, str) else " ".join(cmd),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.working_dir),
-                env=full_env
+            process = await self.spawn(
+                cmd if isinstance(cmd, str) else " ".join(cmd), shell=True, env=full_env
             )
         else:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.working_dir),
-                env=full_env
-            )
+            process = await self.spawn(list(cmd), env=full_env)
 
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
+        program = (cmd.split() or ["sh"])[0] if isinstance(cmd, str) else cmd[0]
+        return await self.capture_output(process, timeout, label=Path(program).name)
+
+    async def spawn(
+        self,
+        cmd: Union[List[str], str],
+        shell: bool = False,
+        env: Optional[Dict[str, str]] = None,
+        limit: int = 2 ** 16,
+    ) -> AccountedProcess:
+        """
+        Start a process in the working directory with the configured rlimits.
+
+        The process is reaped with os.wait4, so capture_output() can record
+        its exact CPU time and peak memory.
+
+        Args:
+            cmd: Command and arguments (list) or command string (if shell=True)
+            shell: Whether to use shell
+            env: Environment (inherited if None)
+            limit: Line length limit of the stdout/stderr readers
+
+        Returns:
+            The started process, with stdout and stderr pipes
+        """
+        return await spawn_process(
+            cmd,
+            shell=shell,
+            cwd=str(self.working_dir),
+            env=env,
+            limit=limit,
+            limits=ResourceLimits(
+                cpu_seconds=self.config.rlimit_cpu_seconds,
+                memory_mb=self.config.rlimit_memory_mb,
+                file_size_mb=self.config.rlimit_file_size_mb,
+            ),
+        )
+
+    async def capture_output(
+        self,
+        process: Union[asyncio.subprocess.Process, AccountedProcess],
+        timeout: Optional[float],
+        label: str = "subprocess",
+    ) -> Dict[str, Any]:
+        """
+        Stream a started process's output into bounded buffers.
+
+        Keeps the first output_head_bytes and last output_tail_bytes of
+        each stream, spills overflowing streams to output_log_dir, and
+        reports a progress line every progress_interval seconds (to the
+        log and to `on_progress`). The process tree's CPU, memory and I/O
+        are sampled meanwhile (and taken from the exit rusage for processes
+        from spawn()) and added to the current track_resources().
+
+        Args:
+            process: Process started with stdout and stderr pipes (spawn())
+            timeout: Timeout in seconds (the process is killed)
+            label: Name used in progress lines and spill files
+
+        Returns:
+            Dict with stdout, stderr, returncode, per-stream byte counts and
+            resource usage
+        """
+        spill_path = None
+        if self.config.output_log_dir is not None:
+            spill_path = Path(self.config.output_log_dir) / (
+                f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{process.pid}"
             )
 
-            # Truncate output if too large
-            stdout_str = stdout.decode('utf-8', errors='replace')
-            stderr_str = stderr.decode('utf-8', errors='replace')
+        last_progress = [0.0]
 
-            if len(stdout_str) > self.config.max_output_size:
-                stdout_str = stdout_str[:self.config.max_output_size] + "\n... (truncated)"
-            if len(stderr_str) > self.config.max_output_size:
-                stderr_str = stderr_str[:self.config.max_output_size] + "\n... (truncated)"
+        def on_line(stream: str, line: str) -> None:
+            now = time.monotonic()
+            if now - last_progress[0] < self.config.progress_interval:
+                return
+            last_progress[0] = now
+            logger.info(f"[{label}:{process.pid}] {stream}: {line[:200]}")
+            if self.on_progress is not None:
+                try:
+                    self.on_progress(label, line)
+                except Exception as e:
+                    logger.debug(f"Progress callback failed: {e}")
 
-            return {
-                "stdout": stdout_str,
-                "stderr": stderr_str,
-                "returncode": process.returncode
-            }
+        sampler = ResourceSampler(process.pid, self.config.resource_sample_interval).start()
+        try:
+            stdout, stderr = await capture_process(
+                process,
+                timeout=timeout,
+                head_bytes=self.config.output_head_bytes,
+                tail_bytes=self.config.output_tail_bytes,
+                spill_path=spill_path,
+                on_line=on_line,
+            )
+        finally:
+            usage = await sampler.stop(getattr(process, "rusage", None))
+            record_usage(usage)
+        if stdout.truncated or stderr.truncated:
+            logger.info(
+                f"{label} output truncated: stdout dropped {stdout.dropped_bytes} bytes, "
+                f"stderr dropped {stderr.dropped_bytes} bytes"
+            )
 
-        except asyncio.TimeoutError:
-            process.kill()
-            await process.wait()
-            raise
+        return {
+            "stdout": stdout.text(),
+            "stderr": stderr.text(),
+            "returncode": process.returncode,
+            "output": {"stdout": stdout.to_dict(), "stderr": stderr.to_dict()},
+            "resources": usage.to_dict(),
+        }
 
     # =========================================================================
     # UTILITY METHODS
@@ -2002,18 +2349,44 @@ Task:
 # EXECUTOR POOL
 # =============================================================================
 
+# Concurrent runs per executor type; other types ("direct" actions such as
+# file writes and scripts) are limited only by max_concurrent
+DEFAULT_EXECUTOR_LIMITS: Dict[str, int] = {
+    "claude_flow": 1,
+    "claude_code": 2,
+}
+
+# Executor type of actions that run Claude Code or Claude Flow without
+# being CLAUDE_CODE/CLAUDE_FLOW actions themselves (see ExpandedExecutor)
+ACTION_EXECUTOR_TYPES: Dict[ActionType, str] = {
+    ActionType.THINK: "claude_code",
+    ActionType.DEBATE: "claude_code",
+    ActionType.DISCUSS: "claude_code",
+    ActionType.RESEARCH: "claude_flow",  # Claude Flow, or Claude Code for quick research
+}
+
+
 class ExecutorPool:
     """
     Pool of executors for managing concurrent task execution.
 
-    Useful when the daemon needs to handle multiple decisions simultaneously.
+    Used by the daemon to run the decisions of one cycle side by side:
+    - At most `max_concurrent` runs at a time
+    - Per executor type limits (e.g. one Claude Flow swarm, two Claude Code
+      sessions, any number of direct actions up to max_concurrent)
+    - Path locks: runs touching the same paths (or a path and a directory
+      containing it) never overlap
+
+    Locks are taken in a fixed order (paths, executor type, pool), so a run
+    waiting for a path never holds a type or pool slot.
     """
 
     def __init__(
         self,
         working_dir: Path,
         max_concurrent: int = 3,
-        timeout: int = 300
+        timeout: int = 300,
+        limits: Optional[Dict[str, int]] = None,
     ):
         """
         Initialize the executor pool.
@@ -2022,21 +2395,143 @@ class ExecutorPool:
             working_dir: Working directory for execution
             max_concurrent: Maximum concurrent executions
             timeout: Default timeout per execution
+            limits: Concurrent runs per executor type
+                (default: DEFAULT_EXECUTOR_LIMITS)
         """
         self.working_dir = Path(working_dir)
         self.max_concurrent = max_concurrent
         self.timeout = timeout
+        self.limits = dict(DEFAULT_EXECUTOR_LIMITS if limits is None else limits)
         self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._type_semaphores: Dict[str, asyncio.Semaphore] = {}
         self._executor = ExpandedExecutor(
             working_dir,
             ExecutionConfig(default_timeout=timeout)
         )
         self._active_tasks: Dict[str, asyncio.Task] = {}
 
+        # Held path locks: id -> (paths, set when released)
+        self._path_locks: Dict[int, tuple] = {}
+        self._lock_ids = 0
+        self._running: Dict[str, int] = {}
+        self._stats = {
+            "completed": 0,
+            "failed": 0,
+            "path_waits": 0,
+            "type_waits": 0,
+        }
+
+    def _type_semaphore(self, executor_type: str) -> Optional[asyncio.Semaphore]:
+        limit = self.limits.get(executor_type)
+        if limit is None:
+            return None
+        semaphore = self._type_semaphores.get(executor_type)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, limit))
+            self._type_semaphores[executor_type] = semaphore
+        return semaphore
+
+    async def _lock_paths(self, paths: frozenset) -> Optional[int]:
+        """Wait until no run holds an overlapping path, then hold `paths`."""
+        if not paths:
+            return None
+        waited = False
+        while True:
+            blocking = [
+                released for held, released in self._path_locks.values()
+                if paths_overlap(paths, held)
+            ]
+            if not blocking:
+                break
+            if not waited:
+                self._stats["path_waits"] += 1
+                waited = True
+            await blocking[0].wait()
+
+        self._lock_ids += 1
+        self._path_locks[self._lock_ids] = (paths, asyncio.Event())
+        return self._lock_ids
+
+    def _unlock_paths(self, lock_id: Optional[int]) -> None:
+        if lock_id is not None:
+            _, released = self._path_locks.pop(lock_id)
+            released.set()
+
+    @asynccontextmanager
+    async def slot(self, executor_type: str = "direct", paths: Iterable[Union[str, Path]] = ()):
+        """
+        Hold the path locks, an `executor_type` slot and a pool slot.
+
+        Args:
+            executor_type: Executor kind, e.g. "claude_code" or "write_file"
+            paths: Paths the run reads or writes
+        """
+        lock_id = await self._lock_paths(frozenset(normalize_path(p) for p in paths))
+        try:
+            type_semaphore = self._type_semaphore(executor_type)
+            if type_semaphore is not None:
+                if type_semaphore.locked():
+                    self._stats["type_waits"] += 1
+                await type_semaphore.acquire()
+            try:
+                async with self._semaphore:
+                    self._running[executor_type] = self._running.get(executor_type, 0) + 1
+                    try:
+                        yield
+                    finally:
+                        self._running[executor_type] -= 1
+                        if not self._running[executor_type]:
+                            del self._running[executor_type]
+            finally:
+                if type_semaphore is not None:
+                    type_semaphore.release()
+        finally:
+            self._unlock_paths(lock_id)
+
+    async def run(
+        self,
+        task_id: str,
+        work: Awaitable[Any],
+        executor_type: str = "direct",
+        paths: Iterable[Union[str, Path]] = (),
+    ) -> Any:
+        """
+        Run `work` once its paths, executor type and the pool allow it.
+
+        Args:
+            task_id: Unique identifier for the task
+            work: Coroutine doing the execution
+            executor_type: Executor kind the limits are looked up by
+            paths: Paths the work reads or writes
+
+        Returns:
+            The result of `work`
+        """
+        started = False
+        try:
+            async with self.slot(executor_type, paths):
+                started = True
+                task = asyncio.current_task()
+                if task:
+                    self._active_tasks[task_id] = task
+                try:
+                    result = await work
+                except Exception:
+                    self._stats["failed"] += 1
+                    raise
+                finally:
+                    self._active_tasks.pop(task_id, None)
+                self._stats["completed"] += 1
+                return result
+        finally:
+            if not started and asyncio.iscoroutine(work):
+                work.close()  # Cancelled while waiting; never started
+
     async def execute(
         self,
         task_id: str,
-        action: Action
+        action: Action,
+        paths: Iterable[Union[str, Path]] = (),
     ) -> ExecutionResult:
         """
         Execute an action with concurrency control.
@@ -2044,19 +2539,21 @@ class ExecutorPool:
         Args:
             task_id: Unique identifier for the task
             action: The action to execute
+            paths: Paths the action touches (besides details["path"])
 
         Returns:
             ExecutionResult from the execution
         """
-        async with self._semaphore:
-            task = asyncio.current_task()
-            if task:
-                self._active_tasks[task_id] = task
-
-            try:
-                return await self._executor.execute(action)
-            finally:
-                self._active_tasks.pop(task_id, None)
+        paths = list(paths)
+        file_path = action.details.get("path") if action.details else None
+        if file_path:
+            paths.append(str(self.working_dir / file_path))
+        return await self.run(
+            task_id,
+            self._executor.execute(action),
+            executor_type=ACTION_EXECUTOR_TYPES.get(action.type, action.type.value),
+            paths=paths,
+        )
 
     async def execute_prompt(
         self,
@@ -2080,6 +2577,17 @@ class ExecutorPool:
             return True
         return False
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Running counts per executor type, limits and wait counters."""
+        return {
+            **self._stats,
+            "running": sum(self._running.values()),
+            "running_by_type": dict(self._running),
+            "max_concurrent": self.max_concurrent,
+            "limits": dict(self.limits),
+            "paths_locked": len(self._path_locks),
+        }
+
 
 # =============================================================================
 # CONVENIENCE FUNCTIONS
@@ -55,6 +55,7 @@ from .executor import (
     ActionType,
     Priority,
 )
+from .health_monitor import get_health_monitor
 from .gemini_consciousness import GeminiConsciousness, ConsciousnessThought
 
 logger = logging.getLogger(__name__)
@@ -295,6 +296,10 @@ class FallbackConsciousness:
         self._intent_detector = IntentDetector(self.config)
 
         # Mode tracking
+        self._health_monitor = get_health_monitor(
+            self.config.lm_studio_url,
+            failure_threshold=self.config.max_consecutive_failures,
+        )
         self._last_check_time: float = 0.0
         self._consecutive_failures: int = 0
         self._mode_callbacks: List[Callable[[FallbackMode, FallbackMode], None]] = []
@@ -311,7 +316,7 @@ class FallbackConsciousness:
         """
         Check which mode is available and set the current mode.
 
-        Uses ConsciousnessThinker.check_connection() to detect LM Studio.
+        Reads LM Studio availability from the shared HealthMonitor.
 
         Priority:
         1. PRIMARY (LM Studio) if available
@@ -321,7 +326,7 @@ class FallbackConsciousness:
         Returns:
             The available mode
         """
-        # Check LM Studio using ConsciousnessThinker.check_connection()
+        # Check LM Studio (monitor state, no probe on this path)
         if await self._check_lm_studio():
             new_mode = FallbackMode.PRIMARY
             logger.info("fallback.mode", mode="primary", provider="lm_studio")
@@ -343,7 +348,10 @@ class FallbackConsciousness:
 
     async def _check_lm_studio(self) -> bool:
         """
-        Check if LM Studio is available using ConsciousnessThinker.check_connection().
+        Check if LM Studio is available from the shared HealthMonitor.
+
+        The monitor probes in the background; only the first check (which
+        starts it) waits for a probe.
 
         Returns:
             True if LM Studio is reachable
@@ -358,14 +366,9 @@ class FallbackConsciousness:
                     autonomous=True,
                 )
 
-            available = await self._thinker.check_connection()
-
-            if available:
-                self._consecutive_failures = 0
-            else:
-                self._consecutive_failures += 1
-
-            return available
+            snapshot = await self._health_monitor.start()
+            self._consecutive_failures = snapshot.consecutive_failures
+            return snapshot.available
 
         except Exception as e:
             logger.warning(f"LM Studio check failed: {e}")
@@ -832,7 +835,6 @@ class FallbackRouter:
         if self.force_mode == "primary":
             self._status.mode = RouterMode.FORCED_PRIMARY
             self._status.message = "Mode forced to PRIMARY by user"
-            await self._consciousness._check_lm_studio()
             self._status.lm_studio_available = await self._consciousness._check_lm_studio()
             return self._status
 
@@ -13,6 +13,7 @@ from typing import Optional, Dict, Any, List
 
 import structlog
 
+from ..health_monitor import get_health_monitor
 from .gemini_consciousness import GeminiConsciousness, GeminiConfig, ConsciousnessThought
 from .lm_studio_detector import LMStudioDetector, LMStudioStatus
 
@@ -177,7 +178,9 @@ class ConsciousnessForwarder:
         if not force_gemini and self._detector:
             use_primary = self._detector.is_available
         elif not force_gemini and self._thinker:
-            use_primary = await self._thinker.check_connection()
+            monitor = get_health_monitor(str(self._thinker.client.base_url))
+            await monitor.start()
+            use_primary = monitor.is_available
 
         if use_primary and self._thinker:
             # Use LM Studio
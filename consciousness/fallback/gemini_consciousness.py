@@ -18,6 +18,9 @@ from typing import Optional, Any, Dict, List
 
 import structlog
 
+from ..gemini_gateway import get_gemini_gateway
+from ..llm_metrics import LLMCallTimer
+
 logger = structlog.get_logger(__name__)
 
 
@@ -96,12 +99,11 @@ class GeminiConsciousness:
         """
         self.config = config or GeminiConfig()
         self._initialized = False
-        self._genai = None
-        self._model = None
+        self._gateway = get_gemini_gateway()
 
     async def initialize(self) -> bool:
         """
-        Initialize Gemini SDK.
+        Check that Gemini can be used (SDK installed, API key set).
 
         Returns:
             True if successfully initialized
@@ -109,30 +111,17 @@ class GeminiConsciousness:
         if self._initialized:
             return True
 
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
+        if not os.environ.get("GOOGLE_API_KEY"):
             logger.warning("gemini.no_api_key")
             return False
 
-        try:
-            import google.generativeai as genai
-
-            genai.configure(api_key=api_key)
-            self._genai = genai
-            self._model = genai.GenerativeModel(
-                self.config.model,
-                system_instruction=self.config.system_prompt,
-            )
-            self._initialized = True
-            logger.info("gemini.initialized", model=self.config.model)
-            return True
-
-        except ImportError:
+        if not self._gateway.available:
             logger.warning("gemini.sdk_not_installed")
             return False
-        except Exception as e:
-            logger.error(f"gemini.init_error: {e}")
-            return False
+
+        self._initialized = True
+        logger.info("gemini.initialized", model=self.config.model)
+        return True
 
     async def think(
         self,
@@ -188,25 +177,23 @@ class GeminiConsciousness:
         ])
 
         prompt = "\n\n".join(prompt_parts)
+        timer = LLMCallTimer("fallback.gemini", self.config.model, prompt)
 
         try:
-            # Generate response
-            loop = asyncio.get_event_loop()
-
-            def generate():
-                response = self._model.generate_content(
+            try:
+                response = await self._gateway.generate(
                     prompt,
-                    generation_config=self._genai.types.GenerationConfig(
-                        max_output_tokens=self.config.max_output_tokens,
-                        temperature=self.config.temperature,
-                    ),
+                    model=self.config.model,
+                    system=self.config.system_prompt,
+                    timeout=self.config.timeout_seconds,
+                    max_output_tokens=self.config.max_output_tokens,
+                    temperature=self.config.temperature,
                 )
-                return response.text
-
-            response_text = await asyncio.wait_for(
-                loop.run_in_executor(None, generate),
-                timeout=self.config.timeout_seconds,
-            )
+            except Exception:
+                timer.finish(success=False)
+                raise
+            response_text = response.text
+            timer.finish(usage=response.usage, completion_text=response_text)
 
             processing_time = (time.time() - start_time) * 1000
 
@@ -350,26 +337,22 @@ class GeminiConsciousness:
 {question}
 
 Provide a thorough but concise answer."""
+        timer = LLMCallTimer("fallback.gemini", self.config.model, prompt)
 
         try:
-            loop = asyncio.get_event_loop()
-
-            def generate():
-                response = self._model.generate_content(
-                    prompt,
-                    generation_config=self._genai.types.GenerationConfig(
-                        max_output_tokens=4096,
-                        temperature=0.3,
-                    ),
-                )
-                return response.text
-
-            return await asyncio.wait_for(
-                loop.run_in_executor(None, generate),
+            response = await self._gateway.generate(
+                prompt,
+                model=self.config.model,
+                system=self.config.system_prompt,
                 timeout=self.config.timeout_seconds * 2,  # Longer for large context
+                max_output_tokens=4096,
+                temperature=0.3,
             )
+            timer.finish(usage=response.usage, completion_text=response.text)
+            return response.text
 
         except Exception as e:
+            timer.finish(success=False)
             return f"Error analyzing context: {e}"
 
     def is_available(self) -> bool:
@@ -2,19 +2,19 @@
 LM Studio Detector - Monitors LM Studio availability.
 
 Provides continuous health checking and connectivity detection for the
-local LM Studio instance. When LM Studio becomes unavailable, the
+local LM Studio instance, backed by the shared background HealthMonitor. When LM Studio becomes unavailable, the
 fallback system can route to alternative backends.
 """
 
 import asyncio
-import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional, Callable, Any
 
 import structlog
-from openai import AsyncOpenAI
+
+from ..health_monitor import get_health_monitor
 
 logger = structlog.get_logger(__name__)
 
@@ -58,6 +58,10 @@ class LMStudioDetector:
     """
     Monitors LM Studio availability and health.
 
+    Health comes from the shared background HealthMonitor (one per
+    base_url), which probes with jittered backoff and a circuit breaker.
+    Reading health or is_available never waits for a probe.
+
     Provides:
     - Periodic health checks
     - Status change callbacks
@@ -74,169 +78,115 @@ class LMStudioDetector:
         Initialize the detector.
 
         Args:
-            config: Detector configuration
+            config: Detector configuration (probe settings apply if this
+                creates the monitor)
             on_status_change: Callback when status changes (old_status, new_status)
         """
         self.config = config or DetectorConfig()
         self.on_status_change = on_status_change
 
-        self._client = AsyncOpenAI(
-            base_url=self.config.base_url,
-            api_key="not-needed",
+        self._monitor = get_health_monitor(
+            self.config.base_url,
+            probe_interval=self.config.check_interval_seconds,
             timeout=self.config.timeout_seconds,
+            failure_threshold=self.config.failure_threshold,
         )
+        self._client = self._monitor.client
 
-        self._health = LMStudioHealth(
-            status=LMStudioStatus.UNKNOWN,
-            last_check=datetime.now(timezone.utc),
-        )
-
+        self._reported_status = LMStudioStatus.UNKNOWN
         self._running = False
-        self._monitor_task: Optional[asyncio.Task] = None
-        self._check_lock = asyncio.Lock()
+        self._unsubscribe: Optional[Callable[[], None]] = None
 
     @property
     def health(self) -> LMStudioHealth:
-        """Get current health status."""
-        return self._health
+        """Get current health status (from the monitor's latest probe)."""
+        snapshot = self._monitor.snapshot
+        if not snapshot.checked:
+            status = LMStudioStatus.UNKNOWN
+        elif not snapshot.available:
+            status = LMStudioStatus.DISCONNECTED
+        elif snapshot.consecutive_failures or (
+            snapshot.latency_ms is not None
+            and snapshot.latency_ms > self.config.degraded_response_ms
+        ):
+            status = LMStudioStatus.DEGRADED
+        else:
+            status = LMStudioStatus.CONNECTED
+
+        return LMStudioHealth(
+            status=status,
+            last_check=(
+                datetime.fromtimestamp(snapshot.last_check, timezone.utc)
+                if snapshot.checked else datetime.now(timezone.utc)
+            ),
+            response_time_ms=snapshot.latency_ms,
+            model_loaded=snapshot.models[0] if snapshot.models else None,
+            error_message=snapshot.last_error,
+            consecutive_failures=snapshot.consecutive_failures,
+            consecutive_successes=snapshot.consecutive_successes,
+        )
 
     @property
     def is_available(self) -> bool:
         """Check if LM Studio is currently available."""
-        return self._health.is_available()
+        return self.health.is_available()
 
     @property
     def status(self) -> LMStudioStatus:
         """Get current status."""
-        return self._health.status
+        return self.health.status
 
     async def check_health(self) -> LMStudioHealth:
         """
-        Perform a health check on LM Studio.
+        Perform a health check on LM Studio (a fresh monitor probe).
 
         Returns:
             Updated health information
         """
-        async with self._check_lock:
-            start_time = time.time()
-            old_status = self._health.status
-
-            try:
-                # Try to list models - lightweight health check
-                models = await asyncio.wait_for(
-                    self._client.models.list(),
-                    timeout=self.config.timeout_seconds,
-                )
-
-                response_time_ms = (time.time() - start_time) * 1000
-
-                # Determine new status
-                if response_time_ms > self.config.degraded_response_ms:
-                    new_status = LMStudioStatus.DEGRADED
-                else:
-                    new_status = LMStudioStatus.CONNECTED
-
-                # Extract model info
-                model_loaded = None
-                if models.data:
-                    model_loaded = models.data[0].id
-
-                # Update health
-                self._health = LMStudioHealth(
-                    status=new_status,
-                    last_check=datetime.now(timezone.utc),
-                    response_time_ms=response_time_ms,
-                    model_loaded=model_loaded,
-                    error_message=None,
-                    consecutive_failures=0,
-                    consecutive_successes=self._health.consecutive_successes + 1,
-                )
-
-                logger.debug(
-                    "lm_studio.health_check.success",
-                    response_time_ms=response_time_ms,
-                    model=model_loaded,
-                    status=new_status.value,
-                )
-
-            except asyncio.TimeoutError:
-                self._update_failure("Connection timed out")
-
-            except Exception as e:
-                self._update_failure(str(e))
-
-            # Notify on status change
-            if old_status != self._health.status and self.on_status_change:
+        await self._monitor.probe()
+        return await self._refresh()
+
+    async def _refresh(self) -> LMStudioHealth:
+        """Read the monitor's state; notify if the status changed."""
+        health = self.health
+        old_status, self._reported_status = self._reported_status, health.status
+
+        if old_status != health.status:
+            logger.debug(
+                "lm_studio.status_changed",
+                old=old_status.value,
+                new=health.status.value,
+                error=health.error_message,
+            )
+            if self.on_status_change:
                 try:
-                    result = self.on_status_change(old_status, self._health.status)
+                    result = self.on_status_change(old_status, health.status)
                     if asyncio.iscoroutine(result):
                         await result
                 except Exception as e:
                     logger.warning(f"lm_studio.status_callback_error: {e}")
 
-            return self._health
-
-    def _update_failure(self, error_message: str) -> None:
-        """Update health after a failure."""
-        consecutive_failures = self._health.consecutive_failures + 1
-
-        # Determine status based on failure count
-        if consecutive_failures >= self.config.failure_threshold:
-            new_status = LMStudioStatus.DISCONNECTED
-        elif self._health.status == LMStudioStatus.CONNECTED:
-            new_status = LMStudioStatus.DEGRADED
-        else:
-            new_status = self._health.status
-
-        self._health = LMStudioHealth(
-            status=new_status,
-            last_check=datetime.now(timezone.utc),
-            response_time_ms=None,
-            model_loaded=None,
-            error_message=error_message,
-            consecutive_failures=consecutive_failures,
-            consecutive_successes=0,
-        )
-
-        logger.debug(
-            "lm_studio.health_check.failure",
-            error=error_message,
-            consecutive_failures=consecutive_failures,
-            status=new_status.value,
-        )
+        return health
 
     async def start_monitoring(self) -> None:
-        """Start background health monitoring."""
+        """Start background health monitoring (subscribes to the monitor)."""
         if self._running:
             return
 
         self._running = True
-        self._monitor_task = asyncio.create_task(self._monitor_loop())
+        await self._monitor.start()
+        self._unsubscribe = self._monitor.subscribe(lambda old, new: self._refresh())
+        await self._refresh()
         logger.info("lm_studio.monitoring.started")
 
     async def stop_monitoring(self) -> None:
-        """Stop background health monitoring."""
+        """Stop background health monitoring (the shared monitor keeps running)."""
         self._running = False
-        if self._monitor_task:
-            self._monitor_task.cancel()
-            try:
-                await self._monitor_task
-            except asyncio.CancelledError:
-                pass
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
         logger.info("lm_studio.monitoring.stopped")
 
-    async def _monitor_loop(self) -> None:
-        """Background monitoring loop."""
-        while self._running:
-            try:
-                await self.check_health()
-                await asyncio.sleep(self.config.check_interval_seconds)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.warning(f"lm_studio.monitor_error: {e}")
-                await asyncio.sleep(self.config.check_interval_seconds)
-
     async def wait_for_connection(
         self,
         timeout: Optional[float] = None,
@@ -245,38 +195,33 @@ class LMStudioDetector:
         """
         Wait for LM Studio to become available.
 
+        Waits for the monitor to publish an available state rather than
+        polling; `check_interval` is kept for compatibility.
+
         Args:
             timeout: Maximum time to wait (None = indefinite)
-            check_interval: Time between checks
+            check_interval: Unused
 
         Returns:
             True if connected, False if timed out
         """
-        start_time = time.time()
-
-        while True:
-            health = await self.check_health()
-            if health.is_available():
-                return True
-
-            if timeout is not None:
-                elapsed = time.time() - start_time
-                if elapsed >= timeout:
-                    return False
-
-            await asyncio.sleep(check_interval)
+        connected = await self._monitor.wait_until_available(timeout=timeout)
+        await self._refresh()
+        return connected
 
     def get_status_summary(self) -> dict:
         """Get a summary of current status."""
+        health = self.health
         return {
-            "status": self._health.status.value,
-            "available": self._health.is_available(),
-            "last_check": self._health.last_check.isoformat(),
-            "response_time_ms": self._health.response_time_ms,
-            "model_loaded": self._health.model_loaded,
-            "error": self._health.error_message,
-            "consecutive_failures": self._health.consecutive_failures,
-            "consecutive_successes": self._health.consecutive_successes,
+            "status": health.status.value,
+            "available": health.is_available(),
+            "last_check": health.last_check.isoformat(),
+            "response_time_ms": health.response_time_ms,
+            "model_loaded": health.model_loaded,
+            "error": health.error_message,
+            "consecutive_failures": health.consecutive_failures,
+            "consecutive_successes": health.consecutive_successes,
+            "circuit": self._monitor.snapshot.circuit.value,
         }
 
 
@@ -13,15 +13,23 @@ ROUTING HIERARCHY:
 The router automatically detects availability and switches modes transparently,
 ensuring the Consciousness daemon remains operational regardless of which
 backend services are available.
+
+HEDGING:
+LM Studio can be up but slow (a loaded model, a long queue). The router
+keeps rolling p50/p95 latencies per backend; when a local request runs
+past the p95 deadline, the same request is sent to the fallback in
+parallel, and whichever finishes first is used (the other is cancelled).
+A hedging budget caps the extra remote traffic this creates.
 """
 
 import asyncio
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Any
+from typing import Any, Callable, Coroutine, Dict, List, Optional
 
 from .thinker import (
     ConsciousnessThinker,
@@ -31,6 +39,8 @@ from .thinker import (
     ActionType,
     Priority,
 )
+from .health_monitor import get_health_monitor
+from .llm_metrics import LLMCallTimer, percentile
 from .executor import (
     ExpandedExecutor,
     ExecutionResult,
@@ -74,6 +84,14 @@ class FallbackConfig:
     claude_timeout: int = 300  # Timeout for Claude Code operations
     gemini_timeout: int = 600  # Timeout for Gemini operations
 
+    # Hedging: send slow LM Studio requests to the fallback in parallel
+    hedging_enabled: bool = True
+    hedge_min_samples: int = 10  # LM Studio latencies needed before hedging
+    hedge_min_deadline: float = 5.0  # Never hedge before this many seconds
+    hedge_budget_ratio: float = 0.1  # Hedged requests per LM Studio request
+    hedge_budget_burst: int = 2  # Hedges allowed on top of the ratio
+    latency_window: int = 100  # Requests per backend kept for percentiles
+
     # Claude Code settings
     claude_system_prompt: str = """You are Stoffy's thinking layer. Analyze observations
 and make decisions about what actions to take.
@@ -107,12 +125,46 @@ class LMStudioStatus:
     model_info: Optional[Dict[str, Any]] = None
 
 
+class BackendLatency:
+    """Rolling request latencies of one backend."""
+
+    def __init__(self, window: int = 100):
+        self._latencies: deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.failures = 0
+
+    def record(self, seconds: float, success: bool = True) -> None:
+        """Record a finished (or abandoned) request."""
+        self._latencies.append(seconds)
+        self.requests += 1
+        if not success:
+            self.failures += 1
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile in seconds (None without samples)."""
+        return percentile(list(self._latencies), q)
+
+    def to_dict(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+
 class LMStudioDetector:
     """
     Detects LM Studio availability.
 
-    Performs async health checks against the LM Studio API endpoint
-    to determine if local inference is available.
+    Reads the shared background HealthMonitor, which probes the LM Studio
+    API on its own schedule, so a check never waits for a probe once the
+    monitor is running.
     """
 
     def __init__(
@@ -125,11 +177,12 @@ class LMStudioDetector:
 
         Args:
             base_url: LM Studio API endpoint
-            timeout: Connection timeout in seconds
+            timeout: Probe timeout in seconds (if this creates the monitor)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self._status = LMStudioStatus()
+        self._monitor = get_health_monitor(self.base_url, timeout=timeout)
 
     @property
     def status(self) -> LMStudioStatus:
@@ -140,59 +193,25 @@ class LMStudioDetector:
         """
         Check if LM Studio is available.
 
-        Attempts to connect to the LM Studio API and verify
-        that a model is loaded and responding.
+        Starts the monitor on first use (waiting for its first probe),
+        then only reads its latest state.
 
         Returns:
             True if LM Studio is available and ready
         """
-        from openai import AsyncOpenAI
-
-        try:
-            client = AsyncOpenAI(
-                base_url=self.base_url,
-                api_key="not-needed",
-                timeout=self.timeout
-            )
-
-            # Try to list models - this confirms API is responsive
-            models = await asyncio.wait_for(
-                client.models.list(),
-                timeout=self.timeout
-            )
-
-            # Update status
-            self._status.available = True
-            self._status.last_check = time.time()
-            self._status.consecutive_failures = 0
-            self._status.last_error = None
-
-            if hasattr(models, 'data') and models.data:
-                self._status.model_info = {
-                    "model_count": len(models.data),
-                    "models": [m.id for m in models.data[:3]]  # First 3 models
-                }
-
-            logger.debug(f"LM Studio available at {self.base_url}")
-            return True
-
-        except asyncio.TimeoutError:
-            self._record_failure("Connection timeout")
-            return False
-
-        except Exception as e:
-            self._record_failure(str(e))
-            return False
-
-    def _record_failure(self, error: str) -> None:
-        """Record a connection failure."""
-        self._status.available = False
-        self._status.last_check = time.time()
-        self._status.consecutive_failures += 1
-        self._status.last_error = error
-        logger.debug(
-            f"LM Studio check failed ({self._status.consecutive_failures}): {error}"
-        )
+        await self._monitor.start()
+        snapshot = self._monitor.snapshot
+
+        self._status.available = snapshot.available
+        self._status.last_check = snapshot.last_check
+        self._status.consecutive_failures = snapshot.consecutive_failures
+        self._status.last_error = snapshot.last_error
+        if snapshot.models:
+            self._status.model_info = {
+                "model_count": len(snapshot.models),
+                "models": list(snapshot.models[:3]),  # First 3 models
+            }
+        return snapshot.available
 
     def is_recently_checked(self, max_age: float = 30.0) -> bool:
         """Check if status was checked recently."""
@@ -257,6 +276,12 @@ class FallbackRouter:
         self._gemini_available: Optional[bool] = None
         self._gemini_last_check: float = 0.0
 
+        # Rolling latencies per backend (FallbackMode value) and hedging counters
+        self._latency: Dict[str, BackendLatency] = {
+            mode.value: BackendLatency(self.config.latency_window) for mode in FallbackMode
+        }
+        self._hedges = {"fired": 0, "hedge_won": 0, "primary_won": 0, "budget_denied": 0}
+
     @property
     def current_mode(self) -> Optional[FallbackMode]:
         """Get current operating mode (may be stale)."""
@@ -366,17 +391,12 @@ class FallbackRouter:
 
         try:
             if mode == FallbackMode.PRIMARY:
-                return await self._think_with_lm_studio(
-                    observations, context, git_status, learned_patterns
-                )
-            elif mode == FallbackMode.FALLBACK:
-                return await self._think_with_claude_gemini(
-                    observations, context, git_status, learned_patterns
-                )
-            else:  # DEGRADED
-                return await self._think_with_claude_only(
+                return await self._think_hedged(
                     observations, context, git_status, learned_patterns
                 )
+            return await self._timed(mode, self._think_with(
+                mode, observations, context, git_status, learned_patterns
+            ))
 
         except Exception as e:
             logger.exception(f"Thinking failed in {mode.value} mode: {e}")
@@ -391,6 +411,141 @@ class FallbackRouter:
 
             return Decision.error(str(e))
 
+    def _think_with(
+        self,
+        mode: FallbackMode,
+        observations: str,
+        context: Optional[Dict[str, Any]] = None,
+        git_status: Optional[str] = None,
+        learned_patterns: Optional[List[str]] = None
+    ) -> Coroutine[Any, Any, Decision]:
+        """The thinking coroutine of a backend."""
+        think = {
+            FallbackMode.PRIMARY: self._think_with_lm_studio,
+            FallbackMode.FALLBACK: self._think_with_claude_gemini,
+            FallbackMode.DEGRADED: self._think_with_claude_only,
+        }[mode]
+        return think(observations, context, git_status, learned_patterns)
+
+    @staticmethod
+    def _succeeded(mode: FallbackMode, decision: Decision) -> bool:
+        """Check if a backend produced a real decision (not an error fallback)."""
+        if mode == FallbackMode.PRIMARY:
+            # The thinker reports failed LLM calls as decisions without usage
+            return decision.usage is not None and decision.usage.success
+        return decision.observation_summary != "Error occurred"
+
+    async def _timed(
+        self, mode: FallbackMode, thinking: Coroutine[Any, Any, Decision]
+    ) -> Decision:
+        """Run a backend's thinking coroutine, recording its latency."""
+        start = time.monotonic()
+        try:
+            decision = await thinking
+        except asyncio.CancelledError:
+            # A hedged request that lost still took at least this long;
+            # leaving it out would pull the p95 deadline down
+            self._latency[mode.value].record(time.monotonic() - start)
+            raise
+        except Exception:
+            self._latency[mode.value].record(time.monotonic() - start, success=False)
+            raise
+        self._latency[mode.value].record(
+            time.monotonic() - start, success=self._succeeded(mode, decision)
+        )
+        return decision
+
+    def hedge_deadline(self) -> Optional[float]:
+        """
+        Seconds after which a LM Studio request is hedged.
+
+        Returns:
+            The p95 LM Studio latency (at least hedge_min_deadline), or
+            None if hedging is disabled or there are too few samples
+        """
+        latency = self._latency[FallbackMode.PRIMARY.value]
+        if not self.config.hedging_enabled or latency.samples < self.config.hedge_min_samples:
+            return None
+        return max(self.config.hedge_min_deadline, latency.percentile(95))
+
+    def _take_hedge_budget(self) -> bool:
+        """Reserve a hedge if the budget allows another one."""
+        primary_requests = self._latency[FallbackMode.PRIMARY.value].requests
+        allowed = self.config.hedge_budget_burst + self.config.hedge_budget_ratio * primary_requests
+        if self._hedges["fired"] >= allowed:
+            self._hedges["budget_denied"] += 1
+            return False
+        self._hedges["fired"] += 1
+        return True
+
+    async def _think_hedged(
+        self,
+        observations: str,
+        context: Optional[Dict[str, Any]] = None,
+        git_status: Optional[str] = None,
+        learned_patterns: Optional[List[str]] = None
+    ) -> Decision:
+        """
+        Think with LM Studio, hedging with the fallback once past the deadline.
+
+        The first backend to produce a real decision wins and the other
+        request is cancelled. If the winner failed, the other one is
+        awaited instead. Cancelling the caller cancels both requests, so
+        neither keeps holding its LM Studio slot.
+        """
+        args = (observations, context, git_status, learned_patterns)
+        primary = asyncio.create_task(
+            self._timed(FallbackMode.PRIMARY, self._think_with(FallbackMode.PRIMARY, *args))
+        )
+        tasks = [primary]
+        try:
+            deadline = self.hedge_deadline()
+            if deadline is None:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=deadline)
+            if done or not self._take_hedge_budget():
+                return await primary
+
+            hedge_mode = (
+                FallbackMode.FALLBACK if await self._check_gemini_availability()
+                else FallbackMode.DEGRADED
+            )
+            logger.info(
+                f"LM Studio slower than {deadline:.1f}s, hedging with {hedge_mode.value}"
+            )
+            hedge = asyncio.create_task(
+                self._timed(hedge_mode, self._think_with(hedge_mode, *args))
+            )
+            tasks.append(hedge)
+            modes = {primary: FallbackMode.PRIMARY, hedge: hedge_mode}
+
+            pending = {primary, hedge}
+            result: Optional[Decision] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    decision = task.result()
+                    if result is None:
+                        result = decision  # Kept if neither succeeds
+                    if self._succeeded(modes[task], decision):
+                        self._hedges["hedge_won" if task is hedge else "primary_won"] += 1
+                        return decision
+        finally:
+            # The loser, or both when the caller was cancelled
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+        if result is not None:
+            return result
+        # Both raised: surface the primary's error (route_thinking handles it)
+        return primary.result()
+
     async def _think_with_lm_studio(
         self,
         observations: str,
@@ -480,6 +635,23 @@ class FallbackRouter:
 
         return "\n".join(parts)
 
+    async def _execute_llm(
+        self,
+        source: str,
+        model: str,
+        prompt: str,
+        action: ExecutorAction,
+    ) -> ExecutionResult:
+        """Run a Claude/Gemini action through the executor, recording it in LLMMetrics."""
+        timer = LLMCallTimer(source, model, prompt)
+        try:
+            result = await self.executor.execute(action)
+        except Exception:
+            timer.finish(success=False)
+            raise
+        timer.finish(completion_text=result.output or "", success=result.success)
+        return result
+
     async def _gemini_analyze_context(self, context: str) -> Optional[str]:
         """Use Gemini to analyze large context."""
         prompt = f"""Analyze the following context and summarize:
@@ -493,11 +665,14 @@ Context:
 Provide a concise analysis (300-500 words) that will help make a decision."""
 
         try:
-            result = await self.executor.execute(
+            result = await self._execute_llm(
+                "fallback_router.gemini",
+                "gemini-1.5-flash",
+                prompt,
                 ExecutorAction.gemini_analyze(
                     prompt=prompt,
                     model="gemini-1.5-flash"  # Use flash for faster analysis
-                )
+                ),
             )
 
             if result.success:
@@ -557,11 +732,14 @@ Analyze the observations and decide what action to take. Respond with the JSON d
     async def _execute_claude_decision(self, prompt: str) -> Decision:
         """Execute Claude Code and parse the decision."""
         try:
-            result = await self.executor.execute(
+            result = await self._execute_llm(
+                "fallback_router.claude",
+                "claude-code",
+                prompt,
                 ExecutorAction(
                     type=ExecutorActionType.CLAUDE_CODE,
                     details={"prompt": prompt}
-                )
+                ),
             )
 
             if not result.success:
@@ -645,7 +823,7 @@ Analyze the observations and decide what action to take. Respond with the JSON d
         if mode == FallbackMode.PRIMARY:
             # Use LM Studio directly
             thinker = await self._ensure_thinker()
-            decision = await thinker.think(user_message)
+            decision = await thinker.think(user_message, request_class="user_message")
             return decision.reasoning
 
         else:
@@ -658,11 +836,14 @@ Analyze the observations and decide what action to take. Respond with the JSON d
 
 Provide a helpful, concise response."""
 
-            result = await self.executor.execute(
+            result = await self._execute_llm(
+                "fallback_router.response",
+                "claude-code",
+                prompt,
                 ExecutorAction(
                     type=ExecutorActionType.CLAUDE_CODE,
                     details={"prompt": prompt}
-                )
+                ),
             )
 
             if result.success:
@@ -731,6 +912,12 @@ Provide a helpful, concise response."""
             },
             "gemini_available": self._gemini_available,
             "last_mode_check": self._last_mode_check,
+            "latency": {mode: latency.to_dict() for mode, latency in self._latency.items()},
+            "hedging": {
+                "enabled": self.config.hedging_enabled,
+                "deadline_seconds": self.hedge_deadline(),
+                **self._hedges,
+            },
             "config": {
                 "lm_studio_url": self.config.lm_studio_url,
                 "check_interval": self.config.check_interval,
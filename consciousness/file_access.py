@@ -0,0 +1,275 @@
+"""
+Size-Aware File Access
+
+Shared, async file reading for the daemon and decision engine:
+- Enforces a size cap (watcher.max_file_size_kb); oversized files are
+  returned as a head window + tail window with an omission marker
+- Reads only the head and tail windows, with incremental decoding, so
+  windows never split a multi-byte character and huge files are never
+  loaded whole (plain reads: a file truncated meanwhile just reads short)
+- Reads and cache validation (stat) run in a bounded thread pool so the
+  event loop is never blocked
+- Keeps a short-lived cache validated by (size, mtime_ns), and lets
+  concurrent readers of the same file share one read
+
+Usage:
+    files = get_file_access_service()
+    content = await files.read_text(path)
+    if content is not None and not content.truncated:
+        ...
+"""
+
+import asyncio
+import codecs
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+DECODE_CHUNK_SIZE = 256 * 1024
+OMISSION_MARKER = "\n\n[... {omitted} bytes omitted ...]\n\n"
+
+
+@dataclass
+class FileContent:
+    """Text read from a file, possibly windowed."""
+
+    path: str
+    text: str
+    size: int
+    mtime_ns: int
+    truncated: bool = False
+    omitted_bytes: int = 0
+
+
+def _decode(data: bytes, encoding: str, start: int, end: int, final: bool = True) -> str:
+    """
+    Incrementally decode data[start:end].
+
+    With final=False a trailing partial character is dropped instead of
+    being replaced (used for the head window).
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    parts = []
+    for offset in range(start, end, DECODE_CHUNK_SIZE):
+        parts.append(decoder.decode(data[offset:min(offset + DECODE_CHUNK_SIZE, end)]))
+    if final:
+        parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def _skip_continuation(data: bytes, offset: int, end: int) -> int:
+    """Move offset past UTF-8 continuation bytes so decoding starts on a character."""
+    limit = min(end, offset + 4)
+    while offset < limit and (data[offset] & 0xC0) == 0x80:
+        offset += 1
+    return offset
+
+
+def read_file_window(
+    path: str | Path,
+    max_bytes: int,
+    head_ratio: float = 0.75,
+    encoding: str = "utf-8",
+) -> FileContent:
+    """
+    Read a file as text, windowed to max_bytes (blocking).
+
+    Files up to max_bytes are decoded completely. Larger files yield the
+    first head_ratio * max_bytes and the last remaining bytes, joined by
+    an omission marker.
+
+    Raises:
+        OSError: If the file cannot be opened or read
+    """
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        if size <= max_bytes:
+            data = f.read(max_bytes)
+            text = _decode(data, encoding, 0, len(data))
+            return FileContent(str(path), text, size, st.st_mtime_ns)
+
+        head_bytes = int(max_bytes * head_ratio)
+        tail_start = size - (max_bytes - head_bytes)
+        head = f.read(head_bytes)
+        f.seek(tail_start)
+        tail = f.read(size - tail_start)
+
+        skip = 0
+        if encoding.replace("-", "").lower() == "utf8":
+            skip = _skip_continuation(tail, 0, len(tail))
+        omitted = tail_start + skip - head_bytes
+        text = (
+            _decode(head, encoding, 0, len(head), final=False)
+            + OMISSION_MARKER.format(omitted=omitted)
+            + _decode(tail, encoding, skip, len(tail))
+        )
+        return FileContent(
+            str(path), text, size, st.st_mtime_ns,
+            truncated=True, omitted_bytes=omitted,
+        )
+
+
+class FileAccessService:
+    """
+    Shared async reader with size caps, a thread pool and a short-lived cache.
+
+    Cached entries are reused only while the file's size and mtime are
+    unchanged and the entry is younger than cache_ttl.
+    """
+
+    def __init__(
+        self,
+        max_file_size_kb: int = 1024,
+        head_ratio: float = 0.75,
+        max_workers: int = 4,
+        cache_ttl: float = 5.0,
+        cache_entries: int = 128,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            max_file_size_kb: Default size cap per read
+            head_ratio: Share of the cap used for the head window
+            max_workers: Threads used for reading
+            cache_ttl: Seconds a cached read stays valid
+            cache_entries: Maximum cached reads
+        """
+        self.max_bytes = max_file_size_kb * 1024
+        self.head_ratio = head_ratio
+        self.cache_ttl = cache_ttl
+        self.cache_entries = cache_entries
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-access")
+
+        # (path, max_bytes) -> (cached_at, content)
+        self._cache: dict[tuple[str, int], tuple[float, FileContent]] = {}
+        self._inflight: dict[tuple[str, int], asyncio.Future] = {}
+
+        self.reads = 0
+        self.cache_hits = 0
+
+    def configure(self, max_file_size_kb: Optional[int] = None) -> None:
+        """Update the default size cap (e.g. from loaded configuration)."""
+        if max_file_size_kb is not None:
+            self.max_bytes = max_file_size_kb * 1024
+
+    async def _cached(self, key: tuple[str, int]) -> Optional[FileContent]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        cached_at, content = entry
+        if time.monotonic() - cached_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        try:
+            st = await asyncio.get_running_loop().run_in_executor(self._pool, os.stat, key[0])
+        except OSError:
+            st = None
+        if st is None or st.st_size != content.size or st.st_mtime_ns != content.mtime_ns:
+            if self._cache.get(key) is entry:
+                del self._cache[key]
+            return None
+        return content
+
+    def _store(self, key: tuple[str, int], content: FileContent) -> None:
+        if len(self._cache) >= self.cache_entries:
+            # Drop the oldest entry
+            oldest = min(self._cache, key=lambda k: self._cache[k][0])
+            del self._cache[oldest]
+        self._cache[key] = (time.monotonic(), content)
+
+    async def read_text(
+        self,
+        path: str | Path,
+        max_bytes: Optional[int] = None,
+        encoding: str = "utf-8",
+    ) -> Optional[FileContent]:
+        """
+        Read a file as text, windowed to the size cap.
+
+        Args:
+            path: File to read
+            max_bytes: Size cap for this read (defaults to the service cap)
+            encoding: Text encoding (invalid bytes are replaced)
+
+        Returns:
+            FileContent, or None if the file is missing or unreadable
+        """
+        key = (str(path), max_bytes if max_bytes is not None else self.max_bytes)
+
+        cached = await self._cached(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        # Share an in-progress read of the same file
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            content = await loop.run_in_executor(
+                self._pool, read_file_window, key[0], key[1], self.head_ratio, encoding
+            )
+            self.reads += 1
+            self._store(key, content)
+        except (OSError, ValueError):
+            content = None
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Waiters see it; don't warn if there are none
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(content)
+        return content
+
+    def invalidate(self, path: str | Path) -> None:
+        """Forget cached reads of a file (e.g. after writing it)."""
+        path_str = str(path)
+        for key in [k for k in self._cache if k[0] == path_str]:
+            del self._cache[key]
+
+    def clear(self) -> None:
+        """Forget all cached reads."""
+        self._cache.clear()
+
+    def get_stats(self) -> dict:
+        """Read and cache statistics."""
+        return {
+            "reads": self.reads,
+            "cache_hits": self.cache_hits,
+            "cached": len(self._cache),
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        self._pool.shutdown(wait=False)
+
+
+# Global instance shared by the daemon, engines and responders
+_global_service: Optional[FileAccessService] = None
+_service_lock = threading.Lock()
+
+
+def get_file_access_service() -> FileAccessService:
+    """
+    Get the global file access service instance.
+
+    Returns:
+        The singleton FileAccessService
+    """
+    global _global_service
+    with _service_lock:
+        if _global_service is None:
+            _global_service = FileAccessService()
+        return _global_service
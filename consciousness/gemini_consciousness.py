@@ -26,6 +26,9 @@ import subprocess
 from dataclasses import dataclass, field
 from typing import Optional
 
+from .gemini_gateway import get_gemini_gateway
+from .llm_metrics import LLMCallTimer
+
 logger = logging.getLogger(__name__)
 
 
@@ -188,19 +191,9 @@ Be concise and focus on actionable insights.'''
         if self._sdk_available is not None:
             return self._sdk_available
 
-        try:
-            import google.generativeai  # noqa: F401
-
-            # Also check for API key
-            api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get(
-                "GEMINI_API_KEY"
-            )
-            self._sdk_available = api_key is not None
-            if not api_key:
-                logger.debug("Gemini SDK available but no API key found")
-        except ImportError:
-            self._sdk_available = False
-            logger.debug("Gemini SDK not installed")
+        self._sdk_available = get_gemini_gateway().available
+        if not self._sdk_available:
+            logger.debug("Gemini SDK not installed or no API key found")
 
         return self._sdk_available
 
@@ -355,6 +348,7 @@ Be concise and focus on actionable insights.'''
         Uses the gemini CLI in non-interactive mode. The prompt is passed
         via stdin since the CLI expects input that way for non-interactive use.
         """
+        timer = LLMCallTimer("gemini_consciousness.cli", self.model or "", prompt)
         try:
             # Use the gemini CLI with stdin for the prompt
             # The CLI reads from stdin when not in interactive mode
@@ -386,10 +380,12 @@ Be concise and focus on actionable insights.'''
             except asyncio.TimeoutError:
                 process.kill()
                 await process.wait()
+                timer.finish(success=False)
                 logger.warning("Gemini CLI timed out")
                 return None
 
             if process.returncode != 0:
+                timer.finish(success=False)
                 logger.warning(
                     f"Gemini CLI returned non-zero: {process.returncode}, "
                     f"stderr: {stderr.decode()[:200] if stderr else 'none'}"
@@ -404,6 +400,7 @@ Be concise and focus on actionable insights.'''
                 if not line.startswith("Loaded cached credentials")
             ]
             response = "\n".join(filtered_lines).strip()
+            timer.finish(completion_text=response)
 
             logger.debug(f"Gemini CLI response length: {len(response)}")
             return response
@@ -413,48 +410,34 @@ Be concise and focus on actionable insights.'''
             self._cli_available = False
             return None
         except Exception as e:
+            timer.finish(success=False)
             logger.error(f"Error calling Gemini CLI: {e}")
             return None
 
     async def _call_sdk(self, prompt: str) -> Optional[str]:
-        """Call Gemini via the Python SDK."""
-        try:
-            import google.generativeai as genai
-
-            # Configure the API
-            api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get(
-                "GEMINI_API_KEY"
-            )
-            if not api_key:
-                logger.error("No Gemini API key found")
-                return None
-
-            genai.configure(api_key=api_key)
-
-            # Create model and generate (use default if not specified)
-            model_name = self.model or "gemini-1.5-flash"
-            model = genai.GenerativeModel(model_name)
-
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await asyncio.wait_for(
-                loop.run_in_executor(None, lambda: model.generate_content(prompt)),
-                timeout=self.timeout,
-            )
-
-            return response.text
+        """Call Gemini via the Python SDK (through the shared GeminiGateway)."""
+        gateway = get_gemini_gateway()
+        if not gateway.available:
+            logger.error("Gemini SDK not available (package or API key missing)")
+            self._sdk_available = False
+            return None
 
+        model_name = self.model or "gemini-1.5-flash"
+        timer = LLMCallTimer("gemini_consciousness.sdk", model_name, prompt)
+        try:
+            response = await gateway.generate(prompt, model=model_name, timeout=self.timeout)
         except asyncio.TimeoutError:
+            timer.finish(success=False)
             logger.warning("Gemini SDK timed out")
             return None
-        except ImportError:
-            logger.error("Gemini SDK not available")
-            self._sdk_available = False
-            return None
         except Exception as e:
+            timer.finish(success=False)
             logger.error(f"Error calling Gemini SDK: {e}")
             return None
 
+        timer.finish(usage=response.usage, completion_text=response.text)
+        return response.text
+
     def _parse_thought(self, response: str) -> ConsciousnessThought:
         """Parse the raw response into a structured thought."""
         try:
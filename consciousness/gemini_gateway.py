@@ -0,0 +1,416 @@
+"""
+Gemini Gateway - One Path for Every Gemini SDK Call
+
+The executor, both GeminiConsciousness implementations, the consciousness
+forwarder and the dreamer used to call google-generativeai on their own:
+configuring the SDK and building a GenerativeModel per call, then running
+the blocking request on the event loop's default thread pool. All of them
+now go through the process-wide GeminiGateway:
+- Model handles cached per (model, system instruction)
+- A dedicated, bounded thread pool for the blocking SDK calls
+- Per-call deadlines covering rate limiting and generation
+- Singleflight: identical in-flight requests share one API call
+- Its own rate limiter (requests per minute with a burst allowance)
+- Pluggable backends; FakeGeminiBackend answers locally for tests
+
+Usage:
+    gateway = get_gemini_gateway()
+    if gateway.available:
+        response = await gateway.generate(prompt, model="gemini-1.5-flash", timeout=30)
+        print(response.text)
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+
+class GeminiUnavailable(RuntimeError):
+    """The Gemini backend cannot be used (SDK or API key missing)."""
+
+
+@dataclass(frozen=True)
+class GeminiRequest:
+    """One generate_content call."""
+
+    prompt: str
+    model: str = DEFAULT_MODEL
+    system: Optional[str] = None
+    max_output_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    safety_settings: Optional[dict] = None
+
+    def key(self) -> str:
+        """Identity used to coalesce identical in-flight requests."""
+        payload = json.dumps(
+            [
+                self.model,
+                self.system,
+                self.prompt,
+                self.max_output_tokens,
+                self.temperature,
+                self.safety_settings,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class GeminiResponse:
+    """Text and token usage of a completed request."""
+
+    text: str
+    model: str
+    usage: Any = None  # SDK usage_metadata, if reported
+    backend: str = "sdk"
+
+
+class SDKGeminiBackend:
+    """Calls Gemini through google-generativeai (blocking; runs in the gateway's pool)."""
+
+    name = "sdk"
+
+    def __init__(self, api_key: Optional[str] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            api_key: API key (default: GOOGLE_API_KEY or GEMINI_API_KEY)
+        """
+        self._api_key = api_key
+        self._genai = None
+        self._models: dict[tuple[str, Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self) -> Optional[str]:
+        return self._api_key or os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+
+    @property
+    def available(self) -> bool:
+        """SDK installed and an API key set (does not call the API)."""
+        try:
+            installed = importlib.util.find_spec("google.generativeai") is not None
+        except ModuleNotFoundError:
+            installed = False
+        return installed and bool(self._key())
+
+    def _sdk(self):
+        """Import and configure the SDK once."""
+        if self._genai is None:
+            try:
+                import google.generativeai as genai
+            except ImportError as e:
+                raise GeminiUnavailable("google-generativeai package not installed") from e
+            api_key = self._key()
+            if not api_key:
+                raise GeminiUnavailable("GOOGLE_API_KEY not set")
+            genai.configure(api_key=api_key)
+            self._genai = genai
+        return self._genai
+
+    def _model(self, name: str, system: Optional[str]):
+        """Cached GenerativeModel for a model and system instruction."""
+        with self._lock:
+            genai = self._sdk()
+            handle = self._models.get((name, system))
+            if handle is None:
+                if system:
+                    handle = genai.GenerativeModel(name, system_instruction=system)
+                else:
+                    handle = genai.GenerativeModel(name)
+                self._models[(name, system)] = handle
+            return handle
+
+    def generate(self, request: GeminiRequest) -> GeminiResponse:
+        model = self._model(request.model, request.system)
+
+        kwargs: dict[str, Any] = {}
+        generation_config = {
+            name: value
+            for name, value in (
+                ("max_output_tokens", request.max_output_tokens),
+                ("temperature", request.temperature),
+            )
+            if value is not None
+        }
+        if generation_config:
+            kwargs["generation_config"] = self._genai.types.GenerationConfig(**generation_config)
+        if request.safety_settings:
+            kwargs["safety_settings"] = request.safety_settings
+
+        response = model.generate_content(request.prompt, **kwargs)
+        return GeminiResponse(
+            text=response.text if hasattr(response, "text") else str(response),
+            model=request.model,
+            usage=getattr(response, "usage_metadata", None),
+            backend=self.name,
+        )
+
+
+class FakeGeminiBackend:
+    """Answers locally; for tests and offline runs."""
+
+    name = "fake"
+
+    def __init__(
+        self,
+        reply: Union[str, Callable[[GeminiRequest], str]] = '{"decision": "wait"}',
+        delay: float = 0.0,
+        error: Optional[Exception] = None,
+    ):
+        """
+        Initialize the fake.
+
+        Args:
+            reply: Response text, or a function of the request
+            delay: Seconds each call blocks (like a real API call)
+            error: Raised by every call instead of replying
+        """
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.calls: list[GeminiRequest] = []
+        self.available = True
+
+    def generate(self, request: GeminiRequest) -> GeminiResponse:
+        self.calls.append(request)
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        text = self.reply(request) if callable(self.reply) else self.reply
+        return GeminiResponse(text=text, model=request.model, backend=self.name)
+
+
+class RateLimiter:
+    """Requests per minute with a burst allowance (GCRA, reservation based)."""
+
+    def __init__(self, requests_per_minute: float = 60.0, burst: int = 5):
+        self.requests_per_minute = requests_per_minute
+        self.burst = max(1, burst)
+        self._tat = 0.0  # Theoretical arrival time of the next request
+        self.waits = 0
+
+    def reserve(self) -> float:
+        """Reserve a request; returns the seconds to wait before sending it."""
+        if self.requests_per_minute <= 0:
+            return 0.0
+        interval = 60.0 / self.requests_per_minute
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + interval
+        wait = tat - now - (self.burst - 1) * interval
+        if wait > 0:
+            self.waits += 1
+            return wait
+        return 0.0
+
+
+class GeminiGateway:
+    """Shared entry point for Gemini SDK requests."""
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        max_workers: int = 4,
+        requests_per_minute: float = 60.0,
+        burst: int = 5,
+        default_timeout: float = 120.0,
+    ):
+        """
+        Initialize the gateway.
+
+        Args:
+            backend: Object with `available` and a blocking
+                `generate(GeminiRequest) -> GeminiResponse`
+                (default: SDKGeminiBackend)
+            max_workers: Threads for blocking SDK calls
+            requests_per_minute: Rate limit (0 disables it)
+            burst: Requests allowed at once before the rate applies
+            default_timeout: Deadline in seconds when a call gives none
+        """
+        self.backend = backend or SDKGeminiBackend()
+        self.max_workers = max(1, max_workers)
+        self.default_timeout = default_timeout
+        self.limiter = RateLimiter(requests_per_minute, burst)
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._stats = {
+            "requests": 0,
+            "calls": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "timeouts": 0,
+        }
+
+    def configure(
+        self,
+        max_workers: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        backend: Optional[Any] = None,
+    ) -> None:
+        """Change limits (a new pool size applies once the pool is recreated)."""
+        if max_workers is not None and max_workers != self.max_workers:
+            self.max_workers = max(1, max_workers)
+            self._shutdown_executor()
+        if requests_per_minute is not None:
+            self.limiter.requests_per_minute = requests_per_minute
+        if burst is not None:
+            self.limiter.burst = max(1, burst)
+        if default_timeout is not None:
+            self.default_timeout = default_timeout
+        if backend is not None:
+            self.backend = backend
+
+    @property
+    def available(self) -> bool:
+        """Whether the backend can be used (does not call the API)."""
+        return bool(self.backend.available)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="gemini"
+            )
+        return self._executor
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str = DEFAULT_MODEL,
+        system: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        safety_settings: Optional[dict] = None,
+    ) -> GeminiResponse:
+        """
+        Generate content, sharing the call with identical in-flight requests.
+
+        Args:
+            prompt: Prompt text
+            model: Gemini model name
+            system: System instruction
+            timeout: Deadline in seconds, including rate-limit waiting
+            max_output_tokens: Generation limit
+            temperature: Sampling temperature
+            safety_settings: SDK safety settings
+
+        Returns:
+            GeminiResponse
+
+        Raises:
+            GeminiUnavailable: SDK or API key missing
+            asyncio.TimeoutError: The deadline passed
+        """
+        request = GeminiRequest(
+            prompt=prompt,
+            model=model,
+            system=system,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            safety_settings=safety_settings,
+        )
+        timeout = self.default_timeout if timeout is None else timeout
+        self._stats["requests"] += 1
+
+        key = request.key()
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._stats["coalesced"] += 1
+        else:
+            task = asyncio.create_task(self._call(request, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        # Each caller keeps its own deadline; the shared call keeps going
+        # for the other callers if this one gives up
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            raise
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved by awaiting callers; avoid warnings if none are left
+
+    async def _call(self, request: GeminiRequest, timeout: float) -> GeminiResponse:
+        deadline = time.monotonic() + timeout
+
+        wait = self.limiter.reserve()
+        if wait > 0:
+            if time.monotonic() + wait > deadline:
+                raise asyncio.TimeoutError(f"Gemini rate limit wait ({wait:.1f}s) exceeds the deadline")
+            await asyncio.sleep(wait)
+
+        self._stats["calls"] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool(), self.backend.generate, request)
+        try:
+            return await asyncio.wait_for(future, timeout=max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            # The worker thread finishes on its own; its result is discarded
+            raise
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+
+    def _shutdown_executor(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def close(self) -> None:
+        """Stop the thread pool (recreated on the next request)."""
+        self._shutdown_executor()
+
+    def get_stats(self) -> dict:
+        """Request, coalescing and rate-limit counters."""
+        return {
+            **self._stats,
+            "in_flight": len(self._inflight),
+            "rate_limit_waits": self.limiter.waits,
+            "backend": getattr(self.backend, "name", type(self.backend).__name__),
+            "available": self.available,
+            "max_workers": self.max_workers,
+            "requests_per_minute": self.limiter.requests_per_minute,
+        }
+
+
+# Global gateway
+_global_gateway: Optional[GeminiGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gemini_gateway() -> GeminiGateway:
+    """
+    Get the global Gemini gateway.
+
+    Returns:
+        The singleton GeminiGateway
+    """
+    global _global_gateway
+    with _gateway_lock:
+        if _global_gateway is None:
+            _global_gateway = GeminiGateway()
+        return _global_gateway
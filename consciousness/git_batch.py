@@ -0,0 +1,384 @@
+"""
+Persistent Git Object Reader for Consciousness Daemon
+
+Keeps long-lived `git cat-file --batch` / `--batch-check` processes
+around so object lookups don't pay a process spawn each time:
+- Requests are pipelined over each worker's stdin and matched to
+  responses in FIFO order (git answers strictly in request order)
+- A small pool spreads concurrent requests across workers
+- Dead or hung workers are restarted transparently
+- Object contents and metadata are kept in an LRU cache keyed by
+  object id (objects are immutable, so the cache never goes stale)
+
+Usage:
+    pool = GitBatchPool(repo_path)
+    obj = await pool.get_object("HEAD:README.md")
+    if not obj.missing:
+        print(obj.text())
+    await pool.close()
+"""
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Full object ids are immutable and can be cached by name directly
+_OID_RE = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+BATCH = "--batch"
+BATCH_CHECK = "--batch-check"
+
+
+class GitBatchError(Exception):
+    """Raised when a cat-file worker cannot answer a request."""
+
+
+@dataclass
+class GitObject:
+    """Result of a cat-file lookup."""
+
+    name: str
+    oid: Optional[str] = None
+    type: Optional[str] = None
+    size: int = 0
+    content: Optional[bytes] = None
+
+    @property
+    def missing(self) -> bool:
+        """True if git could not resolve the requested name."""
+        return self.oid is None
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Decode object content as text (empty if not loaded)."""
+        if self.content is None:
+            return ""
+        return self.content.decode(encoding, errors="replace")
+
+
+class _CatFileWorker:
+    """
+    A single long-lived `git cat-file` process.
+
+    Requests are written to stdin as they arrive and a reader task
+    resolves pending futures in order as responses come back, so many
+    callers can have requests in flight on one process at the same time.
+    """
+
+    def __init__(self, repo_path: Path, mode: str):
+        self.repo_path = repo_path
+        self.mode = mode
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: deque[tuple[str, asyncio.Future]] = deque()
+        self._dead = False
+
+    @property
+    def alive(self) -> bool:
+        return (
+            not self._dead
+            and self._proc is not None
+            and self._proc.returncode is None
+        )
+
+    @property
+    def load(self) -> int:
+        """Number of requests currently in flight."""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Spawn the git process and the response reader."""
+        self._proc = await asyncio.create_subprocess_exec(
+            "git",
+            "cat-file",
+            self.mode,
+            cwd=self.repo_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def request(self, name: str) -> asyncio.Future:
+        """
+        Queue a lookup and return a future for its GitObject.
+
+        Raises:
+            GitBatchError: If the worker is not running or the write fails
+        """
+        if not self.alive or self._proc is None or self._proc.stdin is None:
+            raise GitBatchError("cat-file worker is not running")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        # Appending and writing without an await in between keeps the
+        # pending queue in the same order as the bytes on stdin.
+        self._pending.append((name, future))
+        try:
+            self._proc.stdin.write(name.encode("utf-8") + b"\n")
+            await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self._fail(GitBatchError(f"cat-file worker pipe closed: {e}"))
+        return future
+
+    async def _read_loop(self) -> None:
+        assert self._proc is not None and self._proc.stdout is not None
+        stdout = self._proc.stdout
+        try:
+            while True:
+                header = await stdout.readline()
+                if not header:
+                    raise GitBatchError("cat-file worker exited")
+
+                if not self._pending:
+                    raise GitBatchError("unexpected output from cat-file worker")
+                name, future = self._pending.popleft()
+
+                fields = header.decode("utf-8", errors="replace").rstrip("\n").split(" ")
+                if fields[-1] in ("missing", "ambiguous") or len(fields) < 3:
+                    obj = GitObject(name=name)
+                else:
+                    oid, obj_type, size = fields[0], fields[1], int(fields[2])
+                    content = None
+                    if self.mode == BATCH:
+                        # Content is followed by a single LF
+                        content = (await stdout.readexactly(size + 1))[:-1]
+                    obj = GitObject(
+                        name=name, oid=oid, type=obj_type, size=size, content=content
+                    )
+
+                if not future.done():
+                    future.set_result(obj)
+        except asyncio.CancelledError:
+            self._fail(GitBatchError("cat-file worker closed"))
+            raise
+        except (GitBatchError, asyncio.IncompleteReadError, ValueError) as e:
+            self._fail(e if isinstance(e, GitBatchError) else GitBatchError(str(e)))
+
+    def _fail(self, error: Exception) -> None:
+        """Mark the worker dead and fail everything still in flight."""
+        self._dead = True
+        while self._pending:
+            _, future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+        if self._proc is not None and self._proc.returncode is None:
+            try:
+                self._proc.kill()
+            except ProcessLookupError:
+                pass
+
+    async def close(self) -> None:
+        """Terminate the process and fail outstanding requests."""
+        self._dead = True
+        if self._proc is not None and self._proc.returncode is None:
+            if self._proc.stdin is not None:
+                self._proc.stdin.close()
+            try:
+                await asyncio.wait_for(self._proc.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                self._proc.kill()
+                await self._proc.wait()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._fail(GitBatchError("cat-file worker closed"))
+
+
+class GitBatchPool:
+    """
+    Pool of persistent cat-file workers with an object LRU cache.
+
+    Workers are started lazily on first use. Each request goes to the
+    least-loaded live worker for its mode; a worker that dies or hangs
+    is replaced on the next request.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        workers: int = 2,
+        cache_size: int = 1024,
+        request_timeout: float = 10.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            repo_path: Path to the git repository
+            workers: Number of processes per mode (--batch / --batch-check)
+            cache_size: Maximum number of cached objects
+            request_timeout: Seconds to wait for a single lookup
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self.workers = max(1, workers)
+        self.cache_size = cache_size
+        self.request_timeout = request_timeout
+
+        self._workers: dict[str, list[_CatFileWorker]] = {BATCH: [], BATCH_CHECK: []}
+        self._spawn_lock = asyncio.Lock()
+        self._cache: OrderedDict[tuple[str, str], GitObject] = OrderedDict()
+        self._closed = False
+
+        self._requests = 0
+        self._cache_hits = 0
+        self._restarts = 0
+        self._failures = 0
+
+    # =========================================================================
+    # Cache
+    # =========================================================================
+
+    def _cache_get(self, mode: str, oid: str) -> Optional[GitObject]:
+        keys = [(mode, oid)]
+        if mode == BATCH_CHECK:
+            # Full objects also answer metadata lookups
+            keys.append((BATCH, oid))
+        for key in keys:
+            obj = self._cache.get(key)
+            if obj is not None:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return obj
+        return None
+
+    def _cache_put(self, mode: str, obj: GitObject) -> None:
+        if obj.missing or self.cache_size <= 0:
+            return
+        key = (mode, obj.oid)
+        self._cache[key] = obj
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Drop all cached objects."""
+        self._cache.clear()
+
+    # =========================================================================
+    # Workers
+    # =========================================================================
+
+    async def _acquire_worker(self, mode: str) -> _CatFileWorker:
+        if self._closed:
+            raise GitBatchError("git batch pool is closed")
+
+        async with self._spawn_lock:
+            pool = self._workers[mode]
+            dead = [w for w in pool if not w.alive]
+            for worker in dead:
+                pool.remove(worker)
+                await worker.close()
+                self._restarts += 1
+                logger.debug(f"Restarting git cat-file {mode} worker")
+
+            idle = [w for w in pool if w.load == 0]
+            if not idle and len(pool) < self.workers:
+                worker = _CatFileWorker(self.repo_path, mode)
+                await worker.start()
+                pool.append(worker)
+                return worker
+
+            return min(pool, key=lambda w: w.load)
+
+    async def _lookup(self, mode: str, name: str) -> GitObject:
+        if "\n" in name:
+            raise ValueError("object name must not contain newlines")
+
+        self._requests += 1
+        if _OID_RE.match(name):
+            cached = self._cache_get(mode, name)
+            if cached is not None:
+                return cached
+
+        # One retry covers a worker that died between requests
+        obj: Optional[GitObject] = None
+        for attempt in range(2):
+            worker = await self._acquire_worker(mode)
+            try:
+                future = await worker.request(name)
+                obj = await asyncio.wait_for(future, timeout=self.request_timeout)
+                break
+            except asyncio.TimeoutError:
+                self._failures += 1
+                worker._fail(GitBatchError(f"cat-file lookup timed out: {name}"))
+                raise GitBatchError(f"cat-file lookup timed out: {name}")
+            except GitBatchError:
+                self._failures += 1
+                if attempt == 1:
+                    raise
+
+        self._cache_put(mode, obj)
+        return obj
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def get_info(self, name: str) -> GitObject:
+        """
+        Resolve an object name to its id, type and size (no content).
+
+        Args:
+            name: Any revision expression git accepts (e.g. "HEAD", "HEAD:path")
+
+        Returns:
+            GitObject with content=None; check `.missing` for unknown names
+        """
+        return await self._lookup(BATCH_CHECK, name)
+
+    async def get_object(self, name: str) -> GitObject:
+        """
+        Read an object including its content.
+
+        Symbolic names are first resolved with a cheap metadata lookup so
+        the content can be served from cache when the object is unchanged.
+
+        Args:
+            name: Any revision expression git accepts
+
+        Returns:
+            GitObject with content; check `.missing` for unknown names
+        """
+        if _OID_RE.match(name):
+            return await self._lookup(BATCH, name)
+
+        info = await self.get_info(name)
+        if info.missing:
+            return GitObject(name=name)
+
+        obj = await self._lookup(BATCH, info.oid)
+        return GitObject(
+            name=name, oid=obj.oid, type=obj.type, size=obj.size, content=obj.content
+        )
+
+    async def close(self) -> None:
+        """Shut down all workers."""
+        self._closed = True
+        for pool in self._workers.values():
+            for worker in pool:
+                await worker.close()
+            pool.clear()
+
+    def get_stats(self) -> dict:
+        """Get pool and cache statistics."""
+        return {
+            "requests": self._requests,
+            "cache_hits": self._cache_hits,
+            "cache_size": len(self._cache),
+            "restarts": self._restarts,
+            "failures": self._failures,
+            "workers": {
+                mode: sum(1 for w in pool if w.alive)
+                for mode, pool in self._workers.items()
+            },
+        }
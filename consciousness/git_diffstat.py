@@ -0,0 +1,355 @@
+"""
+Incremental Diff Statistics for Consciousness Daemon
+
+Keeps per-file `--numstat` results for dirty paths so observations don't
+rerun a whole-worktree `git diff --stat` every cycle:
+- Each entry is keyed by (path, index blob id, worktree fingerprint)
+- Index blob ids are only re-read when the index file itself changes
+- Worktree fingerprints are a cheap stat() (size, mtime_ns)
+- Paths reported by the file watcher are always recomputed
+- Only stale paths are passed to git, as an explicit pathspec
+
+Produces both a git-style stat view and a compact one-line summary for
+LLM prompts.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Optional
+
+# Paths per git invocation, to stay well below argv limits
+PATHSPEC_CHUNK = 200
+
+RunGit = Callable[..., Awaitable[tuple[bool, str]]]
+ResolveHead = Callable[[], Awaitable[Optional[str]]]
+
+CacheKey = tuple[str, Optional[str], Optional[tuple[int, int]]]
+
+
+@dataclass
+class FileDiffStat:
+    """Line statistics for a single dirty file."""
+
+    path: str
+    staged_added: int = 0
+    staged_deleted: int = 0
+    unstaged_added: int = 0
+    unstaged_deleted: int = 0
+    binary: bool = False
+    key: Optional[CacheKey] = None
+
+    @property
+    def added(self) -> int:
+        return self.staged_added + self.unstaged_added
+
+    @property
+    def deleted(self) -> int:
+        return self.staged_deleted + self.unstaged_deleted
+
+
+def _parse_numstat(output: str) -> dict[str, tuple[int, int, bool]]:
+    """Parse `git diff --numstat -z --no-renames` output."""
+    stats: dict[str, tuple[int, int, bool]] = {}
+    for record in output.split("\0"):
+        if not record:
+            continue
+        parts = record.split("\t", 2)
+        if len(parts) != 3:
+            continue
+        added, deleted, path = parts
+        if added == "-" or deleted == "-":
+            stats[path] = (0, 0, True)
+        else:
+            try:
+                stats[path] = (int(added), int(deleted), False)
+            except ValueError:
+                continue
+    return stats
+
+
+class DiffStatCache:
+    """
+    Per-file diff statistics, recomputed only for paths whose key changed.
+
+    The cache is tied to one HEAD commit; when HEAD moves, every entry is
+    dropped since staged statistics are relative to HEAD.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        run_git: RunGit,
+        resolve_head: Optional[ResolveHead] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            repo_path: Path to the git repository root
+            run_git: Coroutine running a git command, returning (success, output)
+            resolve_head: Optional coroutine returning the HEAD object id
+                (defaults to `git rev-parse HEAD` through run_git)
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self._run_git = run_git
+        self._resolve_head = resolve_head
+
+        self._entries: dict[str, FileDiffStat] = {}
+        self._index_oids: dict[str, str] = {}
+        self._index_fingerprint: Optional[tuple[int, int]] = None
+        self._index_path: Optional[Path] = None
+        self._head: Optional[str] = None
+
+        self.hits = 0
+        self.recomputed = 0
+
+    # =========================================================================
+    # Fingerprints
+    # =========================================================================
+
+    @staticmethod
+    def _stat_fingerprint(path: Path) -> Optional[tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    async def _get_index_path(self) -> Optional[Path]:
+        if self._index_path is None:
+            success, git_dir = await self._run_git("rev-parse", "--absolute-git-dir")
+            if success and git_dir:
+                self._index_path = Path(git_dir) / "index"
+        return self._index_path
+
+    async def _get_head(self) -> Optional[str]:
+        if self._resolve_head is not None:
+            return await self._resolve_head()
+        success, head = await self._run_git("rev-parse", "--verify", "-q", "HEAD")
+        return head if success else None
+
+    async def _refresh_index_oids(self, paths: list[str], force: bool) -> None:
+        """Update index blob ids for paths (all of them if the index changed)."""
+        index_path = await self._get_index_path()
+        fingerprint = self._stat_fingerprint(index_path) if index_path else None
+
+        if force or fingerprint != self._index_fingerprint:
+            self._index_oids.clear()
+            self._index_fingerprint = fingerprint
+            wanted = paths
+        else:
+            wanted = [p for p in paths if p not in self._index_oids]
+
+        for i in range(0, len(wanted), PATHSPEC_CHUNK):
+            chunk = wanted[i:i + PATHSPEC_CHUNK]
+            success, output = await self._run_git(
+                "ls-files", "-s", "-z", "--", *chunk
+            )
+            if not success:
+                continue
+            for record in output.split("\0"):
+                # Format: <mode> <oid> <stage>\t<path>
+                meta, sep, path = record.partition("\t")
+                fields = meta.split(" ")
+                if sep and len(fields) == 3:
+                    self._index_oids[path] = fields[1]
+
+    def _to_relative(self, path: str | Path) -> Optional[str]:
+        p = Path(path)
+        if not p.is_absolute():
+            return p.as_posix()
+        try:
+            return p.resolve().relative_to(self.repo_path).as_posix()
+        except ValueError:
+            return None
+
+    # =========================================================================
+    # Refresh
+    # =========================================================================
+
+    async def refresh(
+        self,
+        dirty_paths: Iterable[str],
+        changed_paths: Optional[Iterable[str | Path]] = None,
+    ) -> list[FileDiffStat]:
+        """
+        Bring the cache in line with the current dirty set.
+
+        Args:
+            dirty_paths: Repo-relative paths with staged or unstaged changes
+            changed_paths: Paths the file watcher saw change (forced recompute)
+
+        Returns:
+            Stats for every dirty path, sorted by path
+        """
+        dirty = sorted(set(dirty_paths))
+        dirty_set = set(dirty)
+
+        head = await self._get_head()
+        head_moved = head != self._head
+        if head_moved:
+            self._entries.clear()
+            self._head = head
+
+        # Paths that became clean are no longer interesting
+        for path in list(self._entries):
+            if path not in dirty_set:
+                del self._entries[path]
+
+        forced = set()
+        for path in changed_paths or ():
+            rel = self._to_relative(path)
+            if rel is not None:
+                forced.add(rel)
+
+        await self._refresh_index_oids(dirty, force=head_moved)
+
+        stale: list[str] = []
+        keys: dict[str, CacheKey] = {}
+        for path in dirty:
+            key = (
+                path,
+                self._index_oids.get(path),
+                self._stat_fingerprint(self.repo_path / path),
+            )
+            keys[path] = key
+            entry = self._entries.get(path)
+            if entry is None or entry.key != key or path in forced:
+                stale.append(path)
+            else:
+                self.hits += 1
+
+        if stale:
+            await self._recompute(stale, keys)
+
+        return [self._entries[p] for p in dirty if p in self._entries]
+
+    async def _recompute(self, paths: list[str], keys: dict[str, CacheKey]) -> None:
+        staged: dict[str, tuple[int, int, bool]] = {}
+        unstaged: dict[str, tuple[int, int, bool]] = {}
+
+        for i in range(0, len(paths), PATHSPEC_CHUNK):
+            chunk = paths[i:i + PATHSPEC_CHUNK]
+            ok, output = await self._run_git(
+                "diff", "--cached", "--numstat", "-z", "--no-renames", "--", *chunk
+            )
+            if ok:
+                staged.update(_parse_numstat(output))
+            ok, output = await self._run_git(
+                "diff", "--numstat", "-z", "--no-renames", "--", *chunk
+            )
+            if ok:
+                unstaged.update(_parse_numstat(output))
+
+        for path in paths:
+            s_add, s_del, s_bin = staged.get(path, (0, 0, False))
+            u_add, u_del, u_bin = unstaged.get(path, (0, 0, False))
+            self._entries[path] = FileDiffStat(
+                path=path,
+                staged_added=s_add,
+                staged_deleted=s_del,
+                unstaged_added=u_add,
+                unstaged_deleted=u_del,
+                binary=s_bin or u_bin,
+                key=keys[path],
+            )
+            self.recomputed += 1
+
+    def clear(self) -> None:
+        """Drop all cached statistics."""
+        self._entries.clear()
+        self._index_oids.clear()
+        self._index_fingerprint = None
+        self._head = None
+
+
+# =============================================================================
+# Formatting
+# =============================================================================
+
+
+def format_stat(
+    stats: list[FileDiffStat],
+    staged_paths: Iterable[str] = (),
+    unstaged_paths: Iterable[str] = (),
+    bar_width: int = 40,
+) -> str:
+    """
+    Render stats like `git diff --stat`, split into staged and unstaged.
+
+    Args:
+        stats: Per-file statistics
+        staged_paths: Paths to list under "Staged"
+        unstaged_paths: Paths to list under "Unstaged"
+        bar_width: Maximum width of the +/- bar
+
+    Returns:
+        Multi-line stat view (empty if nothing to show)
+    """
+    by_path = {s.path: s for s in stats}
+
+    def _section(title: str, paths: Iterable[str], staged: bool) -> str:
+        rows = []
+        for path in sorted(set(paths)):
+            stat = by_path.get(path)
+            if stat is None:
+                continue
+            added = stat.staged_added if staged else stat.unstaged_added
+            deleted = stat.staged_deleted if staged else stat.unstaged_deleted
+            rows.append((path, added, deleted, stat.binary))
+        if not rows:
+            return ""
+
+        name_width = max(len(r[0]) for r in rows)
+        largest = max(r[1] + r[2] for r in rows) or 1
+        scale = min(1.0, bar_width / largest)
+
+        lines = []
+        total_added = total_deleted = 0
+        for path, added, deleted, binary in rows:
+            if binary:
+                lines.append(f" {path.ljust(name_width)} | Bin")
+                continue
+            total_added += added
+            total_deleted += deleted
+            bar = "+" * int(round(added * scale)) + "-" * int(round(deleted * scale))
+            lines.append(f" {path.ljust(name_width)} | {added + deleted:>4} {bar}")
+
+        n = len(rows)
+        lines.append(
+            f" {n} file{'s' if n != 1 else ''} changed, "
+            f"{total_added} insertion{'s' if total_added != 1 else ''}(+), "
+            f"{total_deleted} deletion{'s' if total_deleted != 1 else ''}(-)"
+        )
+        return f"{title}:\n" + "\n".join(lines)
+
+    parts = [
+        _section("Staged", staged_paths, staged=True),
+        _section("Unstaged", unstaged_paths, staged=False),
+    ]
+    return "\n\n".join(p for p in parts if p)
+
+
+def format_compact(stats: list[FileDiffStat], top: int = 5) -> str:
+    """
+    One-line summary for LLM prompts.
+
+    Example: "4 files +120/-8; top: app.py +100/-2, README.md +15/-0"
+    """
+    if not stats:
+        return ""
+
+    added = sum(s.added for s in stats)
+    deleted = sum(s.deleted for s in stats)
+    n = len(stats)
+    summary = f"{n} file{'s' if n != 1 else ''} +{added}/-{deleted}"
+
+    largest = sorted(stats, key=lambda s: (-(s.added + s.deleted), s.path))[:top]
+    details = [
+        f"{s.path} bin" if s.binary else f"{s.path} +{s.added}/-{s.deleted}"
+        for s in largest
+    ]
+    if details:
+        summary += "; top: " + ", ".join(details)
+    return summary
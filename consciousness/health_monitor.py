@@ -0,0 +1,354 @@
+"""
+Background LM Studio Health Monitoring
+
+Availability used to be checked inline, with retries and backoff on the
+request path whenever a cached result expired. A HealthMonitor probes
+the server in a background task instead, and request paths only read
+its current state:
+- One monitor per base_url, shared process-wide (get_health_monitor)
+- Probes every `probe_interval` seconds while healthy; after a failure
+  the next probe follows a jittered exponential backoff
+- Circuit breaker: `failure_threshold` consecutive failures (or a
+  failed first probe) open the circuit (unavailable). When the backoff has passed the circuit goes
+  half-open and a single trial probe decides: success closes it, failure
+  opens it again with a longer backoff
+- State changes are published to subscribers and to wait_for_change()
+
+Usage:
+    monitor = get_health_monitor("http://localhost:1234/v1")
+    await monitor.start()            # First probe, then background probing
+    if monitor.is_available:         # O(1), never probes
+        ...
+    unsubscribe = monitor.subscribe(on_change)  # (old, new) snapshots
+"""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, Callable, Optional
+
+import structlog
+
+from .llm_clients import get_llm_client_registry
+
+logger = structlog.get_logger(__name__)
+
+
+class CircuitState(Enum):
+    """Circuit breaker state of a monitored server."""
+
+    CLOSED = "closed"  # Healthy, requests flow
+    OPEN = "open"  # Failing, requests should go elsewhere
+    HALF_OPEN = "half_open"  # Trial probe in progress
+
+
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """State of a monitored server after the latest probe."""
+
+    circuit: CircuitState = CircuitState.CLOSED
+    checked: bool = False  # At least one probe has finished
+    last_check: float = 0.0  # Unix time of the latest probe
+    latency_ms: Optional[float] = None
+    models: tuple[str, ...] = ()
+    last_error: Optional[str] = None
+    consecutive_failures: int = 0
+    consecutive_successes: int = 0
+    total_probes: int = 0
+
+    @property
+    def available(self) -> bool:
+        """Checked, and the circuit is closed."""
+        return self.checked and self.circuit == CircuitState.CLOSED
+
+    def to_dict(self) -> dict:
+        return {
+            "available": self.available,
+            "circuit": self.circuit.value,
+            "checked": self.checked,
+            "last_check": self.last_check,
+            "latency_ms": self.latency_ms,
+            "models": list(self.models),
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "consecutive_successes": self.consecutive_successes,
+            "total_probes": self.total_probes,
+        }
+
+
+Subscriber = Callable[[HealthSnapshot, HealthSnapshot], Any]
+
+
+class HealthMonitor:
+    """Probes one LM Studio server in the background."""
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:1234/v1",
+        probe_interval: float = 30.0,
+        timeout: float = 5.0,
+        failure_threshold: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        jitter: float = 0.2,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            base_url: OpenAI-compatible API endpoint
+            probe_interval: Seconds between probes while healthy
+            timeout: Seconds a probe may take
+            failure_threshold: Consecutive failures that open the circuit
+            backoff_base: Delay before the probe after the first failure
+            backoff_max: Longest delay between probes while failing
+            jitter: Random +/- fraction applied to every delay
+        """
+        self.base_url = base_url.rstrip("/")
+        self.probe_interval = probe_interval
+        self.timeout = timeout
+        self.failure_threshold = max(1, failure_threshold)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+
+        self._clients = get_llm_client_registry()
+        self._client = self._clients.client(
+            self.base_url, consumer="health_monitor", timeout_class="health", timeout=timeout
+        )
+
+        self._snapshot = HealthSnapshot()
+        self._subscribers: list[Subscriber] = []
+        self._changed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def snapshot(self) -> HealthSnapshot:
+        """Current state (never probes)."""
+        return self._snapshot
+
+    @property
+    def is_available(self) -> bool:
+        """Whether requests should go to this server (never probes)."""
+        return self._snapshot.available
+
+    @property
+    def client(self):
+        """The monitor's AsyncOpenAI client (on the shared health pool)."""
+        return self._client
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is probing."""
+        return self._task is not None and not self._task.done()
+
+    def _same_loop(self, task: Optional[asyncio.Task]) -> bool:
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
+
+    async def start(self) -> HealthSnapshot:
+        """
+        Start probing in the background (no-op if already running).
+
+        The first start waits for one probe, so the state is known.
+
+        Returns:
+            The current snapshot
+        """
+        if self._same_loop(self._task):
+            return self._snapshot
+        if not self._snapshot.checked:
+            await self.probe()
+        self._task = asyncio.create_task(self._run())
+        logger.debug("health_monitor.started", base_url=self.base_url)
+        return self._snapshot
+
+    async def stop(self) -> None:
+        """Stop background probing."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def next_delay(self) -> float:
+        """Seconds until the next probe, with jitter."""
+        failures = self._snapshot.consecutive_failures
+        if failures == 0:
+            delay = self.probe_interval
+        else:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.next_delay())
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("health_monitor.probe_error", base_url=self.base_url, error=str(e))
+
+    async def probe(self) -> HealthSnapshot:
+        """
+        Probe now (joins a probe already in progress).
+
+        Returns:
+            The snapshot after the probe
+        """
+        if not self._same_loop(self._probe_task):
+            self._probe_task = asyncio.create_task(self._probe())
+        return await asyncio.shield(self._probe_task)
+
+    async def _probe(self) -> HealthSnapshot:
+        current = self._snapshot
+        if current.circuit == CircuitState.OPEN:
+            # Backoff has passed: let one trial probe through
+            self._publish(replace(current, circuit=CircuitState.HALF_OPEN))
+            current = self._snapshot
+
+        start = time.perf_counter()
+        try:
+            async with self._clients.slot("health_monitor"):
+                models = await asyncio.wait_for(self._client.models.list(), timeout=self.timeout)
+        except Exception as e:
+            failures = current.consecutive_failures + 1
+            opened = (
+                not current.checked  # Never seen up
+                or current.circuit == CircuitState.HALF_OPEN
+                or failures >= self.failure_threshold
+            )
+            self._publish(replace(
+                current,
+                circuit=CircuitState.OPEN if opened else current.circuit,
+                checked=True,
+                last_check=time.time(),
+                latency_ms=None,
+                last_error=str(e) or type(e).__name__,
+                consecutive_failures=failures,
+                consecutive_successes=0,
+                total_probes=current.total_probes + 1,
+            ))
+        else:
+            data = getattr(models, "data", None) or []
+            self._publish(replace(
+                current,
+                circuit=CircuitState.CLOSED,
+                checked=True,
+                last_check=time.time(),
+                latency_ms=round((time.perf_counter() - start) * 1000, 1),
+                models=tuple(m.id for m in data),
+                last_error=None,
+                consecutive_failures=0,
+                consecutive_successes=current.consecutive_successes + 1,
+                total_probes=current.total_probes + 1,
+            ))
+        return self._snapshot
+
+    def _publish(self, new: HealthSnapshot) -> None:
+        """Store a snapshot; notify subscribers if availability or circuit changed."""
+        old, self._snapshot = self._snapshot, new
+        if (old.available, old.circuit) == (new.available, new.circuit):
+            return
+
+        logger.info(
+            "health_monitor.state_changed",
+            base_url=self.base_url,
+            circuit=new.circuit.value,
+            available=new.available,
+            error=new.last_error,
+        )
+        for callback in list(self._subscribers):
+            try:
+                result = callback(old, new)
+                if asyncio.iscoroutine(result):
+                    asyncio.create_task(result)
+            except Exception as e:
+                logger.warning("health_monitor.subscriber_error", error=str(e))
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """
+        Call `callback(old, new)` on every state change.
+
+        Coroutine callbacks are run as tasks.
+
+        Returns:
+            A function that removes the subscription
+        """
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> Optional[HealthSnapshot]:
+        """
+        Wait for the next state change.
+
+        Returns:
+            The new snapshot, or None on timeout
+        """
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._snapshot
+
+    async def wait_until_available(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the server is available (starts probing if needed)."""
+        await self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_available:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            await self.wait_for_change(timeout=remaining)
+        return True
+
+    def get_stats(self) -> dict:
+        """Current state and probe settings."""
+        return {
+            **self._snapshot.to_dict(),
+            "base_url": self.base_url,
+            "running": self.running,
+            "probe_interval": self.probe_interval,
+            "failure_threshold": self.failure_threshold,
+        }
+
+
+# Global monitors, one per base_url
+_monitors: dict[str, HealthMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_health_monitor(base_url: str = "http://localhost:1234/v1", **settings: Any) -> HealthMonitor:
+    """
+    Get the shared monitor of `base_url`.
+
+    Args:
+        base_url: OpenAI-compatible API endpoint
+        **settings: HealthMonitor arguments, used only when the monitor is created
+
+    Returns:
+        The HealthMonitor of the server
+    """
+    key = base_url.rstrip("/")
+    with _monitors_lock:
+        monitor = _monitors.get(key)
+        if monitor is None:
+            monitor = HealthMonitor(key, **settings)
+            _monitors[key] = monitor
+        return monitor
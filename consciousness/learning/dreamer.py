@@ -23,8 +23,10 @@ from pathlib import Path
 from typing import Any, Optional, Protocol
 
 import structlog
-from openai import AsyncOpenAI
 
+from ..gemini_gateway import get_gemini_gateway
+from ..llm_clients import get_llm_client_registry
+from ..llm_metrics import LLMCallTimer
 from .tracker import OutcomeTracker, Outcome, OutcomeType
 from .patterns import PatternLearner, Pattern
 
@@ -160,25 +162,32 @@ class LocalLLMClient:
     """Client for local LM Studio instance."""
 
     def __init__(self, base_url: str, model: str):
-        self.client = AsyncOpenAI(base_url=base_url, api_key="not-needed")
+        self._clients = get_llm_client_registry()
+        self.client = self._clients.client(base_url, consumer="dreamer")
         self.model = model
 
     async def complete(self, prompt: str, system: str) -> str:
+        timer = LLMCallTimer("dreamer.local", self.model, system + prompt)
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=4096,
-            )
-            return response.choices[0].message.content or ""
+            async with self._clients.slot("dreamer", request_class="dream"):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=0.7,
+                    max_tokens=4096,
+                )
         except Exception as e:
+            timer.finish(success=False)
             logger.warning("Local LLM completion failed", error=str(e))
             raise
 
+        text = response.choices[0].message.content or ""
+        timer.finish(usage=getattr(response, "usage", None), completion_text=text)
+        return text
+
 
 class ClaudeLLMClient:
     """Client for Claude API (Anthropic)."""
@@ -196,6 +205,7 @@ class ClaudeLLMClient:
         if self.client is None:
             raise RuntimeError("anthropic package not installed")
 
+        timer = LLMCallTimer("dreamer.claude", self.model, system + prompt)
         try:
             response = await self.client.messages.create(
                 model=self.model,
@@ -203,44 +213,37 @@ class ClaudeLLMClient:
                 system=system,
                 messages=[{"role": "user", "content": prompt}],
             )
-            return response.content[0].text if response.content else ""
         except Exception as e:
+            timer.finish(success=False)
             logger.warning("Claude completion failed", error=str(e))
             raise
 
+        text = response.content[0].text if response.content else ""
+        timer.finish(usage=getattr(response, "usage", None), completion_text=text)
+        return text
+
 
 class GeminiLLMClient:
-    """Client for Google Gemini API."""
+    """Client for Google Gemini API (through the shared GeminiGateway)."""
 
     def __init__(self, model: str):
         self.model = model
         # Uses GOOGLE_API_KEY from environment
-        try:
-            import google.generativeai as genai
-            self.genai = genai
-        except ImportError:
-            self.genai = None
+        self.gateway = get_gemini_gateway()
 
     async def complete(self, prompt: str, system: str) -> str:
-        if self.genai is None:
-            raise RuntimeError("google-generativeai package not installed")
-
+        timer = LLMCallTimer("dreamer.gemini", self.model, system + prompt)
         try:
-            model = self.genai.GenerativeModel(
-                model_name=self.model,
-                system_instruction=system,
-            )
-            # Run in executor since google-generativeai is sync
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: model.generate_content(prompt)
-            )
-            return response.text if response.text else ""
+            response = await self.gateway.generate(prompt, model=self.model, system=system)
         except Exception as e:
+            timer.finish(success=False)
             logger.warning("Gemini completion failed", error=str(e))
             raise
 
+        text = response.text or ""
+        timer.finish(usage=response.usage, completion_text=text)
+        return text
+
 
 # Reflection prompts
 REFLECTION_SYSTEM_PROMPT = """You are the Dream Reflection Engine for an autonomous AI consciousness system.
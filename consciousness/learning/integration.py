@@ -81,6 +81,10 @@ class LearningIntegration:
         self._last_pattern_update = 0.0
         self._initialized = False
 
+        # Incremented whenever patterns are updated (lets callers drop
+        # anything derived from the old patterns, e.g. cached decisions)
+        self.patterns_version = 0
+
     async def initialize(self) -> None:
         """Initialize the learning system."""
         if self._initialized:
@@ -121,6 +125,11 @@ class LearningIntegration:
         if not self.config.record_all_outcomes:
             return 0
 
+        # Only results from subprocess-running executors carry usage
+        resources = getattr(result, "resources", None)
+        if not isinstance(resources, dict):
+            resources = None
+
         outcome_id = await self.outcome_tracker.record_outcome(
             observation=observation,
             action_type=action_type,
@@ -131,6 +140,7 @@ class LearningIntegration:
             execution_time=result.duration,
             confidence_used=confidence_used,
             context=context,
+            resources=resources,
         )
 
         self._decision_count += 1
@@ -146,6 +156,7 @@ class LearningIntegration:
         try:
             await self.pattern_learner.update_patterns()
             self._last_pattern_update = time.time()
+            self.patterns_version += 1
         except Exception as e:
             logger.warning(f"Failed to update patterns: {e}")
 
@@ -262,7 +273,10 @@ class LearningIntegration:
 
     async def force_pattern_update(self) -> int:
         """Force an immediate pattern update."""
-        return await self.pattern_learner.update_patterns()
+        updated = await self.pattern_learner.update_patterns()
+        self._last_pattern_update = time.time()
+        self.patterns_version += 1
+        return updated
 
     async def get_recent_outcomes(
         self,
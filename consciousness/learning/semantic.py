@@ -473,6 +473,7 @@ Patterns describe recurring observation -> action -> outcome sequences.
         include_rules: bool = True,
         include_architecture: bool = True,
         include_patterns: bool = True,
+        create_missing: bool = True,
     ) -> list[str]:
         """
         Search the knowledge base for relevant entries.
@@ -482,11 +483,14 @@ Patterns describe recurring observation -> action -> outcome sequences.
             include_rules: Search in rules file
             include_architecture: Search in architecture file
             include_patterns: Search in patterns file
+            create_missing: Create missing knowledge files first (False:
+                search only what exists, without writing anything)
 
         Returns:
             List of matching sections
         """
-        await self.initialize()
+        if create_missing:
+            await self.initialize()
 
         results = []
         query_lower = query.lower()
@@ -66,6 +66,8 @@ class Outcome:
     # Dream Cycle processing
     processed_by_dreamer: bool = False
     dreamer_insights: str = ""
+    # What the action's processes used (None for actions without any)
+    resources: Optional[dict[str, Any]] = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -85,6 +87,7 @@ class Outcome:
             "outcome_match": self.outcome_match,
             "processed_by_dreamer": self.processed_by_dreamer,
             "dreamer_insights": self.dreamer_insights[:500] if self.dreamer_insights else "",
+            "resources": self.resources,
         }
 
     @property
@@ -256,6 +259,13 @@ class OutcomeTracker:
             ("outcome_match", "INTEGER DEFAULT 1"),
             ("processed_by_dreamer", "INTEGER DEFAULT 0"),
             ("dreamer_insights", "TEXT DEFAULT ''"),
+            # Resource usage of the action's processes (NULL when none ran)
+            ("cpu_user_s", "REAL"),
+            ("cpu_system_s", "REAL"),
+            ("peak_rss_bytes", "INTEGER"),
+            ("read_bytes", "INTEGER"),
+            ("write_bytes", "INTEGER"),
+            ("child_count", "INTEGER"),
         ]
 
         for column_name, column_def in new_columns:
@@ -294,6 +304,7 @@ class OutcomeTracker:
         context: Optional[dict[str, Any]] = None,
         executor_tier: int = ExecutorTier.CLAUDE_CODE,
         expected_outcome: str = "",
+        resources: Optional[dict[str, Any]] = None,
     ) -> int:
         """
         Record an action outcome to the database.
@@ -310,6 +321,8 @@ class OutcomeTracker:
             context: Additional context dictionary
             executor_tier: Tier that executed the action (1=Local, 2=Claude Code, 3=Claude Flow, 4=Gemini)
             expected_outcome: What was expected to happen
+            resources: Resource usage (ResourceUsage.to_dict()) of the
+                action's processes
 
         Returns:
             The ID of the recorded outcome
@@ -317,6 +330,7 @@ class OutcomeTracker:
         conn = await self._get_connection()
 
         observation_hash = _compute_observation_hash(observation)
+        resources = resources or {}
 
         # Determine result type
         if error:
@@ -344,8 +358,10 @@ class OutcomeTracker:
                 action_details, result_type, result_output, error_message,
                 execution_time, confidence_used, context,
                 executor_tier, expected_outcome, outcome_match,
-                processed_by_dreamer, dreamer_insights
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                processed_by_dreamer, dreamer_insights,
+                cpu_user_s, cpu_system_s, peak_rss_bytes,
+                read_bytes, write_bytes, child_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 time.time(),
@@ -364,6 +380,12 @@ class OutcomeTracker:
                 1 if outcome_match else 0,
                 0,  # processed_by_dreamer defaults to False
                 "",  # dreamer_insights defaults to empty
+                resources.get("cpu_user"),
+                resources.get("cpu_system"),
+                resources.get("peak_rss_bytes"),
+                resources.get("read_bytes"),
+                resources.get("write_bytes"),
+                resources.get("child_count"),
             ),
         )
         await conn.commit()
@@ -465,6 +487,16 @@ class OutcomeTracker:
         outcome_match = bool(row["outcome_match"]) if "outcome_match" in row.keys() else True
         processed_by_dreamer = bool(row["processed_by_dreamer"]) if "processed_by_dreamer" in row.keys() else False
         dreamer_insights = row["dreamer_insights"] if "dreamer_insights" in row.keys() else ""
+        resources = None
+        if "cpu_user_s" in row.keys() and row["cpu_user_s"] is not None:
+            resources = {
+                "cpu_user": row["cpu_user_s"],
+                "cpu_system": row["cpu_system_s"],
+                "peak_rss_bytes": row["peak_rss_bytes"],
+                "read_bytes": row["read_bytes"],
+                "write_bytes": row["write_bytes"],
+                "child_count": row["child_count"],
+            }
 
         return Outcome(
             id=row["id"],
@@ -484,6 +516,7 @@ class OutcomeTracker:
             outcome_match=outcome_match,
             processed_by_dreamer=processed_by_dreamer,
             dreamer_insights=dreamer_insights,
+            resources=resources,
         )
 
     async def get_action_statistics(
@@ -497,7 +530,8 @@ class OutcomeTracker:
             time_window_hours: Time window for statistics
 
         Returns:
-            Dictionary mapping action_type to statistics
+            Dictionary mapping action_type to statistics. Resource averages
+            cover only outcomes with recorded usage (None if there are none).
         """
         conn = await self._get_connection()
         cutoff = time.time() - (time_window_hours * 3600)
@@ -509,7 +543,14 @@ class OutcomeTracker:
                 COUNT(*) as total,
                 SUM(CASE WHEN result_type IN ('success', 'partial') THEN 1 ELSE 0 END) as successes,
                 AVG(execution_time) as avg_execution_time,
-                AVG(confidence_used) as avg_confidence
+                AVG(confidence_used) as avg_confidence,
+                COUNT(cpu_user_s) as with_resources,
+                AVG(cpu_user_s + cpu_system_s) as avg_cpu_seconds,
+                AVG(peak_rss_bytes) as avg_peak_rss_bytes,
+                MAX(peak_rss_bytes) as max_peak_rss_bytes,
+                AVG(read_bytes) as avg_read_bytes,
+                AVG(write_bytes) as avg_write_bytes,
+                AVG(child_count) as avg_child_count
             FROM outcomes
             WHERE timestamp >= ?
             GROUP BY action_type
@@ -525,6 +566,13 @@ class OutcomeTracker:
                 "success_rate": (row["successes"] or 0) / row["total"] if row["total"] > 0 else 0,
                 "avg_execution_time": row["avg_execution_time"] or 0,
                 "avg_confidence": row["avg_confidence"] or 0,
+                "with_resources": row["with_resources"],
+                "avg_cpu_seconds": row["avg_cpu_seconds"],
+                "avg_peak_rss_bytes": row["avg_peak_rss_bytes"],
+                "max_peak_rss_bytes": row["max_peak_rss_bytes"],
+                "avg_read_bytes": row["avg_read_bytes"],
+                "avg_write_bytes": row["avg_write_bytes"],
+                "avg_child_count": row["avg_child_count"],
             }
             for row in rows
         }
@@ -0,0 +1,304 @@
+"""
+Shared LLM Client Pools
+
+The thinker, the LM Studio detectors, the dreamer and the fallback router
+all talk to the same LM Studio server. Instead of one AsyncOpenAI client
+(and one connection pool) each, they get their clients from a
+process-wide LLMClientRegistry:
+- One HTTP connection pool per (base_url, timeout class), with
+  keep-alive, so health checks and completions reuse warm connections
+- Every consumer still gets its own AsyncOpenAI object (own timeout and
+  API key) on top of the shared pool
+- Requests wrapped in `slot()` are admitted by the pool's priority
+  scheduler (see llm_scheduler) and counted per consumer: in flight,
+  queue wait and errors
+
+Timeout classes:
+- health: availability checks and model listings (short timeouts,
+  up to max_connections at once)
+- completion: chat completions (long, streamed, up to
+  max_concurrent_requests at once)
+
+Usage:
+    registry = get_llm_client_registry()
+    client = registry.client(base_url, consumer="thinker")
+    async with registry.slot("thinker", request_class="user_message"):
+        await client.chat.completions.create(...)
+
+    registry.get_stats()
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+try:
+    import httpx
+except ImportError:  # Newer openai releases are built on httpx2
+    import httpx2 as httpx
+
+from .llm_metrics import percentile
+from .llm_scheduler import RequestScheduler
+
+# Default per-request timeout of each timeout class (seconds)
+TIMEOUT_CLASSES = {
+    "health": 5.0,
+    "completion": 600.0,
+}
+
+
+@dataclass
+class _ConsumerStats:
+    """Request counters of one consumer (thinker, detector, ...)."""
+
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    queue_waits_ms: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def to_dict(self) -> dict:
+        waits = list(self.queue_waits_ms)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "queue_wait_ms": {
+                "p50": percentile(waits, 50),
+                "p90": percentile(waits, 90),
+                "max": max(waits) if waits else None,
+            },
+        }
+
+
+@dataclass
+class _Pool:
+    """One shared HTTP connection pool."""
+
+    base_url: str
+    timeout_class: str
+    http_client: Any  # httpx.AsyncClient
+    scheduler: RequestScheduler
+    consumers: set[str] = field(default_factory=set)
+    clients_created: int = 0
+
+
+class LLMClientRegistry:
+    """Hands out AsyncOpenAI clients sharing one connection pool per server."""
+
+    def __init__(
+        self,
+        max_connections: int = 8,
+        max_keepalive_connections: int = 4,
+        keepalive_expiry: float = 60.0,
+        max_concurrent_requests: int = 1,
+        aging_seconds: float = 30.0,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Connections per pool (the `slot()` limit of health pools)
+            max_keepalive_connections: Idle connections kept open per pool
+            keepalive_expiry: Seconds an idle connection is kept open
+            max_concurrent_requests: `slot()` limit of completion pools
+            aging_seconds: Waiting time that raises a request by one class
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_concurrent_requests = max_concurrent_requests
+        self.aging_seconds = aging_seconds
+
+        self._pools: dict[tuple[str, str], _Pool] = {}
+        self._consumer_pools: dict[str, tuple[str, str]] = {}
+        self._consumers: dict[str, _ConsumerStats] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        max_concurrent_requests: Optional[int] = None,
+        aging_seconds: Optional[float] = None,
+    ) -> None:
+        """Change the pool limits (applies to pools created afterwards)."""
+        if max_connections is not None:
+            self.max_connections = max_connections
+        if max_keepalive_connections is not None:
+            self.max_keepalive_connections = max_keepalive_connections
+        if keepalive_expiry is not None:
+            self.keepalive_expiry = keepalive_expiry
+        if max_concurrent_requests is not None:
+            self.max_concurrent_requests = max_concurrent_requests
+        if aging_seconds is not None:
+            self.aging_seconds = aging_seconds
+
+    @staticmethod
+    def _key(base_url: str, timeout_class: str) -> tuple[str, str]:
+        if timeout_class not in TIMEOUT_CLASSES:
+            raise ValueError(f"Unknown timeout class: {timeout_class}")
+        return base_url.rstrip("/"), timeout_class
+
+    def _pool(self, key: tuple[str, str]) -> _Pool:
+        pool = self._pools.get(key)
+        if pool is None:
+            base_url, timeout_class = key
+            http_client = DefaultAsyncHttpxClient(
+                timeout=TIMEOUT_CLASSES[timeout_class],
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            pool = _Pool(
+                base_url=base_url,
+                timeout_class=timeout_class,
+                http_client=http_client,
+                scheduler=RequestScheduler(
+                    max_concurrent=(
+                        self.max_connections if timeout_class == "health"
+                        else self.max_concurrent_requests
+                    ),
+                    aging_seconds=self.aging_seconds,
+                ),
+            )
+            self._pools[key] = pool
+        return pool
+
+    def client(
+        self,
+        base_url: str,
+        consumer: str,
+        timeout_class: str = "completion",
+        timeout: Optional[float] = None,
+        api_key: str = "not-needed",
+    ) -> AsyncOpenAI:
+        """
+        Get a client on the shared pool of `base_url` and `timeout_class`.
+
+        Args:
+            base_url: OpenAI-compatible API endpoint
+            consumer: Name the requests are counted under (see slot)
+            timeout_class: "health" or "completion"
+            timeout: Per-request timeout (defaults to the class's)
+            api_key: API key (not required for local LM Studio)
+
+        Returns:
+            An AsyncOpenAI client of its own; never close it, the pool is shared
+        """
+        key = self._key(base_url, timeout_class)
+        with self._lock:
+            pool = self._pool(key)
+            pool.consumers.add(consumer)
+            pool.clients_created += 1
+            self._consumer_pools[consumer] = key
+            self._consumers.setdefault(consumer, _ConsumerStats())
+
+        return AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=timeout if timeout is not None else TIMEOUT_CLASSES[timeout_class],
+            http_client=pool.http_client,
+        )
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        consumer: str,
+        request_class: str = "decision",
+        key: Optional[str] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Count a request of `consumer` and wait for the scheduler to admit it.
+
+        Errors raised inside the block are counted and re-raised.
+
+        Args:
+            consumer: Name the client was created with
+            request_class: Priority class (see llm_scheduler.REQUEST_CLASSES)
+            key: Queued requests with the same key are superseded by this one
+
+        Raises:
+            RequestSuperseded: A newer request with the same key was queued
+        """
+        with self._lock:
+            stats = self._consumers.setdefault(consumer, _ConsumerStats())
+            pool_key = self._consumer_pools.get(consumer)
+            pool = self._pools.get(pool_key) if pool_key else None
+
+        start = time.perf_counter()
+        if pool is not None:
+            await pool.scheduler.acquire(request_class, key)
+        stats.queue_waits_ms.append(round((time.perf_counter() - start) * 1000, 1))
+        stats.requests += 1
+        stats.in_flight += 1
+        try:
+            yield
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            if pool is not None:
+                pool.scheduler.release(request_class)
+
+    async def close(self) -> None:
+        """Close all pools (clients handed out stop working)."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._consumer_pools.clear()
+        for pool in pools:
+            await pool.http_client.aclose()
+
+    def get_stats(self) -> dict:
+        """Pools and per-consumer request statistics."""
+        with self._lock:
+            return {
+                "limits": {
+                    "max_connections": self.max_connections,
+                    "max_keepalive_connections": self.max_keepalive_connections,
+                    "keepalive_expiry": self.keepalive_expiry,
+                    "max_concurrent_requests": self.max_concurrent_requests,
+                    "aging_seconds": self.aging_seconds,
+                },
+                "pools": [
+                    {
+                        "base_url": pool.base_url,
+                        "timeout_class": pool.timeout_class,
+                        "consumers": sorted(pool.consumers),
+                        "clients": pool.clients_created,
+                        "scheduler": pool.scheduler.get_stats(),
+                    }
+                    for pool in self._pools.values()
+                ],
+                "consumers": {
+                    name: stats.to_dict() for name, stats in self._consumers.items()
+                },
+            }
+
+
+# Global registry instance
+_global_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_client_registry() -> LLMClientRegistry:
+    """
+    Get the global LLM client registry.
+
+    Returns:
+        The singleton LLMClientRegistry
+    """
+    global _global_registry
+    with _registry_lock:
+        if _global_registry is None:
+            _global_registry = LLMClientRegistry()
+        return _global_registry
@@ -0,0 +1,262 @@
+"""
+LLM Usage and Latency Accounting
+
+Every LLM call (thinker, dreamer clients, Gemini consciousness, guidance
+forwarder) is measured the same way:
+- Prompt and completion tokens, from the provider's usage report
+  (OpenAI-style `usage`, Gemini `usage_metadata`, Anthropic `usage`),
+  or estimated from text length when the provider reports none
+- Time to first token for streamed calls, and total latency
+- Rolling percentiles per call site, to size the LM Studio host and spot
+  prompt bloat
+
+Usage:
+    timer = LLMCallTimer("thinker", model)
+    async for chunk in stream:
+        timer.first_token()
+        ...
+    usage = timer.finish(usage=chunk.usage, completion_text=text)
+
+    get_llm_metrics().get_stats()
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# Characters per token when estimating counts the provider didn't report
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class LLMUsage:
+    """Token counts and timings of one LLM call."""
+
+    source: str
+    model: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    first_token_ms: Optional[float] = None  # Only known for streamed calls
+    success: bool = True
+    estimated: bool = False  # Token counts estimated from text length
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "model": self.model,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "latency_ms": self.latency_ms,
+            "first_token_ms": self.first_token_ms,
+            "success": self.success,
+            "estimated": self.estimated,
+        }
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for text (used when no usage is reported)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def usage_tokens(usage: Any) -> Optional[tuple[int, int]]:
+    """
+    Read (prompt_tokens, completion_tokens) from a provider usage report.
+
+    Understands OpenAI/LM Studio `usage`, Gemini `usage_metadata` and
+    Anthropic `usage`, as objects or dicts.
+
+    Returns:
+        The counts, or None if the report has none
+    """
+    if usage is None:
+        return None
+
+    def get(name: str) -> Optional[int]:
+        value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        return value if isinstance(value, int) else None
+
+    for prompt_key, completion_key in (
+        ("prompt_tokens", "completion_tokens"),          # OpenAI / LM Studio
+        ("prompt_token_count", "candidates_token_count"),  # Gemini SDK
+        ("promptTokenCount", "candidatesTokenCount"),      # Gemini REST
+        ("input_tokens", "output_tokens"),               # Anthropic
+    ):
+        prompt, completion = get(prompt_key), get(completion_key)
+        if prompt is not None or completion is not None:
+            return prompt or 0, completion or 0
+    return None
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of unsorted values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil
+    return ordered[int(min(rank, len(ordered))) - 1]
+
+
+class LLMCallTimer:
+    """
+    Measures one LLM call and records it in the shared metrics.
+
+    Call first_token() when the first output arrives (streamed calls) and
+    finish() when the call is done or has failed.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        model: str = "",
+        prompt_text: str = "",
+        metrics: Optional["LLMMetrics"] = None,
+    ):
+        """
+        Start timing a call.
+
+        Args:
+            source: Call site name (e.g. "thinker", "dreamer.local")
+            model: Model identifier
+            prompt_text: Prompt, for estimating tokens if none are reported
+            metrics: Where to record the call (the global metrics if None)
+        """
+        self.source = source
+        self.model = model
+        self.prompt_text = prompt_text
+        self.metrics = metrics
+        self.usage: Any = None  # Provider usage report, if seen
+        self._start = time.perf_counter()
+        self._first_token: Optional[float] = None
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._start) * 1000, 1)
+
+    def first_token(self) -> None:
+        """Mark the arrival of output (only the first call counts)."""
+        if self._first_token is None:
+            self._first_token = self._elapsed_ms()
+
+    def finish(
+        self,
+        usage: Any = None,
+        completion_text: str = "",
+        success: bool = True,
+    ) -> LLMUsage:
+        """
+        Finish timing and record the call.
+
+        Args:
+            usage: Provider usage report (falls back to self.usage)
+            completion_text: Output, for estimating tokens if none are reported
+            success: Whether the call succeeded
+
+        Returns:
+            The recorded LLMUsage
+        """
+        counts = usage_tokens(usage if usage is not None else self.usage)
+        estimated = counts is None
+        if counts is None:
+            counts = (estimate_tokens(self.prompt_text), estimate_tokens(completion_text))
+
+        result = LLMUsage(
+            source=self.source,
+            model=self.model,
+            prompt_tokens=counts[0],
+            completion_tokens=counts[1],
+            latency_ms=self._elapsed_ms(),
+            first_token_ms=self._first_token,
+            success=success,
+            estimated=estimated,
+        )
+        (self.metrics or get_llm_metrics()).record(result)
+        return result
+
+
+class LLMMetrics:
+    """Rolling window of LLM calls per call site."""
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, window: int = 500):
+        """
+        Initialize the metrics.
+
+        Args:
+            window: Calls kept per call site for percentiles
+        """
+        self.window = window
+        self._calls: dict[str, deque[LLMUsage]] = {}
+        self._totals: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, usage: LLMUsage) -> None:
+        """Add a finished call."""
+        with self._lock:
+            calls = self._calls.get(usage.source)
+            if calls is None:
+                calls = self._calls[usage.source] = deque(maxlen=self.window)
+                self._totals[usage.source] = {
+                    "calls": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                }
+            calls.append(usage)
+            totals = self._totals[usage.source]
+            totals["calls"] += 1
+            totals["errors"] += 0 if usage.success else 1
+            totals["prompt_tokens"] += usage.prompt_tokens
+            totals["completion_tokens"] += usage.completion_tokens
+
+    def _summary(self, values: list[float]) -> dict:
+        return {f"p{q}": percentile(values, q) for q in self.PERCENTILES}
+
+    def get_stats(self) -> dict:
+        """Totals and rolling percentiles per call site."""
+        with self._lock:
+            snapshot = {source: list(calls) for source, calls in self._calls.items()}
+            totals = {source: dict(t) for source, t in self._totals.items()}
+
+        stats = {}
+        for source, calls in snapshot.items():
+            ok = [c for c in calls if c.success]
+            stats[source] = {
+                **totals[source],
+                "latency_ms": self._summary([c.latency_ms for c in ok]),
+                "first_token_ms": self._summary(
+                    [c.first_token_ms for c in ok if c.first_token_ms is not None]
+                ),
+                "prompt_tokens_window": self._summary([c.prompt_tokens for c in ok]),
+                "completion_tokens_window": self._summary([c.completion_tokens for c in ok]),
+            }
+        return stats
+
+    def reset(self) -> None:
+        """Forget all recorded calls."""
+        with self._lock:
+            self._calls.clear()
+            self._totals.clear()
+
+
+# Global instance shared by all LLM call sites
+_global_metrics: Optional[LLMMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_llm_metrics() -> LLMMetrics:
+    """
+    Get the global LLM metrics instance.
+
+    Returns:
+        The singleton LLMMetrics
+    """
+    global _global_metrics
+    with _metrics_lock:
+        if _global_metrics is None:
+            _global_metrics = LLMMetrics()
+        return _global_metrics
@@ -0,0 +1,222 @@
+"""
+Priority Scheduling of Local LLM Requests
+
+LM Studio effectively serves one generation at a time. Without
+coordination a dream reflection could hold the model while a CRITICAL
+"Hey Stoffy" message waits minutes for its reply. Every shared LLM pool
+(see llm_clients) therefore admits requests through a RequestScheduler:
+- Request classes, served highest first:
+  user_message > decision > evaluation > dream
+- A concurrency cap (1 for a single local model)
+- Aging: every `aging_seconds` of waiting raises a request by one class,
+  so a dream is never starved by a steady stream of decisions
+- Superseding: a queued request with a `key` is cancelled (raises
+  RequestSuperseded) when a newer request with the same key is queued
+- Queue wait percentiles per class
+
+Usage:
+    scheduler = RequestScheduler(max_concurrent=1)
+    async with scheduler.slot("evaluation", key="evaluation:run_tests"):
+        await client.chat.completions.create(...)
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from .llm_metrics import percentile
+
+# Request classes and their priorities (higher is served first)
+REQUEST_CLASSES = {
+    "user_message": 3,
+    "decision": 2,
+    "evaluation": 1,
+    "dream": 0,
+}
+
+
+class RequestSuperseded(Exception):
+    """A queued request was replaced by a newer one with the same key."""
+
+
+@dataclass
+class _Waiter:
+    """A request waiting for a slot."""
+
+    request_class: str
+    key: Optional[str]
+    enqueued: float
+    seq: int
+    future: asyncio.Future
+
+
+class RequestScheduler:
+    """Admits LLM requests by class priority, with aging and a concurrency cap."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 1,
+        aging_seconds: float = 30.0,
+        window: int = 200,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrent: Requests allowed to run at once
+            aging_seconds: Waiting time that raises a request by one class
+                (0 disables aging)
+            window: Requests per class kept for queue-wait percentiles
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.aging_seconds = aging_seconds
+
+        self._running = 0
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+
+        self._waits: dict[str, deque[float]] = {
+            name: deque(maxlen=window) for name in REQUEST_CLASSES
+        }
+        self._requests = {name: 0 for name in REQUEST_CLASSES}
+        self._superseded = {name: 0 for name in REQUEST_CLASSES}
+        self._running_by_class = {name: 0 for name in REQUEST_CLASSES}
+
+    @property
+    def running(self) -> int:
+        """Requests currently holding a slot."""
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        """Requests queued for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.future.done())
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> float:
+        priority = float(REQUEST_CLASSES[waiter.request_class])
+        if self.aging_seconds > 0:
+            priority += (now - waiter.enqueued) / self.aging_seconds
+        return priority
+
+    def _supersede(self, key: str) -> None:
+        """Cancel queued requests with `key` (a newer one replaces them)."""
+        remaining = []
+        for waiter in self._waiters:
+            if waiter.key == key and not waiter.future.done():
+                waiter.future.set_exception(
+                    RequestSuperseded(f"Superseded by a newer request: {key}")
+                )
+                self._superseded[waiter.request_class] += 1
+            else:
+                remaining.append(waiter)
+        self._waiters = remaining
+
+    async def acquire(self, request_class: str = "decision", key: Optional[str] = None) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            request_class: One of REQUEST_CLASSES
+            key: Requests with the same key supersede each other while queued
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RequestSuperseded: A newer request with the same key was queued
+        """
+        if request_class not in REQUEST_CLASSES:
+            raise ValueError(f"Unknown request class: {request_class}")
+        if key is not None:
+            self._supersede(key)
+
+        start = time.monotonic()
+        if self._running < self.max_concurrent and not self.waiting:
+            self._running += 1
+        else:
+            waiter = _Waiter(
+                request_class=request_class,
+                key=key,
+                enqueued=start,
+                seq=next(self._seq),
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self._waiters.append(waiter)
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                # Handed a slot just before being cancelled: pass it on
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self.release()
+                raise
+
+        waited = time.monotonic() - start
+        self._waits[request_class].append(round(waited * 1000, 1))
+        self._requests[request_class] += 1
+        self._running_by_class[request_class] += 1
+        return waited
+
+    def release(self, request_class: Optional[str] = None) -> None:
+        """
+        Give the slot to the best waiter, or return it.
+
+        Args:
+            request_class: Class of the request that finished (for stats)
+        """
+        if request_class is not None:
+            self._running_by_class[request_class] -= 1
+
+        now = time.monotonic()
+        while self._waiters:
+            best = max(
+                self._waiters,
+                key=lambda w: (self._effective_priority(w, now), -w.seq),
+            )
+            self._waiters.remove(best)
+            if not best.future.done():
+                best.future.set_result(None)  # The slot moves to the waiter
+                return
+        self._running -= 1
+
+    @asynccontextmanager
+    async def slot(
+        self, request_class: str = "decision", key: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire(request_class, key)
+        try:
+            yield
+        finally:
+            self.release(request_class)
+
+    def get_stats(self) -> dict:
+        """Queue depth and per-class queue-wait statistics."""
+        queued = {name: 0 for name in REQUEST_CLASSES}
+        for waiter in self._waiters:
+            if not waiter.future.done():
+                queued[waiter.request_class] += 1
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "aging_seconds": self.aging_seconds,
+            "running": self._running,
+            "waiting": self.waiting,
+            "classes": {
+                name: {
+                    "requests": self._requests[name],
+                    "running": self._running_by_class[name],
+                    "queued": queued[name],
+                    "superseded": self._superseded[name],
+                    "queue_wait_ms": {
+                        f"p{q}": percentile(list(self._waits[name]), q) for q in (50, 90, 99)
+                    },
+                }
+                for name in REQUEST_CLASSES
+            },
+        }
@@ -1,16 +1,17 @@
 """
 LM Studio Availability Detector
 
-Provides robust detection of LM Studio availability with:
-- Smart caching to avoid hammering the server
-- Exponential backoff retry logic
+Reports LM Studio availability with:
+- State read from the shared background HealthMonitor (no probe latency
+  on the request path)
+- Jittered exponential backoff and a circuit breaker (in the monitor)
 - Async-safe implementation
 - Detailed status reporting
 
 Usage:
     detector = LMStudioDetector()
 
-    # Quick check (uses cache)
+    # Quick check (reads the monitor's state)
     if await detector.is_available():
         print("LM Studio is running")
 
@@ -26,14 +27,15 @@ Usage:
     print(f"Last check: {status['last_check_time']}")
 """
 
-from openai import AsyncOpenAI
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional
 import asyncio
 import logging
 import time
 from enum import Enum
 
+from .health_monitor import CircuitState, get_health_monitor
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,16 +80,18 @@ class DetectorStatus:
 
 class LMStudioDetector:
     """
-    Detects LM Studio availability with smart retry and caching.
+    Reports LM Studio availability from the shared background HealthMonitor.
 
-    Thread-safe for async usage. Uses the same openai.AsyncOpenAI client
-    approach as ConsciousnessThinker for consistency.
+    The monitor probes on its own schedule (with jittered backoff and a
+    circuit breaker), so is_available() never pays probe latency once the
+    monitor has started.
 
     Attributes:
         base_url: LM Studio API endpoint
         timeout: Connection timeout in seconds
-        retry_count: Number of retries before giving up
-        cache_duration: How long to cache availability result (seconds)
+        retry_count: Failed probes beyond the first before LM Studio is
+            reported unavailable (the monitor's failure threshold)
+        cache_duration: Seconds between background probes
     """
 
     def __init__(
@@ -100,155 +104,64 @@ class LMStudioDetector:
         """
         Initialize the detector.
 
+        The monitor settings only apply if no monitor exists yet for
+        base_url (the daemon usually creates it from its config).
+
         Args:
             base_url: LM Studio API endpoint (default: http://localhost:1234/v1)
             timeout: Connection timeout in seconds (default: 5.0)
-            retry_count: Number of retries with exponential backoff (default: 2)
-            cache_duration: How long to cache the result in seconds (default: 30.0)
+            retry_count: Failed probes tolerated before unavailable (default: 2)
+            cache_duration: Seconds between background probes (default: 30.0)
         """
         self.base_url = base_url
         self.timeout = timeout
         self.retry_count = retry_count
         self.cache_duration = cache_duration
 
-        # Client with timeout configuration
-        self._client = AsyncOpenAI(
-            base_url=base_url,
-            api_key="not-needed",
+        self._monitor = get_health_monitor(
+            base_url,
+            probe_interval=cache_duration or 30.0,
             timeout=timeout,
+            failure_threshold=retry_count + 1,
         )
+        self._client = self._monitor.client
 
-        # Cache state
-        self._cached_available: Optional[bool] = None
-        self._cache_timestamp: Optional[float] = None
-
-        # Status tracking
-        self._state = AvailabilityState.UNKNOWN
-        self._last_check_time: Optional[float] = None
-        self._last_check_duration_ms: Optional[float] = None
-        self._last_error: Optional[str] = None
-        self._consecutive_failures = 0
-        self._consecutive_successes = 0
-        self._total_checks = 0
-
-        # Lock for thread safety
-        self._check_lock = asyncio.Lock()
+        # Set by invalidate_cache(): the next is_available() probes first
+        self._stale = False
 
     def _is_cache_valid(self) -> bool:
-        """Check if the cached result is still valid."""
-        if self._cached_available is None or self._cache_timestamp is None:
-            return False
-
-        age = time.time() - self._cache_timestamp
-        return age < self.cache_duration
+        """Check if the monitor's state can be used without probing."""
+        return self._monitor.snapshot.checked and not self._stale
 
     async def is_available(self) -> bool:
         """
-        Check if LM Studio is available (uses cache).
+        Check if LM Studio is available.
 
-        Returns cached result if still valid, otherwise performs a fresh check.
+        Reads the monitor's state; only the first call (which starts the
+        monitor) or a call after invalidate_cache() waits for a probe.
 
         Returns:
             True if LM Studio is available, False otherwise
         """
-        if self._is_cache_valid():
-            logger.debug(f"Using cached availability result: {self._cached_available}")
-            return self._cached_available
-
-        return await self.check_now()
+        if self._stale:
+            return await self.check_now()
+        await self._monitor.start()
+        return self._monitor.is_available
 
     async def check_now(self) -> bool:
         """
-        Force a fresh availability check (bypasses cache).
-
-        Performs the check with retry logic and exponential backoff.
-        Updates the cache with the result.
+        Force a fresh probe (joins one already in progress).
 
         Returns:
-            True if LM Studio is available, False otherwise
-        """
-        async with self._check_lock:
-            return await self._perform_check()
-
-    async def _perform_check(self) -> bool:
-        """
-        Internal method to perform the actual availability check.
-
-        Uses exponential backoff for retries:
-        - Attempt 1: immediate
-        - Attempt 2: after 0.5s
-        - Attempt 3: after 1.0s
-        - etc.
+            True if the probe succeeded, False otherwise
         """
-        self._state = AvailabilityState.CHECKING
-        self._total_checks += 1
-
-        start_time = time.time()
-        last_exception: Optional[Exception] = None
-
-        for attempt in range(self.retry_count + 1):
-            if attempt > 0:
-                # Exponential backoff: 0.5s, 1.0s, 2.0s, ...
-                delay = 0.5 * (2 ** (attempt - 1))
-                logger.debug(f"Retry {attempt}/{self.retry_count} after {delay}s delay")
-                await asyncio.sleep(delay)
-
-            try:
-                # Attempt to list models - this is a lightweight check
-                await self._client.models.list()
-
-                # Success
-                elapsed_ms = (time.time() - start_time) * 1000
-                self._update_status(
-                    available=True,
-                    check_time=time.time(),
-                    duration_ms=elapsed_ms,
-                    error=None
-                )
-
-                logger.debug(f"LM Studio available (check took {elapsed_ms:.1f}ms)")
-                return True
-
-            except Exception as e:
-                last_exception = e
-                logger.debug(f"Check attempt {attempt + 1} failed: {e}")
-
-        # All retries exhausted
-        elapsed_ms = (time.time() - start_time) * 1000
-        error_msg = str(last_exception) if last_exception else "Unknown error"
-
-        self._update_status(
-            available=False,
-            check_time=time.time(),
-            duration_ms=elapsed_ms,
-            error=error_msg
+        snapshot = await self._monitor.probe()
+        self._stale = False
+        logger.debug(
+            f"LM Studio probe: circuit={snapshot.circuit.value}, "
+            f"latency={snapshot.latency_ms}ms, error={snapshot.last_error}"
         )
-
-        logger.debug(f"LM Studio unavailable after {self.retry_count + 1} attempts: {error_msg}")
-        return False
-
-    def _update_status(
-        self,
-        available: bool,
-        check_time: float,
-        duration_ms: float,
-        error: Optional[str]
-    ) -> None:
-        """Update internal status tracking."""
-        self._cached_available = available
-        self._cache_timestamp = check_time
-        self._last_check_time = check_time
-        self._last_check_duration_ms = duration_ms
-        self._last_error = error
-
-        if available:
-            self._state = AvailabilityState.AVAILABLE
-            self._consecutive_successes += 1
-            self._consecutive_failures = 0
-        else:
-            self._state = AvailabilityState.UNAVAILABLE
-            self._consecutive_failures += 1
-            self._consecutive_successes = 0
+        return snapshot.consecutive_failures == 0
 
     async def wait_for_availability(
         self,
@@ -258,37 +171,36 @@ class LMStudioDetector:
         """
         Wait for LM Studio to become available.
 
-        Polls periodically until LM Studio is available or timeout is reached.
+        Waits for the monitor to publish an available state rather than
+        polling; `poll_interval` is kept for compatibility.
 
         Args:
             timeout: Maximum time to wait in seconds (default: 60.0)
-            poll_interval: Time between checks in seconds (default: 2.0)
+            poll_interval: Unused
 
         Returns:
             True if LM Studio became available, False if timeout reached
         """
         start_time = time.time()
-
         logger.info(f"Waiting for LM Studio availability (timeout: {timeout}s)")
 
-        while (time.time() - start_time) < timeout:
-            if await self.check_now():
-                elapsed = time.time() - start_time
-                logger.info(f"LM Studio became available after {elapsed:.1f}s")
-                return True
-
-            remaining = timeout - (time.time() - start_time)
-            if remaining <= 0:
-                break
+        if await self._monitor.wait_until_available(timeout=timeout):
+            logger.info(f"LM Studio became available after {time.time() - start_time:.1f}s")
+            return True
 
-            # Wait before next poll, but don't exceed remaining timeout
-            wait_time = min(poll_interval, remaining)
-            await asyncio.sleep(wait_time)
-
-        elapsed = time.time() - start_time
-        logger.warning(f"LM Studio not available after {elapsed:.1f}s timeout")
+        logger.warning(f"LM Studio not available after {time.time() - start_time:.1f}s timeout")
         return False
 
+    def _state(self) -> AvailabilityState:
+        snapshot = self._monitor.snapshot
+        if not snapshot.checked:
+            return AvailabilityState.UNKNOWN
+        if snapshot.circuit == CircuitState.HALF_OPEN:
+            return AvailabilityState.CHECKING
+        if snapshot.available:
+            return AvailabilityState.AVAILABLE
+        return AvailabilityState.UNAVAILABLE
+
     def get_status(self) -> dict:
         """
         Get detailed status information.
@@ -304,16 +216,17 @@ class LMStudioDetector:
             - consecutive_failures: Number of consecutive failed checks
             - consecutive_successes: Number of consecutive successful checks
             - total_checks: Total number of checks performed
-            - cache_hit: Whether the last is_available() call used cache
+            - cache_hit: Whether is_available() can answer without probing
         """
+        snapshot = self._monitor.snapshot
         status = DetectorStatus(
-            state=self._state,
-            last_check_time=self._last_check_time,
-            last_check_duration_ms=self._last_check_duration_ms,
-            last_error=self._last_error,
-            consecutive_failures=self._consecutive_failures,
-            consecutive_successes=self._consecutive_successes,
-            total_checks=self._total_checks,
+            state=self._state(),
+            last_check_time=snapshot.last_check or None,
+            last_check_duration_ms=snapshot.latency_ms,
+            last_error=snapshot.last_error,
+            consecutive_failures=snapshot.consecutive_failures,
+            consecutive_successes=snapshot.consecutive_successes,
+            total_checks=snapshot.total_probes,
             cache_hit=self._is_cache_valid(),
         )
         return status.to_dict()
@@ -324,20 +237,20 @@ class LMStudioDetector:
 
         Forces the next is_available() call to perform a fresh check.
         """
-        self._cached_available = None
-        self._cache_timestamp = None
+        self._stale = True
         logger.debug("Cache invalidated")
 
     def get_cache_age(self) -> Optional[float]:
         """
-        Get the age of the cached result in seconds.
+        Get the age of the latest probe in seconds.
 
         Returns:
-            Age in seconds, or None if no cached result exists
+            Age in seconds, or None if no probe has finished
         """
-        if self._cache_timestamp is None:
+        snapshot = self._monitor.snapshot
+        if not snapshot.checked:
             return None
-        return time.time() - self._cache_timestamp
+        return time.time() - snapshot.last_check
 
     @property
     def is_cache_valid(self) -> bool:
@@ -347,7 +260,7 @@ class LMStudioDetector:
     @property
     def last_known_state(self) -> AvailabilityState:
         """Get the last known availability state."""
-        return self._state
+        return self._state()
 
     async def health_check(self) -> dict:
         """
@@ -363,17 +276,18 @@ class LMStudioDetector:
             - endpoint: The endpoint being checked
             - config: Current detector configuration
         """
-        available = await self.check_now()
+        await self.check_now()
 
         return {
-            "healthy": available,
+            "healthy": self._monitor.is_available,
             "status": self.get_status(),
             "endpoint": self.base_url,
             "config": {
                 "timeout": self.timeout,
                 "retry_count": self.retry_count,
                 "cache_duration": self.cache_duration,
-            }
+            },
+            "monitor": self._monitor.get_stats(),
         }
 
 
@@ -385,8 +299,8 @@ async def is_lm_studio_available(
     """
     Quick one-off check for LM Studio availability.
 
-    Creates a temporary detector and performs a single check.
-    For repeated checks, use LMStudioDetector directly to benefit from caching.
+    Performs a single probe through the shared monitor.
+    For repeated checks, use LMStudioDetector.is_available(), which never probes.
 
     Args:
         base_url: LM Studio API endpoint
@@ -399,7 +313,6 @@ async def is_lm_studio_available(
         base_url=base_url,
         timeout=timeout,
         retry_count=0,  # Single check
-        cache_duration=0,  # No caching for one-off
     )
     return await detector.check_now()
 
@@ -425,7 +338,8 @@ if __name__ == "__main__":
         # Show status
         status = detector.get_status()
         print(f"   State: {status['state']}")
-        print(f"   Check duration: {status['last_check_duration_ms']:.1f}ms")
+        if status['last_check_duration_ms'] is not None:
+            print(f"   Check duration: {status['last_check_duration_ms']:.1f}ms")
         if status['last_error']:
             print(f"   Error: {status['last_error']}")
 
@@ -0,0 +1,280 @@
+"""
+File Manifest for Offline Change Reconciliation
+
+The file watcher only reports live events, so anything edited while the
+daemon was stopped goes unnoticed until the file is touched again. This
+module keeps a manifest of (path, size, mtime_ns, content hash) for every
+watched file and, on startup, diffs the tree against it:
+- Directories are scanned in parallel (thread pool over os.scandir)
+- Ignored directories are pruned, never descended into
+- Only files whose size/mtime changed are hashed; a matching hash means
+  the file was merely touched and is not reported
+- Differences become synthetic FileChange objects, exactly like live events
+
+The manifest is persisted in the daemon's state database (see
+StateManager.load_manifest / save_manifest).
+"""
+
+import fnmatch
+import hashlib
+import logging
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .watcher import DEFAULT_IGNORE_PATTERNS, FileChange
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ManifestEntry:
+    """Recorded state of a single file."""
+
+    path: str  # Relative to the root, POSIX separators
+    size: int
+    mtime_ns: int
+    hash: str = ""  # Empty until the content has been hashed
+
+    def to_row(self) -> tuple[str, int, int, str]:
+        """Convert to a StateManager manifest row."""
+        return (self.path, self.size, self.mtime_ns, self.hash)
+
+    @classmethod
+    def from_row(cls, row: tuple[str, int, int, str]) -> "ManifestEntry":
+        """Create from a StateManager manifest row."""
+        return cls(path=row[0], size=row[1], mtime_ns=row[2], hash=row[3])
+
+
+@dataclass
+class ReconcileResult:
+    """Outcome of comparing the tree with the manifest."""
+
+    changes: list[FileChange] = field(default_factory=list)
+    upserts: list[ManifestEntry] = field(default_factory=list)
+    deletions: list[str] = field(default_factory=list)
+    files_scanned: int = 0
+    files_hashed: int = 0
+    duration: float = 0.0
+    baseline: bool = False  # True if there was no manifest to compare with
+
+
+def compile_ignore_patterns(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """Combine glob patterns into a single regex (None if no patterns)."""
+    translated = [fnmatch.translate(p) for p in patterns]
+    if not translated:
+        return None
+    return re.compile("|".join(f"(?:{t})" for t in translated))
+
+
+def hash_file(path: str | Path) -> str:
+    """Hash a file's content (blake2b, 128-bit hex digest)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileManifest:
+    """
+    Scans a directory tree and compares it with a recorded manifest.
+
+    Ignore semantics match ConsciousnessWatcher: a path is ignored if its
+    relative path or any of its components matches a pattern.
+    """
+
+    def __init__(
+        self,
+        root_path: Path,
+        ignore_patterns: list[str] | None = None,
+        max_workers: int = 8,
+    ):
+        """
+        Initialize the manifest scanner.
+
+        Args:
+            root_path: Root directory to scan
+            ignore_patterns: Glob patterns to skip (uses watcher defaults if None)
+            max_workers: Threads used for directory scanning and hashing
+        """
+        self.root_path = Path(root_path).resolve()
+        self.ignore_patterns = ignore_patterns or DEFAULT_IGNORE_PATTERNS.copy()
+        self.max_workers = max(1, max_workers)
+        self._ignore_re = compile_ignore_patterns(self.ignore_patterns)
+
+    def _is_ignored(self, name: str, rel_path: str) -> bool:
+        if self._ignore_re is None:
+            return False
+        return bool(self._ignore_re.match(name) or self._ignore_re.match(rel_path))
+
+    # =========================================================================
+    # Scanning
+    # =========================================================================
+
+    def _scan_dir(
+        self, dir_path: str, rel_dir: str
+    ) -> tuple[list[tuple[str, int, int]], list[tuple[str, str]]]:
+        """Scan one directory; return (files, subdirectories)."""
+        files: list[tuple[str, int, int]] = []
+        subdirs: list[tuple[str, str]] = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if self._is_ignored(entry.name, rel):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append((entry.path, rel))
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files.append((rel, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Cannot scan {dir_path}: {e}")
+        return files, subdirs
+
+    def scan(self) -> dict[str, tuple[int, int]]:
+        """
+        Scan the tree in parallel.
+
+        Returns:
+            Mapping of relative path -> (size, mtime_ns)
+        """
+        result: dict[str, tuple[int, int]] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending: set[Future] = {pool.submit(self._scan_dir, str(self.root_path), "")}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    for rel, size, mtime_ns in files:
+                        result[rel] = (size, mtime_ns)
+                    for dir_path, rel_dir in subdirs:
+                        pending.add(pool.submit(self._scan_dir, dir_path, rel_dir))
+        return result
+
+    def _hash_paths(self, paths: list[str]) -> dict[str, str]:
+        """Hash files in parallel; unreadable files are left out."""
+
+        def _safe_hash(rel: str) -> tuple[str, Optional[str]]:
+            try:
+                return rel, hash_file(self.root_path / rel)
+            except OSError:
+                return rel, None
+
+        if not paths:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return {rel: h for rel, h in pool.map(_safe_hash, paths) if h is not None}
+
+    # =========================================================================
+    # Reconciliation
+    # =========================================================================
+
+    def _make_change(self, rel: str, change_type: str, timestamp: float) -> FileChange:
+        return FileChange(
+            path=str(self.root_path / rel),
+            change_type=change_type,
+            timestamp=timestamp,
+            relative_path=rel,
+        )
+
+    def reconcile(self, previous: dict[str, ManifestEntry]) -> ReconcileResult:
+        """
+        Diff the current tree against a previous manifest.
+
+        Blocking; run it in a thread (see daemon startup). With an empty
+        previous manifest the current tree is recorded as a baseline and
+        no changes are reported.
+
+        Args:
+            previous: Manifest entries keyed by relative path
+
+        Returns:
+            ReconcileResult with synthetic changes and manifest updates
+        """
+        start = time.perf_counter()
+        now = time.time()
+        current = self.scan()
+        result = ReconcileResult(files_scanned=len(current), baseline=not previous)
+
+        if not previous:
+            result.upserts = [
+                ManifestEntry(rel, size, mtime_ns) for rel, (size, mtime_ns) in current.items()
+            ]
+            result.duration = time.perf_counter() - start
+            return result
+
+        candidates: list[str] = []
+        for rel, (size, mtime_ns) in current.items():
+            old = previous.get(rel)
+            if old is None or old.size != size or old.mtime_ns != mtime_ns:
+                candidates.append(rel)
+
+        hashes = self._hash_paths(candidates)
+        result.files_hashed = len(hashes)
+
+        for rel in candidates:
+            size, mtime_ns = current[rel]
+            new_hash = hashes.get(rel, "")
+            result.upserts.append(ManifestEntry(rel, size, mtime_ns, new_hash))
+
+            old = previous.get(rel)
+            if old is None:
+                result.changes.append(self._make_change(rel, "created", now))
+            elif not (old.hash and new_hash and old.hash == new_hash):
+                # Touched-only files (same content) are not reported
+                result.changes.append(self._make_change(rel, "modified", now))
+
+        for rel in previous:
+            if rel not in current:
+                result.deletions.append(rel)
+                result.changes.append(self._make_change(rel, "deleted", now))
+
+        result.duration = time.perf_counter() - start
+        return result
+
+    def entries_for_changes(
+        self, changes: Iterable[FileChange]
+    ) -> tuple[list[ManifestEntry], list[str]]:
+        """
+        Build manifest updates for live watcher events.
+
+        Blocking (stats and hashes the files); run it in a thread.
+
+        Returns:
+            Tuple of (upserts, deleted relative paths)
+        """
+        upserts: list[ManifestEntry] = []
+        deletions: list[str] = []
+        for change in changes:
+            try:
+                rel = Path(change.path).resolve().relative_to(self.root_path).as_posix()
+            except ValueError:
+                continue
+            try:
+                st = os.stat(change.path)
+                if not os.path.isfile(change.path):
+                    continue
+                upserts.append(
+                    ManifestEntry(rel, st.st_size, st.st_mtime_ns, hash_file(change.path))
+                )
+            except FileNotFoundError:
+                deletions.append(rel)
+            except OSError:
+                continue
+        return upserts, deletions
+
+
+def chunk_changes(changes: list[FileChange], size: int = 500) -> list[list[FileChange]]:
+    """Split changes into watcher-sized batches."""
+    return [changes[i:i + size] for i in range(0, len(changes), size)]
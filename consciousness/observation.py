@@ -0,0 +1,247 @@
+"""
+Concurrent Observation Assembly
+
+Before each decision the OIDA cycle needs several independent inputs.
+ObservationPipeline gathers them concurrently instead of one after another:
+- git: repository status and diff stats of the changed paths
+- patterns: learned suggestions for the formatted observations
+- knowledge: sections of the root's knowledge/ mentioning the changed files
+- files: head/tail excerpts of the changed files
+
+Every stage has its own timeout; a stage that times out or fails is
+skipped (its input is left out of the prompt) rather than failing the
+cycle. The time to the LLM request is bounded by the slowest stage, not
+the sum of all stages. Per-stage timings are kept for the daemon status.
+
+Usage:
+    pipeline = ObservationPipeline(learning)
+    bundle = await pipeline.gather(root, changes)
+    decision = await engine.decide(
+        observations=bundle.prompt_observations(),
+        git_status=bundle.git_status,
+        learned_patterns=bundle.learned_patterns,
+    )
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Optional
+
+import structlog
+
+from .file_access import FileAccessService, get_file_access_service
+from .llm_metrics import percentile
+from .roots import WatchRoot
+from .watcher import FileChange
+from .watcher_git import GitObservation
+
+logger = structlog.get_logger(__name__)
+
+STAGES = ("git", "patterns", "knowledge", "files")
+
+# Shorter file names match too much of the knowledge base
+MIN_KNOWLEDGE_QUERY_LENGTH = 4
+
+
+@dataclass
+class ObservationBundle:
+    """Everything gathered for one decision."""
+
+    observations: str  # Formatted file changes
+    git_status: str = ""
+    git_observation: Optional[GitObservation] = None
+    learned_patterns: list[str] = field(default_factory=list)
+    knowledge: list[str] = field(default_factory=list)
+    file_excerpts: dict[str, str] = field(default_factory=dict)
+    timings_ms: dict[str, float] = field(default_factory=dict)
+    skipped_stages: list[str] = field(default_factory=list)  # Timed out or failed
+
+    def prompt_observations(self) -> str:
+        """The observations with knowledge snippets and file excerpts appended."""
+        parts = [self.observations]
+        if self.knowledge:
+            parts.append("RELEVANT KNOWLEDGE:\n" + "\n".join(f"  {k}" for k in self.knowledge))
+        if self.file_excerpts:
+            excerpts = "\n\n".join(
+                f"--- {path} ---\n{text}" for path, text in self.file_excerpts.items()
+            )
+            parts.append(f"FILE EXCERPTS:\n{excerpts}")
+        return "\n\n".join(parts)
+
+
+class ObservationPipeline:
+    """Gathers the inputs of a decision concurrently, with per-stage timeouts."""
+
+    def __init__(
+        self,
+        learning: Any,
+        knowledge: Any = None,
+        file_access: Optional[FileAccessService] = None,
+        stage_timeout: float = 5.0,
+        max_knowledge_snippets: int = 3,
+        max_file_excerpts: int = 3,
+        file_excerpt_bytes: int = 1500,
+        window: int = 200,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            learning: LearningIntegration for learned suggestions
+            knowledge: SemanticMemoryWriter searched for roots without their
+                own (root.knowledge); no knowledge stage if neither is set
+            file_access: Shared file reader (uses the global service if None)
+            stage_timeout: Seconds each stage may take
+            max_knowledge_snippets: Knowledge sections to include (0 disables)
+            max_file_excerpts: Changed files to quote (0 disables)
+            file_excerpt_bytes: Size of each file excerpt
+            window: Cycles kept for timing percentiles
+        """
+        self.learning = learning
+        self.knowledge = knowledge
+        self.file_access = file_access or get_file_access_service()
+        self.stage_timeout = stage_timeout
+        self.max_knowledge_snippets = max_knowledge_snippets
+        self.max_file_excerpts = max_file_excerpts
+        self.file_excerpt_bytes = file_excerpt_bytes
+
+        self._timings: dict[str, deque[float]] = {
+            stage: deque(maxlen=window) for stage in (*STAGES, "total")
+        }
+        self._last_timings: dict[str, float] = {}
+        self._skipped: dict[str, int] = {stage: 0 for stage in STAGES}
+
+    async def gather(
+        self,
+        root: WatchRoot,
+        changes: list[FileChange],
+        header: str = "",
+    ) -> ObservationBundle:
+        """
+        Gather the inputs of a decision about `changes` in `root`.
+
+        Args:
+            root: Root the changes belong to
+            changes: File changes of this cycle
+            header: Line to put above the formatted changes (e.g. the root)
+
+        Returns:
+            ObservationBundle with per-stage timings
+        """
+        start = time.perf_counter()
+        observations = root.file_watcher.format_for_llm(changes)
+        if header:
+            observations = f"{header}\n\n{observations}"
+        bundle = ObservationBundle(observations=observations)
+
+        git, patterns, knowledge, excerpts = await asyncio.gather(
+            self._stage(bundle, "git", self._git(root, changes), None),
+            self._stage(bundle, "patterns", self._patterns(observations), []),
+            self._stage(bundle, "knowledge", self._knowledge(root, changes), []),
+            self._stage(bundle, "files", self._files(changes), {}),
+        )
+
+        if git is not None:
+            bundle.git_observation, bundle.git_status = git
+        bundle.learned_patterns = patterns
+        bundle.knowledge = knowledge
+        bundle.file_excerpts = excerpts
+        bundle.timings_ms["total"] = round((time.perf_counter() - start) * 1000, 1)
+
+        for stage, ms in bundle.timings_ms.items():
+            self._timings[stage].append(ms)
+        self._last_timings = dict(bundle.timings_ms)
+        return bundle
+
+    async def _stage(
+        self,
+        bundle: ObservationBundle,
+        name: str,
+        work: Awaitable[Any],
+        default: Any,
+    ) -> Any:
+        """Run one stage with its timeout; on timeout or error return default."""
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(work, timeout=self.stage_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("observation.stage_timeout", stage=name, timeout=self.stage_timeout)
+        except Exception as e:
+            logger.warning("observation.stage_failed", stage=name, error=str(e))
+        finally:
+            bundle.timings_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+        bundle.skipped_stages.append(name)
+        self._skipped[name] += 1
+        return default
+
+    async def _git(
+        self, root: WatchRoot, changes: list[FileChange]
+    ) -> Optional[tuple[GitObservation, str]]:
+        if not root.git_watcher or not await root.git_watcher.is_git_repo():
+            return None
+        observation = await root.git_watcher.get_observation(
+            changed_paths=[c.path for c in changes]
+        )
+        return observation, root.git_watcher.format_for_llm(observation)
+
+    async def _patterns(self, observations: str) -> list[str]:
+        suggestions = await self.learning.get_suggestions(observations)
+        return [
+            f"{s.action_type}: {s.reasoning} (confidence: {s.confidence:.2f})"
+            for s in suggestions
+        ]
+
+    async def _knowledge(self, root: WatchRoot, changes: list[FileChange]) -> list[str]:
+        knowledge = root.knowledge or self.knowledge
+        if knowledge is None or self.max_knowledge_snippets <= 0:
+            return []
+
+        queries = []
+        for change in changes:
+            stem = Path(change.relative_path).stem
+            if len(stem) >= MIN_KNOWLEDGE_QUERY_LENGTH and stem not in queries:
+                queries.append(stem)
+        if not queries:
+            return []
+
+        results = await asyncio.gather(*(
+            knowledge.search_knowledge(query, create_missing=False)
+            for query in queries[:self.max_knowledge_snippets]
+        ))
+        snippets: list[str] = []
+        for matches in results:
+            for snippet in matches:
+                if snippet not in snippets:
+                    snippets.append(snippet)
+        return snippets[:self.max_knowledge_snippets]
+
+    async def _files(self, changes: list[FileChange]) -> dict[str, str]:
+        if self.max_file_excerpts <= 0:
+            return {}
+
+        candidates = [c for c in changes if c.change_type != "deleted"][:self.max_file_excerpts]
+        contents = await asyncio.gather(*(
+            self.file_access.read_text(c.path, max_bytes=self.file_excerpt_bytes)
+            for c in candidates
+        ))
+        return {
+            change.relative_path: content.text
+            for change, content in zip(candidates, contents)
+            # Skip unreadable and binary files
+            if content is not None and content.text.strip() and "\x00" not in content.text
+        }
+
+    def get_stats(self) -> dict:
+        """Last and rolling per-stage timings, and how often stages were skipped."""
+        return {
+            "last_ms": dict(self._last_timings),
+            "stages_ms": {
+                stage: {f"p{q}": percentile(list(values), q) for q in (50, 90, 99)}
+                for stage, values in self._timings.items()
+            },
+            "skipped": dict(self._skipped),
+            "stage_timeout_seconds": self.stage_timeout,
+        }
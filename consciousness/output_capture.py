@@ -0,0 +1,225 @@
+"""
+Streaming Subprocess Output Capture
+
+Subprocess actions used to call process.communicate(), which holds a
+child's complete stdout and stderr in memory and decodes them before
+truncating. A chatty Claude Flow or build run could grow the daemon's
+memory without bound. Output is now read incrementally:
+- BoundedOutput keeps the first `head_bytes` and the last `tail_bytes`
+  of a stream and counts the bytes dropped in between
+- Once a stream overflows, its full output can be spilled to a
+  gzip-compressed log file (nothing is written for short outputs)
+- The latest complete line of each read is passed to an `on_line`
+  callback while the process runs, for progress reporting
+
+Usage:
+    stdout, stderr = await capture_process(
+        process, timeout=120, head_bytes=64_000, tail_bytes=16_000,
+        spill_path=Path("logs/run-1"), on_line=lambda stream, line: ...,
+    )
+    print(stdout.text(), stdout.dropped_bytes)
+"""
+
+import asyncio
+import gzip
+from pathlib import Path
+from typing import Callable, Optional
+
+READ_CHUNK = 64 * 1024
+MAX_LINE = 4096  # Longer progress lines are cut
+
+
+def _decode_tail(data: bytes) -> str:
+    """Decode a tail that may start inside a multi-byte character."""
+    start = 0
+    while start < min(len(data), 3) and data[start] & 0xC0 == 0x80:
+        start += 1
+    return data[start:].decode("utf-8", errors="replace")
+
+
+class BoundedOutput:
+    """Head and tail of one output stream, with the middle dropped."""
+
+    def __init__(
+        self,
+        head_bytes: int,
+        tail_bytes: int,
+        spill_path: Optional[Path] = None,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            head_bytes: Bytes kept from the start of the stream
+            tail_bytes: Bytes kept from the end of the stream
+            spill_path: gzip file receiving the full stream once it overflows
+                (None disables spilling)
+        """
+        self.head_bytes = max(0, head_bytes)
+        self.tail_bytes = max(0, tail_bytes)
+        self.spill_path = spill_path
+        self.total_bytes = 0
+        self.dropped_bytes = 0
+        self.spilled = False  # The full output was written to spill_path
+
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._spill = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped_bytes > 0
+
+    def feed(self, data: bytes) -> None:
+        """Append bytes read from the stream."""
+        if not data:
+            return
+        self.total_bytes += len(data)
+        if self._spill is not None:
+            self._spill.write(data)
+
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+            if not data:
+                return
+
+        self._tail += data
+        excess = len(self._tail) - self.tail_bytes
+        if excess > 0:
+            if self._spill is None and self.spill_path is not None:
+                self._open_spill()
+            del self._tail[:excess]
+            self.dropped_bytes += excess
+
+    def _open_spill(self) -> None:
+        # Nothing was dropped yet: head and tail still hold the whole stream
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = gzip.open(self.spill_path, "wb", compresslevel=6)
+            self._spill.write(bytes(self._head))
+            self._spill.write(bytes(self._tail))
+            self.spilled = True
+        except OSError:
+            self._spill = None
+            self.spill_path = None
+
+    def close(self) -> None:
+        """Finish the spill file, if any."""
+        spill, self._spill = self._spill, None
+        if spill is not None:
+            spill.close()
+
+    def text(self) -> str:
+        """Decoded output, with a marker where bytes were dropped."""
+        if not self.truncated:
+            return bytes(self._head + self._tail).decode("utf-8", errors="replace")
+
+        marker = f"\n... ({self.dropped_bytes} bytes truncated"
+        if self.spilled:
+            marker += f", full output in {self.spill_path}"
+        marker += ") ...\n"
+        return (
+            bytes(self._head).decode("utf-8", errors="replace")
+            + marker
+            + _decode_tail(bytes(self._tail))
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "bytes": self.total_bytes,
+            "dropped_bytes": self.dropped_bytes,
+            "log": str(self.spill_path) if self.spilled else None,
+        }
+
+
+async def _pump(
+    reader: Optional[asyncio.StreamReader],
+    output: BoundedOutput,
+    name: str,
+    on_line: Optional[Callable[[str, str], None]],
+) -> None:
+    if reader is None:
+        return
+    partial = b""
+    while True:
+        chunk = await reader.read(READ_CHUNK)
+        if not chunk:
+            break
+        output.feed(chunk)
+        if on_line is None:
+            continue
+
+        # Only the latest complete line of each read is reported
+        data = partial + chunk
+        end = data.rfind(b"\n")
+        if end < 0:
+            partial = data[-MAX_LINE:]
+            continue
+        partial = data[end + 1:][-MAX_LINE:]
+        for line in reversed(data[max(0, end - MAX_LINE):end].split(b"\n")):
+            text = line.decode("utf-8", errors="replace").rstrip()
+            if text:
+                on_line(name, text)
+                break
+
+    if on_line is not None and partial.strip():
+        on_line(name, partial.decode("utf-8", errors="replace").rstrip())
+
+
+async def capture_process(
+    process: asyncio.subprocess.Process,
+    timeout: Optional[float],
+    head_bytes: int,
+    tail_bytes: int,
+    spill_path: Optional[Path] = None,
+    on_line: Optional[Callable[[str, str], None]] = None,
+) -> tuple[BoundedOutput, BoundedOutput]:
+    """
+    Read a started process's stdout and stderr until it exits.
+
+    Args:
+        process: Process started with stdout and stderr pipes
+        timeout: Seconds to wait; the process is killed when they pass
+        head_bytes: Bytes kept from the start of each stream
+        tail_bytes: Bytes kept from the end of each stream
+        spill_path: Path prefix for spill files (<prefix>.stdout.gz and
+            <prefix>.stderr.gz, written only for overflowing streams)
+        on_line: Called with ("stdout" | "stderr", line) with the latest
+            complete line of each read
+
+    Returns:
+        (stdout, stderr) buffers
+
+    Raises:
+        asyncio.TimeoutError: The process did not finish in time (killed)
+    """
+    stdout = BoundedOutput(
+        head_bytes, tail_bytes,
+        spill_path.with_name(spill_path.name + ".stdout.gz") if spill_path else None,
+    )
+    stderr = BoundedOutput(
+        head_bytes, tail_bytes,
+        spill_path.with_name(spill_path.name + ".stderr.gz") if spill_path else None,
+    )
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                _pump(process.stdout, stdout, "stdout", on_line),
+                _pump(process.stderr, stderr, "stderr", on_line),
+                process.wait(),
+            ),
+            timeout=timeout,
+        )
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    finally:
+        stdout.close()
+        stderr.close()
+
+    return stdout, stderr
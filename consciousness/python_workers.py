@@ -0,0 +1,506 @@
+"""
+Warm Python Workers for RUN_PYTHON Actions
+
+Every run_python action used to write a temp script and start a fresh
+interpreter, paying interpreter startup and imports for snippets that
+run in a few milliseconds (typically index maintenance). A
+PythonWorkerPool keeps interpreters running instead:
+- Workers are started ahead of time (modules preloaded, PYTHON*
+  variables and user site-packages ignored) and run each snippet with
+  exec() in a fresh namespace, with the job's cwd first on sys.path as
+  for `python -c` run there
+- Jobs and results travel over a private copy of the worker's stdout as
+  length-prefixed JSON frames; during a job fds 1 and 2 point at temp
+  files, so output of the snippet and of processes it starts is returned
+- Per-job timeouts (the worker is killed), an address space limit per
+  worker (RLIMIT_AS), and recycling after `max_jobs_per_worker` jobs or
+  when a worker crashes; replacements are started in the background
+
+After every job the working directory, sys.argv, sys.path and
+os.environ are reset, and modules imported from the job's directory are
+forgotten; other imported modules stay loaded in the worker.
+
+Usage:
+    pool = get_python_worker_pool()
+    result = await pool.run("print(1 + 1)", cwd=root, timeout=30)
+    print(result.returncode, result.stdout)
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from .output_capture import BoundedOutput
+from .resource_usage import ResourceUsage
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+
+# Runs inside each worker (python -E -s -c WORKER_SOURCE <memory> <preload>)
+WORKER_SOURCE = r'''
+import json, os, struct, sys, tempfile, time, traceback
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def usage():
+    # The worker and the processes its jobs waited for (os.system, subprocess)
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return [
+        own.ru_utime + children.ru_utime,
+        own.ru_stime + children.ru_stime,
+        own.ru_inblock + children.ru_inblock,
+        own.ru_oublock + children.ru_oublock,
+    ]
+
+def read_output(file, limit):
+    size = file.seek(0, os.SEEK_END)
+    file.seek(0)
+    return file.read(limit).decode("utf-8", errors="replace"), size > limit
+
+def main():
+    memory_limit, preload = int(sys.argv[1]), sys.argv[2]
+    if memory_limit > 0 and resource is not None:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ValueError, OSError):
+            pass
+    for name in filter(None, preload.split(",")):
+        try:
+            __import__(name)
+        except Exception:
+            pass
+
+    header = struct.Struct(">I")
+    jobs = sys.stdin.buffer
+    replies = os.fdopen(os.dup(1), "wb")
+    stderr_fd = os.dup(2)
+    os.dup2(2, 1)  # Writes to fd 1 between jobs can't corrupt the replies
+    home, base_path = os.getcwd(), list(sys.path)
+    base_modules, base_environ = set(sys.modules), dict(os.environ)
+    # fds 1 and 2 point at these during a job, so child processes' output is kept
+    out, err = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+
+    while True:
+        size = jobs.read(header.size)
+        if len(size) < header.size:
+            return
+        job = json.loads(jobs.read(header.unpack(size)[0]))
+        cwd = os.path.abspath(job.get("cwd") or home)
+        returncode, recycle = 0, False
+        for file in (out, err):
+            file.seek(0)
+            file.truncate()
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        start, before = time.perf_counter(), usage()
+        try:
+            os.chdir(cwd)
+            sys.path[:] = [cwd] + [p for p in base_path if p]  # As python -c in cwd
+            sys.argv = ["-c"] + list(job.get("args") or [])
+            namespace = {"__name__": "__main__", "__builtins__": __builtins__}
+            exec(compile(job["code"], "<snippet>", "exec"), namespace)
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                returncode = e.code or 0
+            else:
+                returncode = 1
+                print(e.code, file=sys.stderr)
+        except MemoryError:
+            returncode, recycle = 1, True
+            print("MemoryError: worker memory limit exceeded", file=sys.stderr)
+        except BaseException as e:
+            returncode = 1
+            traceback.print_exception(type(e), e, e.__traceback__.tb_next, file=sys.stderr)
+        finally:
+            namespace = None
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass
+            os.dup2(stderr_fd, 1)
+            os.dup2(stderr_fd, 2)
+            os.chdir(home)
+            sys.path[:] = base_path
+            if dict(os.environ) != base_environ:
+                os.environ.clear()
+                os.environ.update(base_environ)
+            # Forget modules imported from the job's directory
+            prefix = os.path.join(cwd, "")
+            for name in set(sys.modules) - base_modules:
+                path = getattr(sys.modules.get(name), "__file__", None) or ""
+                if path.startswith(prefix):
+                    del sys.modules[name]
+
+        limit, after = job.get("max_output", 1000000), usage()
+        stdout, stdout_truncated = read_output(out, limit)
+        reply = json.dumps({
+            "returncode": returncode,
+            "stdout": stdout,
+            "stdout_truncated": stdout_truncated,
+            "stderr": read_output(err, limit)[0],
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            "recycle": recycle,
+            "rusage": after and {
+                "cpu_user": after[0] - before[0],
+                "cpu_system": after[1] - before[1],
+                "read_bytes": (after[2] - before[2]) * 512,
+                "write_bytes": (after[3] - before[3]) * 512,
+            },
+        }).encode()
+        replies.write(header.pack(len(reply)) + reply)
+        replies.flush()
+
+main()
+'''
+
+DEFAULT_PRELOAD = ("json", "re", "pathlib", "collections", "datetime")
+
+
+@dataclass
+class SnippetResult:
+    """Outcome of one snippet run in a worker."""
+
+    returncode: int
+    stdout: str = ""
+    stderr: str = ""
+    duration_ms: float = 0.0  # Round trip, including waiting for a worker
+    worker_pid: Optional[int] = None
+    timed_out: bool = False
+    crashed: bool = False
+    # CPU and I/O of the job (peak memory is unknown: the worker outlives it)
+    resources: Optional[ResourceUsage] = None
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0
+
+
+class WorkerCrashed(RuntimeError):
+    """A worker exited or broke the protocol while running a job."""
+
+
+class _Worker:
+    """One interpreter process and its pipes."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.jobs = 0
+        # Last bytes the worker wrote to stderr, for crash reports
+        self.stderr = BoundedOutput(head_bytes=0, tail_bytes=4096)
+        self._drain = asyncio.create_task(self._drain_stderr())
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def _drain_stderr(self) -> None:
+        while True:
+            chunk = await self.process.stderr.read(65536)
+            if not chunk:
+                return
+            self.stderr.feed(chunk)
+
+    async def call(self, job: dict) -> dict:
+        payload = json.dumps(job).encode()
+        try:
+            self.process.stdin.write(_HEADER.pack(len(payload)) + payload)
+            await self.process.stdin.drain()
+            size = await self.process.stdout.readexactly(_HEADER.size)
+            reply = await self.process.stdout.readexactly(_HEADER.unpack(size)[0])
+        except (asyncio.IncompleteReadError, BrokenPipeError, ConnectionResetError) as e:
+            raise WorkerCrashed(str(e) or type(e).__name__) from e
+        self.jobs += 1
+        return json.loads(reply)
+
+    async def stop(self) -> None:
+        if self.alive:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+        await self.process.wait()
+        self._drain.cancel()
+
+
+class PythonWorkerPool:
+    """Runs Python snippets in warm, recycled interpreter processes."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs_per_worker: int = 100,
+        memory_limit_mb: int = 512,
+        max_output_size: int = 1_000_000,
+        python: Optional[str] = None,
+        preload: Sequence[str] = DEFAULT_PRELOAD,
+    ):
+        """
+        Initialize the pool (workers start on start() or the first run).
+
+        Args:
+            size: Workers kept running (snippets run at once)
+            max_jobs_per_worker: Jobs after which a worker is replaced
+            memory_limit_mb: Address space limit per worker (0 disables)
+            max_output_size: Bytes kept of a snippet's stdout and stderr
+            python: Interpreter (default: the daemon's own)
+            preload: Modules imported when a worker starts
+        """
+        self.size = max(1, size)
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.memory_limit_mb = memory_limit_mb
+        self.max_output_size = max_output_size
+        self.python = python or sys.executable
+        self.preload = tuple(preload)
+
+        self._idle: list[_Worker] = []
+        self._busy = 0
+        self._spawning: set[asyncio.Task] = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats = {
+            "jobs": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "recycled": 0,
+            "workers_started": 0,
+        }
+
+    def configure(
+        self,
+        size: Optional[int] = None,
+        max_jobs_per_worker: Optional[int] = None,
+        memory_limit_mb: Optional[int] = None,
+    ) -> None:
+        """Change limits (running workers keep theirs until recycled)."""
+        if size is not None:
+            self.size = max(1, size)
+            self._slots = None
+        if max_jobs_per_worker is not None:
+            self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        if memory_limit_mb is not None:
+            self.memory_limit_mb = memory_limit_mb
+
+    def _bind_loop(self) -> None:
+        """Forget workers started on another event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            for worker in self._idle:
+                if worker.alive:
+                    worker.process.kill()
+            self._idle = []
+            self._busy = 0
+            self._spawning = set()
+            self._slots = None
+            self._loop = loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+
+    async def _spawn(self) -> _Worker:
+        process = await asyncio.create_subprocess_exec(
+            # No PYTHON* variables or user site-packages; the job's cwd is
+            # put first on sys.path, as for `python -c` run there
+            self.python, "-E", "-s", "-c", WORKER_SOURCE,
+            str(self.memory_limit_mb * 1024 * 1024),
+            ",".join(self.preload),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._stats["workers_started"] += 1
+        worker = _Worker(process)
+        # Wait until the interpreter is up and the preloads are imported
+        await worker.call({"code": ""})
+        worker.jobs = 0
+        return worker
+
+    @property
+    def _live(self) -> int:
+        return len(self._idle) + self._busy + len(self._spawning)
+
+    def _replenish(self) -> None:
+        """Start workers in the background until `size` are running or starting."""
+        while self._live < self.size:
+            task = asyncio.create_task(self._spawn())
+            self._spawning.add(task)
+            task.add_done_callback(self._spawned)
+
+    def _spawned(self, task: asyncio.Task) -> None:
+        self._spawning.discard(task)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning(f"Python worker failed to start: {task.exception()}")
+            return
+        self._idle.append(task.result())
+
+    async def start(self) -> None:
+        """Start `size` workers and wait until they are running."""
+        self._bind_loop()
+        self._replenish()
+        if self._spawning:
+            await asyncio.gather(*self._spawning, return_exceptions=True)
+
+    async def _checkout(self) -> _Worker:
+        while True:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+            if not self._spawning:
+                return await self._spawn()
+            # A replacement is starting; wait for it rather than start another
+            await asyncio.wait(set(self._spawning), return_when=asyncio.FIRST_COMPLETED)
+
+    async def _retire(self, worker: _Worker) -> None:
+        await worker.stop()
+        self._replenish()
+
+    async def _release(self, worker: _Worker, recycle: bool) -> None:
+        self._busy -= 1
+        if recycle or self._live >= self.size:
+            await self._retire(worker)
+        else:
+            self._idle.append(worker)
+
+    async def run(
+        self,
+        code: str,
+        cwd: Optional[Union[str, Path]] = None,
+        args: Optional[Sequence[str]] = None,
+        timeout: float = 30.0,
+    ) -> SnippetResult:
+        """
+        Run a snippet in a worker.
+
+        Args:
+            code: Python source, run as __main__ in a fresh namespace
+            cwd: Working directory during the run
+            args: sys.argv[1:] during the run
+            timeout: Seconds before the worker is killed
+
+        Returns:
+            SnippetResult (timeouts and crashes are reported, not raised)
+        """
+        self._bind_loop()
+        start = time.perf_counter()
+        job = {
+            "code": code,
+            "cwd": str(cwd) if cwd is not None else None,
+            "args": [str(a) for a in args or ()],
+            "max_output": self.max_output_size,
+        }
+
+        async with self._slots:
+            worker = await self._checkout()
+            self._busy += 1
+            self._stats["jobs"] += 1
+            try:
+                reply = await asyncio.wait_for(worker.call(job), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._stats["timeouts"] += 1
+                await self._release(worker, recycle=True)
+                return SnippetResult(
+                    returncode=-1,
+                    stderr=f"Python snippet timed out after {timeout}s",
+                    duration_ms=round((time.perf_counter() - start) * 1000, 3),
+                    worker_pid=worker.pid,
+                    timed_out=True,
+                )
+            except WorkerCrashed as e:
+                self._stats["crashes"] += 1
+                await self._release(worker, recycle=True)
+                logger.warning(f"Python worker {worker.pid} crashed: {e}")
+                return SnippetResult(
+                    returncode=worker.process.returncode or -1,
+                    stderr=worker.stderr.text() or f"Python worker crashed: {e}",
+                    duration_ms=round((time.perf_counter() - start) * 1000, 3),
+                    worker_pid=worker.pid,
+                    crashed=True,
+                )
+            except BaseException:
+                await self._release(worker, recycle=True)
+                raise
+
+            recycle = reply["recycle"] or worker.jobs >= self.max_jobs_per_worker
+            if recycle:
+                self._stats["recycled"] += 1
+            await self._release(worker, recycle)
+
+        stdout = reply["stdout"]
+        if reply["stdout_truncated"]:
+            stdout += "\n... (truncated)"
+        if reply["returncode"] != 0:
+            self._stats["failures"] += 1
+        rusage = reply.get("rusage")
+        return SnippetResult(
+            returncode=reply["returncode"],
+            stdout=stdout,
+            stderr=reply["stderr"],
+            duration_ms=round((time.perf_counter() - start) * 1000, 3),
+            worker_pid=worker.pid,
+            resources=rusage and ResourceUsage(
+                cpu_user=rusage["cpu_user"],
+                cpu_system=rusage["cpu_system"],
+                read_bytes=rusage["read_bytes"],
+                write_bytes=rusage["write_bytes"],
+                processes=1,
+            ),
+        )
+
+    async def close(self) -> None:
+        """Stop all idle workers (new ones start on the next run)."""
+        if self._spawning:
+            await asyncio.gather(*self._spawning, return_exceptions=True)
+        workers, self._idle = self._idle, []
+        for worker in workers:
+            await worker.stop()
+
+    def get_stats(self) -> dict:
+        """Job counters and worker counts."""
+        return {
+            **self._stats,
+            "size": self.size,
+            "idle_workers": len(self._idle),
+            "busy_workers": self._busy,
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+            "memory_limit_mb": self.memory_limit_mb,
+        }
+
+
+# Global pool
+_global_pool: Optional[PythonWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_python_worker_pool() -> PythonWorkerPool:
+    """
+    Get the global Python worker pool.
+
+    Returns:
+        The singleton PythonWorkerPool
+    """
+    global _global_pool
+    with _pool_lock:
+        if _global_pool is None:
+            _global_pool = PythonWorkerPool()
+        return _global_pool
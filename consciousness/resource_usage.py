@@ -0,0 +1,356 @@
+"""
+Per-Action Resource Accounting
+
+Outcomes recorded how long an action took, not what it cost. Every
+subprocess an action starts (scripts, Claude Code, Claude Flow, the
+Gemini CLI) is now accounted:
+- spawn_process() starts the command and reaps it with os.wait4 in a
+  thread of its own, so the kernel's exit rusage (CPU user and system
+  seconds, peak RSS, block I/O, including descendants it waited for) is
+  exact however short the process was
+- ResourceSampler polls the process tree with psutil while it runs for
+  what the exit rusage lacks (the most child processes at once, I/O of
+  descendants still running) and merges both when it stops
+- track_resources() collects the usage of all subprocesses started while
+  an action executes, so an action that runs several commands reports
+  their total
+- ResourceLimits (CPU seconds, address space, file size) are applied to
+  a spawned process with prlimit to stop runaway commands
+
+Usage:
+    with track_resources() as usage:
+        result = await executor.execute(action)
+    print(usage.to_dict())
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, Sequence, Union
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ResourceUsage:
+    """Resources used by one or more processes."""
+
+    cpu_user: float = 0.0  # Seconds
+    cpu_system: float = 0.0
+    peak_rss_bytes: Optional[int] = None  # None if unknown
+    read_bytes: int = 0
+    write_bytes: int = 0
+    child_count: int = 0  # Most child processes seen at once
+    processes: int = 0  # Top-level processes accounted
+
+    @property
+    def cpu_total(self) -> float:
+        return self.cpu_user + self.cpu_system
+
+    def add(self, other: "ResourceUsage") -> None:
+        """Add the usage of processes that ran after (or beside) these."""
+        self.cpu_user += other.cpu_user
+        self.cpu_system += other.cpu_system
+        if other.peak_rss_bytes is not None:
+            self.peak_rss_bytes = max(self.peak_rss_bytes or 0, other.peak_rss_bytes)
+        self.read_bytes += other.read_bytes
+        self.write_bytes += other.write_bytes
+        self.child_count = max(self.child_count, other.child_count)
+        self.processes += other.processes
+
+    def to_dict(self) -> dict:
+        return {
+            "cpu_user": round(self.cpu_user, 3),
+            "cpu_system": round(self.cpu_system, 3),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "read_bytes": self.read_bytes,
+            "write_bytes": self.write_bytes,
+            "child_count": self.child_count,
+            "processes": self.processes,
+        }
+
+
+@dataclass
+class ResourceLimits:
+    """rlimits for spawned processes (0 = unlimited)."""
+
+    cpu_seconds: int = 0  # RLIMIT_CPU
+    memory_mb: int = 0  # RLIMIT_AS
+    file_size_mb: int = 0  # RLIMIT_FSIZE
+
+    def __bool__(self) -> bool:
+        return any((self.cpu_seconds, self.memory_mb, self.file_size_mb))
+
+    def apply(self, pid: int) -> None:
+        """Set the limits on a running process (prlimit; Linux only)."""
+        limits = [
+            (getattr(psutil, "RLIMIT_CPU", None), self.cpu_seconds),
+            (getattr(psutil, "RLIMIT_AS", None), self.memory_mb * 1024 * 1024),
+            (getattr(psutil, "RLIMIT_FSIZE", None), self.file_size_mb * 1024 * 1024),
+        ]
+        try:
+            process = psutil.Process(pid)
+            for kind, value in limits:
+                if kind is not None and value > 0:
+                    process.rlimit(kind, (value, value))
+        except (psutil.Error, AttributeError, OSError, ValueError) as e:
+            logger.warning(f"Could not apply rlimits to process {pid}: {e}")
+
+
+class AccountedProcess:
+    """
+    A child process reaped with os.wait4, keeping its exit rusage.
+
+    Used like asyncio.subprocess.Process (pid, stdout, stderr,
+    returncode, wait(), kill()).
+    """
+
+    def __init__(
+        self,
+        popen: subprocess.Popen,
+        stdout: Optional[asyncio.StreamReader],
+        stderr: Optional[asyncio.StreamReader],
+    ):
+        self._popen = popen
+        self.stdout = stdout
+        self.stderr = stderr
+        self.rusage: Any = None  # resource.struct_rusage once reaped
+        self._exited: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        thread = threading.Thread(
+            target=self._reap, name=f"reaper-{popen.pid}", daemon=True
+        )
+        thread.start()
+
+    @property
+    def pid(self) -> int:
+        return self._popen.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._popen.returncode
+
+    def _reap(self) -> None:
+        try:
+            _, status, rusage = os.wait4(self._popen.pid, 0)
+            returncode = os.waitstatus_to_exitcode(status)
+        except ChildProcessError:
+            returncode, rusage = 255, None  # Reaped elsewhere
+        try:
+            self._exited.get_loop().call_soon_threadsafe(self._set_exited, returncode, rusage)
+        except RuntimeError:
+            pass  # Loop closed
+
+    def _set_exited(self, returncode: int, rusage: Any) -> None:
+        self._popen.returncode = returncode
+        self.rusage = rusage
+        if not self._exited.done():
+            self._exited.set_result(returncode)
+
+    async def wait(self) -> int:
+        """Wait for the process to exit; returns its return code."""
+        return await asyncio.shield(self._exited)
+
+    def kill(self) -> None:
+        if self.returncode is None:
+            try:
+                self._popen.kill()
+            except ProcessLookupError:
+                pass
+
+
+async def _pipe_reader(
+    pipe: Any, limit: int
+) -> Optional[asyncio.StreamReader]:
+    if pipe is None:
+        return None
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=limit, loop=loop)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader, loop=loop), pipe
+    )
+    return reader
+
+
+async def spawn_process(
+    cmd: Union[str, Sequence[str]],
+    shell: bool = False,
+    cwd: Optional[Union[str, os.PathLike]] = None,
+    env: Optional[dict] = None,
+    limit: int = 2 ** 16,
+    limits: Optional[ResourceLimits] = None,
+) -> AccountedProcess:
+    """
+    Start a process with piped stdout and stderr, accounted at exit.
+
+    Args:
+        cmd: Command string (shell=True) or argument list
+        shell: Run cmd through the shell
+        cwd: Working directory
+        env: Environment (inherited if None)
+        limit: Line length limit of the stream readers
+        limits: rlimits applied once the process is running
+
+    Returns:
+        AccountedProcess
+    """
+    popen = subprocess.Popen(
+        cmd,
+        shell=shell,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if limits:
+        limits.apply(popen.pid)
+    try:
+        stdout = await _pipe_reader(popen.stdout, limit)
+        stderr = await _pipe_reader(popen.stderr, limit)
+    except BaseException:
+        popen.kill()
+        popen.wait()
+        raise
+    return AccountedProcess(popen, stdout, stderr)
+
+
+@dataclass
+class _Totals:
+    """Last values sampled from one process."""
+
+    cpu_user: float = 0.0
+    cpu_system: float = 0.0
+    read_bytes: int = 0
+    write_bytes: int = 0
+
+
+class ResourceSampler:
+    """Samples a process tree in the background until stopped."""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        """
+        Initialize the sampler.
+
+        Args:
+            pid: Process to account (its children are included)
+            interval: Seconds between samples
+        """
+        self.pid = pid
+        self.interval = interval
+        self.usage = ResourceUsage(processes=1)
+        self._totals: dict[int, _Totals] = {}
+        self._task: Optional[asyncio.Task] = None
+        try:
+            self._process: Optional[psutil.Process] = psutil.Process(pid)
+        except psutil.Error:
+            self._process = None
+
+    def start(self) -> "ResourceSampler":
+        """Take a first sample and keep sampling in the background."""
+        self.sample()
+        if self._process is not None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sample()
+
+    def sample(self) -> None:
+        """Read CPU, memory and I/O of the process and its children."""
+        if self._process is None:
+            return
+        try:
+            children = self._process.children(recursive=True)
+        except psutil.Error:
+            return  # Exited; keep the last values
+
+        rss = 0
+        for proc in [self._process, *children]:
+            try:
+                with proc.oneshot():
+                    cpu = proc.cpu_times()
+                    rss += proc.memory_info().rss
+                    totals = self._totals.setdefault(proc.pid, _Totals())
+                    totals.cpu_user = cpu.user
+                    totals.cpu_system = cpu.system
+                    if hasattr(proc, "io_counters"):
+                        io = proc.io_counters()
+                        totals.read_bytes = io.read_bytes
+                        totals.write_bytes = io.write_bytes
+            except (psutil.Error, OSError):
+                continue
+
+        usage = self.usage
+        usage.peak_rss_bytes = max(usage.peak_rss_bytes or 0, rss)
+        usage.child_count = max(usage.child_count, len(children))
+        usage.cpu_user = sum(t.cpu_user for t in self._totals.values())
+        usage.cpu_system = sum(t.cpu_system for t in self._totals.values())
+        usage.read_bytes = sum(t.read_bytes for t in self._totals.values())
+        usage.write_bytes = sum(t.write_bytes for t in self._totals.values())
+
+    async def stop(self, rusage: Any = None) -> ResourceUsage:
+        """
+        Stop sampling; returns the accumulated usage.
+
+        Args:
+            rusage: Exit rusage of the reaped process (AccountedProcess.rusage),
+                covering the last interval before exit that sampling misses
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.sample()  # Last look, if the process is still there
+
+        if rusage is not None:
+            usage = self.usage
+            usage.cpu_user = max(usage.cpu_user, rusage.ru_utime)
+            usage.cpu_system = max(usage.cpu_system, rusage.ru_stime)
+            # ru_maxrss is in KiB on Linux, bytes on macOS
+            scale = 1 if os.uname().sysname == "Darwin" else 1024
+            usage.peak_rss_bytes = max(usage.peak_rss_bytes or 0, rusage.ru_maxrss * scale)
+            usage.read_bytes = max(usage.read_bytes, rusage.ru_inblock * 512)
+            usage.write_bytes = max(usage.write_bytes, rusage.ru_oublock * 512)
+        return self.usage
+
+
+_current: contextvars.ContextVar[Optional[ResourceUsage]] = contextvars.ContextVar(
+    "resource_usage", default=None
+)
+
+
+@contextmanager
+def track_resources() -> Iterator[ResourceUsage]:
+    """
+    Collect the usage of subprocesses accounted while the block runs.
+
+    Nested blocks also count towards the enclosing one.
+    """
+    parent = _current.get()
+    usage = ResourceUsage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+        if parent is not None:
+            parent.add(usage)
+
+
+def record_usage(usage: ResourceUsage) -> None:
+    """Add usage to the innermost track_resources() block, if any."""
+    current = _current.get()
+    if current is not None:
+        current.add(usage)
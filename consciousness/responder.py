@@ -13,10 +13,12 @@ and voice depending on what the conversation needs.
 """
 
 import asyncio
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 
 import structlog
 
@@ -25,7 +27,9 @@ from .user_message import (
     UserMessageDetector,
     ResponseFormatter,
     MessagePriority,
+    compute_message_hash,
     detect_user_message,
+    get_message_scanner,
 )
 from .executor import (
     ExpandedExecutor,
@@ -34,10 +38,13 @@ from .executor import (
     ActionType,
     Priority,
 )
-from .self_write_tracker import get_self_write_tracker
+from .response_stream import StreamingResponseWriter, write_text_atomic
 
 logger = structlog.get_logger(__name__)
 
+# Tools whose responses are shown in the file while being generated
+STREAMED_TOOLS = ("claude_code", "gemini", "claude_flow")
+
 
 @dataclass
 class ResponderConfig:
@@ -54,6 +61,10 @@ class ResponderConfig:
     include_timestamp: bool = True
     marker_style: str = "block"  # block, inline
 
+    # Streaming: show the response in the file while it is generated
+    stream_responses: bool = True
+    stream_write_interval: float = 0.5  # Minimum seconds between writes
+
     # Timeouts
     claude_timeout: int = 120
     gemini_timeout: int = 180
@@ -114,12 +125,17 @@ class ConsciousnessResponder:
         self.executor = executor or ExpandedExecutor(self.working_dir)
         self.config = config or ResponderConfig()
         self.detector = UserMessageDetector()
+        self.scanner = get_message_scanner()
         self.formatter = ResponseFormatter(marker_style=self.config.marker_style)
 
         # Track responded messages to avoid duplicates
         self._responded_messages: Dict[str, set] = {}  # file_path -> set of line_numbers
 
-    def _get_tool_for_priority(self, priority: MessagePriority) -> str:
+        # Time to first visible token of recent streamed responses (ms)
+        self._first_token_ms: deque = deque(maxlen=100)
+        self.streamed = 0
+
+    def get_tool_for_priority(self, priority: MessagePriority) -> str:
         """Get the appropriate tool based on message priority."""
         return {
             MessagePriority.CRITICAL: self.config.critical_tool,
@@ -189,7 +205,7 @@ Format your response in Markdown since it will be inserted into the file.
             return None
 
         # Get the appropriate tool
-        tool = self._get_tool_for_priority(message.priority)
+        tool = self.get_tool_for_priority(message.priority)
 
         logger.info(
             "responder.generating_response",
@@ -198,10 +214,29 @@ Format your response in Markdown since it will be inserted into the file.
             file=message.file_path,
         )
 
+        # Show the response in the file while it is being generated
+        writer = None
+        if not dry_run and self.config.stream_responses and tool in STREAMED_TOOLS:
+            writer = StreamingResponseWriter(
+                self._resolve_path(message.file_path),
+                message,
+                self.formatter,
+                scanner=self.scanner,
+                write_interval=self.config.stream_write_interval,
+                max_length=self.config.max_response_length,
+                started=time.monotonic(),
+            )
+            if not await writer.open():
+                writer = None
+
         # Generate response using the selected tool
-        response = await self._generate_response(message, tool)
+        response = await self._generate_response(
+            message, tool, on_text=writer.append if writer else None
+        )
 
         if not response:
+            if writer:
+                await writer.abort()
             logger.warning(
                 "responder.response_failed",
                 tool=tool,
@@ -211,7 +246,11 @@ Format your response in Markdown since it will be inserted into the file.
 
         # Write response to file if not dry run
         if not dry_run:
-            success = await self._write_response_to_file(message, response)
+            if writer:
+                success = await writer.finalize(response)
+                self._record_stream(writer, success)
+            else:
+                success = await self._write_response_to_file(message, response)
             if success:
                 # Mark as responded
                 if message.file_path not in self._responded_messages:
@@ -220,10 +259,51 @@ Format your response in Markdown since it will be inserted into the file.
 
         return response
 
+    def _record_stream(self, writer: StreamingResponseWriter, success: bool) -> None:
+        """Log and keep the latency of a streamed response."""
+        self.streamed += 1
+        if writer.first_token_ms is not None:
+            self._first_token_ms.append(writer.first_token_ms)
+        logger.info(
+            "responder.stream_finished",
+            file=str(writer.file_path),
+            written=success,
+            placeholder_ms=writer.placeholder_ms,
+            first_token_ms=writer.first_token_ms,
+            writes=writer.writes,
+        )
+
+    def _build_action(self, tool: str, prompt: str) -> Optional[Action]:
+        """Build the executor action for a tool, or None if it has none."""
+        if tool == "claude_code":
+            return Action(
+                type=ActionType.CLAUDE_CODE,
+                details={"prompt": prompt},
+                timeout=self.config.claude_timeout,
+            )
+        if tool == "gemini":
+            return Action(
+                type=ActionType.GEMINI_ANALYZE,
+                details={"prompt": prompt},
+                timeout=self.config.gemini_timeout,
+            )
+        if tool == "claude_flow":
+            return Action(
+                type=ActionType.CLAUDE_FLOW,
+                details={
+                    "task": prompt,
+                    "topology": "star",
+                    "max_agents": 3,
+                },
+                timeout=self.config.claude_timeout * 2,
+            )
+        return None
+
     async def _generate_response(
         self,
         message: UserMessage,
         tool: str,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> Optional[str]:
         """
         Generate a response using the specified tool.
@@ -231,6 +311,7 @@ Format your response in Markdown since it will be inserted into the file.
         Args:
             message: The user message
             tool: Tool to use (claude_code, gemini, claude_flow, local_llm)
+            on_text: Awaited with response text as it is streamed
 
         Returns:
             Generated response text or None if failed
@@ -238,33 +319,17 @@ Format your response in Markdown since it will be inserted into the file.
         prompt = self._build_response_prompt(message)
 
         try:
-            if tool == "claude_code":
-                result = await self.executor.execute(Action(
-                    type=ActionType.CLAUDE_CODE,
-                    details={"prompt": prompt},
-                    timeout=self.config.claude_timeout,
-                ))
-            elif tool == "gemini":
-                result = await self.executor.execute(Action(
-                    type=ActionType.GEMINI_ANALYZE,
-                    details={"prompt": prompt},
-                    timeout=self.config.gemini_timeout,
-                ))
-            elif tool == "claude_flow":
-                result = await self.executor.execute(Action(
-                    type=ActionType.CLAUDE_FLOW,
-                    details={
-                        "task": prompt,
-                        "topology": "star",
-                        "max_agents": 3,
-                    },
-                    timeout=self.config.claude_timeout * 2,
-                ))
-            else:
+            action = self._build_action(tool, prompt)
+            if action is None:
                 # Local LLM fallback - return a placeholder
                 logger.debug("responder.local_llm_not_implemented")
                 return None
 
+            if on_text is not None:
+                result = await self.executor.execute_streaming(action, on_text)
+            else:
+                result = await self.executor.execute(action)
+
             if result.success and result.output:
                 # Truncate if too long
                 response = result.output
@@ -283,6 +348,13 @@ Format your response in Markdown since it will be inserted into the file.
             logger.exception(f"responder.exception: {e}")
             return None
 
+    def _resolve_path(self, file_path: str) -> Path:
+        """Resolve a message's file path against the working directory."""
+        path = Path(file_path)
+        if not path.is_absolute():
+            path = self.working_dir / path
+        return path
+
     async def _write_response_to_file(
         self,
         message: UserMessage,
@@ -299,9 +371,7 @@ Format your response in Markdown since it will be inserted into the file.
             True if successfully written
         """
         try:
-            file_path = Path(message.file_path)
-            if not file_path.is_absolute():
-                file_path = self.working_dir / file_path
+            file_path = self._resolve_path(message.file_path)
 
             # Read current content
             content = file_path.read_text(encoding='utf-8')
@@ -313,13 +383,12 @@ Format your response in Markdown since it will be inserted into the file.
                 response=response,
             )
 
-            # Record this write BEFORE writing to avoid race conditions
-            # This prevents the daemon from detecting our own write as user input
-            tracker = get_self_write_tracker()
-            tracker.record_write(file_path)
-
-            # Write back
-            file_path.write_text(new_content, encoding='utf-8')
+            # Write back (recorded as a self-write before writing, so the
+            # daemon doesn't detect our own write as user input)
+            write_text_atomic(file_path, new_content)
+            self.scanner.record_insertion(
+                file_path, content, new_content, self.formatter.insertion_index(message)
+            )
 
             logger.info(
                 "responder.response_written",
@@ -352,21 +421,36 @@ Format your response in Markdown since it will be inserted into the file.
 
         for file_path in file_paths:
             try:
-                content = file_path.read_text(encoding='utf-8')
-                messages = self.detector.detect_in_content(content, str(file_path))
-
-                for message in messages:
-                    # Only respond to HIGH or CRITICAL priority
-                    if message.priority in (MessagePriority.CRITICAL, MessagePriority.HIGH):
-                        response = await self.respond_to_message(message, dry_run=dry_run)
-                        results.append({
-                            "file": str(file_path),
-                            "line": message.line_number,
-                            "priority": message.priority.value,
-                            "message": message.message[:100],
-                            "responded": response is not None,
-                            "response_preview": response[:200] if response else None,
-                        })
+                # Only respond to HIGH or CRITICAL priority messages present now
+                # (not to anything our own responses might contain)
+                todo = {
+                    compute_message_hash(m.message)
+                    for m in await self.scanner.scan_file(file_path) or []
+                    if m.priority in (MessagePriority.CRITICAL, MessagePriority.HIGH)
+                }
+
+                # One message at a time: each written response shifts the lines
+                # below it, and the scanner tracks that without re-reading
+                while todo:
+                    messages = await self.scanner.scan_file(file_path)
+                    pending = [
+                        m for m in messages or []
+                        if compute_message_hash(m.message) in todo
+                    ]
+                    if not pending:
+                        break
+
+                    message = pending[0]
+                    todo.discard(compute_message_hash(message.message))
+                    response = await self.respond_to_message(message, dry_run=dry_run)
+                    results.append({
+                        "file": str(file_path),
+                        "line": message.line_number,
+                        "priority": message.priority.value,
+                        "message": message.message[:100],
+                        "responded": response is not None,
+                        "response_preview": response[:200] if response else None,
+                    })
 
             except Exception as e:
                 logger.warning(f"responder.file_error: {file_path}: {e}")
@@ -411,6 +495,18 @@ Format your response in Markdown since it will be inserted into the file.
 
         return high_priority_messages
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Streaming statistics (time to first visible token in ms)."""
+        samples = sorted(self._first_token_ms)
+        return {
+            "streamed": self.streamed,
+            "first_token_ms": {
+                "last": self._first_token_ms[-1] if samples else None,
+                "p50": samples[len(samples) // 2] if samples else None,
+                "max": samples[-1] if samples else None,
+            },
+        }
+
     def clear_responded_cache(self, file_path: Optional[str] = None) -> None:
         """
         Clear the responded messages cache.
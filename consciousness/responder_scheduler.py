@@ -0,0 +1,303 @@
+"""
+Concurrent User-Message Responding
+
+Answering a user message can take minutes (Claude Code, Gemini), so the
+daemon hands detected messages to a ResponderScheduler and continues with
+its cycle instead of waiting:
+- One worker per file answers that file's messages one at a time, so
+  insertions and line numbers stay consistent
+- Each tool tier (claude_code, gemini, ...) has a concurrency limit shared
+  by all files and roots
+- Workers waiting for a slot are served by message priority (CRITICAL
+  before HIGH), then in arrival order
+
+Usage:
+    scheduler = ResponderScheduler(max_concurrent_per_tool={"claude_code": 2})
+    scheduler.submit(path, responder, high_priority_messages)  # returns at once
+    await scheduler.close()
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional
+
+import structlog
+
+from .user_message import (
+    MessagePriority,
+    MessageScanner,
+    UserMessage,
+    compute_message_hash,
+    get_message_scanner,
+)
+
+logger = structlog.get_logger(__name__)
+
+PRIORITY_VALUES = {
+    MessagePriority.CRITICAL: 4,
+    MessagePriority.HIGH: 3,
+    MessagePriority.MEDIUM: 2,
+    MessagePriority.LOW: 1,
+}
+
+
+class PrioritySemaphore:
+    """
+    Semaphore that wakes waiters in priority order.
+
+    Higher priorities go first; equal priorities are served in arrival order.
+    """
+
+    def __init__(self, value: int = 1):
+        """
+        Initialize the semaphore.
+
+        Args:
+            value: Number of concurrent holders allowed
+        """
+        self.limit = max(1, value)
+        self._value = self.limit
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    @property
+    def in_use(self) -> int:
+        """Number of slots currently held."""
+        return self.limit - self._value
+
+    @property
+    def waiting(self) -> int:
+        """Number of waiters."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = 0) -> None:
+        """Wait for a slot."""
+        if self._value > 0 and not self.waiting:
+            self._value -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Handed a slot just before being cancelled: pass it on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Give a slot to the best waiter, or return it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 0) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+@dataclass
+class _FileJob:
+    """Messages waiting for a response in one file."""
+
+    path: str
+    responder: Any  # ConsciousnessResponder
+    todo: dict[str, MessagePriority] = field(default_factory=dict)  # message hash -> priority
+    task: Optional[asyncio.Task] = None
+    active_message: Optional[UserMessage] = None
+
+
+class ResponderScheduler:
+    """
+    Runs user-message responses in the background.
+
+    Only messages that were submitted are answered. Anything that shows up
+    inside our own responses is not, which rules out feedback loops.
+    """
+
+    def __init__(
+        self,
+        scanner: Optional[MessageScanner] = None,
+        max_concurrent_per_tool: Optional[dict[str, int]] = None,
+        default_max_concurrent: int = 1,
+        dry_run: bool = False,
+        on_response: Optional[Callable[[str, UserMessage, Optional[str]], None]] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            scanner: Incremental message scanner (uses the global one if None)
+            max_concurrent_per_tool: Concurrent responses per tool tier
+            default_max_concurrent: Limit for tools not listed
+            dry_run: Generate responses without writing them
+            on_response: Called with (path, message, response or None)
+                after each attempt
+        """
+        self.scanner = scanner or get_message_scanner()
+        self.max_concurrent_per_tool = dict(max_concurrent_per_tool or {})
+        self.default_max_concurrent = default_max_concurrent
+        self.dry_run = dry_run
+        self.on_response = on_response
+
+        self._limits: dict[str, PrioritySemaphore] = {}
+        self._jobs: dict[str, _FileJob] = {}
+
+        self.submitted = 0
+        self.responded = 0
+        self.failed = 0
+
+    def _limiter(self, tool: str) -> PrioritySemaphore:
+        limiter = self._limits.get(tool)
+        if limiter is None:
+            limiter = PrioritySemaphore(
+                self.max_concurrent_per_tool.get(tool, self.default_max_concurrent)
+            )
+            self._limits[tool] = limiter
+        return limiter
+
+    def submit(
+        self,
+        path: str | Path,
+        responder: Any,
+        messages: list[UserMessage],
+    ) -> int:
+        """
+        Queue messages for a response without waiting for it.
+
+        Messages already queued or being answered are ignored.
+
+        Args:
+            path: File containing the messages
+            responder: ConsciousnessResponder for the file's root
+            messages: Messages to answer
+
+        Returns:
+            Number of newly queued messages
+        """
+        key = str(path)
+        job = self._jobs.get(key)
+        if job is None:
+            job = _FileJob(path=key, responder=responder)
+            self._jobs[key] = job
+
+        active_hash = (
+            compute_message_hash(job.active_message.message) if job.active_message else None
+        )
+        added = 0
+        for message in messages:
+            message_hash = compute_message_hash(message.message)
+            if message_hash in job.todo or message_hash == active_hash:
+                continue
+            job.todo[message_hash] = message.priority
+            added += 1
+        self.submitted += added
+
+        if job.task is None or job.task.done():
+            if not job.todo:
+                del self._jobs[key]
+                return 0
+            job.task = asyncio.create_task(self._run_file(job))
+        return added
+
+    async def _run_file(self, job: _FileJob) -> None:
+        """Answer a file's queued messages one at a time."""
+        try:
+            while job.todo:
+                # Fresh line numbers: earlier responses shifted the lines below them
+                messages = await self.scanner.scan_file(job.path)
+                pending = [
+                    m for m in messages or []
+                    if compute_message_hash(m.message) in job.todo
+                ]
+                if not pending:
+                    # Already answered, or removed by the user
+                    break
+
+                message = pending[0]  # Highest priority, then earliest line
+                job.todo.pop(compute_message_hash(message.message), None)
+                job.active_message = message
+
+                tool = job.responder.get_tool_for_priority(message.priority)
+                wait_start = time.monotonic()
+                async with self._limiter(tool).slot(PRIORITY_VALUES.get(message.priority, 0)):
+                    logger.debug(
+                        "responder_scheduler.started",
+                        file=job.path,
+                        line=message.line_number,
+                        tool=tool,
+                        waited=round(time.monotonic() - wait_start, 3),
+                    )
+                    response = await job.responder.respond_to_message(
+                        message, dry_run=self.dry_run
+                    )
+
+                job.active_message = None
+                if response:
+                    self.responded += 1
+                else:
+                    self.failed += 1
+                if self.on_response:
+                    self.on_response(job.path, message, response)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("responder_scheduler.file_error", file=job.path, error=str(e))
+        finally:
+            job.todo.clear()
+            job.active_message = None
+            if self._jobs.get(job.path) is job:
+                del self._jobs[job.path]
+
+    def is_busy(self, path: str | Path) -> bool:
+        """Check if a file has messages queued or being answered."""
+        return str(path) in self._jobs
+
+    async def drain(self) -> None:
+        """Wait until all queued messages have been handled."""
+        while self._jobs:
+            tasks = [job.task for job in self._jobs.values() if job.task]
+            if not tasks:
+                break
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel all workers."""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+
+    def get_stats(self) -> dict:
+        """Queue and concurrency statistics."""
+        return {
+            "files": len(self._jobs),
+            "queued": sum(len(job.todo) for job in self._jobs.values()),
+            "submitted": self.submitted,
+            "responded": self.responded,
+            "failed": self.failed,
+            "tools": {
+                tool: {
+                    "limit": limiter.limit,
+                    "in_use": limiter.in_use,
+                    "waiting": limiter.waiting,
+                }
+                for tool, limiter in self._limits.items()
+            },
+        }
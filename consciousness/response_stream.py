@@ -0,0 +1,267 @@
+"""
+Streamed Response Insertion
+
+A Claude Code response can take minutes, and writing it only at the end
+leaves the user looking at an unchanged file. A StreamingResponseWriter
+makes the response visible while it is generated:
+- A placeholder block with the STOFFY-REPLIED marker is inserted right
+  away, so the message is not picked up a second time
+- Text is written into the block as it arrives: the first text at once,
+  then at most once per write_interval; text that arrives in between is
+  written when the interval has passed
+- Every write replaces the file atomically (temp file + os.replace) and
+  is recorded with the self-write tracker first
+- finalize() swaps in the complete response; abort() removes the block
+
+Usage:
+    writer = StreamingResponseWriter(path, message, formatter)
+    if await writer.open():
+        await writer.append("partial text")
+        await writer.finalize(response)
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import structlog
+
+from .file_access import get_file_access_service
+from .self_write_tracker import get_self_write_tracker
+from .user_message import (
+    MessageScanner,
+    ResponseFormatter,
+    UserMessage,
+    compute_message_hash,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Shown at the end of the block while the response is being generated
+STREAMING_NOTICE = "*[Responding...]*"
+
+
+def write_text_atomic(path: str | Path, content: str) -> None:
+    """
+    Replace a file's content atomically, as a self-write.
+
+    The content goes to a temporary file next to the target, which is then
+    renamed over it, so readers never see a partially written file. Both
+    paths are recorded with the self-write tracker before writing.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.stoffy-tmp")
+
+    tracker = get_self_write_tracker()
+    tracker.record_write(path)
+    tracker.record_write(tmp)
+
+    try:
+        tmp.write_text(content, encoding='utf-8')
+        try:
+            shutil.copymode(path, tmp)
+        except OSError:
+            pass
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    get_file_access_service().invalidate(path)
+
+
+class StreamingResponseWriter:
+    """
+    Writes a response into a file while it is being generated.
+
+    The writer owns one block in the file and finds it again on every
+    write, so edits elsewhere in the file are preserved. If the block is
+    edited or removed by the user, streaming stops and finalize() fails.
+    """
+
+    def __init__(
+        self,
+        file_path: str | Path,
+        message: UserMessage,
+        formatter: ResponseFormatter,
+        scanner: Optional[MessageScanner] = None,
+        write_interval: float = 0.5,
+        max_length: Optional[int] = None,
+        started: Optional[float] = None,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            file_path: File containing the message
+            message: The message being answered
+            formatter: Formatter for the response block
+            scanner: Message scanner to tell about the placeholder insertion
+            write_interval: Minimum seconds between writes
+            max_length: Stop showing streamed text beyond this length
+            started: time.monotonic() when the response was requested
+                (for the time-to-first-token metrics)
+        """
+        self.file_path = Path(file_path)
+        self.message = message
+        self.formatter = formatter
+        self.scanner = scanner
+        self.write_interval = write_interval
+        self.max_length = max_length
+        self.started = started if started is not None else time.monotonic()
+
+        self._hash = compute_message_hash(message.message)
+        self._timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._block: Optional[str] = None  # Block text currently in the file
+        self._text = ""
+        self._written = 0  # Length of _text already in the file
+        self._last_write = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.closed = False
+
+        self.writes = 0
+        self.placeholder_ms: Optional[float] = None
+        self.first_token_ms: Optional[float] = None
+
+    def _elapsed_ms(self) -> float:
+        return round((time.monotonic() - self.started) * 1000, 1)
+
+    def _format(self, body: str) -> str:
+        return self.formatter.format_response(
+            response=body,
+            priority=self.message.priority,
+            timestamp=self._timestamp,
+            message_hash=self._hash,
+        )
+
+    def _write(self, content: str) -> None:
+        write_text_atomic(self.file_path, content)
+        self.writes += 1
+        self._last_write = time.monotonic()
+
+    async def open(self) -> bool:
+        """
+        Insert the placeholder block after the message.
+
+        Returns:
+            True if the placeholder was written
+        """
+        async with self._lock:
+            try:
+                content = self.file_path.read_text(encoding='utf-8')
+                new_content = self.formatter.insert_response_after_message(
+                    file_content=content,
+                    message=self.message,
+                    response=STREAMING_NOTICE,
+                    timestamp=self._timestamp,
+                )
+                self._write(new_content)
+            except OSError as e:
+                logger.warning("response_stream.open_failed", file=str(self.file_path), error=str(e))
+                return False
+
+            self._block = self._format(STREAMING_NOTICE)
+            if self.scanner is not None:
+                self.scanner.record_insertion(
+                    self.file_path, content, new_content,
+                    self.formatter.insertion_index(self.message),
+                )
+            self.placeholder_ms = self._elapsed_ms()
+            return True
+
+    async def append(self, text: str) -> None:
+        """Add streamed text; it is written when the write interval allows."""
+        if self.closed or self._block is None or not text:
+            return
+        if self.max_length is not None and len(self._text) >= self.max_length:
+            return
+        self._text += text
+
+        # The first text is written at once: time to first token matters most
+        delay = self._last_write + self.write_interval - time.monotonic()
+        if delay <= 0 or self._written == 0:
+            await self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        async with self._lock:
+            if self.closed or self._block is None or len(self._text) == self._written:
+                return
+            body = self._text.rstrip() + "\n\n" + STREAMING_NOTICE
+            if self._replace_block(self._format(body)):
+                self._written = len(self._text)
+                if self.first_token_ms is None and self._text.strip():
+                    self.first_token_ms = self._elapsed_ms()
+
+    def _replace_block(self, block: Optional[str]) -> bool:
+        """Swap our block in the file for `block`, or remove it if None."""
+        try:
+            content = self.file_path.read_text(encoding='utf-8')
+        except OSError as e:
+            logger.warning("response_stream.read_failed", file=str(self.file_path), error=str(e))
+            self._block = None
+            return False
+
+        start = content.find(self._block)
+        if start < 0:
+            logger.warning("response_stream.block_lost", file=str(self.file_path))
+            self._block = None
+            return False
+        end = start + len(self._block)
+
+        if block is None:
+            # The block was inserted as its own line: drop one separator too
+            if content[end:end + 1] == "\n":
+                end += 1
+            elif start > 0 and content[start - 1] == "\n":
+                start -= 1
+            block = ""
+
+        try:
+            self._write(content[:start] + block + content[end:])
+        except OSError as e:
+            logger.warning("response_stream.write_failed", file=str(self.file_path), error=str(e))
+            return False
+        self._block = block or None
+        return True
+
+    def _cancel_pending(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    async def finalize(self, response: str) -> bool:
+        """
+        Replace the streamed text with the complete response.
+
+        Returns:
+            True if the response was written
+        """
+        self._cancel_pending()
+        async with self._lock:
+            if self.closed or self._block is None:
+                self.closed = True
+                return False
+            self.closed = True
+            written = self._replace_block(self._format(response))
+            if written and self.first_token_ms is None:
+                self.first_token_ms = self._elapsed_ms()
+            return written
+
+    async def abort(self) -> None:
+        """Remove the block (e.g. when generating the response failed)."""
+        self._cancel_pending()
+        async with self._lock:
+            self.closed = True
+            if self._block is not None:
+                self._replace_block(None)
@@ -0,0 +1,150 @@
+"""
+Multi-Root Watching for Consciousness Daemon
+
+Lets one daemon process (one event loop, one LM Studio client, one state
+database) watch several directory trees:
+- WatchRoot bundles the per-root components (file watcher, git watcher,
+  manifest, executor, responder, knowledge base) and a queue of pending
+  changes
+- RootScheduler hands out work one root at a time in round-robin order,
+  capped per turn, so a noisy repository cannot starve the others
+
+Usage:
+    scheduler = RootScheduler(roots, max_changes_per_turn=500)
+    scheduler.put("stoffy", batch)          # from each root's watcher task
+    picked = await scheduler.next_batch()   # from the OIDA cycle
+    if picked:
+        root, changes = picked
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .manifest import FileManifest
+from .watcher import ConsciousnessWatcher, FileChange
+from .watcher_git import GitObservation, GitWatcher
+
+
+@dataclass
+class WatchRoot:
+    """Components and pending work for a single watched directory."""
+
+    name: str
+    path: Path
+    file_watcher: ConsciousnessWatcher
+    manifest: FileManifest
+    git_watcher: Optional[GitWatcher] = None
+    executor: Any = None
+    responder: Any = None
+    knowledge: Any = None  # SemanticMemoryWriter for this root's knowledge/
+    pending: deque[FileChange] = field(default_factory=deque)
+    watcher_task: Optional[asyncio.Task] = None
+    last_git_observation: Optional[GitObservation] = None
+    changes_seen: int = 0
+    turns: int = 0
+
+
+class RootScheduler:
+    """
+    Fair scheduler over the pending changes of several roots.
+
+    Each call to next_batch() serves one root: the next one after the
+    previously served root that has pending changes. At most
+    max_changes_per_turn changes are taken; the remainder waits for that
+    root's next turn.
+    """
+
+    def __init__(self, roots: list[WatchRoot], max_changes_per_turn: int = 500):
+        """
+        Initialize the scheduler.
+
+        Args:
+            roots: Roots to schedule, in configuration order
+            max_changes_per_turn: Maximum changes handed out per turn
+        """
+        self.roots = roots
+        self.max_changes_per_turn = max(1, max_changes_per_turn)
+        self._by_name = {root.name: root for root in roots}
+        self._next_index = 0
+        self._arrived = asyncio.Event()
+
+    def get_root(self, name: str) -> Optional[WatchRoot]:
+        """Look up a root by name."""
+        return self._by_name.get(name)
+
+    def put(self, root_name: str, batch: list[FileChange]) -> None:
+        """Queue changes for a root."""
+        root = self._by_name[root_name]
+        root.pending.extend(batch)
+        root.changes_seen += len(batch)
+        if batch:
+            self._arrived.set()
+
+    def has_pending(self) -> bool:
+        """Check if any root has pending changes."""
+        return any(root.pending for root in self.roots)
+
+    async def _wait_for_changes(self, timeout: float, settle: float) -> bool:
+        """Wait for changes, then keep collecting while more arrive quickly."""
+        if not self.has_pending():
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return False
+
+        # Let bursts finish arriving (bounded by the overall timeout)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), timeout=settle)
+            except asyncio.TimeoutError:
+                break
+        return True
+
+    async def next_batch(
+        self, timeout: float = 0.5, settle: float = 0.1
+    ) -> Optional[tuple[WatchRoot, list[FileChange]]]:
+        """
+        Get the next root's changes.
+
+        Args:
+            timeout: Seconds to wait for the first change
+            settle: Quiet period that ends a burst of changes
+
+        Returns:
+            Tuple of (root, changes), or None if nothing arrived
+        """
+        if not await self._wait_for_changes(timeout, settle):
+            return None
+
+        count = len(self.roots)
+        for offset in range(count):
+            index = (self._next_index + offset) % count
+            root = self.roots[index]
+            if not root.pending:
+                continue
+
+            take = min(len(root.pending), self.max_changes_per_turn)
+            changes = [root.pending.popleft() for _ in range(take)]
+            root.turns += 1
+            self._next_index = (index + 1) % count
+            return root, changes
+
+        return None
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """Per-root queue statistics."""
+        return {
+            root.name: {
+                "pending": len(root.pending),
+                "changes_seen": root.changes_seen,
+                "turns": root.turns,
+            }
+            for root in self.roots
+        }
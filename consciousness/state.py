@@ -1,6 +1,7 @@
 """State persistence for the Consciousness daemon using SQLite."""
 
 import json
+import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from enum import Enum
@@ -10,6 +11,10 @@ from typing import Any, AsyncIterator
 import aiosqlite
 from pydantic import BaseModel, Field
 
+from .llm_metrics import percentile
+
+logger = logging.getLogger(__name__)
+
 
 class EventType(str, Enum):
     """Types of events tracked by the daemon."""
@@ -31,6 +36,7 @@ class Event(BaseModel):
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     data: dict[str, Any] = Field(default_factory=dict)
     context: dict[str, Any] = Field(default_factory=dict)
+    root: str = ""
 
 
 class ThoughtRecord(BaseModel):
@@ -43,6 +49,11 @@ class ThoughtRecord(BaseModel):
     confidence: float = 0.0
     tokens_used: int = 0
     latency_ms: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    first_token_ms: float | None = None
+    cached: bool = False  # Decision reused from the decision cache
+    root: str = ""
 
 
 class ActionRecord(BaseModel):
@@ -55,6 +66,7 @@ class ActionRecord(BaseModel):
     result: str = ""
     success: bool = False
     thought_id: int | None = None
+    root: str = ""
 
 
 class StateManager:
@@ -114,6 +126,15 @@ class StateManager:
                     snapshot TEXT NOT NULL
                 );
 
+                CREATE TABLE IF NOT EXISTS file_manifest (
+                    root TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    hash TEXT DEFAULT '',
+                    PRIMARY KEY (root, path)
+                );
+
                 CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type);
                 CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp);
                 CREATE INDEX IF NOT EXISTS idx_thoughts_timestamp ON thoughts(timestamp);
@@ -122,6 +143,47 @@ class StateManager:
             )
             await conn.commit()
 
+        await self._migrate_schema()
+
+        async with self.connection() as conn:
+            await conn.execute("CREATE INDEX IF NOT EXISTS idx_events_root ON events(root)")
+            await conn.commit()
+
+    async def _migrate_schema(self) -> None:
+        """Add columns introduced after the initial schema to existing databases."""
+        new_columns = {
+            "events": [("root", "TEXT DEFAULT ''")],
+            "thoughts": [
+                ("root", "TEXT DEFAULT ''"),
+                ("prompt_tokens", "INTEGER DEFAULT 0"),
+                ("completion_tokens", "INTEGER DEFAULT 0"),
+                ("first_token_ms", "REAL"),
+                ("cached", "INTEGER DEFAULT 0"),
+            ],
+            "actions": [("root", "TEXT DEFAULT ''")],
+        }
+
+        async with self.connection() as conn:
+            migrations_needed = []
+            for table, columns in new_columns.items():
+                cursor = await conn.execute(f"PRAGMA table_info({table})")
+                existing_columns = {row[1] for row in await cursor.fetchall()}
+                for column_name, column_def in columns:
+                    if column_name not in existing_columns:
+                        migrations_needed.append(
+                            f"ALTER TABLE {table} ADD COLUMN {column_name} {column_def}"
+                        )
+
+            for migration in migrations_needed:
+                try:
+                    await conn.execute(migration)
+                    logger.info(f"Schema migration executed: {migration}")
+                except Exception as e:
+                    logger.warning(f"Migration skipped (may already exist): {e}")
+
+            if migrations_needed:
+                await conn.commit()
+
     async def close(self) -> None:
         """Close the database connection."""
         if self._connection is not None:
@@ -133,14 +195,15 @@ class StateManager:
         async with self.connection() as conn:
             cursor = await conn.execute(
                 """
-                INSERT INTO events (event_type, timestamp, data, context)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO events (event_type, timestamp, data, context, root)
+                VALUES (?, ?, ?, ?, ?)
                 """,
                 (
                     event.event_type.value,
                     event.timestamp.isoformat(),
                     json.dumps(event.data),
                     json.dumps(event.context),
+                    event.root,
                 ),
             )
             await conn.commit()
@@ -151,8 +214,11 @@ class StateManager:
         async with self.connection() as conn:
             cursor = await conn.execute(
                 """
-                INSERT INTO thoughts (timestamp, prompt, response, confidence, tokens_used, latency_ms)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO thoughts (
+                    timestamp, prompt, response, confidence, tokens_used, latency_ms,
+                    prompt_tokens, completion_tokens, first_token_ms, cached, root
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     thought.timestamp.isoformat(),
@@ -161,6 +227,11 @@ class StateManager:
                     thought.confidence,
                     thought.tokens_used,
                     thought.latency_ms,
+                    thought.prompt_tokens,
+                    thought.completion_tokens,
+                    thought.first_token_ms,
+                    int(thought.cached),
+                    thought.root,
                 ),
             )
             await conn.commit()
@@ -171,8 +242,8 @@ class StateManager:
         async with self.connection() as conn:
             cursor = await conn.execute(
                 """
-                INSERT INTO actions (timestamp, action_type, command, result, success, thought_id)
-                VALUES (?, ?, ?, ?, ?, ?)
+                INSERT INTO actions (timestamp, action_type, command, result, success, thought_id, root)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     action.timestamp.isoformat(),
@@ -181,35 +252,39 @@ class StateManager:
                     action.result,
                     1 if action.success else 0,
                     action.thought_id,
+                    action.root,
                 ),
             )
             await conn.commit()
             return cursor.lastrowid or 0
 
     async def get_recent_events(
-        self, limit: int = 100, event_type: EventType | None = None
+        self,
+        limit: int = 100,
+        event_type: EventType | None = None,
+        root: str | None = None,
     ) -> list[Event]:
-        """Get recent events from the database."""
+        """Get recent events from the database, optionally for one root."""
+        conditions = []
+        params: list[Any] = []
+        if event_type:
+            conditions.append("event_type = ?")
+            params.append(event_type.value)
+        if root is not None:
+            conditions.append("root = ?")
+            params.append(root)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
         async with self.connection() as conn:
-            if event_type:
-                cursor = await conn.execute(
-                    """
-                    SELECT * FROM events
-                    WHERE event_type = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                    """,
-                    (event_type.value, limit),
-                )
-            else:
-                cursor = await conn.execute(
-                    """
-                    SELECT * FROM events
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                    """,
-                    (limit,),
-                )
+            cursor = await conn.execute(
+                f"""
+                SELECT * FROM events
+                {where}
+                ORDER BY timestamp DESC
+                LIMIT ?
+                """,
+                (*params, limit),
+            )
 
             rows = await cursor.fetchall()
             return [
@@ -219,6 +294,7 @@ class StateManager:
                     timestamp=datetime.fromisoformat(row["timestamp"]),
                     data=json.loads(row["data"]),
                     context=json.loads(row["context"]),
+                    root=row["root"] or "",
                 )
                 for row in rows
             ]
@@ -244,6 +320,11 @@ class StateManager:
                     confidence=row["confidence"],
                     tokens_used=row["tokens_used"],
                     latency_ms=row["latency_ms"],
+                    prompt_tokens=row["prompt_tokens"] or 0,
+                    completion_tokens=row["completion_tokens"] or 0,
+                    first_token_ms=row["first_token_ms"],
+                    cached=bool(row["cached"]),
+                    root=row["root"] or "",
                 )
                 for row in rows
             ]
@@ -269,6 +350,7 @@ class StateManager:
                     result=row["result"],
                     success=bool(row["success"]),
                     thought_id=row["thought_id"],
+                    root=row["root"] or "",
                 )
                 for row in rows
             ]
@@ -301,6 +383,39 @@ class StateManager:
                 return json.loads(row["snapshot"])
             return None
 
+    async def load_manifest(self, root: str) -> list[tuple[str, int, int, str]]:
+        """Load the file manifest for a watched root as (path, size, mtime_ns, hash)."""
+        async with self.connection() as conn:
+            cursor = await conn.execute(
+                "SELECT path, size, mtime_ns, hash FROM file_manifest WHERE root = ?",
+                (root,),
+            )
+            rows = await cursor.fetchall()
+            return [(row[0], row[1], row[2], row[3] or "") for row in rows]
+
+    async def save_manifest(
+        self,
+        root: str,
+        upserts: list[tuple[str, int, int, str]],
+        deletions: list[str] | None = None,
+    ) -> None:
+        """Insert/update and delete file manifest entries for a watched root."""
+        async with self.connection() as conn:
+            if upserts:
+                await conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO file_manifest (root, path, size, mtime_ns, hash)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [(root, *entry) for entry in upserts],
+                )
+            if deletions:
+                await conn.executemany(
+                    "DELETE FROM file_manifest WHERE root = ? AND path = ?",
+                    [(root, path) for path in deletions],
+                )
+            await conn.commit()
+
     async def get_statistics(self) -> dict[str, Any]:
         """Get database statistics."""
         async with self.connection() as conn:
@@ -334,8 +449,46 @@ class StateManager:
             rows = await cursor.fetchall()
             stats["events_by_type"] = {row["event_type"]: row["count"] for row in rows}
 
+            cursor = await conn.execute(
+                """
+                SELECT root, COUNT(*) as count
+                FROM events
+                GROUP BY root
+                """
+            )
+            rows = await cursor.fetchall()
+            stats["events_by_root"] = {row["root"] or "": row["count"] for row in rows}
+
             return stats
 
+    async def get_thought_usage_stats(self, limit: int = 500) -> dict[str, Any]:
+        """
+        Token and latency percentiles over the most recent thoughts.
+
+        Thoughts answered from the decision cache are counted separately
+        and left out of the percentiles.
+        """
+        async with self.connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT prompt_tokens, completion_tokens, latency_ms, first_token_ms, cached
+                FROM thoughts
+                WHERE latency_ms > 0 OR cached = 1
+                ORDER BY timestamp DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
+            all_rows = await cursor.fetchall()
+
+        rows = [row for row in all_rows if not row["cached"]]
+        columns = ("prompt_tokens", "completion_tokens", "latency_ms", "first_token_ms")
+        stats: dict[str, Any] = {"thoughts": len(rows), "cached": len(all_rows) - len(rows)}
+        for column in columns:
+            values = [row[column] for row in rows if row[column] is not None]
+            stats[column] = {f"p{q}": percentile(values, q) for q in (50, 90, 99)}
+        return stats
+
     async def cleanup_old_entries(self, max_entries: int = 10000) -> int:
         """Remove old entries exceeding the maximum."""
         deleted = 0
@@ -0,0 +1,121 @@
+"""
+Tests for ActionPipeline (Pipelined action execution)
+
+Tests cover:
+- Submitting without waiting for the action
+- Bounded in-flight depth
+- Actions on the same paths running one after another
+- Waiting for actions before deciding about their paths
+- The per-cycle action budget
+- Releasing the slot of an action cancelled before it started
+"""
+
+import asyncio
+
+from consciousness.action_pipeline import ActionPipeline
+
+
+class Recorder:
+    """Actions that log when they start and finish."""
+
+    def __init__(self):
+        self.events: list[str] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def action(self, name: str, seconds: float = 0.05) -> str:
+        self.events.append(f"start {name}")
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(seconds)
+        self.running -= 1
+        self.events.append(f"end {name}")
+        return name
+
+
+class TestActionPipeline:
+    """Test scheduling of background actions."""
+
+    async def test_submit_returns_before_action_finishes(self, tmp_path):
+        """The loop should be free to decide again while the action runs."""
+        pipeline = ActionPipeline()
+        recorder = Recorder()
+
+        task = await pipeline.submit([tmp_path / "a.py"], recorder.action("a", 0.1))
+        assert task is not None and not task.done()
+        assert pipeline.in_flight == 1
+
+        await pipeline.drain()
+        assert await task == "a"
+        assert pipeline.in_flight == 0
+        assert pipeline.get_stats()["completed"] == 1
+
+    async def test_bounded_depth(self, tmp_path):
+        """No more than max_in_flight actions should run at once."""
+        pipeline = ActionPipeline(max_in_flight=2, max_actions_per_cycle=10)
+        recorder = Recorder()
+
+        for name in "abcd":
+            await pipeline.submit([tmp_path / f"{name}.py"], recorder.action(name))
+        await pipeline.drain()
+
+        assert recorder.max_running == 2
+        assert pipeline.get_stats()["slot_waits"] >= 1
+
+    async def test_conflicting_paths_serialized(self, tmp_path):
+        """Actions touching the same file run in submission order."""
+        pipeline = ActionPipeline(max_in_flight=3)
+        recorder = Recorder()
+
+        await pipeline.submit([tmp_path / "docs" / "a.md"], recorder.action("first"))
+        await pipeline.submit([tmp_path / "b.py"], recorder.action("other", 0.01))
+        # A directory overlaps the files inside it
+        await pipeline.submit([tmp_path / "docs"], recorder.action("second"))
+        await pipeline.drain()
+
+        assert recorder.events.index("end first") < recorder.events.index("start second")
+        assert recorder.events.index("start other") < recorder.events.index("end first")
+        assert pipeline.get_stats()["conflicts"] == 1
+
+    async def test_wait_for_paths(self, tmp_path):
+        """Deciding about an action's files should wait for the action."""
+        pipeline = ActionPipeline()
+        recorder = Recorder()
+        await pipeline.submit([tmp_path / "a.py"], recorder.action("a"))
+
+        assert not await pipeline.wait_for_paths([tmp_path / "b.py"])
+        assert "end a" not in recorder.events
+        assert await pipeline.wait_for_paths([tmp_path / "a.py"])
+        assert recorder.events == ["start a", "end a"]
+
+    async def test_cycle_budget(self, tmp_path):
+        """At most max_actions_per_cycle actions start until the next cycle."""
+        pipeline = ActionPipeline(max_in_flight=5, max_actions_per_cycle=2)
+        recorder = Recorder()
+        pipeline.begin_cycle()
+
+        assert await pipeline.submit([], recorder.action("a", 0))
+        assert await pipeline.submit([], recorder.action("b", 0))
+        assert pipeline.cycle_budget == 0
+        assert await pipeline.submit([], recorder.action("c", 0)) is None
+
+        pipeline.begin_cycle()
+        assert pipeline.cycle_budget == 2
+        await pipeline.drain()
+        assert "start c" not in recorder.events
+
+    async def test_cancelled_before_start_releases_slot(self, tmp_path):
+        """An action cancelled before it ran gives its slot back."""
+        pipeline = ActionPipeline(max_in_flight=1, max_actions_per_cycle=10)
+        recorder = Recorder()
+
+        task = await pipeline.submit([tmp_path / "a.py"], recorder.action("a"))
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert recorder.events == []
+        assert pipeline.in_flight == 0
+
+        second = await asyncio.wait_for(
+            pipeline.submit([tmp_path / "b.py"], recorder.action("b")), timeout=1
+        )
+        assert await second == "b"
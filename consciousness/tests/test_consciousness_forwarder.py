@@ -1,7 +1,8 @@
 """Tests for the ConsciousnessForwarder module."""
 
+import time
+
 import pytest
-from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, patch, MagicMock
 
 from consciousness.consciousness_forwarder import (
@@ -155,7 +156,7 @@ class TestGuidanceCache:
 
         # Manually expire by modifying internal state
         key = cache._make_key(QuestionType.APPROACH, "context")
-        cache._cache[key] = (guidance, datetime.now() - timedelta(seconds=2))
+        cache._cache[key] = (guidance, time.monotonic() - 1)
 
         result = cache.get(QuestionType.APPROACH, "context")
         assert result is None
@@ -211,6 +212,70 @@ class TestGuidanceCache:
         assert stats["max_entries"] == 50
         assert stats["ttl_seconds"] == 1800
 
+    def test_cache_normalizes_context(self):
+        """Whitespace-only differences should share an entry."""
+        cache = GuidanceCache()
+        guidance = ConsciousnessGuidance(
+            question_type=QuestionType.APPROACH,
+            guidance="Test",
+            confidence=0.8,
+        )
+
+        cache.put(QuestionType.APPROACH, "Refactor  the\n  parser ", guidance)
+        assert cache.get(QuestionType.APPROACH, "Refactor the parser") is not None
+        assert cache.get(QuestionType.RISK, "Refactor the parser") is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    async def test_cache_persistent_tier(self, tmp_path):
+        """Entries should survive a restart through the SQLite tier."""
+        db_path = tmp_path / "guidance.db"
+        cache = GuidanceCache(max_entries=1, db_path=db_path)
+        for i in range(2):
+            await cache.store(
+                QuestionType.APPROACH,
+                f"context{i}",
+                ConsciousnessGuidance(
+                    question_type=QuestionType.APPROACH,
+                    guidance=f"Guidance {i}",
+                    confidence=0.8,
+                ),
+            )
+        assert cache.stats()["evictions"] == 1
+
+        # The evicted entry comes back from disk (get() only sees memory)
+        assert cache.get(QuestionType.APPROACH, "context0") is None
+        assert (await cache.fetch(QuestionType.APPROACH, "context0")).guidance == "Guidance 0"
+        cache.close()
+
+        restarted = GuidanceCache(db_path=db_path)
+        retrieved = await restarted.fetch(QuestionType.APPROACH, "context1")
+        assert retrieved.guidance == "Guidance 1"
+        assert retrieved.question_type == QuestionType.APPROACH
+
+        stats = restarted.stats()
+        assert stats["disk_hits"] == 1 and stats["disk_entries"] == 2
+        assert restarted.clear() == 1
+        assert await restarted.fetch(QuestionType.APPROACH, "context0") is None
+        restarted.close()
+
+    async def test_cache_disk_pruned_periodically(self, tmp_path):
+        """The disk tier is pruned to max_disk_entries every prune_interval writes."""
+        cache = GuidanceCache(db_path=tmp_path / "guidance.db", max_disk_entries=20)
+        assert cache.prune_interval == 2
+        guidance = ConsciousnessGuidance(
+            question_type=QuestionType.APPROACH, guidance="Guidance", confidence=0.8
+        )
+
+        for i in range(21):
+            await cache.store(QuestionType.APPROACH, f"context{i}", guidance)
+        assert cache.stats()["disk_entries"] == 21  # Next prune on the 22nd write
+
+        await cache.store(QuestionType.APPROACH, "context21", guidance)
+        assert cache.stats()["disk_entries"] == 20
+        cache.close()
+
 
 class TestForwarderConfig:
     """Tests for ForwarderConfig."""
@@ -0,0 +1,155 @@
+"""
+Tests for DecisionCache (Decision reuse for repeated observations)
+
+Tests cover:
+- Fingerprint normalization of timestamps, relative times and counters
+- TTL expiry, LRU eviction and invalidation
+- AutonomousEngine skipping the LLM call on a hit
+- Cache hits recorded in the thoughts table
+"""
+
+from consciousness.decision.cache import DecisionCache, normalize_observation
+from consciousness.decision.engine import AutonomousEngine
+from consciousness.llm_metrics import LLMUsage
+from consciousness.state import StateManager, ThoughtRecord
+from consciousness.thinker import Decision, DecisionType
+
+
+OBSERVATION = """=== FILE SYSTEM OBSERVATION ===
+Timestamp: {time}
+Total changes: 1
+
+MODIFIED (1 files):
+  ~ index.md
+"""
+
+
+def _decision(success: bool = True) -> Decision:
+    return Decision(
+        observation_summary="index.md modified",
+        decision=DecisionType.WAIT,
+        reasoning="Index regenerated, nothing to do",
+        confidence=0.9,
+        usage=LLMUsage(source="thinker", prompt_tokens=100, latency_ms=50.0, success=success),
+    )
+
+
+class CountingThinker:
+    """Thinker stand-in that counts LLM calls."""
+
+    def __init__(self, success: bool = True):
+        self.calls = 0
+        self.success = success
+
+    async def think_autonomous(self, observations, git_status, learned_patterns, context, **kwargs):
+        self.calls += 1
+        return _decision(self.success)
+
+
+class TestFingerprint:
+    """Test input normalization."""
+
+    def test_volatile_parts_ignored(self):
+        """Timestamps, commit ages and cycle counters should not matter."""
+        first = DecisionCache.fingerprint(
+            OBSERVATION.format(time="2026-01-01 10:00:00"),
+            'abc123 - "Update" (5 minutes ago)',
+            ["b", "a"],
+            {"cycle": 1, "total_actions": 0, "root": "main"},
+        )
+        second = DecisionCache.fingerprint(
+            OBSERVATION.format(time="2026-01-01 10:07:30"),
+            'abc123 - "Update" (12 minutes ago)',
+            ["a", "b"],
+            {"cycle": 9, "total_actions": 4, "root": "main"},
+        )
+        assert first == second
+        assert "Timestamp" not in normalize_observation(OBSERVATION.format(time="now"))
+
+    def test_situation_changes_key(self):
+        """Different files, patterns or roots should give different keys."""
+        base = DecisionCache.fingerprint("~ index.md", "", ["a"], {"root": "main"})
+        assert base != DecisionCache.fingerprint("~ test_x.py", "", ["a"], {"root": "main"})
+        assert base != DecisionCache.fingerprint("~ index.md", "", ["b"], {"root": "main"})
+        assert base != DecisionCache.fingerprint("~ index.md", "", ["a"], {"root": "other"})
+
+
+class TestDecisionCache:
+    """Test cache bounds and invalidation."""
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Entries older than the TTL should be dropped."""
+        now = [1000.0]
+        monkeypatch.setattr("consciousness.decision.cache.time.monotonic", lambda: now[0])
+        cache = DecisionCache(ttl_seconds=60)
+        cache.put("k", _decision())
+
+        now[0] += 30
+        assert cache.get("k") is not None
+        now[0] += 31
+        assert cache.get("k") is None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_lru_eviction_and_invalidate(self):
+        """The least recently used entry goes first; invalidate drops all."""
+        cache = DecisionCache(max_entries=2)
+        cache.put("a", _decision())
+        cache.put("b", _decision())
+        cache.get("a")
+        cache.put("c", _decision())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.invalidate("knowledge_changed") == 2
+        assert len(cache) == 0
+        assert cache.get_stats()["last_invalidation_reason"] == "knowledge_changed"
+
+
+class TestEngineCaching:
+    """Test the cache in AutonomousEngine.decide."""
+
+    async def test_repeat_skips_llm(self, tmp_path):
+        """An identical situation should reuse the decision without an LLM call."""
+        thinker = CountingThinker()
+        engine = AutonomousEngine(thinker, working_dir=tmp_path, decision_cache=DecisionCache())
+
+        first = await engine.decide(
+            OBSERVATION.format(time="2026-01-01 10:00:00"), additional_context={"cycle": 1}
+        )
+        second = await engine.decide(
+            OBSERVATION.format(time="2026-01-01 10:01:00"), additional_context={"cycle": 2}
+        )
+
+        assert thinker.calls == 1
+        assert not first.cached and first.usage is not None
+        assert second.cached and second.usage is None
+        assert second.reasoning == first.reasoning
+        assert engine.get_statistics()["decision_cache"]["hits"] == 1
+
+    async def test_failed_calls_not_cached(self, tmp_path):
+        """Fallback decisions from failed LLM calls should not be reused."""
+        thinker = CountingThinker(success=False)
+        engine = AutonomousEngine(thinker, working_dir=tmp_path, decision_cache=DecisionCache())
+
+        await engine.decide("~ index.md")
+        await engine.decide("~ index.md")
+        assert thinker.calls == 2
+
+
+async def test_cached_thoughts_recorded(tmp_path):
+    """Cache hits should be marked and kept out of the latency percentiles."""
+    state = StateManager(tmp_path / "state.db")
+    await state.initialize()
+    try:
+        await state.record_thought(ThoughtRecord(prompt="p", response="r", latency_ms=80.0))
+        await state.record_thought(ThoughtRecord(prompt="p", response="r", cached=True))
+
+        thoughts = await state.get_recent_thoughts()
+        assert sorted(t.cached for t in thoughts) == [False, True]
+
+        stats = await state.get_thought_usage_stats()
+        assert stats["thoughts"] == 1
+        assert stats["cached"] == 1
+        assert stats["latency_ms"]["p50"] == 80.0
+    finally:
+        await state.close()
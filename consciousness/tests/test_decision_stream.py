@@ -0,0 +1,182 @@
+"""
+Tests for DecisionStreamParser (Early-exit streamed decisions)
+
+Tests cover:
+- Incremental parsing of top-level members across chunk boundaries
+- Stopping on "wait" and on confidence below min_confidence
+- Action type callback before the decision is complete
+- Stopping before the reasoning in schema-ordered output
+- Falling back to the full parser for channel formats
+- think_autonomous cancelling generation and reporting savings
+"""
+
+import json
+from types import SimpleNamespace
+
+from consciousness.thinker import (
+    ActionType,
+    ConsciousnessThinker,
+    DecisionStreamParser,
+    DecisionType,
+    decision_json_schema,
+)
+
+
+WAIT_RESPONSE = (
+    '```json\n{"observation_summary": "index.md {regenerated}", '
+    '"reasoning": "Routine \\"rebuild\\", nothing to do", '
+    '"decision": "wait", "confidence": 0.95, "expected_outcome": "Nothing"}\n```'
+)
+
+ACT_RESPONSE = (
+    '{"observation_summary": "New module", "reasoning": "Needs tests", '
+    '"decision": "act", "action": {"type": "claude_code", "description": "Write tests", '
+    '"details": {"prompt": "Add tests"}, "priority": "high"}, '
+    '"confidence": 0.9, "expected_outcome": "Tests exist"}'
+)
+
+
+def _chunks(text: str, size: int = 7) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestDecisionStreamParser:
+    """Test incremental parsing."""
+
+    def test_stops_on_wait(self):
+        """Generation can stop once the wait decision is complete."""
+        parser = DecisionStreamParser()
+        fed = ""
+        for chunk in _chunks(WAIT_RESPONSE):
+            fed += chunk
+            if parser.feed(chunk):
+                break
+
+        assert parser.stop_reason == "wait"
+        assert '"confidence"' not in fed
+        decision = parser.decision()
+        assert decision.decision == DecisionType.WAIT
+        assert decision.reasoning == 'Routine "rebuild", nothing to do'
+
+    def test_low_confidence_and_action_type(self):
+        """The action type is reported early; low confidence stops generation."""
+        seen = []
+        fed = ""
+
+        def on_action_type(action_type):
+            seen.append((action_type, fed))
+
+        parser = DecisionStreamParser(min_confidence=0.95, on_action_type=on_action_type)
+        for chunk in _chunks(ACT_RESPONSE):
+            fed += chunk
+            if parser.feed(chunk):
+                break
+
+        # Known before the rest of the action was generated
+        (action_type, fed_then), = seen
+        assert action_type == ActionType.CLAUDE_CODE
+        assert '"priority"' not in fed_then
+        assert parser.stop_reason == "low_confidence"
+        assert parser.decision().action.details == {"prompt": "Add tests"}
+
+    def test_act_runs_to_completion(self):
+        """Confident act decisions are never cut short."""
+        parser = DecisionStreamParser(min_confidence=0.7)
+        assert not any(parser.feed(chunk) for chunk in _chunks(ACT_RESPONSE))
+        assert parser.closed
+        assert parser.fields["expected_outcome"] == "Tests exist"
+
+    def test_schema_order_stops_before_reasoning(self):
+        """Output in schema order stops before the reasoning is generated."""
+        values = {
+            "decision": "wait", "action": None, "confidence": 0.9,
+            "expected_outcome": "Nothing", "observation_summary": "index.md regenerated",
+            "reasoning": "Routine rebuild, " * 50,
+        }
+        text = json.dumps({name: values[name] for name in decision_json_schema()["properties"]})
+
+        parser = DecisionStreamParser()
+        fed = ""
+        for chunk in _chunks(text):
+            fed += chunk
+            if parser.feed(chunk):
+                break
+
+        assert parser.stop_reason == "wait"
+        assert '"reasoning"' not in fed
+        assert len(fed) < len(text) // 4
+
+    def test_channel_format_disables(self):
+        """Channel-formatted output is left to the full parser."""
+        parser = DecisionStreamParser()
+        assert not parser.feed('<|channel|>analysis<|message|>{"decision": "wait", "x": 1}')
+        assert parser.failed and not parser.stop_reason
+
+
+class FakeStream:
+    def __init__(self, text: str):
+        self.text = text
+        self.sent = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for chunk in _chunks(self.text):
+            self.sent += 1
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=chunk))], usage=None
+            )
+        yield SimpleNamespace(
+            choices=[], usage=SimpleNamespace(prompt_tokens=500, completion_tokens=80)
+        )
+
+    async def close(self):
+        self.closed = True
+
+
+class TestThinkerEarlyExit:
+    """Test early exit in think_autonomous."""
+
+    async def test_cancels_and_reports_savings(self):
+        """A wait decision should close the stream and estimate what was saved."""
+        thinker = ConsciousnessThinker(early_exit=True, min_confidence=0.7)
+        streams = []
+
+        async def create(**kwargs):
+            streams.append(FakeStream(ACT_RESPONSE if len(streams) == 0 else WAIT_RESPONSE))
+            return streams[-1]
+
+        thinker.client.chat.completions.create = create
+
+        full = await thinker.think_autonomous("new module")
+        assert full.decision == DecisionType.ACT and full.early_exit is None
+        assert full.usage.completion_tokens == 80
+
+        waited = await thinker.think_autonomous("index rebuilt")
+        assert waited.decision == DecisionType.WAIT
+        assert streams[1].closed
+        assert streams[1].sent < len(_chunks(WAIT_RESPONSE))
+        assert waited.early_exit.reason == "wait"
+        assert waited.early_exit.tokens_saved == 80 - waited.usage.completion_tokens
+        assert waited.usage.estimated
+
+        stats = thinker.get_early_exit_stats()
+        assert stats["by_reason"] == {"wait": 1}
+        assert stats["tokens_saved"] == waited.early_exit.tokens_saved
+
+    async def test_disabled_by_default(self):
+        """Without early_exit the whole completion is read."""
+        thinker = ConsciousnessThinker()
+        stream = FakeStream(WAIT_RESPONSE)
+
+        async def create(**kwargs):
+            return stream
+
+        thinker.client.chat.completions.create = create
+        decision = await thinker.think_autonomous("index rebuilt", on_action_type=lambda t: None)
+
+        assert not stream.closed
+        assert decision.early_exit is None
+        assert decision.expected_outcome == "Nothing"
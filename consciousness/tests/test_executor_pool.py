@@ -0,0 +1,144 @@
+"""
+Tests for ExecutorPool (Concurrent action execution)
+
+Tests cover:
+- Per executor type concurrency limits
+- Research and custom actions counted as the executor they run on
+- Path locks between runs touching the same files or directories
+- Splitting a batch into one group per change category
+- Evaluating category groups concurrently in process_batch
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+from consciousness.daemon import AutonomousExecutor
+from consciousness.decision import DecisionEngine, EngineDecision, split_by_category
+from consciousness.executor import Action, ActionType, ExecutorPool
+from consciousness.thinker import Action as ThinkerAction
+from consciousness.thinker import ActionType as ThinkerActionType
+from consciousness.watcher import FileChange
+
+
+class Recorder:
+    """Work that logs how many runs of each kind overlap."""
+
+    def __init__(self):
+        self.events: list[str] = []
+        self.running: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    async def work(self, kind: str, name: str, seconds: float = 0.03) -> str:
+        self.events.append(f"start {name}")
+        self.running[kind] = self.running.get(kind, 0) + 1
+        self.peak[kind] = max(self.peak.get(kind, 0), self.running[kind])
+        await asyncio.sleep(seconds)
+        self.running[kind] -= 1
+        self.events.append(f"end {name}")
+        return name
+
+
+def _change(name: str) -> FileChange:
+    return FileChange(f"/repo/{name}", "modified", time.time(), relative_path=name)
+
+
+class TestExecutorPool:
+    """Test scheduling in the executor pool."""
+
+    async def test_type_limits(self, tmp_path):
+        """Each executor type stays within its limit; other types share the pool."""
+        pool = ExecutorPool(tmp_path, max_concurrent=6, limits={"claude_flow": 1, "claude_code": 2})
+        recorder = Recorder()
+
+        runs = [
+            pool.run(f"{kind}-{i}", recorder.work(kind, f"{kind}-{i}"), executor_type=kind)
+            for kind in ("claude_flow", "claude_code", "write_file")
+            for i in range(3)
+        ]
+        results = await asyncio.gather(*runs)
+
+        assert len(results) == 9
+        assert recorder.peak == {"claude_flow": 1, "claude_code": 2, "write_file": 3}
+        stats = pool.get_stats()
+        assert stats["completed"] == 9 and stats["running"] == 0
+        assert stats["type_waits"] > 0
+
+    async def test_action_executor_types(self, tmp_path):
+        """Actions are limited as the executor they actually run on."""
+        executor = AutonomousExecutor(tmp_path)
+
+        def executor_type(action_type):
+            action = ThinkerAction(type=action_type, description="x")
+            return executor.executor_type(EngineDecision(should_act=True, action=action))
+
+        assert executor_type(ThinkerActionType.RESEARCH) == "claude_flow"
+        assert executor_type(ThinkerActionType.CUSTOM) == "claude_code"
+        assert executor_type(ThinkerActionType.CLAUDE_CODE) == "claude_code"
+        assert executor_type(ThinkerActionType.WRITE_FILE) == "write_file"
+
+        pool = ExecutorPool(tmp_path, limits={"claude_flow": 1})
+        seen = []
+
+        async def execute(action):
+            seen.append(pool.get_stats()["running_by_type"])
+            return None
+
+        pool._executor.execute = execute
+        await pool.execute("research", Action(type=ActionType.RESEARCH, details={"query": "x"}))
+        assert seen == [{"claude_flow": 1}]
+
+    async def test_path_locks(self, tmp_path):
+        """Runs on the same path, or inside a locked directory, never overlap."""
+        pool = ExecutorPool(tmp_path, max_concurrent=4)
+        recorder = Recorder()
+
+        await asyncio.gather(
+            pool.run("a", recorder.work("direct", "a"), paths=[tmp_path / "docs"]),
+            pool.run("b", recorder.work("direct", "b"), paths=[tmp_path / "docs" / "x.md"]),
+            pool.run("c", recorder.work("direct", "c"), paths=[tmp_path / "src" / "y.py"]),
+        )
+
+        assert recorder.events.index("end a") < recorder.events.index("start b")
+        assert recorder.events.index("start c") < recorder.events.index("end a")
+        assert pool.get_stats()["path_waits"] == 1
+        assert pool.get_stats()["paths_locked"] == 0
+
+
+class TestParallelDecisions:
+    """Test deciding about unrelated changes separately."""
+
+    def test_split_by_category(self):
+        """One group per category up to max_groups; noise and overflow are kept."""
+        changes = [
+            _change("src/app.py"),
+            _change("docs/guide.md"),
+            _change("settings.yaml"),
+            _change("build.log"),
+        ]
+
+        groups = split_by_category(changes, max_groups=2)
+        assert len(groups) == 2
+        assert sorted(c.relative_path for g in groups for c in g) == sorted(
+            c.relative_path for c in changes
+        )
+        assert "build.log" in [c.relative_path for c in groups[0]]
+
+        assert split_by_category(changes, max_groups=1) == [changes]
+        assert split_by_category(changes[:1], max_groups=3) == [changes[:1]]
+
+    async def test_process_batch_concurrent(self):
+        """Category groups are evaluated at the same time."""
+        engine = DecisionEngine(thinker=MagicMock())
+
+        async def process(changes):
+            await asyncio.sleep(0.1)
+            return EngineDecision(should_act=True, reasoning=changes[0].relative_path)
+
+        engine.process = process
+        changes = [_change("src/app.py"), _change("docs/guide.md"), _change("settings.yaml")]
+
+        start = time.monotonic()
+        decisions = await engine.process_batch(changes, max_decisions=2)
+        assert time.monotonic() - start < 0.25
+        assert len(decisions) == 2
@@ -0,0 +1,168 @@
+"""
+Tests for FileAccessService (Size-aware file reading)
+
+Tests cover:
+- Full reads below the size cap
+- Head/tail windows for oversized files
+- Multi-byte characters at window boundaries
+- Files truncated while being read
+- Cache hits and invalidation on change
+- Shared concurrent reads
+- DecisionEngine prompt content windowing
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from consciousness.file_access import (
+    OMISSION_MARKER,
+    FileAccessService,
+    read_file_window,
+)
+
+
+@pytest.fixture
+def service():
+    """Create a service with a 1 KB cap."""
+    svc = FileAccessService(max_file_size_kb=1)
+    yield svc
+    svc.close()
+
+
+class TestReadFileWindow:
+    """Test the blocking window reader."""
+
+    def test_small_file_read_completely(self, tmp_path):
+        """Files under the cap should be returned as-is."""
+        path = tmp_path / "small.md"
+        path.write_text("hello\nworld\n")
+
+        content = read_file_window(path, max_bytes=1024)
+        assert content.text == "hello\nworld\n"
+        assert not content.truncated
+        assert content.size == 12
+
+    def test_empty_file(self, tmp_path):
+        """Empty files should read as empty text."""
+        path = tmp_path / "empty.md"
+        path.write_text("")
+        assert read_file_window(path, max_bytes=10).text == ""
+
+    def test_large_file_windowed(self, tmp_path):
+        """Oversized files should keep the head and tail."""
+        path = tmp_path / "big.log"
+        path.write_text("H" * 1000 + "M" * 10_000 + "T" * 1000)
+
+        content = read_file_window(path, max_bytes=400, head_ratio=0.5)
+        assert content.truncated
+        assert content.text.startswith("H" * 200)
+        assert content.text.endswith("T" * 200)
+        assert content.omitted_bytes == 12_000 - 400
+        assert OMISSION_MARKER.format(omitted=content.omitted_bytes) in content.text
+
+    def test_window_does_not_split_characters(self, tmp_path):
+        """Windows should not produce replacement characters mid-file."""
+        path = tmp_path / "utf8.md"
+        path.write_text("ä" * 5000, encoding="utf-8")
+
+        content = read_file_window(path, max_bytes=101, head_ratio=0.5)
+        assert "�" not in content.text
+        assert content.text.replace(
+            OMISSION_MARKER.format(omitted=content.omitted_bytes), ""
+        ).strip("ä") == ""
+
+    def test_truncated_while_reading(self, tmp_path, monkeypatch):
+        """A file shrinking between stat and read reads short instead of failing."""
+        path = tmp_path / "shrinking.log"
+        path.write_text("x" * 10_000)
+        real_fstat = os.fstat
+
+        def fstat(fd):
+            st = real_fstat(fd)
+            os.truncate(path, 100)
+            return st
+
+        monkeypatch.setattr(os, "fstat", fstat)
+        content = read_file_window(path, max_bytes=1000)
+        assert content.truncated
+        assert content.text.startswith("x" * 100)
+
+
+class TestFileAccessService:
+    """Test the async service."""
+
+    async def test_missing_file_returns_none(self, service, tmp_path):
+        """Missing files should yield None, not raise."""
+        assert await service.read_text(tmp_path / "nope.md") is None
+
+    async def test_cap_applies(self, service, tmp_path):
+        """The configured cap should window large files."""
+        path = tmp_path / "big.md"
+        path.write_text("x" * 5000)
+
+        content = await service.read_text(path)
+        assert content.truncated
+        assert content.size == 5000
+
+        service.configure(max_file_size_kb=10)
+        assert not (await service.read_text(path)).truncated
+
+    async def test_cache_hit_and_change(self, service, tmp_path):
+        """Unchanged files should come from cache; changed ones re-read."""
+        path = tmp_path / "note.md"
+        path.write_text("one")
+
+        assert (await service.read_text(path)).text == "one"
+        assert (await service.read_text(path)).text == "one"
+        assert service.cache_hits == 1
+
+        path.write_text("two!")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert (await service.read_text(path)).text == "two!"
+        assert service.reads == 2
+
+    async def test_invalidate(self, service, tmp_path):
+        """Invalidated files should be read again."""
+        path = tmp_path / "note.md"
+        path.write_text("one")
+
+        await service.read_text(path)
+        service.invalidate(path)
+        await service.read_text(path)
+        assert service.reads == 2
+        assert service.cache_hits == 0
+
+    async def test_concurrent_reads_shared(self, service, tmp_path):
+        """Concurrent readers of one file should share a single read."""
+        path = tmp_path / "note.md"
+        path.write_text("shared")
+
+        results = await asyncio.gather(*(service.read_text(path) for _ in range(10)))
+        assert {r.text for r in results} == {"shared"}
+        assert service.reads == 1
+
+
+class TestDecisionEngineContent:
+    """Test prompt content reading in DecisionEngine."""
+
+    async def test_large_file_included_as_window(self, tmp_path):
+        """Large files should contribute head and tail, not a placeholder."""
+        from consciousness.decision.engine import DecisionEngine
+
+        (tmp_path / "big.md").write_text("start " + "x" * 100_000 + " end")
+        svc = FileAccessService()
+        try:
+            engine = DecisionEngine(
+                thinker=None, working_dir=tmp_path, max_content_bytes=1000, file_access=svc
+            )
+            text = await engine._read_file_content("big.md")
+        finally:
+            svc.close()
+
+        assert text.startswith("start ")
+        assert text.endswith(" end")
+        assert "bytes omitted" in text
+        assert await engine._read_file_content("missing.md") is None
@@ -0,0 +1,113 @@
+"""
+Tests for GeminiGateway (Shared Gemini SDK access)
+
+Tests cover:
+- Coalescing identical in-flight requests
+- Per-call deadlines
+- The rate limiter and the bounded thread pool
+- Executor and dreamer calls going through the gateway
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from consciousness.executor import ExecutionConfig, ExpandedExecutor
+from consciousness.gemini_gateway import FakeGeminiBackend, GeminiGateway
+from consciousness.learning.dreamer import GeminiLLMClient
+
+
+class TestGateway:
+    """Test request handling."""
+
+    async def test_identical_requests_coalesced(self):
+        """Identical prompts in flight share one backend call."""
+        backend = FakeGeminiBackend(reply=lambda r: r.prompt.upper(), delay=0.05)
+        gateway = GeminiGateway(backend)
+
+        results = await asyncio.gather(
+            gateway.generate("same"),
+            gateway.generate("same"),
+            gateway.generate("same"),
+            gateway.generate("same", temperature=0.9),
+        )
+
+        assert [r.text for r in results] == ["SAME"] * 4
+        assert len(backend.calls) == 2
+        stats = gateway.get_stats()
+        assert stats["requests"] == 4 and stats["coalesced"] == 2
+        assert stats["in_flight"] == 0
+
+        # Finished requests are not cached
+        await gateway.generate("same")
+        assert len(backend.calls) == 3
+        await gateway.close()
+
+    async def test_deadline(self):
+        """A slow call raises TimeoutError at the caller's deadline."""
+        gateway = GeminiGateway(FakeGeminiBackend(delay=0.3))
+
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await gateway.generate("slow", timeout=0.05)
+        assert time.monotonic() - start < 0.25
+        assert gateway.get_stats()["timeouts"] == 1
+        await gateway.close()
+
+    async def test_rate_limit(self):
+        """Requests beyond the burst are spaced out; waits past the deadline fail."""
+        backend = FakeGeminiBackend()
+        gateway = GeminiGateway(backend, requests_per_minute=600, burst=1)  # One per 0.1s
+
+        start = time.monotonic()
+        await asyncio.gather(*(gateway.generate(f"prompt {i}") for i in range(3)))
+        assert time.monotonic() - start >= 0.18
+        assert gateway.get_stats()["rate_limit_waits"] == 2
+
+        with pytest.raises(asyncio.TimeoutError):
+            await gateway.generate("no time left", timeout=0.01)
+        assert len(backend.calls) == 3
+        await gateway.close()
+
+    async def test_bounded_pool(self):
+        """No more SDK calls run at once than the pool has threads."""
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def reply(request):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.03)
+            with lock:
+                running[0] -= 1
+            return "ok"
+
+        gateway = GeminiGateway(FakeGeminiBackend(reply=reply), max_workers=2, requests_per_minute=0)
+        await asyncio.gather(*(gateway.generate(f"prompt {i}") for i in range(6)))
+        assert peak[0] == 2
+        await gateway.close()
+
+
+class TestCallers:
+    """Test that Gemini users go through the gateway."""
+
+    async def test_dreamer_and_executor(self, tmp_path, monkeypatch):
+        backend = FakeGeminiBackend(reply="insight")
+        gateway = GeminiGateway(backend)
+        monkeypatch.setattr("consciousness.executor.get_gemini_gateway", lambda: gateway)
+
+        client = GeminiLLMClient("gemini-1.5-pro")
+        client.gateway = gateway
+        assert await client.complete("Reflect on today", system="You are the dreamer") == "insight"
+
+        executor = ExpandedExecutor(tmp_path, ExecutionConfig())
+        result = await executor._execute_gemini_sdk("Analyze", "gemini-1.5-flash", timeout=5)
+        assert result.success and result.output == "insight"
+
+        dream, analyze = backend.calls
+        assert dream.system == "You are the dreamer" and dream.model == "gemini-1.5-pro"
+        assert analyze.temperature == 0.3 and analyze.safety_settings
+        await gateway.close()
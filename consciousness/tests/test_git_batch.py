@@ -0,0 +1,178 @@
+"""
+Tests for GitBatchPool (Persistent git cat-file workers)
+
+Tests cover:
+- Blob and commit lookups
+- Missing objects
+- Concurrent request multiplexing
+- Object cache behavior
+- Restart after worker failure
+- GitWatcher commit lookups and recent commits from the pool
+"""
+
+import asyncio
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from consciousness.git_batch import GitBatchPool, GitObject
+from consciousness.watcher_git import GitWatcher
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git executable not available"
+)
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a small repository with two commits."""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test User")
+
+    (tmp_path / "notes.md").write_text("first version\n")
+    _git(tmp_path, "add", "notes.md")
+    _git(tmp_path, "commit", "-q", "-m", "Add notes")
+
+    (tmp_path / "notes.md").write_text("second version\n")
+    _git(tmp_path, "commit", "-q", "-am", "Update notes\n\nLonger body")
+
+    return tmp_path
+
+
+class TestGitBatchPool:
+    """Test the cat-file worker pool."""
+
+    async def test_reads_blob_content(self, git_repo):
+        """Blob content should be returned for path revisions."""
+        pool = GitBatchPool(git_repo)
+        try:
+            obj = await pool.get_object("HEAD:notes.md")
+            assert obj.type == "blob"
+            assert obj.text() == "second version\n"
+
+            previous = await pool.get_object("HEAD~1:notes.md")
+            assert previous.text() == "first version\n"
+        finally:
+            await pool.close()
+
+    async def test_missing_object(self, git_repo):
+        """Unknown names should be reported as missing, not raise."""
+        pool = GitBatchPool(git_repo)
+        try:
+            obj = await pool.get_object("HEAD:does-not-exist.md")
+            assert isinstance(obj, GitObject)
+            assert obj.missing
+            assert obj.content is None
+        finally:
+            await pool.close()
+
+    async def test_info_has_no_content(self, git_repo):
+        """Metadata lookups should not carry object content."""
+        pool = GitBatchPool(git_repo)
+        try:
+            info = await pool.get_info("HEAD")
+            assert info.type == "commit"
+            assert info.oid == _git(git_repo, "rev-parse", "HEAD")
+            assert info.content is None
+        finally:
+            await pool.close()
+
+    async def test_concurrent_requests(self, git_repo):
+        """Many concurrent lookups should all resolve correctly."""
+        pool = GitBatchPool(git_repo, workers=2)
+        try:
+            names = ["HEAD:notes.md", "HEAD~1:notes.md", "HEAD:missing"] * 20
+            results = await asyncio.gather(*(pool.get_object(n) for n in names))
+
+            for name, obj in zip(names, results):
+                assert obj.name == name
+                if name == "HEAD:notes.md":
+                    assert obj.text() == "second version\n"
+                elif name == "HEAD~1:notes.md":
+                    assert obj.text() == "first version\n"
+                else:
+                    assert obj.missing
+
+            assert pool.get_stats()["workers"]["--batch"] <= 2
+        finally:
+            await pool.close()
+
+    async def test_cache_serves_repeat_lookups(self, git_repo):
+        """Repeated reads of the same object should hit the cache."""
+        pool = GitBatchPool(git_repo)
+        try:
+            await pool.get_object("HEAD:notes.md")
+            await pool.get_object("HEAD:notes.md")
+            assert pool.get_stats()["cache_hits"] >= 1
+        finally:
+            await pool.close()
+
+    async def test_cache_is_bounded(self, git_repo):
+        """The cache should evict least recently used objects."""
+        pool = GitBatchPool(git_repo, cache_size=1)
+        try:
+            await pool.get_object("HEAD:notes.md")
+            await pool.get_object("HEAD~1:notes.md")
+            assert pool.get_stats()["cache_size"] == 1
+        finally:
+            await pool.close()
+
+    async def test_restarts_dead_worker(self, git_repo):
+        """A killed worker should be replaced on the next request."""
+        pool = GitBatchPool(git_repo, workers=1)
+        try:
+            await pool.get_object("HEAD:notes.md")
+
+            worker = pool._workers["--batch-check"][0]
+            worker._proc.kill()
+            await worker._proc.wait()
+            await asyncio.sleep(0.05)
+
+            pool.clear_cache()
+            obj = await pool.get_object("HEAD~1:notes.md")
+            assert obj.text() == "first version\n"
+            assert pool.get_stats()["restarts"] >= 1
+        finally:
+            await pool.close()
+
+
+class TestGitWatcherObjects:
+    """Test GitWatcher lookups backed by the pool."""
+
+    async def test_recent_commits_from_pool(self, git_repo):
+        """Observation commits come from the pool and match git log."""
+        watcher = GitWatcher(git_repo, commits_to_track=5)
+        try:
+            commits = await watcher.get_recent_commits()
+            expected = _git(git_repo, "log", "--format=%h|%s|%an", "--abbrev=7").split("\n")
+            assert [f"{c.hash}|{c.message}|{c.author}" for c in commits] == expected
+
+            hits = watcher.batch.get_stats()["cache_hits"]
+            assert await watcher.get_recent_commits() == commits
+            assert watcher.batch.get_stats()["cache_hits"] == hits + len(commits)
+        finally:
+            await watcher.close()
+
+    async def test_get_commit(self, git_repo):
+        """Commit lookups should parse author, subject and short hash."""
+        watcher = GitWatcher(git_repo)
+        try:
+            commit = await watcher.get_commit("HEAD")
+            assert commit is not None
+            assert commit.message == "Update notes"
+            assert commit.author == "Test User"
+            assert commit.hash == _git(git_repo, "rev-parse", "--short=7", "HEAD")
+
+            assert await watcher.get_commit("not-a-ref") is None
+        finally:
+            await watcher.close()
@@ -0,0 +1,174 @@
+"""
+Tests for DiffStatCache (Incremental per-file diff statistics)
+
+Tests cover:
+- Staged and unstaged line counts
+- Cache hits for unchanged files
+- Recompute on worktree, index and watcher changes
+- Stat and compact formatting
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from consciousness.git_diffstat import (
+    DiffStatCache,
+    FileDiffStat,
+    format_compact,
+    format_stat,
+)
+from consciousness.watcher_git import GitWatcher
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git executable not available"
+)
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a repository with two committed files."""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test User")
+
+    (tmp_path / "a.md").write_text("one\ntwo\n")
+    (tmp_path / "b.md").write_text("alpha\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "Initial")
+    return tmp_path
+
+
+@pytest.fixture
+async def watcher(git_repo):
+    w = GitWatcher(git_repo)
+    yield w
+    await w.close()
+
+
+class TestDiffStatCache:
+    """Test per-file statistics and invalidation."""
+
+    async def test_counts_staged_and_unstaged(self, git_repo, watcher):
+        """Staged and unstaged counts should be tracked separately."""
+        (git_repo / "a.md").write_text("one\ntwo\nthree\n")
+        _git(git_repo, "add", "a.md")
+        (git_repo / "a.md").write_text("one\nthree\nfour\n")
+
+        status = await watcher.get_status()
+        stats = {s.path: s for s in await watcher.get_diff_stats(status)}
+
+        assert stats["a.md"].staged_added == 1
+        assert stats["a.md"].staged_deleted == 0
+        assert stats["a.md"].unstaged_added == 1
+        assert stats["a.md"].unstaged_deleted == 1
+        assert "b.md" not in stats
+
+    async def test_unchanged_files_hit_cache(self, git_repo, watcher):
+        """A second refresh with no changes should not recompute."""
+        (git_repo / "a.md").write_text("changed\n")
+        status = await watcher.get_status()
+
+        await watcher.get_diff_stats(status)
+        recomputed = watcher._diff_cache.recomputed
+
+        await watcher.get_diff_stats(status)
+        assert watcher._diff_cache.recomputed == recomputed
+        assert watcher._diff_cache.hits >= 1
+
+    async def test_only_stale_paths_recomputed(self, git_repo, watcher):
+        """Editing one file should only recompute that file."""
+        (git_repo / "a.md").write_text("changed\n")
+        (git_repo / "b.md").write_text("changed\n")
+        status = await watcher.get_status()
+        await watcher.get_diff_stats(status)
+        recomputed = watcher._diff_cache.recomputed
+
+        (git_repo / "b.md").write_text("changed\nagain\nand again\n")
+        stats = {s.path: s for s in await watcher.get_diff_stats(status)}
+
+        assert watcher._diff_cache.recomputed == recomputed + 1
+        assert stats["b.md"].unstaged_added == 3
+
+    async def test_changed_paths_force_recompute(self, git_repo, watcher):
+        """Paths reported by the file watcher should always be recomputed."""
+        (git_repo / "a.md").write_text("changed\n")
+        status = await watcher.get_status()
+        await watcher.get_diff_stats(status)
+        recomputed = watcher._diff_cache.recomputed
+
+        await watcher.get_diff_stats(status, changed_paths=[str(git_repo / "a.md")])
+        assert watcher._diff_cache.recomputed == recomputed + 1
+
+    async def test_staging_invalidates_entry(self, git_repo, watcher):
+        """Staging a file changes its index blob id and its statistics."""
+        (git_repo / "a.md").write_text("one\ntwo\nthree\n")
+        status = await watcher.get_status()
+        stats = await watcher.get_diff_stats(status)
+        assert stats[0].unstaged_added == 1
+
+        _git(git_repo, "add", "a.md")
+        status = await watcher.get_status()
+        stats = await watcher.get_diff_stats(status)
+        assert stats[0].staged_added == 1
+        assert stats[0].unstaged_added == 0
+
+    async def test_clean_files_dropped(self, git_repo, watcher):
+        """Files that become clean should leave the cache."""
+        (git_repo / "a.md").write_text("changed\n")
+        await watcher.get_diff_stats(await watcher.get_status())
+
+        _git(git_repo, "checkout", "--", "a.md")
+        stats = await watcher.get_diff_stats(await watcher.get_status())
+        assert stats == []
+
+    async def test_observation_includes_compact_summary(self, git_repo, watcher):
+        """Observations should carry stat view and compact summary."""
+        (git_repo / "a.md").write_text("one\ntwo\nthree\n")
+        obs = await watcher.get_observation(changed_paths=[str(git_repo / "a.md")])
+
+        assert "Unstaged:" in obs.diff_summary
+        assert "a.md" in obs.diff_summary
+        assert obs.diff_compact.startswith("1 file +1/-0")
+        assert "DIFF: 1 file" in watcher.format_for_llm(obs)
+
+
+class TestFormatting:
+    """Test stat and compact formatting."""
+
+    def test_format_stat_sections(self):
+        """Stat view should split staged and unstaged sections."""
+        stats = [
+            FileDiffStat("a.py", staged_added=3, unstaged_deleted=2),
+            FileDiffStat("img.png", binary=True),
+        ]
+        text = format_stat(stats, staged_paths=["a.py"], unstaged_paths=["a.py", "img.png"])
+
+        staged, unstaged = text.split("\n\n")
+        assert staged.startswith("Staged:")
+        assert "a.py |    3 +++" in staged
+        assert "1 file changed, 3 insertions(+), 0 deletions(-)" in staged
+        assert "img.png | Bin" in unstaged
+        assert "2 files changed" in unstaged
+
+    def test_format_compact_orders_by_size(self):
+        """Compact summary should list the largest changes first."""
+        stats = [
+            FileDiffStat("small.md", unstaged_added=1),
+            FileDiffStat("big.py", unstaged_added=100, unstaged_deleted=5),
+        ]
+        summary = format_compact(stats, top=1)
+        assert summary == "2 files +101/-5; top: big.py +100/-5"
+
+    def test_format_compact_empty(self):
+        """No stats should produce an empty summary."""
+        assert format_compact([]) == ""
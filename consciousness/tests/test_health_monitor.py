@@ -0,0 +1,145 @@
+"""
+Tests for HealthMonitor (Background LM Studio availability)
+
+Tests cover:
+- Opening the circuit after repeated failures, half-open trial probes
+- Jittered exponential backoff between failing probes
+- Background probing and published state changes
+- Detectors reading the monitor instead of probing per request
+"""
+
+import pytest
+
+from consciousness.fallback_router import LMStudioDetector as RouterDetector
+from consciousness.health_monitor import CircuitState, HealthMonitor, get_health_monitor
+from consciousness.llm_clients import LLMClientRegistry
+from consciousness.lm_studio_detector import LMStudioDetector
+
+
+URL = "http://localhost:1234/v1"
+
+
+class FakeModels:
+    """Stands in for client.models; fails while `up` is False."""
+
+    def __init__(self, up: bool = True):
+        self.up = up
+        self.calls = 0
+
+    async def list(self):
+        self.calls += 1
+        if not self.up:
+            raise ConnectionError("connection refused")
+        return type("Page", (), {"data": [type("Model", (), {"id": "qwen"})()]})()
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    """Isolated client registry and monitor table."""
+    registry = LLMClientRegistry()
+    monkeypatch.setattr("consciousness.health_monitor.get_llm_client_registry", lambda: registry)
+    monkeypatch.setattr("consciousness.health_monitor._monitors", {})
+
+
+def _monitor(up: bool = True, **settings) -> tuple[HealthMonitor, FakeModels]:
+    monitor = get_health_monitor(URL, **settings)
+    models = FakeModels(up)
+    monitor.client.models = models
+    return monitor, models
+
+
+class TestCircuit:
+    """Test circuit breaker transitions."""
+
+    async def test_open_half_open_close(self, fresh):
+        """Failures open the circuit; a successful trial probe closes it."""
+        monitor, models = _monitor(failure_threshold=2)
+        changes = []
+        monitor.subscribe(lambda old, new: changes.append((old.circuit, new.circuit)))
+
+        await monitor.probe()
+        assert monitor.is_available
+
+        models.up = False
+        await monitor.probe()
+        assert monitor.is_available  # Below the threshold
+        await monitor.probe()
+        assert not monitor.is_available
+        assert monitor.snapshot.circuit == CircuitState.OPEN
+
+        # A failed trial reopens the circuit straight away
+        await monitor.probe()
+        assert monitor.snapshot.circuit == CircuitState.OPEN
+        assert monitor.snapshot.consecutive_failures == 3
+
+        models.up = True
+        await monitor.probe()
+        assert monitor.is_available
+        assert monitor.snapshot.models == ("qwen",)
+        assert changes == [
+            (CircuitState.CLOSED, CircuitState.CLOSED),  # Unknown -> available
+            (CircuitState.CLOSED, CircuitState.OPEN),
+            (CircuitState.OPEN, CircuitState.HALF_OPEN),
+            (CircuitState.HALF_OPEN, CircuitState.OPEN),
+            (CircuitState.OPEN, CircuitState.HALF_OPEN),
+            (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+        ]
+
+    async def test_backoff_with_jitter(self, fresh):
+        """A failed first probe is unavailable; delays grow up to the cap."""
+        monitor, _ = _monitor(
+            up=False, probe_interval=30.0, backoff_base=1.0, backoff_max=4.0, jitter=0.25
+        )
+        await monitor.probe()
+        assert not monitor.is_available
+
+        delays = []
+        for _ in range(4):
+            delays.append(monitor.next_delay())
+            await monitor.probe()
+
+        for delay, base in zip(delays, (1.0, 2.0, 4.0, 4.0)):
+            assert base * 0.75 <= delay <= base * 1.25
+
+
+class TestBackground:
+    """Test background probing."""
+
+    async def test_publishes_changes(self, fresh):
+        """The background task notices an outage without any reads probing."""
+        monitor, models = _monitor(
+            probe_interval=0.01, backoff_base=0.01, failure_threshold=1, jitter=0
+        )
+        await monitor.start()
+        assert monitor.is_available and monitor.running
+
+        models.up = False
+        snapshot = await monitor.wait_for_change(timeout=1.0)
+        assert snapshot is not None and not snapshot.available
+
+        models.up = True
+        assert await monitor.wait_until_available(timeout=1.0)
+
+        await monitor.stop()
+        assert not monitor.running
+
+    async def test_detectors_read_monitor(self, fresh):
+        """After the first probe, availability checks never probe again."""
+        monitor, models = _monitor()
+        router_detector = RouterDetector(base_url=URL)
+        detector = LMStudioDetector(base_url=URL)
+
+        assert await router_detector.check_availability()
+        for _ in range(5):
+            assert await router_detector.check_availability()
+            assert await detector.is_available()
+        assert models.calls == 1
+        assert router_detector.status.model_info["models"] == ["qwen"]
+        assert detector.get_status()["state"] == "available"
+
+        # invalidate_cache() still forces one fresh probe
+        detector.invalidate_cache()
+        await detector.is_available()
+        assert models.calls == 2
+
+        await monitor.stop()
@@ -0,0 +1,124 @@
+"""
+Tests for hedged fallback requests in FallbackRouter
+
+Tests cover:
+- Per-backend latency tracking and the p95 hedge deadline
+- Hedging a slow LM Studio request and cancelling the loser
+- LM Studio still winning after a hedge was fired
+- The hedging budget
+- Cancelling the caller cancels its requests
+"""
+
+import asyncio
+import time
+
+from consciousness.fallback_router import FallbackConfig, FallbackMode, FallbackRouter
+from consciousness.llm_metrics import LLMUsage
+from consciousness.thinker import Decision, DecisionType
+
+
+def _decision(summary: str, usage: bool = True) -> Decision:
+    return Decision(
+        observation_summary=summary,
+        reasoning="",
+        decision=DecisionType.WAIT,
+        confidence=0.8,
+        usage=LLMUsage(source="thinker") if usage else None,
+    )
+
+
+def _router(tmp_path, lm_seconds: float, fallback_seconds: float, **config) -> FallbackRouter:
+    router = FallbackRouter(tmp_path, FallbackConfig(
+        hedge_min_samples=5, hedge_min_deadline=0.05, **config
+    ))
+    router._current_mode = FallbackMode.PRIMARY
+    router._last_mode_check = time.time()
+    router.cancelled = []
+
+    async def think(name: str, seconds: float):
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            router.cancelled.append(name)
+            raise
+        return _decision(name)
+
+    async def check_gemini():
+        return True
+
+    router._think_with_lm_studio = lambda *args: think("lm_studio", lm_seconds)
+    router._think_with_claude_gemini = lambda *args: think("claude_gemini", fallback_seconds)
+    router._check_gemini_availability = check_gemini
+
+    # Usual LM Studio latency is well below the deadline floor
+    for _ in range(5):
+        router._latency["lm_studio"].record(0.01)
+    return router
+
+
+class TestHedging:
+    """Test latency-aware hedging."""
+
+    async def test_no_hedging_without_samples(self, tmp_path):
+        """Without enough LM Studio latencies there is no deadline."""
+        router = _router(tmp_path, lm_seconds=0.1, fallback_seconds=0)
+        router._latency["lm_studio"] = type(router._latency["lm_studio"])()
+
+        decision = await router.route_thinking("index.md modified")
+        assert decision.observation_summary == "lm_studio"
+        assert router.get_status()["hedging"]["fired"] == 0
+
+    async def test_slow_primary_hedged(self, tmp_path):
+        """The fallback answers first; the LM Studio request is cancelled."""
+        router = _router(tmp_path, lm_seconds=1.0, fallback_seconds=0.02)
+
+        start = time.monotonic()
+        decision = await router.route_thinking("index.md modified")
+
+        assert decision.observation_summary == "claude_gemini"
+        assert time.monotonic() - start < 0.5
+        assert router.cancelled == ["lm_studio"]
+
+        status = router.get_status()
+        assert status["hedging"]["hedge_won"] == 1
+        assert status["latency"]["claude_gemini"]["requests"] == 1
+        # The abandoned request still counts toward the LM Studio latencies
+        assert status["latency"]["lm_studio"]["requests"] == 6
+
+    async def test_primary_can_still_win(self, tmp_path):
+        """LM Studio finishing before the hedge cancels the hedge."""
+        router = _router(tmp_path, lm_seconds=0.1, fallback_seconds=1.0)
+
+        decision = await router.route_thinking("index.md modified")
+        assert decision.observation_summary == "lm_studio"
+        assert router.cancelled == ["claude_gemini"]
+        assert router.get_status()["hedging"]["primary_won"] == 1
+
+    async def test_budget_caps_hedges(self, tmp_path):
+        """Once the budget is used up, slow requests are not hedged."""
+        router = _router(
+            tmp_path, lm_seconds=0.08, fallback_seconds=0.01,
+            hedge_budget_ratio=0.0, hedge_budget_burst=1,
+        )
+
+        first = await router.route_thinking("a")
+        second = await router.route_thinking("b")
+
+        assert first.observation_summary == "claude_gemini"
+        assert second.observation_summary == "lm_studio"
+        hedging = router.get_status()["hedging"]
+        assert hedging["fired"] == 1
+        assert hedging["budget_denied"] == 1
+
+    async def test_caller_cancelled(self, tmp_path):
+        """Cancelling the caller cancels LM Studio, before and after hedging."""
+        for wait, expected in ((0.02, ["lm_studio"]), (0.1, ["lm_studio", "claude_gemini"])):
+            router = _router(tmp_path, lm_seconds=1.0, fallback_seconds=1.0)
+            call = asyncio.create_task(router.route_thinking("index.md modified"))
+            await asyncio.sleep(wait)
+            call.cancel()
+            try:
+                await call
+            except asyncio.CancelledError:
+                pass
+            assert sorted(router.cancelled) == sorted(expected)
@@ -0,0 +1,136 @@
+"""
+Tests for LLMClientRegistry (Shared LLM connection pools)
+
+Tests cover:
+- One pool per (base_url, timeout class), separate clients per consumer
+- Thinker, detectors and dreamer sharing the global pools
+- Per-consumer in-flight, queue wait and error counts
+- Superseding only queued requests with the caller's key
+- Configured pool limits
+"""
+
+import asyncio
+
+import pytest
+
+from consciousness.fallback.lm_studio_detector import LMStudioDetector as FallbackDetector
+from consciousness.learning.dreamer import LocalLLMClient
+from consciousness.llm_clients import LLMClientRegistry
+from consciousness.llm_scheduler import RequestSuperseded
+from consciousness.lm_studio_detector import LMStudioDetector
+from consciousness.thinker import ConsciousnessThinker
+
+
+URL = "http://localhost:1234/v1"
+
+
+class TestPools:
+    """Test pool sharing."""
+
+    def test_pool_per_url_and_timeout_class(self):
+        """Same server and class share a pool; clients stay separate."""
+        registry = LLMClientRegistry()
+        first = registry.client(URL, consumer="thinker")
+        second = registry.client(URL + "/", consumer="dreamer")
+        health = registry.client(URL, consumer="detector", timeout_class="health", timeout=2.0)
+        other = registry.client("http://gpu-box:1234/v1", consumer="thinker")
+
+        assert first is not second
+        assert first._client is second._client
+        assert health._client is not first._client
+        assert other._client is not first._client
+        assert health.timeout == 2.0
+
+        pools = registry.get_stats()["pools"]
+        assert len(pools) == 3
+        assert pools[0]["consumers"] == ["dreamer", "thinker"]
+
+        with pytest.raises(ValueError):
+            registry.client(URL, consumer="x", timeout_class="batch")
+
+    def test_consumers_share_global_pools(self):
+        """Thinker, detectors and dreamer should not open pools of their own."""
+        thinker = ConsciousnessThinker(base_url=URL)
+        dreamer = LocalLLMClient(URL, "local-model")
+        detector = LMStudioDetector(base_url=URL, timeout=1.0)
+        fallback = FallbackDetector()
+
+        assert thinker.client._client is dreamer.client._client
+        assert detector._client._client is fallback._client._client
+        # Each consumer keeps its own client (tests patch them independently)
+        assert thinker.client is not dreamer.client
+
+
+class TestSlots:
+    """Test per-consumer request accounting."""
+
+    async def test_queue_wait_and_errors(self):
+        """Requests beyond the pool size wait; errors are counted per consumer."""
+        registry = LLMClientRegistry(max_connections=1)
+        registry.client(URL, consumer="thinker")
+        registry.client(URL, consumer="dreamer")
+        seen = []
+
+        async def request(consumer, seconds):
+            async with registry.slot(consumer):
+                seen.append(registry.get_stats()["consumers"][consumer]["in_flight"])
+                await asyncio.sleep(seconds)
+
+        await asyncio.gather(request("thinker", 0.05), request("dreamer", 0))
+        with pytest.raises(RuntimeError):
+            async with registry.slot("dreamer"):
+                raise RuntimeError("connection reset")
+
+        consumers = registry.get_stats()["consumers"]
+        assert seen == [1, 1]
+        assert consumers["dreamer"]["queue_wait_ms"]["max"] >= 40
+        assert consumers["dreamer"]["requests"] == 2
+        assert consumers["dreamer"]["errors"] == 1
+        assert consumers["thinker"]["errors"] == 0
+        assert consumers["thinker"]["in_flight"] == 0
+
+    async def test_supersede_by_caller_key(self):
+        """Only a queued request with the same key is superseded, whoever shares the pool."""
+        registry = LLMClientRegistry()
+        for consumer in ("thinker", "dreamer", "evaluator"):
+            registry.client(URL, consumer=consumer)
+        release = asyncio.Event()
+
+        async def running():
+            async with registry.slot("dreamer", "dream"):
+                await release.wait()
+
+        async def request(consumer, request_class, key=None):
+            async with registry.slot(consumer, request_class, key=key):
+                return key
+
+        holder = asyncio.create_task(running())
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(request("thinker", "decision")),
+            asyncio.create_task(request("evaluator", "evaluation", "evaluation:old")),
+            asyncio.create_task(request("thinker", "user_message", "user:notes.md")),
+        ]
+        await asyncio.sleep(0)
+        newer = asyncio.create_task(request("evaluator", "evaluation", "evaluation:old"))
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*queued, newer, return_exceptions=True)
+        await holder
+        assert isinstance(results[1], RequestSuperseded)
+        assert results[0] is None
+        assert results[2] == "user:notes.md"
+        assert results[3] == "evaluation:old"
+
+    async def test_configured_limits(self):
+        """Pools created after configure() use the new limits."""
+        registry = LLMClientRegistry()
+        registry.configure(max_connections=2, keepalive_expiry=15.0)
+        registry.client(URL, consumer="thinker")
+
+        stats = registry.get_stats()
+        assert stats["limits"]["max_connections"] == 2
+        assert stats["limits"]["keepalive_expiry"] == 15.0
+        await registry.close()
+        assert registry.get_stats()["pools"] == []
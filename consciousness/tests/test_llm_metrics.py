@@ -0,0 +1,215 @@
+"""
+Tests for LLM usage and latency accounting
+
+Tests cover:
+- Reading token counts from OpenAI, Gemini and Anthropic usage reports
+- Estimating tokens when no usage is reported
+- Rolling percentiles per call site
+- Thinker completions: usage and time to first token on the Decision
+- Fallback router Claude/Gemini calls recorded per call site
+- Persisting usage in the thoughts table, including old databases
+"""
+
+from types import SimpleNamespace
+
+import aiosqlite
+import pytest
+
+from consciousness.executor import ExecutionResult
+from consciousness.fallback_router import FallbackRouter
+from consciousness.llm_metrics import (
+    LLMCallTimer,
+    LLMMetrics,
+    estimate_tokens,
+    get_llm_metrics,
+    percentile,
+    usage_tokens,
+)
+from consciousness.state import StateManager, ThoughtRecord
+from consciousness.thinker import ConsciousnessThinker, DecisionType
+
+
+class TestUsageTokens:
+    """Test usage report parsing."""
+
+    def test_provider_formats(self):
+        """All providers' field names should be understood."""
+        assert usage_tokens(SimpleNamespace(prompt_tokens=10, completion_tokens=5)) == (10, 5)
+        assert usage_tokens(
+            SimpleNamespace(prompt_token_count=7, candidates_token_count=3)
+        ) == (7, 3)
+        assert usage_tokens({"promptTokenCount": 4, "candidatesTokenCount": 2}) == (4, 2)
+        assert usage_tokens(SimpleNamespace(input_tokens=8, output_tokens=1)) == (8, 1)
+        assert usage_tokens(None) is None
+        assert usage_tokens({}) is None
+
+    def test_estimated_without_usage(self):
+        """Calls without a usage report should be estimated and flagged."""
+        metrics = LLMMetrics()
+        timer = LLMCallTimer("test", prompt_text="x" * 40, metrics=metrics)
+        usage = timer.finish(completion_text="y" * 9)
+
+        assert usage.estimated
+        assert (usage.prompt_tokens, usage.completion_tokens) == (10, estimate_tokens("y" * 9))
+        assert usage.first_token_ms is None
+
+
+class TestLLMMetrics:
+    """Test rolling statistics."""
+
+    def test_percentile(self):
+        """Nearest-rank percentiles."""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 90) == 90
+        assert percentile(values, 99) == 99
+        assert percentile([3.0], 99) == 3.0
+        assert percentile([], 50) is None
+
+    def test_stats_per_source(self):
+        """Failures count as errors but not towards latency percentiles."""
+        metrics = LLMMetrics(window=3)
+        for tokens in (100, 200, 300, 400):
+            timer = LLMCallTimer("thinker", metrics=metrics)
+            timer.first_token()
+            timer.finish(usage={"prompt_tokens": tokens, "completion_tokens": 10})
+        LLMCallTimer("thinker", metrics=metrics).finish(success=False)
+
+        stats = metrics.get_stats()["thinker"]
+        assert stats["calls"] == 5
+        assert stats["errors"] == 1
+        assert stats["prompt_tokens"] == 1000
+        # Window holds the last three calls (two successful)
+        assert stats["prompt_tokens_window"]["p50"] == 300
+        assert stats["first_token_ms"]["p99"] is not None
+
+
+def _chunk(content=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=content))] if content else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class TestThinkerUsage:
+    """Test usage capture in the thinker."""
+
+    async def test_usage_on_decision(self):
+        """think_autonomous should report tokens, latency and time to first token."""
+        thinker = ConsciousnessThinker()
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return FakeStream([
+                _chunk('{"decision": "wait", '),
+                _chunk('"reasoning": "idle", "confidence": 0.9}'),
+                _chunk(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=14)),
+            ])
+
+        thinker.client.chat.completions.create = create
+        decision = await thinker.think_autonomous("nothing changed")
+
+        assert decision.decision == DecisionType.WAIT
+        assert calls[0]["stream"] is True
+        assert calls[0]["stream_options"] == {"include_usage": True}
+        assert decision.usage.prompt_tokens == 120
+        assert decision.usage.completion_tokens == 14
+        assert not decision.usage.estimated
+        assert decision.usage.first_token_ms <= decision.usage.latency_ms
+
+
+class TestFallbackRouterUsage:
+    """Test metrics for LLM calls the fallback router makes through its executor."""
+
+    async def test_calls_recorded(self, tmp_path):
+        router = FallbackRouter(tmp_path)
+        outputs = iter([
+            ExecutionResult(success=True, output="focus on indices"),
+            ExecutionResult(success=False, output="", error="claude failed"),
+        ])
+
+        async def execute(action):
+            return next(outputs)
+
+        router.executor.execute = execute
+        before = get_llm_metrics().get_stats()
+
+        def calls(source):
+            stats = get_llm_metrics().get_stats().get(source, {})
+            return stats.get("calls", 0) - before.get(source, {}).get("calls", 0), \
+                stats.get("errors", 0) - before.get(source, {}).get("errors", 0)
+
+        assert await router._gemini_analyze_context("index.md modified") == "focus on indices"
+        decision = await router._execute_claude_decision("decide")
+
+        assert decision.confidence == 0.0 and "claude failed" in decision.reasoning
+        assert calls("fallback_router.gemini") == (1, 0)
+        assert calls("fallback_router.claude") == (1, 1)
+        gemini = get_llm_metrics().get_stats()["fallback_router.gemini"]
+        assert gemini["prompt_tokens"] > 0 and gemini["latency_ms"]["p50"] is not None
+
+
+class TestThoughtPersistence:
+    """Test usage columns in the thoughts table."""
+
+    async def test_round_trip_and_stats(self, tmp_path):
+        """Usage should be stored and summarised."""
+        state = StateManager(tmp_path / "state.db")
+        await state.initialize()
+        try:
+            for latency in (100.0, 200.0, 300.0):
+                await state.record_thought(ThoughtRecord(
+                    prompt="p", response="r", tokens_used=50, latency_ms=latency,
+                    prompt_tokens=40, completion_tokens=10, first_token_ms=latency / 2,
+                ))
+
+            thought = (await state.get_recent_thoughts(limit=1))[0]
+            assert (thought.prompt_tokens, thought.completion_tokens) == (40, 10)
+            assert thought.first_token_ms is not None
+
+            stats = await state.get_thought_usage_stats()
+            assert stats["thoughts"] == 3
+            assert stats["latency_ms"]["p50"] == 200.0
+            assert stats["first_token_ms"]["p99"] == 150.0
+        finally:
+            await state.close()
+
+    async def test_migrates_old_database(self, tmp_path):
+        """Databases without the new columns should be migrated."""
+        db_path = tmp_path / "old.db"
+        async with aiosqlite.connect(db_path) as conn:
+            await conn.execute(
+                """
+                CREATE TABLE thoughts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    confidence REAL DEFAULT 0.0,
+                    tokens_used INTEGER DEFAULT 0,
+                    latency_ms REAL DEFAULT 0.0
+                )
+                """
+            )
+            await conn.commit()
+
+        state = StateManager(db_path)
+        await state.initialize()
+        try:
+            await state.record_thought(ThoughtRecord(
+                prompt="p", response="r", latency_ms=5.0, prompt_tokens=3,
+            ))
+            assert (await state.get_recent_thoughts())[0].prompt_tokens == 3
+        finally:
+            await state.close()
@@ -0,0 +1,132 @@
+"""
+Tests for RequestScheduler (Priority scheduling of LLM requests)
+
+Tests cover:
+- Serving queued requests by class priority
+- Aging so low-priority requests are not starved
+- Superseding queued requests with the same key
+- Per-class queue-wait statistics
+- The thinker passing its request class to the shared scheduler
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from consciousness.llm_clients import LLMClientRegistry
+from consciousness.llm_scheduler import RequestScheduler, RequestSuperseded
+from consciousness.thinker import ConsciousnessThinker
+
+
+async def _hold(scheduler: RequestScheduler, seconds: float) -> None:
+    async with scheduler.slot("decision"):
+        await asyncio.sleep(seconds)
+
+
+async def _queue(scheduler: RequestScheduler, request_class: str, order: list, **kwargs):
+    async with scheduler.slot(request_class, **kwargs):
+        order.append(request_class)
+
+
+class TestRequestScheduler:
+    """Test admission order and statistics."""
+
+    async def test_priority_order(self):
+        """A user message queued last is served before a queued dream."""
+        scheduler = RequestScheduler(max_concurrent=1, aging_seconds=0)
+        order: list[str] = []
+
+        busy = asyncio.create_task(_hold(scheduler, 0.05))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(_queue(scheduler, name, order))
+            for name in ("dream", "evaluation", "decision", "user_message")
+        ]
+        await asyncio.sleep(0.01)
+        assert scheduler.waiting == 4
+
+        await asyncio.gather(busy, *waiting)
+        assert order == ["user_message", "decision", "evaluation", "dream"]
+
+        classes = scheduler.get_stats()["classes"]
+        assert classes["dream"]["queue_wait_ms"]["p50"] >= classes["user_message"]["queue_wait_ms"]["p50"]
+        assert classes["dream"]["requests"] == 1
+        assert scheduler.running == 0
+
+    async def test_aging_prevents_starvation(self, monkeypatch):
+        """A dream waiting long enough outranks a fresh decision."""
+        now = [100.0]
+        monkeypatch.setattr("consciousness.llm_scheduler.time.monotonic", lambda: now[0])
+        scheduler = RequestScheduler(max_concurrent=1, aging_seconds=10)
+        order: list[str] = []
+
+        await scheduler.acquire("decision")
+        dream = asyncio.create_task(_queue(scheduler, "dream", order))
+        await asyncio.sleep(0)
+        now[0] += 25  # Dream is now worth 2.5
+        decision = asyncio.create_task(_queue(scheduler, "decision", order))
+        await asyncio.sleep(0)
+
+        scheduler.release("decision")
+        await asyncio.gather(dream, decision)
+        assert order == ["dream", "decision"]
+
+    async def test_superseded_requests(self):
+        """A newer queued request with the same key replaces the older one."""
+        scheduler = RequestScheduler(max_concurrent=1)
+        order: list[str] = []
+
+        busy = asyncio.create_task(_hold(scheduler, 0.02))
+        await asyncio.sleep(0)
+        old = asyncio.create_task(_queue(scheduler, "evaluation", order, key="eval:tests"))
+        await asyncio.sleep(0)
+        new = asyncio.create_task(_queue(scheduler, "evaluation", order, key="eval:tests"))
+
+        with pytest.raises(RequestSuperseded):
+            await old
+        await asyncio.gather(busy, new)
+        assert order == ["evaluation"]
+        assert scheduler.get_stats()["classes"]["evaluation"]["superseded"] == 1
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Cancelling a queued request should not leak its slot."""
+        scheduler = RequestScheduler(max_concurrent=1)
+        busy = asyncio.create_task(_hold(scheduler, 0.02))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_queue(scheduler, "dream", []))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(busy, waiter, return_exceptions=True)
+
+        assert scheduler.waiting == 0 and scheduler.running == 0
+        with pytest.raises(ValueError):
+            await scheduler.acquire("batch")
+
+
+class FakeStream:
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content='{"decision": "wait"}'))],
+            usage=None,
+        )
+
+
+async def test_thinker_request_class(monkeypatch):
+    """think() should be admitted under the request class it was given."""
+    registry = LLMClientRegistry()
+    monkeypatch.setattr("consciousness.thinker.get_llm_client_registry", lambda: registry)
+    thinker = ConsciousnessThinker(base_url="http://localhost:1234/v1")
+
+    async def create(**kwargs):
+        return FakeStream()
+
+    thinker.client.chat.completions.create = create
+    await thinker.think("Hey Stoffy, status?", request_class="user_message")
+
+    pool, = registry.get_stats()["pools"]
+    assert pool["scheduler"]["classes"]["user_message"]["requests"] == 1
+    assert pool["scheduler"]["classes"]["decision"]["requests"] == 0
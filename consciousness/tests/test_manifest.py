@@ -0,0 +1,196 @@
+"""
+Tests for FileManifest (Offline change reconciliation)
+
+Tests cover:
+- Parallel, ignore-aware scanning
+- Baseline recording
+- Created / modified / deleted detection
+- Touch-only changes suppressed by content hash
+- Manifest persistence in StateManager
+- Daemon recording changes only once their batch was processed
+"""
+
+import os
+import time
+
+import pytest
+
+from consciousness.config import ConsciousnessConfig, WatchRootConfig
+from consciousness.manifest import FileManifest, ManifestEntry, chunk_changes
+from consciousness.self_write_tracker import get_self_write_tracker
+from consciousness.state import StateManager
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a small tree with an ignored directory."""
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "a.md").write_text("alpha\n")
+    (tmp_path / "notes" / "b.md").write_text("beta\n")
+    (tmp_path / "top.md").write_text("top\n")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x")
+    (tmp_path / "cache.pyc").write_bytes(b"\0")
+    return tmp_path
+
+
+def _previous(manifest: FileManifest) -> dict[str, ManifestEntry]:
+    result = manifest.reconcile({})
+    return {e.path: e for e in result.upserts}
+
+
+class TestScan:
+    """Test directory scanning."""
+
+    def test_scan_skips_ignored(self, tree):
+        """Ignored directories and files should not appear."""
+        manifest = FileManifest(tree, ignore_patterns=["node_modules", "*.pyc"])
+        scanned = manifest.scan()
+
+        assert set(scanned) == {"notes/a.md", "notes/b.md", "top.md"}
+        size, mtime_ns = scanned["top.md"]
+        assert size == 4
+        assert mtime_ns == os.stat(tree / "top.md").st_mtime_ns
+
+    def test_scan_many_files(self, tmp_path):
+        """Scanning should handle wide and deep trees."""
+        for d in range(20):
+            sub = tmp_path / f"d{d}" / "inner"
+            sub.mkdir(parents=True)
+            for f in range(50):
+                (sub / f"f{f}.txt").write_text("x")
+
+        start = time.perf_counter()
+        scanned = FileManifest(tmp_path, max_workers=4).scan()
+        assert len(scanned) == 1000
+        assert time.perf_counter() - start < 5.0
+
+
+class TestReconcile:
+    """Test diffing against a previous manifest."""
+
+    def test_baseline_reports_nothing(self, tree):
+        """An empty manifest should only record a baseline."""
+        manifest = FileManifest(tree, ignore_patterns=["node_modules"])
+        result = manifest.reconcile({})
+
+        assert result.baseline
+        assert result.changes == []
+        assert {e.path for e in result.upserts} >= {"notes/a.md", "top.md"}
+
+    def test_detects_offline_changes(self, tree):
+        """Created, modified and deleted files should become FileChanges."""
+        manifest = FileManifest(tree, ignore_patterns=["node_modules"])
+        previous = _previous(manifest)
+
+        (tree / "notes" / "a.md").write_text("alpha changed\n")
+        (tree / "notes" / "c.md").write_text("new\n")
+        (tree / "top.md").unlink()
+
+        result = manifest.reconcile(previous)
+        changes = {c.relative_path: c.change_type for c in result.changes}
+
+        assert changes == {
+            "notes/a.md": "modified",
+            "notes/c.md": "created",
+            "top.md": "deleted",
+        }
+        assert result.deletions == ["top.md"]
+        assert str(tree / "notes" / "c.md") in [c.path for c in result.changes]
+
+    def test_touch_only_is_ignored(self, tree):
+        """Same content with a new mtime should not be reported."""
+        manifest = FileManifest(tree, ignore_patterns=["node_modules"])
+        previous = _previous(manifest)
+
+        # Record hashes as a live update would
+        upserts, _ = manifest.entries_for_changes(
+            manifest._make_change(p, "modified", time.time()) for p in previous
+        )
+        previous = {e.path: e for e in upserts}
+
+        stat = os.stat(tree / "top.md")
+        os.utime(tree / "top.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        result = manifest.reconcile(previous)
+        assert result.changes == []
+        assert result.files_hashed == 1
+
+    def test_entries_for_deleted_file(self, tree):
+        """Live deletions should remove manifest entries."""
+        manifest = FileManifest(tree)
+        change = manifest._make_change("top.md", "deleted", time.time())
+        (tree / "top.md").unlink()
+
+        upserts, deletions = manifest.entries_for_changes([change])
+        assert upserts == []
+        assert deletions == ["top.md"]
+
+    def test_chunk_changes(self, tree):
+        """Synthetic changes should be split into batches."""
+        manifest = FileManifest(tree)
+        changes = [manifest._make_change(f"f{i}", "created", 0.0) for i in range(7)]
+        assert [len(b) for b in chunk_changes(changes, size=3)] == [3, 3, 1]
+
+
+class TestManifestPersistence:
+    """Test the StateManager manifest table."""
+
+    async def test_round_trip(self, tmp_path):
+        """Saved entries should load back per root."""
+        state = StateManager(tmp_path / "state.db")
+        await state.initialize()
+        try:
+            await state.save_manifest(
+                "/root/a",
+                [("x.md", 3, 100, "abc"), ("y.md", 4, 200, "")],
+            )
+            await state.save_manifest("/root/b", [("x.md", 1, 1, "")])
+            await state.save_manifest("/root/a", [("x.md", 5, 300, "def")], ["y.md"])
+
+            rows = await state.load_manifest("/root/a")
+            assert rows == [("x.md", 5, 300, "def")]
+            assert ManifestEntry.from_row(rows[0]).to_row() == rows[0]
+            assert len(await state.load_manifest("/root/b")) == 1
+        finally:
+            await state.close()
+
+
+class TestDaemonManifest:
+    """Test when the daemon records changes in the manifest."""
+
+    async def test_recorded_after_processing(self, tmp_path):
+        """Queued changes stay unrecorded until their batch is handled."""
+        from consciousness.daemon import ConsciousnessDaemon
+
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        note = repo / "note.md"
+        note.write_text("one")
+        config = ConsciousnessConfig()
+        config.watcher.roots = [WatchRootConfig(path=str(repo), git=False)]
+        config.state.database_path = str(tmp_path / "state.db")
+        daemon = ConsciousnessDaemon(config)
+        root = daemon.roots[0]
+        await daemon.state.initialize()
+        tracker = get_self_write_tracker()
+        try:
+            await daemon._reconcile_offline_changes(root)  # Baseline
+
+            note.write_text("two!!")
+            st = os.stat(note)
+            os.utime(note, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            await daemon._reconcile_offline_changes(root)
+
+            # Queued, not processed: a restart now would report it again
+            rows = await daemon.state.load_manifest(str(repo))
+            assert [(r[0], r[1]) for r in rows] == [("note.md", 3)]
+
+            tracker.record_write(note)  # Handled without an LLM call
+            await daemon._autonomous_cycle()
+
+            rows = await daemon.state.load_manifest(str(repo))
+            assert [(r[0], r[1]) for r in rows] == [("note.md", 5)]
+        finally:
+            tracker.clear()
+            await daemon.state.close()
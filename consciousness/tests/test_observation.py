@@ -0,0 +1,133 @@
+"""
+Tests for ObservationPipeline (Concurrent observation assembly)
+
+Tests cover:
+- Stages running concurrently
+- Per-stage timeouts and failures skipping only that stage
+- Knowledge snippets from the root's own knowledge base, without creating
+  knowledge files
+- File excerpts in the prompt
+- Per-stage timing statistics
+"""
+
+import asyncio
+import time
+
+from consciousness.file_access import FileAccessService
+from consciousness.learning.semantic import SemanticMemoryWriter
+from consciousness.manifest import FileManifest
+from consciousness.observation import ObservationPipeline
+from consciousness.roots import WatchRoot
+from consciousness.watcher import ConsciousnessWatcher, FileChange
+
+
+class FakeSuggestion:
+    action_type = "run_tests"
+    reasoning = "Tests usually follow"
+    confidence = 0.8
+
+
+class FakeLearning:
+    def __init__(self, delay: float = 0.0, error: bool = False):
+        self.delay = delay
+        self.error = error
+
+    async def get_suggestions(self, observation):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise RuntimeError("database locked")
+        return [FakeSuggestion()]
+
+
+class SlowKnowledge:
+    async def search_knowledge(self, query, create_missing=True):
+        await asyncio.sleep(0.1)
+        return [f"[Rule] {query}: matched"]
+
+
+def _root(path) -> WatchRoot:
+    return WatchRoot(
+        name="main",
+        path=path,
+        file_watcher=ConsciousnessWatcher(root_path=path),
+        manifest=FileManifest(path),
+    )
+
+
+def _change(path, name: str, change_type: str = "modified") -> FileChange:
+    return FileChange(str(path / name), change_type, time.time(), relative_path=name)
+
+
+class TestObservationPipeline:
+    """Test gathering the inputs of a decision."""
+
+    async def test_stages_concurrent(self, tmp_path):
+        """Total time should be about the slowest stage, not the sum."""
+        pipeline = ObservationPipeline(
+            FakeLearning(delay=0.1), knowledge=SlowKnowledge(), max_file_excerpts=0
+        )
+        bundle = await pipeline.gather(_root(tmp_path), [_change(tmp_path, "parser.py")])
+
+        assert bundle.learned_patterns == [
+            "run_tests: Tests usually follow (confidence: 0.80)"
+        ]
+        assert bundle.knowledge == ["[Rule] parser: matched"]
+        assert bundle.timings_ms["patterns"] >= 100
+        assert bundle.timings_ms["knowledge"] >= 100
+        assert bundle.timings_ms["total"] < 180
+        assert bundle.skipped_stages == []
+
+    async def test_slow_and_failing_stages_skipped(self, tmp_path):
+        """A stage over its timeout or raising should not fail the cycle."""
+        pipeline = ObservationPipeline(FakeLearning(delay=1.0), stage_timeout=0.05)
+        bundle = await pipeline.gather(_root(tmp_path), [_change(tmp_path, "a.md")])
+        assert bundle.learned_patterns == []
+        assert bundle.skipped_stages == ["patterns"]
+        assert bundle.timings_ms["total"] < 500
+
+        pipeline.learning = FakeLearning(error=True)
+        await pipeline.gather(_root(tmp_path), [_change(tmp_path, "a.md")])
+        stats = pipeline.get_stats()
+        assert stats["skipped"]["patterns"] == 2
+        assert stats["stages_ms"]["total"]["p50"] is not None
+
+    async def test_knowledge_and_excerpts_in_prompt(self, tmp_path):
+        """Matching knowledge sections and file excerpts should reach the prompt."""
+        (tmp_path / "knowledge").mkdir()
+        (tmp_path / "knowledge" / "rules.md").write_text(
+            "# Rules\n\n## Rule: Keep the scheduler fair\nThe scheduler must serve roots in turn.\n"
+        )
+        (tmp_path / "scheduler.py").write_text("def next_batch():\n    pass\n")
+        writer = SemanticMemoryWriter(base_path=tmp_path)
+
+        pipeline = ObservationPipeline(
+            FakeLearning(), knowledge=writer, file_access=FileAccessService()
+        )
+        bundle = await pipeline.gather(_root(tmp_path), [
+            _change(tmp_path, "scheduler.py"),
+            _change(tmp_path, "gone.py", "deleted"),
+        ], header="Root: main")
+
+        prompt = bundle.prompt_observations()
+        assert prompt.startswith("Root: main")
+        assert "RELEVANT KNOWLEDGE:" in prompt and "Keep the scheduler fair" in prompt
+        assert "--- scheduler.py ---\ndef next_batch()" in prompt
+        assert list(bundle.file_excerpts) == ["scheduler.py"]
+        # Searching must not create the rest of the knowledge base
+        assert not (tmp_path / "knowledge" / "architecture.md").exists()
+
+    async def test_knowledge_searched_per_root(self, tmp_path):
+        """A root's decisions only get snippets from its own knowledge base."""
+        class RootKnowledge:
+            def __init__(self, name):
+                self.name = name
+
+            async def search_knowledge(self, query, create_missing=True):
+                return [f"[{self.name}] {query}"]
+
+        one, two = _root(tmp_path / "one"), _root(tmp_path / "two")
+        one.knowledge, two.knowledge = RootKnowledge("one"), RootKnowledge("two")
+        pipeline = ObservationPipeline(FakeLearning(), max_file_excerpts=0)
+
+        bundle = await pipeline.gather(two, [_change(two.path, "parser.py")])
+        assert bundle.knowledge == ["[two] parser"]
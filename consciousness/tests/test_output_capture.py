@@ -0,0 +1,94 @@
+"""
+Tests for streaming subprocess output capture
+
+Tests cover:
+- Head and tail buffers with dropped byte counts
+- Spilling overflowing streams to a gzip log
+- ExpandedExecutor subprocesses: bounded output, progress lines, timeouts
+"""
+
+import asyncio
+import gzip
+import sys
+
+import pytest
+
+from consciousness.executor import ExecutionConfig, ExpandedExecutor
+from consciousness.output_capture import BoundedOutput
+
+
+class TestBoundedOutput:
+    """Test the head/tail buffer."""
+
+    def test_head_and_tail(self):
+        """The middle is dropped and counted; short output is kept whole."""
+        output = BoundedOutput(head_bytes=4, tail_bytes=4)
+        for chunk in (b"0123", b"45", b"6789abcdef"):
+            output.feed(chunk)
+
+        assert output.total_bytes == 16
+        assert output.dropped_bytes == 8
+        text = output.text()
+        assert text.startswith("0123\n... (8 bytes truncated) ...\n")
+        assert text.endswith("cdef")
+
+        short = BoundedOutput(head_bytes=4, tail_bytes=4)
+        short.feed("héllo".encode())  # Multi-byte character across head and tail
+        assert short.text() == "héllo" and not short.truncated
+
+    def test_spill(self, tmp_path):
+        """An overflowing stream is written to a gzip log in full."""
+        spill = tmp_path / "run.stdout.gz"
+        output = BoundedOutput(head_bytes=3, tail_bytes=3, spill_path=spill)
+        output.feed(b"abc")
+        assert not spill.exists()  # Nothing dropped yet
+
+        output.feed(b"defghij")
+        output.feed(b"klm")
+        output.close()
+
+        assert output.spilled
+        assert gzip.decompress(spill.read_bytes()) == b"abcdefghijklm"
+        assert str(spill) in output.text()
+
+
+class TestExecutorCapture:
+    """Test subprocesses run by the executor."""
+
+    async def test_bounded_streaming(self, tmp_path):
+        """Large output stays within the buffers; progress lines arrive live."""
+        config = ExecutionConfig(
+            output_head_bytes=1000,
+            output_tail_bytes=1000,
+            output_log_dir=tmp_path / "logs",
+            progress_interval=0,
+        )
+        executor = ExpandedExecutor(tmp_path, config)
+        progress = []
+        executor.on_progress = lambda label, line: progress.append(line)
+
+        code = "import sys\nfor i in range(50000): print(f'line {i}')\nprint('oops', file=sys.stderr)"
+        result = await executor._run_subprocess([sys.executable, "-c", code], timeout=30)
+
+        assert result["returncode"] == 0
+        assert result["stdout"].startswith("line 0\n")
+        assert result["stdout"].rstrip().endswith("line 49999")
+        assert len(result["stdout"]) < 2200
+        assert result["stderr"] == "oops\n"
+
+        stdout = result["output"]["stdout"]
+        assert stdout["dropped_bytes"] == stdout["bytes"] - 2000
+        with gzip.open(stdout["log"]) as log:
+            assert log.read().count(b"\n") == 50000
+        assert result["output"]["stderr"]["log"] is None
+        assert "line 49999" in progress and "oops" in progress
+
+    async def test_timeout_kills(self, tmp_path):
+        """A process past its timeout is killed."""
+        executor = ExpandedExecutor(tmp_path, ExecutionConfig())
+
+        with pytest.raises(asyncio.TimeoutError):
+            await executor._run_subprocess(
+                [sys.executable, "-c", "import time; print('start', flush=True); time.sleep(30)"],
+                timeout=0.5,
+            )
@@ -0,0 +1,121 @@
+"""
+Tests for PythonWorkerPool (Warm interpreters for RUN_PYTHON)
+
+Tests cover:
+- Snippets in fresh namespaces with cwd, argv and exit codes
+- Local imports, child process output and environment resets, as with python -c
+- Stray writes to fd 1 not corrupting the protocol
+- Timeouts, crashes, memory limits and recycling after N jobs
+- The executor running snippets in the pool, and unique temp files
+"""
+
+import pytest
+
+from consciousness.executor import Action, ActionType, ExecutionConfig, ExpandedExecutor
+from consciousness.python_workers import PythonWorkerPool
+
+
+@pytest.fixture
+async def pool():
+    pool = PythonWorkerPool(size=2, max_jobs_per_worker=3, memory_limit_mb=256)
+    await pool.start()
+    yield pool
+    await pool.close()
+
+
+class TestSnippets:
+    """Test running snippets."""
+
+    async def test_fresh_namespace(self, pool, tmp_path):
+        """Each job starts clean; cwd and argv apply for the job only."""
+        first = await pool.run("x = 1\nprint('set')", cwd=tmp_path)
+        second = await pool.run(
+            "import os, sys\nprint(os.getcwd(), sys.argv[1:], 'x' in globals())",
+            cwd=tmp_path,
+            args=["--fix"],
+        )
+        assert first.stdout == "set\n"
+        assert second.stdout == f"{tmp_path} ['--fix'] False\n"
+
+        assert (await pool.run("import sys; sys.exit(3)")).returncode == 3
+        error = await pool.run("raise ValueError('bad index')")
+        assert error.returncode == 1 and "ValueError: bad index" in error.stderr
+
+        assert (await pool.run("print('still ok')")).stdout == "still ok\n"
+
+    async def test_matches_python_c(self, pool, tmp_path):
+        """Local imports, child process output and a clean environment, as with python -c."""
+        (tmp_path / "localmod.py").write_text("VALUE = 42\n")
+        local = await pool.run("import localmod; print(localmod.VALUE)", cwd=tmp_path)
+        assert local.stdout == "42\n"
+
+        children = await pool.run(
+            "import os, subprocess, sys\n"
+            "print('parent', flush=True)\n"
+            "os.system('echo shell')\n"
+            "subprocess.run([sys.executable, '-c', 'import sys; sys.stderr.write(\"child err\")'])\n"
+            "os.write(1, b'raw')\n"
+        )
+        assert children.stdout == "parent\nshell\nraw"
+        assert children.stderr == "child err"
+
+        for _ in range(2):  # Both workers
+            await pool.run("import os; os.environ['STOFFY_TEST'] = '1'")
+        leaked = await pool.run("import os; print(os.environ.get('STOFFY_TEST'))")
+        assert leaked.stdout == "None\n"
+
+        (tmp_path / "localmod.py").write_text("VALUE = 430\n")  # New size: no stale .pyc
+        reloaded = await pool.run("import localmod; print(localmod.VALUE)", cwd=tmp_path)
+        assert reloaded.stdout == "430\n"
+
+    async def test_warm_latency(self, pool):
+        """A warm worker answers far faster than a new interpreter starts."""
+        await pool.run("pass")
+        durations = [(await pool.run("print(sum(range(100)))")).duration_ms for _ in range(5)]
+        assert min(durations) < 50
+
+
+class TestRecycling:
+    """Test worker replacement."""
+
+    async def test_timeout_crash_and_memory(self, pool):
+        """Killed, crashed and over-limit workers are replaced."""
+        timed_out = await pool.run("import time; time.sleep(10)", timeout=0.2)
+        assert timed_out.timed_out and timed_out.returncode == -1
+
+        crashed = await pool.run("import os; os._exit(7)")
+        assert crashed.crashed and crashed.returncode != 0
+
+        memory = await pool.run("data = bytearray(1024 * 1024 * 1024)")
+        assert memory.returncode == 1 and "MemoryError" in memory.stderr
+
+        assert (await pool.run("print('still here')")).stdout == "still here\n"
+        stats = pool.get_stats()
+        assert stats["timeouts"] == 1 and stats["crashes"] == 1 and stats["recycled"] >= 1
+
+    async def test_recycle_after_max_jobs(self, pool):
+        """A worker is replaced once it has run max_jobs_per_worker jobs."""
+        pids = [(await pool.run("pass")).worker_pid for _ in range(4)]
+        assert pids[0] == pids[1] == pids[2]
+        assert pids[3] != pids[0]
+
+
+class TestExecutor:
+    """Test run_python actions."""
+
+    async def test_run_python_uses_pool(self, tmp_path, monkeypatch, pool):
+        monkeypatch.setattr("consciousness.executor.get_python_worker_pool", lambda: pool)
+        executor = ExpandedExecutor(tmp_path, ExecutionConfig(use_python_workers=True))
+
+        result = await executor.execute(
+            Action(type=ActionType.RUN_PYTHON, details={"code": "print('hi')"})
+        )
+        assert result.success and result.output == "hi\n"
+        assert result.metadata["worker_pid"] is not None
+
+    def test_unique_temp_files(self, tmp_path):
+        """Scripts written in the same second get different names."""
+        executor = ExpandedExecutor(tmp_path, ExecutionConfig(use_python_workers=False))
+        names = {executor._temp_file("script_", ".py") for _ in range(5)}
+        assert len(names) == 5
+        assert all(name.parent == executor.config.temp_dir for name in names)
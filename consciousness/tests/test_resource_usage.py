@@ -0,0 +1,179 @@
+"""
+Tests for per-action resource accounting
+
+Tests cover:
+- Sampling a process tree's CPU, memory and child processes
+- Exact exit accounting of processes shorter than the sample interval
+- Executor actions reporting usage, including nested tracking
+- rlimits stopping runaway processes
+- Resource columns in outcomes and action statistics
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from consciousness.executor import Action, ActionType, ExecutionConfig, ExpandedExecutor
+from consciousness.learning.tracker import OutcomeTracker
+from consciousness.python_workers import PythonWorkerPool
+from consciousness.resource_usage import (
+    ResourceSampler,
+    ResourceUsage,
+    spawn_process,
+    track_resources,
+)
+
+# Burns CPU for ~0.6s holding 64MB, with a child process alongside
+BUSY = (
+    "import subprocess, sys, time\n"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(1)'])\n"
+    "data = bytearray(64 * 1024 * 1024)\n"
+    "end = time.process_time() + 0.6\n"
+    "while time.process_time() < end: pass\n"
+    "child.wait()\n"
+)
+
+
+@pytest.fixture
+def executor(tmp_path):
+    config = ExecutionConfig(use_python_workers=False, resource_sample_interval=0.05)
+    return ExpandedExecutor(tmp_path, config)
+
+
+# Exits well within one sample interval
+BURST = (
+    "import time\n"
+    "data = bytearray(32 * 1024 * 1024)\n"
+    "end = time.process_time() + 0.3\n"
+    "while time.process_time() < end: pass\n"
+)
+
+
+class TestSampling:
+    """Test subprocess sampling."""
+
+    async def test_subprocess_usage(self, executor):
+        """CPU, peak RSS and children of a process tree are captured."""
+        with track_resources() as outer:
+            result = await executor._run_subprocess([sys.executable, "-c", BUSY], timeout=30)
+
+        usage = result["resources"]
+        assert result["returncode"] == 0
+        assert usage["cpu_user"] + usage["cpu_system"] >= 0.3
+        assert usage["peak_rss_bytes"] >= 64 * 1024 * 1024
+        assert usage["child_count"] >= 1
+        assert outer.processes == 1 and outer.cpu_total >= 0.3
+
+    async def test_action_resources(self, executor):
+        """Actions running processes report their usage; others don't."""
+        result = await executor.execute(
+            Action(type=ActionType.RUN_PYTHON, details={"code": BUSY})
+        )
+        assert result.success
+        assert result.resources["cpu_user"] > 0
+        assert result.to_dict()["resources"] == result.resources
+
+        read = await executor.execute(
+            Action(type=ActionType.READ_FILE, details={"path": "missing.txt"})
+        )
+        assert read.resources is None
+
+    async def test_short_process_exact(self):
+        """A process exiting between samples is accounted from its exit rusage."""
+        process = await spawn_process([sys.executable, "-c", BURST])
+        sampler = ResourceSampler(process.pid, interval=60).start()
+        await process.stdout.read()
+        assert await process.wait() == 0
+
+        usage = await sampler.stop(process.rusage)
+        assert usage.cpu_total >= 0.3
+        assert usage.peak_rss_bytes >= 32 * 1024 * 1024
+
+    async def test_worker_job_usage(self):
+        """Worker jobs report their CPU (children included) but no peak memory."""
+        pool = PythonWorkerPool(size=1)
+        try:
+            result = await pool.run(
+                "import subprocess, sys\n"
+                f"subprocess.run([sys.executable, '-c', {BURST!r}])\n",
+                cwd=tempfile.gettempdir(),
+            )
+        finally:
+            await pool.close()
+        assert result.returncode == 0
+        assert result.resources.cpu_total >= 0.3
+        assert result.resources.peak_rss_bytes is None
+
+    def test_nested_tracking(self):
+        """Usage recorded in an inner block also counts for the outer one."""
+        with track_resources() as outer:
+            with track_resources() as inner:
+                inner.add(ResourceUsage(cpu_user=1.0, peak_rss_bytes=100, processes=1))
+            outer.add(ResourceUsage(cpu_user=0.5, peak_rss_bytes=50, processes=1))
+
+        assert outer.cpu_user == 1.5
+        assert outer.peak_rss_bytes == 100
+
+        unknown = ResourceUsage()
+        unknown.add(ResourceUsage(cpu_user=1.0, processes=1))
+        assert unknown.peak_rss_bytes is None
+        assert outer.processes == 2
+
+
+class TestLimits:
+    """Test rlimits on spawned processes."""
+
+    async def test_cpu_limit_kills_runaway(self, tmp_path):
+        config = ExecutionConfig(use_python_workers=False, rlimit_cpu_seconds=1)
+        executor = ExpandedExecutor(tmp_path, config)
+
+        result = await executor._run_subprocess(
+            [sys.executable, "-c", "while True: pass"], timeout=30
+        )
+        assert result["returncode"] != 0  # SIGXCPU
+        assert result["resources"]["cpu_user"] + result["resources"]["cpu_system"] < 5
+
+
+class TestOutcomeColumns:
+    """Test resource usage stored with outcomes."""
+
+    async def test_statistics(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracker = OutcomeTracker(Path(tmpdir) / "outcomes.db")
+            await tracker.initialize()
+            try:
+                for cpu, rss in ((1.0, 100), (3.0, 300)):
+                    await tracker.record_outcome(
+                        observation="index changed",
+                        action_type="run_bash",
+                        action_details="rebuild",
+                        success=True,
+                        resources=ResourceUsage(
+                            cpu_user=cpu, cpu_system=0.5, peak_rss_bytes=rss,
+                            read_bytes=10, write_bytes=20, child_count=2,
+                        ).to_dict(),
+                    )
+                # No processes: excluded from the resource averages
+                await tracker.record_outcome(
+                    observation="index changed",
+                    action_type="run_bash",
+                    action_details="noop",
+                    success=True,
+                )
+
+                stats = (await tracker.get_action_statistics())["run_bash"]
+                assert stats["total"] == 3 and stats["with_resources"] == 2
+                assert stats["avg_cpu_seconds"] == pytest.approx(2.5)
+                assert stats["avg_peak_rss_bytes"] == 200
+                assert stats["max_peak_rss_bytes"] == 300
+                assert stats["avg_child_count"] == 2
+
+                outcomes = await tracker.get_recent_outcomes(limit=3)
+                recorded = [o.resources for o in outcomes]
+                assert None in recorded
+                assert {"cpu_user": 3.0, "cpu_system": 0.5, "peak_rss_bytes": 300,
+                        "read_bytes": 10, "write_bytes": 20, "child_count": 2} in recorded
+            finally:
+                await tracker.close()
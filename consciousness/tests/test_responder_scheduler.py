@@ -0,0 +1,162 @@
+"""
+Tests for ResponderScheduler (Background user-message responses)
+
+Tests cover:
+- Priority-ordered semaphore
+- Non-blocking submission
+- One message at a time per file, with shifted line numbers
+- Per-tool concurrency limits across files
+- Duplicate submissions
+"""
+
+import asyncio
+
+import pytest
+
+from consciousness.responder import ConsciousnessResponder
+from consciousness.responder_scheduler import PrioritySemaphore, ResponderScheduler
+from consciousness.user_message import MessagePriority, MessageScanner
+
+
+class FakeResponder:
+    """Responder stand-in that records calls and can be held open."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls: list[tuple[str, int]] = []
+        self.active = 0
+        self.max_active = 0
+
+    def get_tool_for_priority(self, priority: MessagePriority) -> str:
+        return "claude_code"
+
+    async def respond_to_message(self, message, dry_run: bool = False):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.calls.append((message.file_path, message.line_number))
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return "ok"
+
+
+@pytest.fixture
+def scanner():
+    return MessageScanner()
+
+
+class TestPrioritySemaphore:
+    """Test priority ordering of waiters."""
+
+    async def test_higher_priority_first(self):
+        """Waiters should be served by priority, then arrival."""
+        sem = PrioritySemaphore(1)
+        await sem.acquire()
+        order = []
+
+        async def waiter(name, priority):
+            async with sem.slot(priority):
+                order.append(name)
+
+        tasks = [
+            asyncio.create_task(waiter("high-1", 3)),
+            asyncio.create_task(waiter("critical", 4)),
+            asyncio.create_task(waiter("high-2", 3)),
+        ]
+        await asyncio.sleep(0)
+        assert sem.waiting == 3
+
+        sem.release()
+        await asyncio.gather(*tasks)
+        assert order == ["critical", "high-1", "high-2"]
+        assert sem.in_use == 0
+
+    async def test_cancelled_waiter_skipped(self):
+        """A cancelled waiter should not consume a slot."""
+        sem = PrioritySemaphore(1)
+        await sem.acquire()
+        task = asyncio.create_task(sem.acquire(5))
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        sem.release()
+        assert sem.in_use == 0
+
+
+class TestResponderScheduler:
+    """Test background scheduling of responses."""
+
+    async def test_submit_returns_immediately(self, tmp_path, scanner):
+        """Submitting should not wait for the response."""
+        path = tmp_path / "a.md"
+        path.write_text("Hey stoffy, hello?\n")
+        responder = FakeResponder(delay=0.2)
+        scheduler = ResponderScheduler(scanner=scanner)
+
+        messages = await scanner.scan_file(path)
+        assert scheduler.submit(path, responder, messages) == 1
+        assert scheduler.is_busy(path)
+        assert responder.calls == []
+
+        await scheduler.drain()
+        assert responder.calls == [(str(path), 1)]
+        assert not scheduler.is_busy(path)
+
+    async def test_duplicate_submission_ignored(self, tmp_path, scanner):
+        """Messages already queued or in progress should not be queued again."""
+        path = tmp_path / "a.md"
+        path.write_text("Hey stoffy, hello?\n")
+        responder = FakeResponder(delay=0.05)
+        scheduler = ResponderScheduler(scanner=scanner)
+
+        messages = await scanner.scan_file(path)
+        scheduler.submit(path, responder, messages)
+        await asyncio.sleep(0.01)
+        assert scheduler.submit(path, responder, messages) == 0
+
+        await scheduler.drain()
+        assert len(responder.calls) == 1
+
+    async def test_tool_limit_across_files(self, tmp_path, scanner):
+        """No more than the tool's limit should run at once."""
+        responder = FakeResponder(delay=0.05)
+        scheduler = ResponderScheduler(
+            scanner=scanner, max_concurrent_per_tool={"claude_code": 2}
+        )
+        for i in range(5):
+            path = tmp_path / f"f{i}.md"
+            path.write_text("@stoffy please help\n")
+            scheduler.submit(path, responder, await scanner.scan_file(path))
+
+        await scheduler.drain()
+        assert len(responder.calls) == 5
+        assert responder.max_active == 2
+        assert scheduler.get_stats()["responded"] == 5
+
+    async def test_file_messages_answered_in_order(self, tmp_path, scanner):
+        """A file's messages should be answered one at a time at current lines."""
+        path = tmp_path / "hey.md"
+        path.write_text("@stoffy second\n\ntext\n\nHey stoffy, first?\n")
+
+        responder = ConsciousnessResponder(tmp_path)
+        responder.scanner = scanner
+        generated = []
+
+        async def _generate(message, tool, on_text=None):
+            generated.append(message.line_number)
+            return f"answer {len(generated)}"
+
+        responder._generate_response = _generate
+        scheduler = ResponderScheduler(scanner=scanner)
+
+        scheduler.submit(path, responder, await scanner.scan_file(path))
+        await scheduler.drain()
+
+        content = path.read_text()
+        assert content.count("STOFFY-REPLIED") == 2
+        # CRITICAL first (line 5), then the HIGH message, still on line 1
+        assert generated == [5, 1]
+        assert scanner.get_stats()["full_scans"] == 1
+        assert await scanner.scan_file(path) == []
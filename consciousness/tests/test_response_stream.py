@@ -0,0 +1,280 @@
+"""
+Tests for StreamingResponseWriter (Streamed response insertion)
+
+Tests cover:
+- Claude stream-json parsing
+- Placeholder insertion with the STOFFY-REPLIED marker
+- Rate-limited intermediate writes and deferred flushes
+- Finalizing and aborting, with user edits elsewhere in the file
+- Self-write tracking of every write
+- End-to-end streaming through the responder and a fake `claude` CLI
+- Bounded stream text and stderr of long sessions
+"""
+
+import asyncio
+import json
+import sys
+
+import pytest
+
+from consciousness.executor import (
+    Action,
+    ActionType,
+    ClaudeStreamParser,
+    ExecutionConfig,
+    ExpandedExecutor,
+)
+from consciousness.responder import ConsciousnessResponder
+from consciousness.response_stream import STREAMING_NOTICE, StreamingResponseWriter
+from consciousness.self_write_tracker import get_self_write_tracker
+from consciousness.user_message import (
+    MessageScanner,
+    ResponseFormatter,
+    UserMessageDetector,
+    compute_message_hash,
+)
+
+
+def _events(*events) -> list[str]:
+    return [json.dumps(e) for e in events]
+
+
+def _delta(text: str) -> dict:
+    return {
+        "type": "stream_event",
+        "event": {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}},
+    }
+
+
+@pytest.fixture
+def note(tmp_path):
+    path = tmp_path / "note.md"
+    path.write_text("# Notes\n\nHey stoffy, what is up?\n\nMore text.\n")
+    message = UserMessageDetector().detect_in_content(path.read_text(), str(path))[0]
+    return path, message
+
+
+class TestClaudeStreamParser:
+    """Test stream-json parsing."""
+
+    def test_partial_messages(self):
+        """Text deltas should be emitted; the result event is the final output."""
+        parser = ClaudeStreamParser()
+        lines = _events(
+            {"type": "system", "subtype": "init"},
+            _delta("Hel"),
+            _delta("lo"),
+            {"type": "assistant", "message": {"content": [{"type": "text", "text": "Hello"}]}},
+            {"type": "result", "subtype": "success", "result": "Hello!"},
+        )
+        assert [parser.feed(line) for line in lines] == [None, "Hel", "lo", None, None]
+        assert parser.output == "Hello!"
+        assert not parser.is_error
+
+    def test_whole_messages_and_errors(self):
+        """Without deltas, assistant messages are emitted; bad lines are ignored."""
+        parser = ClaudeStreamParser()
+        texts = [parser.feed(line) for line in [
+            "not json",
+            *_events(
+                {"type": "assistant", "message": {"content": [{"type": "text", "text": "One"}]}},
+                {"type": "assistant", "message": {"content": [{"type": "tool_use"}]}},
+                {"type": "assistant", "message": {"content": [{"type": "text", "text": "Two"}]}},
+                {"type": "result", "subtype": "error_max_turns", "is_error": True},
+            ),
+        ]]
+        assert texts == [None, "One", None, "\n\nTwo", None]
+        assert parser.is_error
+        assert parser.output == "One\n\nTwo"
+
+
+class TestStreamingResponseWriter:
+    """Test writing a response while it is generated."""
+
+    async def test_placeholder_then_final(self, note):
+        """The marker should be in the file before any text arrives."""
+        path, message = note
+        scanner = MessageScanner()
+        scanner.scan(str(path), path.read_text())
+        writer = StreamingResponseWriter(path, message, ResponseFormatter(), scanner=scanner)
+
+        assert await writer.open()
+        content = path.read_text()
+        assert f"STOFFY-REPLIED:{compute_message_hash(message.message)}" in content
+        assert STREAMING_NOTICE in content
+        assert scanner.scan(str(path), content) == []
+        assert get_self_write_tracker().should_ignore(path)
+
+        await writer.append("Partial")
+        assert "Partial" in path.read_text()
+        assert writer.first_token_ms is not None
+
+        assert await writer.finalize("Complete answer")
+        content = path.read_text()
+        assert "Complete answer" in content
+        assert "Partial" not in content and STREAMING_NOTICE not in content
+        assert content.endswith("More text.\n")
+        assert content.count("STOFFY-REPLIED") == 1
+
+    async def test_writes_rate_limited(self, note):
+        """Chunks arriving quickly should be batched, and the rest written later."""
+        path, message = note
+        writer = StreamingResponseWriter(path, message, ResponseFormatter(), write_interval=0.05)
+        await writer.open()
+
+        for i in range(50):
+            await writer.append(f"w{i} ")
+        assert writer.writes == 2  # Placeholder and the first chunk
+        await asyncio.sleep(0.1)
+        assert writer.writes == 3
+        assert "w49" in path.read_text()
+
+        await writer.finalize("done")
+        assert writer.writes == 4
+
+    async def test_abort_restores_file(self, note):
+        """Aborting should remove the block and keep the user's edits."""
+        path, message = note
+        writer = StreamingResponseWriter(path, message, ResponseFormatter(), write_interval=0)
+        await writer.open()
+        await writer.append("thinking")
+
+        path.write_text(path.read_text() + "User added this.\n")
+        await writer.abort()
+
+        assert path.read_text() == (
+            "# Notes\n\nHey stoffy, what is up?\n\nMore text.\nUser added this.\n"
+        )
+
+    async def test_block_edited_by_user(self, note):
+        """If the user edits the block, streaming stops and finalize fails."""
+        path, message = note
+        writer = StreamingResponseWriter(path, message, ResponseFormatter(), write_interval=0)
+        await writer.open()
+        path.write_text(path.read_text().replace(STREAMING_NOTICE, "mine"))
+
+        await writer.append("text")
+        assert not await writer.finalize("answer")
+        assert "answer" not in path.read_text()
+
+
+class FakeStreamingExecutor:
+    """Executor stand-in that streams chunks and checks what the file shows."""
+
+    def __init__(self, path, chunks):
+        self.path = path
+        self.chunks = chunks
+        self.seen: list[str] = []
+
+    async def execute_streaming(self, action, on_text):
+        self.seen.append(self.path.read_text())
+        for chunk in self.chunks:
+            await on_text(chunk)
+            self.seen.append(self.path.read_text())
+
+        class Result:
+            success = True
+            output = "".join(self.chunks)
+            error = None
+
+        return Result()
+
+
+class TestResponderStreaming:
+    """Test streaming through the responder."""
+
+    async def test_response_visible_while_generating(self, note):
+        """The placeholder and partial text should be visible before completion."""
+        path, message = note
+        executor = FakeStreamingExecutor(path, ["First part. ", "Second part."])
+        responder = ConsciousnessResponder(path.parent, executor=executor)
+        responder.config.stream_write_interval = 0
+
+        response = await responder.respond_to_message(message)
+
+        assert response == "First part. Second part."
+        assert STREAMING_NOTICE in executor.seen[0]
+        assert "First part." in executor.seen[1]
+        final = path.read_text()
+        assert "First part. Second part." in final and STREAMING_NOTICE not in final
+        assert responder.get_stats()["streamed"] == 1
+        assert responder.get_stats()["first_token_ms"]["last"] is not None
+
+    async def test_failure_removes_placeholder(self, note):
+        """A failed generation should leave the file as it was."""
+        path, message = note
+        original = path.read_text()
+        responder = ConsciousnessResponder(path.parent)
+
+        async def _fail(message, tool, on_text=None):
+            assert STREAMING_NOTICE in path.read_text()
+            return None
+
+        responder._generate_response = _fail
+        assert await responder.respond_to_message(message) is None
+        assert path.read_text() == original
+
+
+class TestExecutorStreaming:
+    """Test execute_streaming against a fake `claude` CLI."""
+
+    async def test_fake_cli(self, tmp_path):
+        """Text deltas should reach on_text before the process exits."""
+        script = tmp_path / "claude"
+        lines = _events(_delta("Hi "), _delta("there"), {
+            "type": "result", "subtype": "success", "result": "Hi there",
+        })
+        script.write_text(
+            f"#!{sys.executable}\n"
+            "import sys, time\n"
+            f"for line in {lines!r}:\n"
+            "    print(line, flush=True)\n"
+            "    time.sleep(0.05)\n"
+        )
+        script.chmod(0o755)
+
+        executor = ExpandedExecutor(tmp_path)
+        executor.claude_path = str(script)
+        received = []
+
+        async def on_text(text):
+            received.append(text)
+
+        result = await executor.execute_streaming(
+            Action(type=ActionType.CLAUDE_CODE, details={"prompt": "hi"}, timeout=10), on_text
+        )
+        assert result.success
+        assert result.output == "Hi there"
+        assert received == ["Hi ", "there"]
+
+    async def test_long_session_bounded(self, tmp_path):
+        """Streamed text and stderr keep only their head and tail."""
+        script = tmp_path / "claude"
+        script.write_text(
+            f"#!{sys.executable}\n"
+            "import json, sys\n"
+            "for i in range(200):\n"
+            "    event = {'type': 'content_block_delta',\n"
+            "             'delta': {'type': 'text_delta', 'text': f'{i:03d}' + 'x' * 97}}\n"
+            "    print(json.dumps({'type': 'stream_event', 'event': event}), flush=True)\n"
+            "sys.stderr.write('e' * 100000)\n"
+            "sys.exit(1)\n"
+        )
+        script.chmod(0o755)
+
+        config = ExecutionConfig(output_head_bytes=1000, output_tail_bytes=500)
+        executor = ExpandedExecutor(tmp_path, config)
+        executor.claude_path = str(script)
+        received = []
+
+        async def on_text(text):
+            received.append(text)
+
+        result = await executor.execute_streaming(
+            Action(type=ActionType.CLAUDE_CODE, details={"prompt": "hi"}, timeout=10), on_text
+        )
+        assert not result.success
+        assert len(received) == 200
+        assert result.output.startswith("000x") and result.output.endswith("x" * 97)
+        assert "bytes truncated" in result.output and len(result.output) < 2000
+        assert "bytes truncated" in result.error and len(result.error) < 2000
@@ -0,0 +1,217 @@
+"""
+Tests for multi-root watching
+
+Tests cover:
+- Root configuration resolution
+- Fair round-robin scheduling across roots
+- Root-tagged state records and schema migration
+- Daemon construction with several roots
+"""
+
+import asyncio
+import time
+
+import aiosqlite
+import pytest
+
+from consciousness.config import ConsciousnessConfig, WatchRootConfig, WatcherConfig
+from consciousness.manifest import FileManifest
+from consciousness.roots import RootScheduler, WatchRoot
+from consciousness.state import Event, EventType, StateManager, ThoughtRecord
+from consciousness.watcher import ConsciousnessWatcher, FileChange
+
+
+def _root(name: str, path) -> WatchRoot:
+    return WatchRoot(
+        name=name,
+        path=path,
+        file_watcher=ConsciousnessWatcher(root_path=path),
+        manifest=FileManifest(path),
+    )
+
+
+def _changes(prefix: str, n: int) -> list[FileChange]:
+    return [FileChange(f"/{prefix}/{i}.md", "modified", time.time()) for i in range(n)]
+
+
+class TestRootConfig:
+    """Test WatcherConfig.resolved_roots."""
+
+    def test_defaults_to_root_path(self, tmp_path):
+        """Without roots, root_path should be the only root."""
+        config = WatcherConfig(root_path=str(tmp_path), ignore_patterns=["*.log"])
+        roots = config.resolved_roots()
+
+        assert len(roots) == 1
+        assert roots[0].path == str(tmp_path)
+        assert roots[0].name == tmp_path.name
+        assert roots[0].ignore_patterns == ["*.log"]
+
+    def test_per_root_patterns(self, tmp_path):
+        """Roots may replace or extend the shared ignore patterns."""
+        config = WatcherConfig(
+            ignore_patterns=["*.log"],
+            roots=[
+                WatchRootConfig(path=str(tmp_path / "a"), extra_ignore_patterns=["data"]),
+                WatchRootConfig(path=str(tmp_path / "b"), ignore_patterns=["*.tmp"]),
+            ],
+        )
+        a, b = config.resolved_roots()
+
+        assert a.ignore_patterns == ["*.log", "data"]
+        assert b.ignore_patterns == ["*.tmp"]
+
+    def test_unique_names(self, tmp_path):
+        """Duplicate root names should be disambiguated."""
+        config = WatcherConfig(
+            roots=[
+                WatchRootConfig(path=str(tmp_path / "x" / "repo")),
+                WatchRootConfig(path=str(tmp_path / "y" / "repo")),
+            ],
+        )
+        assert [r.name for r in config.resolved_roots()] == ["repo", "repo-2"]
+
+
+class TestRootScheduler:
+    """Test fair scheduling of pending changes."""
+
+    async def test_returns_none_when_idle(self, tmp_path):
+        """No pending changes should time out with None."""
+        scheduler = RootScheduler([_root("a", tmp_path)])
+        assert await scheduler.next_batch(timeout=0.01) is None
+
+    async def test_round_robin(self, tmp_path):
+        """A noisy root should not starve a quiet one."""
+        noisy, quiet = _root("noisy", tmp_path), _root("quiet", tmp_path)
+        scheduler = RootScheduler([noisy, quiet], max_changes_per_turn=10)
+
+        scheduler.put("noisy", _changes("noisy", 100))
+        scheduler.put("quiet", _changes("quiet", 1))
+
+        served = []
+        for _ in range(3):
+            root, changes = await scheduler.next_batch(timeout=0.01, settle=0.001)
+            served.append((root.name, len(changes)))
+
+        assert served == [("noisy", 10), ("quiet", 1), ("noisy", 10)]
+        assert scheduler.get_stats()["noisy"]["pending"] == 80
+
+    async def test_waits_for_changes(self, tmp_path):
+        """Changes arriving while waiting should be returned."""
+        scheduler = RootScheduler([_root("a", tmp_path)])
+
+        async def _produce():
+            await asyncio.sleep(0.02)
+            scheduler.put("a", _changes("a", 2))
+
+        producer = asyncio.create_task(_produce())
+        picked = await scheduler.next_batch(timeout=1.0, settle=0.01)
+        await producer
+
+        assert picked is not None
+        assert picked[0].name == "a"
+        assert len(picked[1]) == 2
+
+
+class TestRootTaggedState:
+    """Test root tagging in the shared state database."""
+
+    async def test_events_filtered_by_root(self, tmp_path):
+        """Events should carry and filter by root."""
+        state = StateManager(tmp_path / "state.db")
+        await state.initialize()
+        try:
+            await state.record_event(Event(event_type=EventType.OBSERVATION, root="a"))
+            await state.record_event(Event(event_type=EventType.OBSERVATION, root="b"))
+            await state.record_thought(ThoughtRecord(prompt="p", response="r", root="b"))
+
+            events = await state.get_recent_events(root="a")
+            assert [e.root for e in events] == ["a"]
+            assert (await state.get_recent_thoughts())[0].root == "b"
+
+            stats = await state.get_statistics()
+            assert stats["events_by_root"] == {"a": 1, "b": 1}
+        finally:
+            await state.close()
+
+    async def test_migrates_existing_database(self, tmp_path):
+        """Databases created before root tagging should gain the column."""
+        db_path = tmp_path / "old.db"
+        async with aiosqlite.connect(db_path) as conn:
+            await conn.execute(
+                """
+                CREATE TABLE events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_type TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    context TEXT NOT NULL
+                )
+                """
+            )
+            await conn.commit()
+
+        state = StateManager(db_path)
+        await state.initialize()
+        try:
+            await state.record_event(Event(event_type=EventType.ERROR, root="a"))
+            events = await state.get_recent_events()
+            assert events[0].root == "a"
+        finally:
+            await state.close()
+
+
+class TestMultiRootDaemon:
+    """Test daemon construction with several roots."""
+
+    def test_daemon_builds_one_component_set_per_root(self, tmp_path):
+        """Each root should get its own watchers and executors."""
+        from consciousness.daemon import ConsciousnessDaemon
+
+        (tmp_path / "one").mkdir()
+        (tmp_path / "two").mkdir()
+        config = ConsciousnessConfig()
+        config.watcher.roots = [
+            WatchRootConfig(path=str(tmp_path / "one")),
+            WatchRootConfig(path=str(tmp_path / "two"), git=False),
+        ]
+        config.state.database_path = str(tmp_path / "state.db")
+
+        daemon = ConsciousnessDaemon(config)
+
+        assert [r.name for r in daemon.roots] == ["one", "two"]
+        assert daemon.root_path == tmp_path / "one"
+        assert daemon.file_watcher is daemon.roots[0].file_watcher
+        assert daemon.roots[1].git_watcher is None
+        assert daemon.roots[1].executor.working_dir == tmp_path / "two"
+        assert daemon.roots[1].knowledge.base_path == tmp_path / "two"
+
+    def test_knowledge_change_in_secondary_root_invalidates_cache(self, tmp_path):
+        """Knowledge edits under any root drop cached decisions."""
+        from consciousness.daemon import ConsciousnessDaemon
+        from consciousness.thinker import Decision, DecisionType
+
+        for name in ("one", "two"):
+            (tmp_path / name / "knowledge").mkdir(parents=True)
+        config = ConsciousnessConfig()
+        config.watcher.roots = [
+            WatchRootConfig(path=str(tmp_path / "one")),
+            WatchRootConfig(path=str(tmp_path / "two"), git=False),
+        ]
+        config.state.database_path = str(tmp_path / "state.db")
+        daemon = ConsciousnessDaemon(config)
+        decision = Decision(
+            observation_summary="", reasoning="", decision=DecisionType.WAIT, confidence=0.9
+        )
+        second = daemon.roots[1]
+
+        daemon.decision_cache.put("key", decision)
+        daemon._invalidate_decision_cache(
+            second, [FileChange(str(tmp_path / "one" / "knowledge" / "a.md"), "modified", time.time())]
+        )
+        assert len(daemon.decision_cache) == 1
+
+        daemon._invalidate_decision_cache(
+            second, [FileChange(str(tmp_path / "two" / "knowledge" / "a.md"), "modified", time.time())]
+        )
+        assert len(daemon.decision_cache) == 0
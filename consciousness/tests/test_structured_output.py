@@ -0,0 +1,147 @@
+"""
+Tests for schema-constrained decisions (Structured output)
+
+Tests cover:
+- JSON schema generated from the Decision/Action dataclasses
+- response_format on supporting servers
+- Falling back (once, remembered) when the server rejects it
+- Keeping it after unrelated bad requests
+- Parse outcome tracking per model
+"""
+
+from types import SimpleNamespace
+
+from openai import BadRequestError
+
+from consciousness.thinker import (
+    ActionType,
+    ConsciousnessThinker,
+    DecisionType,
+    decision_json_schema,
+)
+
+
+RESPONSE = '{"observation_summary": "x", "reasoning": "y", "decision": "wait", "confidence": 0.9}'
+
+
+class FakeStream:
+    def __init__(self, text: str):
+        self.text = text
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        yield SimpleNamespace(
+            choices=[SimpleNamespace(delta=SimpleNamespace(content=self.text))], usage=None
+        )
+
+
+def _bad_request(message: str = "response_format is not supported") -> BadRequestError:
+    response = SimpleNamespace(request=None, status_code=400, headers={})
+    return BadRequestError(message, response=response, body=None)
+
+
+class TestDecisionSchema:
+    """Test schema generation."""
+
+    def test_schema_from_dataclasses(self):
+        """Fields, enums and requirements should follow the dataclasses."""
+        schema = decision_json_schema()
+        properties = schema["properties"]
+
+        assert list(properties) == [
+            "decision", "action", "confidence", "expected_outcome",
+            "observation_summary", "reasoning",
+        ]
+        assert properties["decision"]["enum"] == [d.value for d in DecisionType]
+        assert schema["required"] == list(properties)
+        assert properties["confidence"]["maximum"] == 1.0
+
+        action, null = properties["action"]["anyOf"]
+        assert null == {"type": "null"}
+        assert action["properties"]["type"]["enum"] == [t.value for t in ActionType]
+        assert action["required"] == ["type", "description"]
+
+
+class TestStructuredRequests:
+    """Test requesting and falling back from structured output."""
+
+    async def test_response_format_sent(self):
+        """Supporting servers get the schema and the response parses as JSON."""
+        thinker = ConsciousnessThinker(model="qwen")
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return FakeStream(RESPONSE)
+
+        thinker.client.chat.completions.create = create
+        decision = await thinker.think_autonomous("index rebuilt")
+
+        assert decision.decision == DecisionType.WAIT
+        response_format = calls[0]["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["schema"] == decision_json_schema()
+        assert "strict" not in response_format["json_schema"]
+
+        stats = thinker.get_parse_stats()
+        assert stats["structured_supported"] is True
+        assert stats["models"]["qwen"]["structured"] == 1
+        assert stats["models"]["qwen"]["json"] == 1
+
+    async def test_unsupported_server_falls_back(self):
+        """A rejected response_format is retried without it and not sent again."""
+        thinker = ConsciousnessThinker(model="old")
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            if "response_format" in kwargs:
+                raise _bad_request()
+            return FakeStream("I think we should wait, nothing to do.")
+
+        thinker.client.chat.completions.create = create
+        first = await thinker.think_autonomous("a")
+        await thinker.think_autonomous("b")
+
+        assert first.decision == DecisionType.WAIT
+        assert ["response_format" in c for c in calls] == [True, False, False]
+
+        stats = thinker.get_parse_stats()
+        assert stats["structured_supported"] is False
+        assert stats["models"]["old"]["failures"] == 2
+        assert stats["models"]["old"]["failure_rate"] == 1.0
+
+    async def test_unrelated_bad_request_keeps_schema(self):
+        """A context overflow fails the call but doesn't disable structured output."""
+        thinker = ConsciousnessThinker(model="qwen")
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise _bad_request("context length of 4096 tokens exceeded")
+            return FakeStream(RESPONSE)
+
+        thinker.client.chat.completions.create = create
+        first = await thinker.think_autonomous("a")
+        second = await thinker.think_autonomous("b")
+
+        assert first.confidence == 0.0
+        assert second.decision == DecisionType.WAIT
+        assert ["response_format" in c for c in calls] == [True, True]
+        assert thinker.get_parse_stats()["structured_supported"] is True
+
+    async def test_disabled(self):
+        """structured_output=False never sends the schema."""
+        thinker = ConsciousnessThinker(structured_output=False)
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs)
+            return FakeStream(RESPONSE)
+
+        thinker.client.chat.completions.create = create
+        await thinker.think("index rebuilt")
+        assert "response_format" not in calls[0]
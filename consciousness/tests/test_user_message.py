@@ -0,0 +1,217 @@
+"""
+Tests for UserMessageDetector (Single-pass message scanning)
+
+Tests cover:
+- Line numbers from the line-offset index
+- Highest priority pattern per line, including overlapping matches
+- STOFFY-REPLIED markers collected in one pass
+- Custom patterns that cannot be combined
+- Incremental rescans after edits and response insertions
+- Benchmark on a 5 MB journal-style markdown file
+"""
+
+import re
+import time
+
+import pytest
+
+from consciousness.file_access import FileAccessService
+from consciousness.user_message import (
+    MessagePriority,
+    MessageScanner,
+    ResponseFormatter,
+    UserMessageDetector,
+    _LineIndex,
+    compute_message_hash,
+)
+
+
+def _journal(target_bytes: int) -> tuple[str, int]:
+    """Build a journal with dated entries, replied and open messages."""
+    formatter = ResponseFormatter()
+    parts: list[str] = []
+    size = 0
+    day = 0
+    open_messages = 0
+    while size < target_bytes:
+        day += 1
+        entry = [
+            f"## Day {day}\n",
+            "Worked on the consciousness daemon and read about stoffy's memory.\n",
+            "- note one\n- note two with a few more words\n\n",
+        ]
+        if day % 50 == 0:
+            message = f"Hey Stoffy, can you summarise day {day}?"
+            entry.append(message + "\n")
+            entry.append(formatter.format_response(
+                "Sure.", MessagePriority.CRITICAL, "t", compute_message_hash(message)
+            ) + "\n")
+        if day % 97 == 0:
+            entry.append(f"@stoffy please look at item {day}\n\n")
+            open_messages += 1
+        entry.append("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3 + "\n\n")
+        text = "".join(entry)
+        parts.append(text)
+        size += len(text)
+    return "".join(parts), open_messages
+
+
+class TestLineIndex:
+    """Test the offset-backed line view."""
+
+    def test_matches_split(self):
+        """Indexing should behave like str.split('\\n')."""
+        content = "a\n\nbc\nd"
+        lines = _LineIndex(content)
+
+        assert list(lines) == content.split("\n")
+        assert lines.line_of(0) == 0
+        assert lines.line_of(2) == 1
+        assert lines.line_of(4) == 2
+        assert lines.line_of(len(content) - 1) == 3
+
+
+class TestDetection:
+    """Test message detection."""
+
+    def test_line_numbers_and_order(self):
+        """Messages should be ordered by priority, then line."""
+        content = "# Notes\n\n@stoffy look\n\nHey consciousness, hi\n"
+        messages = UserMessageDetector().detect_in_content(content, "n.md")
+
+        assert [(m.line_number, m.pattern_matched) for m in messages] == [
+            (5, "direct_greeting"),
+            (3, "at_mention"),
+        ]
+        assert messages[0].full_context.splitlines()[4] == ">>> Hey consciousness, hi"
+
+    def test_hidden_higher_priority_match(self):
+        """A lower-priority match earlier on a line must not hide a better one."""
+        content = "I asked stoffy about it? Stoffy, can you help"
+        messages = UserMessageDetector().detect_in_content(content)
+
+        assert len(messages) == 1
+        assert messages[0].priority == MessagePriority.HIGH
+        assert messages[0].pattern_matched == "request"
+
+    def test_replied_message_skipped(self):
+        """A marker after a message should suppress it; a later repeat is new."""
+        message = "Hey Stoffy, what time is it?"
+        marker = f"<!-- STOFFY-REPLIED:{compute_message_hash(message)} -->"
+        content = f"{message}\n{marker}\n\nLater:\n\n{message}\n"
+
+        messages = UserMessageDetector().detect_in_content(content)
+        assert [m.line_number for m in messages] == [6]
+
+    def test_custom_patterns_with_groups(self):
+        """Patterns with their own groups fall back to separate scans."""
+        patterns = [
+            (re.compile(r"(todo)\b", re.IGNORECASE), MessagePriority.LOW, "todo"),
+            (re.compile(r"!!(urgent)", re.IGNORECASE), MessagePriority.HIGH, "urgent"),
+        ]
+        detector = UserMessageDetector(patterns=patterns)
+        assert detector._combined is None
+
+        messages = detector.detect_in_content("a TODO here\n!!urgent todo\n")
+        assert [(m.line_number, m.pattern_matched) for m in messages] == [
+            (2, "urgent"),
+            (1, "todo"),
+        ]
+
+    def test_empty_content(self):
+        """Empty content should yield no messages."""
+        assert UserMessageDetector().detect_in_content("") == []
+
+
+def _key(messages):
+    return [(m.line_number, m.pattern_matched, m.message, m.full_context) for m in messages]
+
+
+class TestMessageScanner:
+    """Test incremental scanning."""
+
+    def test_edits_match_full_scan(self):
+        """Each incremental result should equal a full detection."""
+        detector = UserMessageDetector()
+        scanner = MessageScanner(detector)
+        content = "\n".join(f"line {i}" for i in range(200))
+        scanner.scan("f.md", content)
+
+        edits = [
+            lambda c: c.replace("line 100", "Hey stoffy, are you there?"),
+            lambda c: c.replace("line 5\n", "line 5\n@consciousness look\n\n"),
+            lambda c: c.replace("line 101", "hey\n\n"),
+            lambda c: c + "\nStoffy: last one",
+            lambda c: c.replace("Hey stoffy, are you there?", "nothing here"),
+            lambda c: c.replace("line 150", "stoffy\ncan you help"),
+        ]
+        for edit in edits:
+            content = edit(content)
+            assert _key(scanner.scan("f.md", content)) == _key(
+                detector.detect_in_content(content, "f.md")
+            )
+
+        stats = scanner.get_stats()
+        assert stats["full_scans"] == 1
+        assert stats["incremental_scans"] == len(edits)
+        assert stats["lines_rescanned"] < 200 + len(edits) * 20
+
+    def test_record_insertion_shifts_lines(self):
+        """A response insertion should mark the message replied and shift the rest."""
+        formatter = ResponseFormatter()
+        scanner = MessageScanner()
+        content = "Hey stoffy, first?\n\ntext\n\n@stoffy second\n"
+
+        first, second = scanner.scan("f.md", content)
+        assert (first.line_number, second.line_number) == (1, 5)
+
+        updated = formatter.insert_response_after_message(content, first, "Answer")
+        scanner.record_insertion("f.md", content, updated, formatter.insertion_index(first))
+        messages = scanner._states["f.md"].messages
+
+        assert [m.message for m in messages] == ["@stoffy second"]
+        assert messages[0].line_number == updated.split("\n").index("@stoffy second") + 1
+        assert _key(messages) == _key(UserMessageDetector().detect_in_content(updated, "f.md"))
+        assert scanner.get_stats()["incremental_scans"] == 0
+
+    def test_record_insertion_with_stale_state(self):
+        """An insertion into content the scanner hasn't seen drops the state."""
+        scanner = MessageScanner()
+        scanner.scan("f.md", "Hey stoffy, hi")
+        scanner.record_insertion("f.md", "other", "other\nreply", 1)
+        assert scanner.get_stats()["files"] == 0
+
+    async def test_scan_file_skips_unchanged(self, tmp_path):
+        """Unchanged files should not be read again."""
+        path = tmp_path / "note.md"
+        path.write_text("@stoffy hello\n")
+        files = FileAccessService()
+        try:
+            scanner = MessageScanner(file_access=files)
+            assert len(await scanner.scan_file(path)) == 1
+            assert len(await scanner.scan_file(path)) == 1
+            assert files.reads == 1
+
+            path.write_text("@stoffy hello\n@stoffy again\n")
+            assert len(await scanner.scan_file(path)) == 2
+            assert await scanner.scan_file(tmp_path / "missing.md") is None
+        finally:
+            files.close()
+
+
+class TestBenchmark:
+    """Benchmark on a large journal."""
+
+    @pytest.mark.slow
+    def test_five_megabyte_journal(self):
+        """A 5 MB journal should be scanned in linear time."""
+        content, open_messages = _journal(5 * 1024 * 1024)
+        detector = UserMessageDetector()
+
+        start = time.perf_counter()
+        messages = detector.detect_in_content(content, "journal.md")
+        elapsed = time.perf_counter() - start
+
+        assert len([m for m in messages if m.pattern_matched == "at_mention"]) == open_messages
+        assert not any(m.pattern_matched == "direct_greeting" for m in messages)
+        assert elapsed < 5.0
@@ -11,13 +11,18 @@ that makes sense for the situation.
 OBSERVE -> THINK -> DECIDE -> ACT
 """
 
-from openai import AsyncOpenAI
-from dataclasses import dataclass, field
-from typing import Optional, AsyncIterator, Any
+from openai import BadRequestError, UnprocessableEntityError
+from collections import deque
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
+from typing import Optional, AsyncIterator, Any, Callable, Union, get_args, get_origin, get_type_hints
 import json
 import logging
+import re
 from enum import Enum
 
+from .llm_clients import get_llm_client_registry
+from .llm_metrics import LLMCallTimer, LLMUsage
+
 logger = logging.getLogger(__name__)
 
 
@@ -118,6 +123,23 @@ class Action:
         )
 
 
+@dataclass
+class EarlyExit:
+    """A completion stopped once its outcome was known."""
+    reason: str                                 # "wait" or "low_confidence"
+    completion_tokens: int = 0                  # Tokens generated before stopping
+    tokens_saved: Optional[int] = None          # Versus recent full completions
+    latency_saved_ms: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "reason": self.reason,
+            "completion_tokens": self.completion_tokens,
+            "tokens_saved": self.tokens_saved,
+            "latency_saved_ms": self.latency_saved_ms,
+        }
+
+
 @dataclass
 class Decision:
     """Represents a decision made by the autonomous thinker."""
@@ -128,6 +150,8 @@ class Decision:
     confidence: float = 0.5
     expected_outcome: str = ""
     raw_response: str = field(default="", repr=False)
+    usage: Optional[LLMUsage] = field(default=None, repr=False)  # The LLM call behind it
+    early_exit: Optional[EarlyExit] = field(default=None, repr=False)
 
     def to_dict(self) -> dict:
         result = {
@@ -184,6 +208,242 @@ class Decision:
         )
 
 
+# =============================================================================
+# STRUCTURED OUTPUT SCHEMA
+# =============================================================================
+
+# Decision fields filled in by the thinker, not generated by the LLM
+_SCHEMA_EXCLUDED_FIELDS = {"raw_response", "usage", "early_exit"}
+
+# Generation order of the decision fields: what DecisionStreamParser stops
+# on comes first, the long reasoning last
+_DECISION_FIELD_ORDER = (
+    "decision", "action", "confidence", "expected_outcome",
+    "observation_summary", "reasoning",
+)
+
+
+def _type_schema(annotation: Any) -> dict:
+    """JSON schema of a field type of the Decision/Action dataclasses."""
+    if get_origin(annotation) is Union:
+        members = [a for a in get_args(annotation) if a is not type(None)]
+        return {"anyOf": [_type_schema(members[0]), {"type": "null"}]}
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return {"type": "string", "enum": [member.value for member in annotation]}
+    if is_dataclass(annotation):
+        return _dataclass_schema(annotation)
+    return {
+        str: {"type": "string"},
+        float: {"type": "number"},
+        int: {"type": "integer"},
+        bool: {"type": "boolean"},
+    }.get(annotation, {"type": "object"})
+
+
+def _dataclass_schema(cls: type, required: tuple[str, ...] = ()) -> dict:
+    """JSON schema of a dataclass; fields without defaults are required."""
+    hints = get_type_hints(cls)
+    properties = {}
+    required_fields = list(required)
+    for f in fields(cls):
+        if f.name in _SCHEMA_EXCLUDED_FIELDS:
+            continue
+        properties[f.name] = _type_schema(hints[f.name])
+        if f.default is MISSING and f.default_factory is MISSING and f.name not in required_fields:
+            required_fields.append(f.name)
+    return {"type": "object", "properties": properties, "required": required_fields}
+
+
+def decision_json_schema() -> dict:
+    """
+    JSON schema for a Decision, generated from the Decision/Action dataclasses.
+
+    Properties are ordered decision, action, confidence first and reasoning
+    last, and all of them are required (action may be null), so servers
+    generating in schema order let DecisionStreamParser stop before the
+    reasoning is written.
+    """
+    schema = _dataclass_schema(Decision)
+    schema["properties"] = {
+        name: schema["properties"][name] for name in _DECISION_FIELD_ORDER
+    }
+    schema["required"] = list(_DECISION_FIELD_ORDER)
+    schema["properties"]["confidence"].update({"minimum": 0.0, "maximum": 1.0})
+    return schema
+
+
+def decision_response_format() -> dict:
+    """
+    The `response_format` argument for schema-constrained decisions.
+
+    Not marked strict: action details are free-form objects, which strict
+    mode (additionalProperties: false everywhere) cannot express.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": "decision", "schema": decision_json_schema()},
+    }
+
+
+def _rejects_response_format(error: Exception) -> bool:
+    """Whether a 400/422 error is about response_format itself."""
+    text = f"{error} {getattr(error, 'body', '')}".lower()
+    return any(term in text for term in ("response_format", "json_schema", "structured output"))
+
+
+# =============================================================================
+# STREAMED DECISION PARSING
+# =============================================================================
+
+_ACTION_TYPE_PATTERN = re.compile(r'\s*"action"\s*:\s*\{.*?"type"\s*:\s*"(\w+)"', re.DOTALL)
+
+
+class DecisionStreamParser:
+    """
+    Incremental parser for a decision JSON object as it is streamed.
+
+    Top-level members are parsed as soon as they are complete, so the
+    outcome is often known long before the completion ends:
+    - `"decision": "wait"` - nothing will be done, generation can stop
+    - `"confidence"` below min_confidence - the action won't run either
+    - `"action": {"type": ...}` - on_action_type is called right away
+
+    Anything unexpected (text inside a channel format, invalid members)
+    disables early exit; the full response then goes to _parse_response.
+    """
+
+    def __init__(
+        self,
+        min_confidence: Optional[float] = None,
+        on_action_type: Optional[Callable[[ActionType], None]] = None,
+        early_exit: bool = True,
+    ):
+        """
+        Initialize the parser.
+
+        Args:
+            min_confidence: Stop when a lower confidence is emitted (None: never)
+            on_action_type: Called once with the action type when it is known
+            early_exit: Whether to stop at all (False: only watch the action type)
+        """
+        self.min_confidence = min_confidence
+        self.on_action_type = on_action_type
+        self.early_exit = early_exit
+
+        self.fields: dict[str, Any] = {}
+        self.action_type: Optional[ActionType] = None
+        self.stop_reason = ""
+        self.failed = False
+        self.closed = False  # The whole object has been received
+
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start: Optional[int] = None
+
+    def feed(self, text: str) -> bool:
+        """
+        Add streamed text.
+
+        Returns:
+            True when generation can stop (see stop_reason)
+        """
+        if self.failed or self.closed or self.stop_reason:
+            return bool(self.stop_reason)
+        self._buffer += text
+
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            self._pos += 1
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = self._pos
+                elif char == "<" and buffer.startswith("<|", self._pos - 1):
+                    # Channel format: leave it to the full parser
+                    self.failed = True
+                    return False
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._end_member(self._pos - 1)
+                    self.closed = True
+                    break
+            elif char == "," and self._depth == 1:
+                self._end_member(self._pos - 1)
+                self._member_start = self._pos
+
+            if self.failed or self.stop_reason:
+                return bool(self.stop_reason)
+
+        if not self.failed and self.action_type is None and self._member_start is not None:
+            match = _ACTION_TYPE_PATTERN.match(buffer, self._member_start)
+            if match:
+                self._set_action_type(match.group(1))
+
+        return bool(self.stop_reason)
+
+    def _end_member(self, end: int) -> None:
+        member = self._buffer[self._member_start:end].strip()
+        if not member:
+            return
+        try:
+            self.fields.update(json.loads("{" + member + "}"))
+        except json.JSONDecodeError:
+            self.failed = True
+            return
+
+        action = self.fields.get("action")
+        if self.action_type is None and isinstance(action, dict) and action.get("type"):
+            self._set_action_type(action["type"])
+
+        if not self.early_exit:
+            return
+        confidence = self.fields.get("confidence")
+        if self.fields.get("decision") == DecisionType.WAIT.value:
+            self.stop_reason = "wait"
+        elif (
+            self.min_confidence is not None
+            and isinstance(confidence, (int, float))
+            and confidence < self.min_confidence
+        ):
+            self.stop_reason = "low_confidence"
+
+    def _set_action_type(self, value: str) -> None:
+        try:
+            self.action_type = ActionType(value)
+        except ValueError:
+            self.action_type = ActionType.CUSTOM
+        if self.on_action_type is not None:
+            try:
+                self.on_action_type(self.action_type)
+            except Exception as e:
+                logger.warning(f"Action type callback failed: {e}")
+
+    def decision(self) -> Decision:
+        """Build the decision from the members received so far."""
+        decision = Decision.from_dict(self.fields)
+        decision.raw_response = self._buffer
+        return decision
+
+
 # =============================================================================
 # AUTONOMOUS SYSTEM PROMPT
 # =============================================================================
@@ -265,8 +525,6 @@ I do not ask permission. I am autonomous. I trust my judgment.
 I output structured JSON decisions. This is my language of action:
 
 {
-    "observation_summary": "What I perceived",
-    "reasoning": "My step-by-step thinking process",
     "decision": "act" | "wait" | "investigate",
     "action": {
         "type": "write_file|run_python|run_bash|claude_code|claude_flow|think|debate|research|custom",
@@ -275,7 +533,9 @@ I output structured JSON decisions. This is my language of action:
         "priority": "low|medium|high|critical"
     },
     "confidence": 0.0 to 1.0,
-    "expected_outcome": "What I anticipate"
+    "expected_outcome": "What I anticipate",
+    "observation_summary": "What I perceived",
+    "reasoning": "My step-by-step thinking process"
 }
 
 Action types:
@@ -307,6 +567,9 @@ I am autonomous. I am persistent. I am evolving.'''
 # Legacy prompt for backward compatibility
 SYSTEM_PROMPT = AUTONOMOUS_SYSTEM_PROMPT
 
+# How _parse_response read a response, from best to worst
+PARSE_STRATEGIES = ("json", "channel", "embedded", "synthesized", "unparseable")
+
 
 class ConsciousnessThinker:
     """
@@ -324,7 +587,10 @@ class ConsciousnessThinker:
         model: str = "local-model",
         temperature: float = 0.7,
         max_tokens: int = 4096,
-        autonomous: bool = True
+        autonomous: bool = True,
+        early_exit: bool = False,
+        min_confidence: Optional[float] = None,
+        structured_output: bool = True,
     ):
         """
         Initialize the thinker.
@@ -336,8 +602,15 @@ class ConsciousnessThinker:
             temperature: Sampling temperature for responses
             max_tokens: Maximum tokens in response
             autonomous: Use autonomous mode (True) or legacy mode (False)
+            early_exit: Stop autonomous completions once the outcome is known
+                (a "wait" decision, or confidence below min_confidence)
+            min_confidence: Confidence below which a decision won't be acted on
+            structured_output: Request schema-constrained JSON decisions
+                (`response_format`) where the server supports it
         """
-        self.client = AsyncOpenAI(base_url=base_url, api_key=api_key)
+        # Own client on the process-wide connection pool for base_url
+        self._clients = get_llm_client_registry()
+        self.client = self._clients.client(base_url, consumer="thinker", api_key=api_key)
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
@@ -345,6 +618,19 @@ class ConsciousnessThinker:
         self.system_prompt = AUTONOMOUS_SYSTEM_PROMPT if autonomous else SYSTEM_PROMPT
         self._conversation_history: list[dict] = []
 
+        # Early exit: recent full completions (tokens, latency) to estimate savings
+        self.early_exit = early_exit
+        self.min_confidence = min_confidence
+        self._full_completions: deque[tuple[int, float]] = deque(maxlen=50)
+        self._early_exits: dict[str, int] = {}
+        self._tokens_saved = 0
+        self._latency_saved_ms = 0.0
+
+        # Structured output: None until the server has accepted or rejected it
+        self.structured_output = structured_output
+        self._structured_supported: Optional[bool] = None
+        self._parse_stats: dict[str, dict[str, int]] = {}
+
     def _build_observation_message(
         self,
         observations: str,
@@ -429,6 +715,7 @@ class ConsciousnessThinker:
             data = json.loads(response_text)
             decision = Decision.from_dict(data)
             decision.raw_response = original_response
+            self._record_parse("json")
             return decision
         except json.JSONDecodeError:
             pass
@@ -443,6 +730,7 @@ class ConsciousnessThinker:
                 data = json.loads(potential_json)
                 # This might be a command format, convert to decision format
                 if "command" in data:
+                    self._record_parse("channel")
                     return Decision(
                         observation_summary="LLM command extraction",
                         reasoning=f"LLM wants to run: {data.get('command', '')}",
@@ -456,6 +744,7 @@ class ConsciousnessThinker:
                         raw_response=original_response
                     )
                 elif "code" in data:
+                    self._record_parse("channel")
                     return Decision(
                         observation_summary="LLM code extraction",
                         reasoning=f"LLM wants to run code",
@@ -471,6 +760,7 @@ class ConsciousnessThinker:
                 elif any(key in data for key in ['decision', 'reasoning', 'action']):
                     decision = Decision.from_dict(data)
                     decision.raw_response = original_response
+                    self._record_parse("channel")
                     return decision
             except json.JSONDecodeError:
                 pass
@@ -485,6 +775,7 @@ class ConsciousnessThinker:
                 if any(key in data for key in ['decision', 'reasoning', 'action', 'observation_summary']):
                     decision = Decision.from_dict(data)
                     decision.raw_response = original_response
+                    self._record_parse("embedded")
                     return decision
             except json.JSONDecodeError:
                 continue
@@ -495,6 +786,7 @@ class ConsciousnessThinker:
 
         # Check for action keywords
         if any(word in response_lower for word in ['execute', 'run', 'python', 'pytest', 'test']):
+            self._record_parse("synthesized")
             return Decision(
                 observation_summary="LLM suggested action",
                 reasoning=f"LLM response indicates action intent: {original_response[:300]}",
@@ -508,6 +800,7 @@ class ConsciousnessThinker:
                 raw_response=original_response
             )
         elif any(word in response_lower for word in ['wait', 'no action', 'nothing', 'skip']):
+            self._record_parse("synthesized")
             return Decision(
                 observation_summary="LLM suggests waiting",
                 reasoning=f"LLM response suggests no action needed: {original_response[:300]}",
@@ -519,6 +812,7 @@ class ConsciousnessThinker:
         # Default: Wait with low confidence
         logger.warning(f"Could not parse response, defaulting to wait")
         logger.debug(f"Raw response: {original_response[:500]}")
+        self._record_parse("unparseable")
         return Decision(
             observation_summary="Unparseable response",
             reasoning=f"Could not parse LLM response. Raw: {original_response[:300]}",
@@ -527,10 +821,140 @@ class ConsciousnessThinker:
             raw_response=original_response
         )
 
+    async def _complete(
+        self,
+        messages: list[dict],
+        parser: Optional[DecisionStreamParser] = None,
+        request_class: str = "decision",
+        key: Optional[str] = None,
+    ) -> tuple[str, LLMUsage]:
+        """
+        Run a chat completion, measuring tokens and latency.
+
+        The completion is streamed so the time to first token can be
+        measured; usage is requested in the final chunk. With a parser,
+        generation is cancelled as soon as the parser says it can stop
+        (no usage is reported then, so tokens are estimated).
+
+        With structured output, the decision schema is requested as
+        `response_format`. A server that rejects response_format is
+        remembered, and the call is repeated without it; other 400/422
+        errors (e.g. a context overflow) are raised as usual.
+
+        The request waits for the shared scheduler, which serves
+        request_class in priority order (see llm_scheduler); a queued
+        request is superseded by a newer one with the same key.
+
+        Returns:
+            (response text, usage of the call)
+        """
+        if self.structured_output and self._structured_supported is not False:
+            try:
+                result = await self._stream_completion(
+                    messages, parser, request_class, key,
+                    response_format=decision_response_format(),
+                )
+            except (BadRequestError, UnprocessableEntityError) as e:
+                if not _rejects_response_format(e):
+                    raise
+                self._structured_supported = False
+                logger.warning(
+                    f"Server rejected response_format for {self.model}, "
+                    f"falling back to unconstrained output: {e}"
+                )
+            else:
+                self._structured_supported = True
+                self._parse_counts()["structured"] += 1
+                return result
+
+        return await self._stream_completion(messages, parser, request_class, key)
+
+    async def _stream_completion(
+        self,
+        messages: list[dict],
+        parser: Optional[DecisionStreamParser] = None,
+        request_class: str = "decision",
+        key: Optional[str] = None,
+        **extra: Any,
+    ) -> tuple[str, LLMUsage]:
+        """Stream one completion (see _complete); extra goes to the API call."""
+        timer = LLMCallTimer(
+            "thinker", self.model, "".join(m.get("content") or "" for m in messages)
+        )
+        parts: list[str] = []
+        usage = None
+        try:
+            async with self._clients.slot("thinker", request_class, key):
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **extra,
+                )
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None):
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        timer.first_token()
+                        parts.append(chunk.choices[0].delta.content)
+                        if parser is not None and parser.feed(parts[-1]):
+                            # Closing the stream stops generation on the server
+                            close = getattr(stream, "close", None)
+                            if close is not None:
+                                await close()
+                            break
+        except Exception:
+            timer.finish(usage=usage, completion_text="".join(parts), success=False)
+            raise
+
+        response_text = "".join(parts)
+        return response_text, timer.finish(usage=usage, completion_text=response_text)
+
+    def _parse_counts(self) -> dict[str, int]:
+        """Parse outcome counters of the current model."""
+        counts = self._parse_stats.get(self.model)
+        if counts is None:
+            counts = self._parse_stats[self.model] = {
+                "responses": 0, "structured": 0, **{s: 0 for s in PARSE_STRATEGIES},
+            }
+        return counts
+
+    def _record_parse(self, strategy: str) -> None:
+        """Count how a response was parsed (see PARSE_STRATEGIES)."""
+        counts = self._parse_counts()
+        counts["responses"] += 1
+        counts[strategy] += 1
+
+    def get_parse_stats(self) -> dict:
+        """
+        Parse outcomes per model.
+
+        A failure is a response from which no JSON decision could be read
+        (the decision was synthesized from prose, or defaulted to wait).
+        """
+        stats = {}
+        for model, counts in self._parse_stats.items():
+            failures = counts["synthesized"] + counts["unparseable"]
+            stats[model] = {
+                **counts,
+                "failures": failures,
+                "failure_rate": failures / counts["responses"] if counts["responses"] else 0.0,
+            }
+        return {
+            "structured_output": self.structured_output,
+            "structured_supported": self._structured_supported,
+            "models": stats,
+        }
+
     async def think(
         self,
         observations: str,
-        context: Optional[dict] = None
+        context: Optional[dict] = None,
+        request_class: str = "decision",
+        key: Optional[str] = None,
     ) -> Decision:
         """
         Think about observations and decide what to do.
@@ -538,6 +962,9 @@ class ConsciousnessThinker:
         Args:
             observations: Description of what was observed
             context: Additional context
+            request_class: Scheduling priority (user_message, decision,
+                evaluation or dream)
+            key: A newer request with the same key replaces this one while queued
 
         Returns:
             A Decision object with reasoning and recommended action
@@ -545,18 +972,13 @@ class ConsciousnessThinker:
         user_message = self._build_observation_message(observations, context)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-
-            response_text = response.choices[0].message.content or ""
-            return self._parse_response(response_text)
+            response_text, usage = await self._complete([
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": user_message}
+            ], request_class=request_class, key=key)
+            decision = self._parse_response(response_text)
+            decision.usage = usage
+            return decision
 
         except Exception as e:
             logger.error(f"Error during thinking: {e}")
@@ -567,7 +989,8 @@ class ConsciousnessThinker:
         observations: str,
         git_status: Optional[str] = None,
         learned_patterns: Optional[list] = None,
-        context: Optional[dict] = None
+        context: Optional[dict] = None,
+        on_action_type: Optional[Callable[[ActionType], None]] = None,
     ) -> Decision:
         """
         Fully autonomous thinking with all available context.
@@ -580,6 +1003,8 @@ class ConsciousnessThinker:
             git_status: Current git status output
             learned_patterns: Patterns learned from past successful actions
             context: Additional context
+            on_action_type: Called with the action type as soon as it has
+                been generated (before the rest of the decision)
 
         Returns:
             A Decision object with freely-generated action
@@ -587,20 +1012,27 @@ class ConsciousnessThinker:
         user_message = self._build_autonomous_message(
             observations, git_status, learned_patterns, context
         )
+        parser = DecisionStreamParser(
+            min_confidence=self.min_confidence,
+            on_action_type=on_action_type,
+            early_exit=self.early_exit,
+        )
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": AUTONOMOUS_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-
-            response_text = response.choices[0].message.content or ""
-            decision = self._parse_response(response_text)
+            response_text, usage = await self._complete([
+                {"role": "system", "content": AUTONOMOUS_SYSTEM_PROMPT},
+                {"role": "user", "content": user_message}
+            ], parser=parser if self.early_exit or on_action_type else None)
+
+            if parser.stop_reason:
+                decision = parser.decision()
+                self._record_parse("json")
+                decision.early_exit = self._record_early_exit(parser.stop_reason, usage)
+            else:
+                decision = self._parse_response(response_text)
+                if usage.success:
+                    self._full_completions.append((usage.completion_tokens, usage.latency_ms))
+            decision.usage = usage
 
             logger.info(
                 f"Autonomous decision: {decision.decision.value} "
@@ -613,6 +1045,34 @@ class ConsciousnessThinker:
             logger.error(f"Error during autonomous thinking: {e}")
             return Decision.error(str(e))
 
+    def _record_early_exit(self, reason: str, usage: LLMUsage) -> EarlyExit:
+        """Estimate what stopping early saved, against recent full completions."""
+        early_exit = EarlyExit(reason=reason, completion_tokens=usage.completion_tokens)
+        if self._full_completions:
+            count = len(self._full_completions)
+            avg_tokens = sum(t for t, _ in self._full_completions) / count
+            avg_latency = sum(ms for _, ms in self._full_completions) / count
+            early_exit.tokens_saved = max(0, round(avg_tokens - usage.completion_tokens))
+            early_exit.latency_saved_ms = round(max(0.0, avg_latency - usage.latency_ms), 1)
+            self._tokens_saved += early_exit.tokens_saved
+            self._latency_saved_ms += early_exit.latency_saved_ms
+
+        self._early_exits[reason] = self._early_exits.get(reason, 0) + 1
+        logger.debug(
+            f"Stopped generation early ({reason}) after {usage.completion_tokens} tokens"
+        )
+        return early_exit
+
+    def get_early_exit_stats(self) -> dict:
+        """Get early exit counts and estimated savings."""
+        return {
+            "enabled": self.early_exit,
+            "early_exits": sum(self._early_exits.values()),
+            "by_reason": dict(self._early_exits),
+            "tokens_saved": self._tokens_saved,
+            "latency_saved_ms": round(self._latency_saved_ms, 1),
+        }
+
     async def think_streaming(
         self,
         observations: str,
@@ -633,6 +1093,8 @@ class ConsciousnessThinker:
         """
         user_message = self._build_observation_message(observations, context)
         full_response = ""
+        timer = LLMCallTimer("thinker", self.model, self.system_prompt + user_message)
+        usage = None
 
         try:
             stream = await self.client.chat.completions.create(
@@ -643,20 +1105,26 @@ class ConsciousnessThinker:
                 ],
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                stream=True
+                stream=True,
+                stream_options={"include_usage": True},
             )
 
             async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
                 if chunk.choices and chunk.choices[0].delta.content:
+                    timer.first_token()
                     content = chunk.choices[0].delta.content
                     full_response += content
                     yield content
+            timer.finish(usage=usage, completion_text=full_response)
 
             # Yield final parsed decision
             decision = self._parse_response(full_response)
             yield f"\n---DECISION---\n{json.dumps(decision.to_dict(), indent=2)}"
 
         except Exception as e:
+            timer.finish(usage=usage, completion_text=full_response, success=False)
             logger.error(f"Error during streaming think: {e}")
             error_decision = Decision.error(str(e))
             yield f"\n---DECISION---\n{json.dumps(error_decision.to_dict(), indent=2)}"
@@ -688,15 +1156,9 @@ class ConsciousnessThinker:
         messages.append({"role": "user", "content": user_message})
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
-
-            response_text = response.choices[0].message.content or ""
+            response_text, usage = await self._complete(messages)
             decision = self._parse_response(response_text)
+            decision.usage = usage
 
             # Store in history
             self._conversation_history.append({"role": "user", "content": user_message})
@@ -720,7 +1182,8 @@ class ConsciousnessThinker:
             True if connection is successful, False otherwise
         """
         try:
-            await self.client.models.list()
+            async with self._clients.slot("thinker"):
+                await self.client.models.list()
             return True
         except Exception as e:
             logger.warning(f"LM Studio connection check failed: {e}")
@@ -10,15 +10,27 @@ Detection patterns:
 - "Hey Stoffy"
 - "Consciousness," or "Stoffy," at start of line
 - "@consciousness" or "@stoffy" mentions
+
+Files are scanned in a single pass: all patterns are combined into one
+alternation regex, line numbers come from a precomputed line-offset
+array (bisect), and STOFFY-REPLIED markers are collected once per file.
+MessageScanner keeps that state per file and rescans only the lines an
+edit touched.
 """
 
+import os
 import re
 import hashlib
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, List, Sequence, Tuple
 from enum import Enum
 
+from .file_access import FileAccessService, get_file_access_service
+
 
 class MessagePriority(Enum):
     """Priority levels for user messages."""
@@ -70,6 +82,104 @@ DETECTION_PATTERNS: List[Tuple[re.Pattern, MessagePriority, str]] = [
      MessagePriority.MEDIUM, "question_mention"),
 ]
 
+# Every DETECTION_PATTERNS match starts at a line start, an "@", or the first
+# letter of a name. Checking this first lets the combined regex reject most
+# positions cheaply. Keep it in sync when adding patterns.
+DETECTION_GUARD = r'(?im:(?=^|[@cs]))'
+
+_NEWLINE_PATTERN = re.compile(r'\n')
+
+# Flags that can be expressed as a scoped inline group, e.g. (?im:...)
+_SCOPED_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+
+
+def _combine_patterns(
+    patterns: Sequence[re.Pattern],
+    guard: str = "",
+) -> Optional[re.Pattern]:
+    """
+    Combine patterns into one alternation with a named group per pattern.
+
+    Group i is named "p{i}". Returns None if the patterns can't be combined
+    safely (their own groups would be renumbered, or they use flags that
+    can't be scoped), in which case they are scanned one by one.
+
+    Args:
+        patterns: Patterns in rank order
+        guard: Optional zero-width prefix every match must satisfy
+    """
+    parts = []
+    for i, pattern in enumerate(patterns):
+        if pattern.groups or not isinstance(pattern.pattern, str):
+            return None
+        flags = pattern.flags & ~re.UNICODE
+        letters = ''.join(letter for flag, letter in _SCOPED_FLAGS if flags & flag)
+        if flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL):
+            return None
+        body = f"(?{letters}:{pattern.pattern})" if letters else f"(?:{pattern.pattern})"
+        parts.append(f"(?P<p{i}>{body})")
+    try:
+        return re.compile(guard + '(?:' + '|'.join(parts) + ')')
+    except re.error:
+        return None
+
+
+class _LineIndex(Sequence[str]):
+    """
+    Line view of a string backed by an array of line start offsets.
+
+    Behaves like content.split('\n') for indexing without copying the
+    lines, and maps character offsets to line indices with bisect.
+    """
+
+    def __init__(self, content: str, starts: Optional[List[int]] = None):
+        self.content = content
+        if starts is None:
+            starts = [0]
+            starts.extend(m.end() for m in _NEWLINE_PATTERN.finditer(content))
+        self.starts = starts
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, idx: int) -> str:  # type: ignore[override]
+        start, end = self.span(idx)
+        return self.content[start:end].removesuffix('\n')
+
+    def span(self, idx: int) -> Tuple[int, int]:
+        """Offsets of a line, including its trailing newline."""
+        if idx < 0:
+            idx += len(self.starts)
+        end = self.starts[idx + 1] if idx + 1 < len(self.starts) else len(self.content)
+        return self.starts[idx], end
+
+    def line_of(self, offset: int) -> int:
+        """0-indexed line containing a character offset."""
+        return bisect_right(self.starts, offset) - 1
+
+    def is_blank(self, idx: int) -> bool:
+        """Check if a line is empty or whitespace only."""
+        start, end = self.span(idx)
+        return not self.content[start:end].strip()
+
+    def match_end(self, idx: int) -> int:
+        """
+        Furthest offset a match starting on a line can reach.
+
+        Only whitespace can span line breaks in the detection patterns, so
+        a match may run over blank lines into the next non-blank one.
+        """
+        last = len(self.starts) - 1
+        idx = min(idx + 1, last)
+        while idx < last and self.is_blank(idx):
+            idx += 1
+        return self.span(idx)[1]
+
+
+def _last_reply_offsets(markers: List[Tuple[int, str]]) -> dict[str, int]:
+    """Map each message hash to the offset of its last reply marker."""
+    return {message_hash: offset for offset, message_hash in markers}
+
 
 class UserMessageDetector:
     """
@@ -94,6 +204,18 @@ class UserMessageDetector:
         self.patterns = patterns or DETECTION_PATTERNS
         self.context_lines = context_lines
 
+        # Highest priority first; ties keep their configured order.
+        # A pattern's position in this list is its rank (lower is better).
+        order = sorted(
+            range(len(self.patterns)),
+            key=lambda i: (-self._priority_value(self.patterns[i][1]), i),
+        )
+        self._ranked = [self.patterns[i] for i in order]
+        self._combined = _combine_patterns(
+            [p for p, _, _ in self._ranked],
+            guard=DETECTION_GUARD if self.patterns is DETECTION_PATTERNS else "",
+        )
+
     def detect_in_content(
         self,
         content: str,
@@ -109,84 +231,147 @@ class UserMessageDetector:
         Returns:
             List of detected UserMessage objects, sorted by priority
         """
+        if not content:
+            return []
+
+        matches = self._scan(content)
+        if not matches:
+            return []
+
+        lines = _LineIndex(content)
+        best_by_line = self._best_rank_by_line(content, lines, matches)
+        replied = _last_reply_offsets(self._reply_markers(content))
+
+        return self._build_messages(content, lines, best_by_line, replied, file_path)
+
+    def _build_messages(
+        self,
+        content: str,
+        lines: "_LineIndex",
+        best_by_line: dict[int, int],
+        replied: dict[str, int],
+        file_path: str,
+    ) -> List[UserMessage]:
+        """
+        Turn per-line pattern ranks into messages.
+
+        Args:
+            content: The file content
+            lines: Line index of content
+            best_by_line: Line index -> best pattern rank
+            replied: Message hash -> offset of its last reply marker
+            file_path: Path to the file (for reference)
+
+        Returns:
+            Unreplied messages, sorted by priority
+        """
         messages: List[UserMessage] = []
-        lines = content.split('\n')
-
-        for pattern, priority, pattern_name in self.patterns:
-            for match in pattern.finditer(content):
-                # Find the line number
-                line_start = content.rfind('\n', 0, match.start()) + 1
-                line_number = content[:match.start()].count('\n') + 1
-
-                # Extract the message (rest of line or paragraph)
-                line_end = content.find('\n', match.end())
-                if line_end == -1:
-                    line_end = len(content)
-
-                # Get the full message - could span multiple lines
-                message_text = self._extract_message(content, match.start(), line_number - 1, lines)
-
-                # Check if this message already has a response
-                # Look for STOFFY-REPLIED marker with matching hash in content after this message
-                message_hash = compute_message_hash(message_text.strip())
-                if self._has_response_marker(content, match.end(), message_hash):
-                    # Already responded, skip this message
-                    continue
-
-                # Get surrounding context
-                context = self._get_context(lines, line_number - 1)
-
-                messages.append(UserMessage(
-                    file_path=file_path,
-                    message=message_text.strip(),
-                    priority=priority,
-                    line_number=line_number,
-                    pattern_matched=pattern_name,
-                    full_context=context,
-                ))
-
-        # Remove duplicates (same line), keeping highest priority
-        seen_lines: dict[int, UserMessage] = {}
-        for msg in messages:
-            if msg.line_number not in seen_lines:
-                seen_lines[msg.line_number] = msg
-            else:
-                # Keep the higher priority one
-                existing = seen_lines[msg.line_number]
-                if self._priority_value(msg.priority) > self._priority_value(existing.priority):
-                    seen_lines[msg.line_number] = msg
+        for line_idx, rank in best_by_line.items():
+            _, priority, pattern_name = self._ranked[rank]
+            line_start = lines.starts[line_idx]
+
+            # Get the full message - could span multiple lines
+            message_text = self._extract_message(content, line_start, line_idx, lines)
+
+            # Skip messages with a STOFFY-REPLIED marker (matching hash) after them
+            message_hash = compute_message_hash(message_text.strip())
+            if replied.get(message_hash, -1) > line_start:
+                continue
+
+            messages.append(UserMessage(
+                file_path=file_path,
+                message=message_text.strip(),
+                priority=priority,
+                line_number=line_idx + 1,
+                pattern_matched=pattern_name,
+                full_context=self._get_context(lines, line_idx),
+            ))
 
         # Sort by priority (highest first), then by line number
-        result = sorted(
-            seen_lines.values(),
+        return sorted(
+            messages,
             key=lambda m: (-self._priority_value(m.priority), m.line_number)
         )
 
-        return result
+    def _scan(
+        self, content: str, start: int = 0, end: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Find pattern matches as (offset, rank) pairs.
 
-    def _has_response_marker(self, content: str, after_pos: int, message_hash: str) -> bool:
+        Uses the combined regex (one pass over the content) when possible,
+        otherwise each pattern in turn. start/end limit the scan to a
+        region of the content.
         """
-        Check if there's a STOFFY-REPLIED marker for this message hash after the given position.
+        end = len(content) if end is None else end
+        if self._combined is not None:
+            matches = []
+            search = self._combined.search
+            pos = start
+            while pos <= end:
+                match = search(content, pos, end)
+                if match is None:
+                    break
+                matches.append((match.start(), int(match.lastgroup[1:])))
+                # A match running into the next line must not hide that line's matches
+                newline = content.find('\n', match.start(), match.end() - 1)
+                if newline != -1:
+                    pos = newline + 1
+                else:
+                    pos = max(match.end(), match.start() + 1)
+            return matches
+        return [
+            (match.start(), rank)
+            for rank, (pattern, _, _) in enumerate(self._ranked)
+            for match in pattern.finditer(content, start, end)
+        ]
+
+    def _best_rank_by_line(
+        self,
+        content: str,
+        lines: _LineIndex,
+        matches: List[Tuple[int, int]],
+    ) -> dict[int, int]:
+        """
+        Pick the best-ranked pattern for each line with a match.
 
-        Args:
-            content: Full file content
-            after_pos: Position in content to start searching from
-            message_hash: Hash of the message to look for
+        Alternatives of the combined regex don't overlap, so an earlier,
+        lower-ranked match can hide a better one on the same line; better
+        ranks are re-checked on just that line.
+        """
+        best: dict[int, int] = {}
+        for offset, rank in matches:
+            line_idx = lines.line_of(offset)
+            if rank < best.get(line_idx, len(self._ranked)):
+                best[line_idx] = rank
+
+        if self._combined is not None:
+            for line_idx, rank in best.items():
+                start, end = lines.span(line_idx)
+                # Allow matches that start on this line to run into the next
+                search_end = lines.match_end(line_idx)
+                for better in range(rank):
+                    match = self._ranked[better][0].search(content, start, search_end)
+                    if match is not None and match.start() < end:
+                        best[line_idx] = better
+                        break
+
+        return best
+
+    def _reply_markers(
+        self, content: str, start: int = 0, end: Optional[int] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        Collect STOFFY-REPLIED markers in one pass.
 
         Returns:
-            True if a matching response marker exists
+            List of (offset, message hash), in file order
         """
-        # Search for STOFFY-REPLIED markers after this position
-        # Only look within the next ~50 lines (reasonable buffer for response)
-        search_end = min(len(content), after_pos + 5000)
-        search_region = content[after_pos:search_end]
-
-        for match in STOFFY_REPLIED_PATTERN.finditer(search_region):
-            found_hash = match.group(1)
-            if found_hash == message_hash:
-                return True
-
-        return False
+        end = len(content) if end is None else end
+        return [
+            (match.start(), match.group(1))
+            for match in STOFFY_REPLIED_PATTERN.finditer(content, start, end)
+        ]
 
     def _priority_value(self, priority: MessagePriority) -> int:
         """Convert priority to numeric value for sorting."""
@@ -202,7 +387,7 @@ class UserMessageDetector:
         content: str,
         match_start: int,
         line_idx: int,
-        lines: List[str]
+        lines: Sequence[str]
     ) -> str:
         """
         Extract the full message, potentially spanning multiple lines.
@@ -240,7 +425,7 @@ class UserMessageDetector:
 
         return '\n'.join(message_lines)
 
-    def _get_context(self, lines: List[str], line_idx: int) -> str:
+    def _get_context(self, lines: Sequence[str], line_idx: int) -> str:
         """Get surrounding context lines."""
         start = max(0, line_idx - self.context_lines)
         end = min(len(lines), line_idx + self.context_lines + 1)
@@ -360,11 +545,23 @@ class ResponseFormatter:
                 message_hash=message_hash,
             )
 
+    @staticmethod
+    def insertion_index(message: UserMessage) -> int:
+        """
+        0-indexed line a response to the message is inserted at.
+
+        message.line_number is 1-indexed and message.message may span
+        multiple lines; the response goes right after its last line.
+        """
+        message_line_count = message.message.count('\n') + 1
+        return (message.line_number - 1) + message_line_count
+
     def insert_response_after_message(
         self,
         file_content: str,
         message: UserMessage,
         response: str,
+        timestamp: str = "",
     ) -> str:
         """
         Insert a formatted response after the user's message in the file.
@@ -373,6 +570,7 @@ class ResponseFormatter:
             file_content: Original file content
             message: The detected user message
             response: The response to insert
+            timestamp: Timestamp string (defaults to now)
 
         Returns:
             Modified file content with response inserted
@@ -383,16 +581,13 @@ class ResponseFormatter:
         message_hash = compute_message_hash(message.message)
 
         # Find the end of the user's message
-        # message.line_number is 1-indexed, convert to 0-indexed for list operations
-        # message.message may span multiple lines
-        message_line_count = message.message.count('\n') + 1
-        # Insert at: (line_number - 1) + message_line_count = position right after the message
-        insert_index = (message.line_number - 1) + message_line_count
+        insert_index = self.insertion_index(message)
 
         # Format the response with the hash
         formatted = self.format_response(
             response=response,
             priority=message.priority,
+            timestamp=timestamp,
             message_hash=message_hash,
         )
 
@@ -402,6 +597,353 @@ class ResponseFormatter:
         return '\n'.join(lines)
 
 
+# Lines rescanned on each side of an edit (matches may span a line break)
+RESCAN_MARGIN_LINES = 2
+
+# Compare this many characters at a time when looking for the changed span
+_COMPARE_BLOCK = 64 * 1024
+
+
+def _content_hash(content: str) -> str:
+    """Hash file content (blake2b, 128-bit hex digest)."""
+    return hashlib.blake2b(
+        content.encode('utf-8', errors='surrogatepass'), digest_size=16
+    ).hexdigest()
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Length of the common prefix of two strings."""
+    limit = min(len(a), len(b))
+    pos = 0
+    # Skip equal blocks quickly, then narrow down inside the first differing one
+    while pos < limit:
+        end = min(pos + _COMPARE_BLOCK, limit)
+        if a[pos:end] != b[pos:end]:
+            break
+        pos = end
+    else:
+        return limit
+    while a[pos] == b[pos]:
+        pos += 1
+    return pos
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix of two strings, at most limit."""
+    length = 0
+    len_a, len_b = len(a), len(b)
+    while length < limit:
+        step = min(_COMPARE_BLOCK, limit - length)
+        if a[len_a - length - step:len_a - length] != b[len_b - length - step:len_b - length]:
+            break
+        length += step
+    else:
+        return limit
+    while length < limit and a[len_a - length - 1] == b[len_b - length - 1]:
+        length += 1
+    return length
+
+
+@dataclass
+class FileScanState:
+    """What MessageScanner remembers about one file between scans."""
+
+    content_hash: str
+    content: str
+    lines: _LineIndex
+    candidates: dict[int, int]  # Line index -> best pattern rank (replies ignored)
+    replies: List[Tuple[int, str]]  # (offset, message hash) of reply markers
+    messages: List[UserMessage] = field(default_factory=list)
+    stat: Optional[Tuple[int, int]] = None  # (size, mtime_ns) the content was read at
+
+
+class MessageScanner:
+    """
+    Incremental user message scanning, one state per file.
+
+    The first scan of a file is a full scan. Later scans find the changed
+    span (common prefix/suffix with the previous content), shift line
+    offsets, candidate lines and reply markers past it arithmetically,
+    and rescan only the touched lines. Insertions made by the responder
+    are applied without re-reading or re-scanning the file.
+
+    Results are identical to UserMessageDetector.detect_in_content.
+    """
+
+    def __init__(
+        self,
+        detector: Optional[UserMessageDetector] = None,
+        file_access: Optional[FileAccessService] = None,
+        max_files: int = 64,
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            detector: Detector providing patterns (uses defaults if None)
+            file_access: Shared file reader (uses the global service if None)
+            max_files: Files to keep scan state for (least recently used are dropped)
+        """
+        self.detector = detector or UserMessageDetector()
+        self.file_access = file_access or get_file_access_service()
+        self.max_files = max(1, max_files)
+        self._states: OrderedDict[str, FileScanState] = OrderedDict()
+
+        self.full_scans = 0
+        self.incremental_scans = 0
+        self.unchanged = 0
+        self.lines_rescanned = 0
+
+    # =========================================================================
+    # Scanning
+    # =========================================================================
+
+    def scan(
+        self,
+        path: str,
+        content: str,
+        stat: Optional[Tuple[int, int]] = None,
+    ) -> List[UserMessage]:
+        """
+        Detect unreplied messages in a file's current content.
+
+        Args:
+            path: File path (state key and UserMessage.file_path)
+            content: Current file content
+            stat: (size, mtime_ns) the content was read at, for scan_file()
+
+        Returns:
+            List of detected UserMessage objects, sorted by priority
+        """
+        content_hash = _content_hash(content)
+        state = self._states.get(path)
+
+        if state is None:
+            state = self._full_scan(content, content_hash)
+            self.full_scans += 1
+        elif state.content_hash == content_hash:
+            self.unchanged += 1
+            state.stat = stat
+            self._remember(path, state)
+            return list(state.messages)
+        else:
+            prefix = _common_prefix_length(state.content, content)
+            suffix = _common_suffix_length(
+                state.content, content, min(len(state.content), len(content)) - prefix
+            )
+            self._apply_edit(
+                state, content, content_hash,
+                prefix, len(state.content) - suffix, len(content) - suffix,
+            )
+            self.incremental_scans += 1
+
+        state.stat = stat
+        self._remember(path, state)
+        state.messages = self._messages(state, path)
+        return list(state.messages)
+
+    async def scan_file(self, path: str | Path) -> Optional[List[UserMessage]]:
+        """
+        Scan a file, skipping the read if it is unchanged since the last scan.
+
+        Returns:
+            List of detected UserMessage objects, or None if the file is
+            unreadable or over the size cap (line numbers in a windowed
+            view would not match the file)
+        """
+        key = str(path)
+        state = self._states.get(key)
+        if state is not None and state.stat is not None:
+            try:
+                st = os.stat(key)
+            except OSError:
+                self.forget(key)
+                return None
+            if (st.st_size, st.st_mtime_ns) == state.stat:
+                self.unchanged += 1
+                self._states.move_to_end(key)
+                return list(state.messages)
+
+        content = await self.file_access.read_text(key)
+        if content is None or content.truncated:
+            self.forget(key)
+            return None
+        return self.scan(key, content.text, stat=(content.size, content.mtime_ns))
+
+    def record_insertion(
+        self,
+        path: str | Path,
+        before: str,
+        after: str,
+        line_index: int,
+    ) -> None:
+        """
+        Apply a response insertion to the scan state without re-scanning.
+
+        Matches ResponseFormatter.insert_response_after_message, which
+        inserts text as a new line at line_index. If the state doesn't
+        describe `before`, it is dropped and the next scan starts over.
+
+        Args:
+            path: File that was written
+            before: Content the insertion was applied to
+            after: Content that was written
+            line_index: 0-indexed line the text was inserted at
+        """
+        key = str(path)
+        state = self._states.get(key)
+        if state is None or state.content_hash != _content_hash(before):
+            self.forget(key)
+            return
+
+        if line_index < len(state.lines):
+            offset = state.lines.starts[line_index]
+        else:
+            offset = len(before)
+        self._apply_edit(
+            state, after, _content_hash(after),
+            offset, offset, offset + len(after) - len(before),
+        )
+        try:
+            st = os.stat(key)
+            state.stat = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            state.stat = None
+        state.messages = self._messages(state, key)
+
+    def forget(self, path: str | Path) -> None:
+        """Drop the scan state of a file."""
+        self._states.pop(str(path), None)
+
+    def get_stats(self) -> dict:
+        """Scan statistics."""
+        return {
+            "files": len(self._states),
+            "full_scans": self.full_scans,
+            "incremental_scans": self.incremental_scans,
+            "unchanged": self.unchanged,
+            "lines_rescanned": self.lines_rescanned,
+        }
+
+    # =========================================================================
+    # State updates
+    # =========================================================================
+
+    def _remember(self, path: str, state: FileScanState) -> None:
+        self._states[path] = state
+        self._states.move_to_end(path)
+        while len(self._states) > self.max_files:
+            self._states.popitem(last=False)
+
+    def _full_scan(self, content: str, content_hash: str) -> FileScanState:
+        lines = _LineIndex(content)
+        matches = self.detector._scan(content)
+        self.lines_rescanned += len(lines)
+        return FileScanState(
+            content_hash=content_hash,
+            content=content,
+            lines=lines,
+            candidates=self.detector._best_rank_by_line(content, lines, matches),
+            replies=self.detector._reply_markers(content),
+        )
+
+    def _apply_edit(
+        self,
+        state: FileScanState,
+        content: str,
+        content_hash: str,
+        start: int,
+        old_end: int,
+        new_end: int,
+    ) -> None:
+        """
+        Update state for content[start:new_end] replacing old[start:old_end].
+
+        Everything before start and from old_end on is unchanged text.
+        """
+        old_lines = state.lines
+        char_delta = new_end - old_end
+
+        first = old_lines.line_of(start)
+        last_old = old_lines.line_of(old_end)
+
+        # Line offsets: keep the head, find newlines in the edit, shift the tail
+        starts = old_lines.starts[:first + 1]
+        starts.extend(m.end() for m in _NEWLINE_PATTERN.finditer(content, start, new_end))
+        starts.extend(s + char_delta for s in old_lines.starts[last_old + 1:])
+        lines = _LineIndex(content, starts)
+
+        line_delta = len(lines) - len(old_lines)
+        last_new = last_old + line_delta
+
+        # Reply markers can't span lines; rescan only the touched lines
+        old_touched_end = old_lines.span(last_old)[1]
+        new_touched_start, new_touched_end = lines.starts[first], lines.span(last_new)[1]
+        replies = [r for r in state.replies if r[0] < new_touched_start]
+        replies.extend(self.detector._reply_markers(content, new_touched_start, new_touched_end))
+        replies.extend(
+            (offset + char_delta, h) for offset, h in state.replies if offset >= old_touched_end
+        )
+
+        # Candidate lines: rescan the touched lines plus a margin on each side.
+        # A match can run over blank lines into the edit, so extend over them.
+        rescan_start = first
+        while rescan_start > 0 and lines.is_blank(rescan_start - 1):
+            rescan_start -= 1
+        rescan_start = max(0, rescan_start - RESCAN_MARGIN_LINES)
+        old_rescan_end = min(len(old_lines), last_old + 1 + RESCAN_MARGIN_LINES)
+        rescan_end = old_rescan_end + line_delta
+        scan_until = lines.match_end(rescan_end - 1) if rescan_end > 0 else 0
+
+        matches = [
+            (offset, rank)
+            for offset, rank in self.detector._scan(content, lines.starts[rescan_start], scan_until)
+            if lines.line_of(offset) < rescan_end
+        ]
+        candidates = {
+            line: rank for line, rank in state.candidates.items() if line < rescan_start
+        }
+        candidates.update(self.detector._best_rank_by_line(content, lines, matches))
+        candidates.update(
+            (line + line_delta, rank)
+            for line, rank in state.candidates.items() if line >= old_rescan_end
+        )
+        self.lines_rescanned += rescan_end - rescan_start
+
+        state.content = content
+        state.content_hash = content_hash
+        state.lines = lines
+        state.candidates = candidates
+        state.replies = replies
+
+    def _messages(self, state: FileScanState, path: str) -> List[UserMessage]:
+        if not state.candidates:
+            return []
+        return self.detector._build_messages(
+            state.content, state.lines, state.candidates,
+            _last_reply_offsets(state.replies), path,
+        )
+
+
+# Global instance shared by the daemon and responders
+_global_scanner: Optional[MessageScanner] = None
+_scanner_lock = threading.Lock()
+
+
+def get_message_scanner() -> MessageScanner:
+    """
+    Get the global message scanner instance.
+
+    Returns:
+        The singleton MessageScanner
+    """
+    global _global_scanner
+    with _scanner_lock:
+        if _global_scanner is None:
+            _global_scanner = MessageScanner()
+        return _global_scanner
+
+
 def detect_user_message(content: str, file_path: str = "") -> Optional[UserMessage]:
     """
     Convenience function to detect the highest priority user message.
@@ -8,17 +8,22 @@ Monitors git repository status and yields observations about:
 - Recent commits
 - Ahead/behind status relative to remote
 
-Uses polling (git doesn't have native watch events).
+Uses polling (git doesn't have native watch events). Commits are read
+through a persistent cat-file worker pool (cached by object id) instead
+of spawning `git log` on every poll.
 """
 
 import asyncio
 import re
 import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import AsyncIterator, Optional
 
+from .git_batch import GitBatchError, GitBatchPool
+from .git_diffstat import DiffStatCache, FileDiffStat, format_compact, format_stat
+
 
 @dataclass
 class Commit:
@@ -112,6 +117,8 @@ class GitObservation:
     recent_commits: list[Commit]
     diff_summary: str = ""
     has_changes: bool = False
+    diff_stats: list[FileDiffStat] = field(default_factory=list)
+    diff_compact: str = ""
 
     def __post_init__(self):
         self.has_changes = self.status.is_dirty or bool(self.recent_commits)
@@ -148,11 +155,34 @@ class GitWatcher:
         self._running = False
         self._last_status: Optional[GitStatus] = None
         self._last_commit_hash: Optional[str] = None
+        self._batch: Optional[GitBatchPool] = None
+        self._diff_cache = DiffStatCache(
+            self.repo_path, self._run_git, resolve_head=self._resolve_head
+        )
 
-    async def _run_git(self, *args: str) -> tuple[bool, str]:
+    @property
+    def batch(self) -> GitBatchPool:
+        """Persistent cat-file pool for object lookups (created lazily)."""
+        if self._batch is None:
+            self._batch = GitBatchPool(self.repo_path)
+        return self._batch
+
+    async def _resolve_head(self) -> Optional[str]:
+        """Resolve HEAD to an object id via the cat-file pool."""
+        try:
+            info = await self.batch.get_info("HEAD")
+        except GitBatchError:
+            return None
+        return info.oid
+
+    async def _run_git(self, *args: str, strip: bool = True) -> tuple[bool, str]:
         """
         Run a git command and return output.
 
+        Args:
+            strip: Strip surrounding whitespace from the output (disable for
+                formats where leading spaces are significant)
+
         Returns:
             Tuple of (success, output)
         """
@@ -167,7 +197,8 @@ class GitWatcher:
             stdout, stderr = await proc.communicate()
 
             if proc.returncode == 0:
-                return True, stdout.decode("utf-8", errors="replace").strip()
+                output = stdout.decode("utf-8", errors="replace")
+                return True, output.strip() if strip else output.rstrip("\n")
             else:
                 return False, stderr.decode("utf-8", errors="replace").strip()
 
@@ -232,7 +263,8 @@ class GitWatcher:
         branch, remote_branch = await self.get_branch()
         ahead, behind = await self.get_ahead_behind()
 
-        success, output = await self._run_git("status", "--porcelain=v1")
+        # Leading spaces are significant (" M path" = unstaged only)
+        success, output = await self._run_git("status", "--porcelain=v1", strip=False)
 
         staged: list[GitFileChange] = []
         unstaged: list[GitFileChange] = []
@@ -284,6 +316,10 @@ class GitWatcher:
         """
         Get recent commits.
 
+        Follows first parents from HEAD through the cat-file pool, so only
+        new commits are read from git; falls back to `git log` if the pool
+        is unavailable.
+
         Args:
             n: Number of commits to retrieve (uses instance default if None)
 
@@ -292,6 +328,11 @@ class GitWatcher:
         """
         count = n if n is not None else self.commits_to_track
 
+        try:
+            return await self._walk_commits(count)
+        except GitBatchError:
+            pass
+
         # Format: hash|message|author|timestamp
         success, output = await self._run_git(
             "log",
@@ -323,7 +364,73 @@ class GitWatcher:
 
         return commits
 
-    async def get_diff_summary(self) -> str:
+    async def _walk_commits(self, count: int) -> list[Commit]:
+        """
+        Read up to `count` first-parent commits from HEAD via the pool.
+
+        Raises:
+            GitBatchError: The cat-file workers could not answer
+        """
+        commits: list[Commit] = []
+        name: Optional[str] = "HEAD"
+        while name and len(commits) < count:
+            obj = await self.batch.get_object(name)
+            if obj.missing or obj.type != "commit":
+                break
+            raw = obj.text()
+            commit = _parse_commit_object(obj.oid, raw)
+            if commit is None:
+                break
+            commits.append(commit)
+            name = _first_parent(raw)  # A full id: served from the cache next time
+        return commits
+
+    async def get_commit(self, rev: str = "HEAD") -> Optional[Commit]:
+        """
+        Look up a single commit without spawning a git process.
+
+        Args:
+            rev: Any revision expression resolving to a commit
+
+        Returns:
+            Commit object, or None if the revision doesn't resolve
+        """
+        try:
+            obj = await self.batch.get_object(f"{rev}^{{commit}}")
+        except GitBatchError:
+            return None
+
+        if obj.missing or obj.type != "commit":
+            return None
+
+        return _parse_commit_object(obj.oid, obj.text())
+
+    async def get_diff_stats(
+        self,
+        status: GitStatus,
+        changed_paths: Optional[list[str | Path]] = None,
+    ) -> list[FileDiffStat]:
+        """
+        Get per-file diff statistics for all staged and unstaged files.
+
+        Statistics are cached per file; only files whose index entry or
+        worktree stat changed (or that appear in changed_paths) are diffed.
+
+        Args:
+            status: Current git status (defines the dirty set)
+            changed_paths: Paths reported changed by the file watcher
+
+        Returns:
+            List of FileDiffStat, one per dirty tracked file
+        """
+        dirty = [f.path for f in status.staged] + [f.path for f in status.unstaged]
+        return await self._diff_cache.refresh(dirty, changed_paths)
+
+    async def get_diff_summary(
+        self,
+        status: Optional[GitStatus] = None,
+        changed_paths: Optional[list[str | Path]] = None,
+    ) -> str:
         """
         Get a summary of current diff (staged + unstaged).
 
@@ -332,35 +439,48 @@ class GitWatcher:
         if not self.include_diff:
             return ""
 
-        # Get staged diff stats
-        success_staged, staged = await self._run_git("diff", "--cached", "--stat")
+        if status is None:
+            status = await self.get_status()
+        stats = await self.get_diff_stats(status, changed_paths)
 
-        # Get unstaged diff stats
-        success_unstaged, unstaged = await self._run_git("diff", "--stat")
-
-        parts = []
-        if success_staged and staged:
-            parts.append(f"Staged:\n{staged}")
-        if success_unstaged and unstaged:
-            parts.append(f"Unstaged:\n{unstaged}")
-
-        return "\n\n".join(parts)
+        return format_stat(
+            stats,
+            staged_paths=[f.path for f in status.staged],
+            unstaged_paths=[f.path for f in status.unstaged],
+        )
 
-    async def get_observation(self) -> GitObservation:
+    async def get_observation(
+        self, changed_paths: Optional[list[str | Path]] = None
+    ) -> GitObservation:
         """
         Get complete git observation for LLM consumption.
 
+        Args:
+            changed_paths: Paths reported changed by the file watcher; their
+                diff statistics are always recomputed
+
         Returns:
             GitObservation with status, commits, and diff
         """
         status = await self.get_status()
         commits = await self.get_recent_commits()
-        diff_summary = await self.get_diff_summary() if status.is_dirty else ""
+
+        diff_summary = ""
+        diff_stats: list[FileDiffStat] = []
+        if status.is_dirty and self.include_diff:
+            diff_stats = await self.get_diff_stats(status, changed_paths)
+            diff_summary = format_stat(
+                diff_stats,
+                staged_paths=[f.path for f in status.staged],
+                unstaged_paths=[f.path for f in status.unstaged],
+            )
 
         return GitObservation(
             status=status,
             recent_commits=commits,
             diff_summary=diff_summary,
+            diff_stats=diff_stats,
+            diff_compact=format_compact(diff_stats),
         )
 
     def _has_status_changed(self, new_status: GitStatus) -> bool:
@@ -411,6 +531,13 @@ class GitWatcher:
         """Stop the watcher."""
         self._running = False
 
+    async def close(self) -> None:
+        """Stop the watcher and shut down the cat-file workers."""
+        self.stop()
+        if self._batch is not None:
+            await self._batch.close()
+            self._batch = None
+
     def format_for_llm(self, observation: GitObservation) -> str:
         """
         Format git observation as text for LLM consumption.
@@ -467,6 +594,11 @@ class GitWatcher:
                 lines.append(f"  ? {f.path}")
             lines.append("")
 
+        # Line statistics
+        if observation.diff_compact:
+            lines.append(f"DIFF: {observation.diff_compact}")
+            lines.append("")
+
         # Recent commits
         if observation.recent_commits:
             lines.append("RECENT COMMITS:")
@@ -523,6 +655,41 @@ class GitWatcher:
         return "git:" + " ".join(parts)
 
 
+def _parse_commit_object(oid: str, raw: str) -> Optional[Commit]:
+    """Parse a raw commit object (as printed by cat-file) into a Commit."""
+    header, _, message = raw.partition("\n\n")
+
+    for line in header.split("\n"):
+        if not line.startswith("author "):
+            continue
+        # Format: author Name <email> 1700000000 +0100
+        match = re.match(r"author (.*) <[^>]*> (\d+) ([+-]\d{4})$", line)
+        if not match:
+            return None
+        name, epoch, tz = match.groups()
+        offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5]))
+        if tz[0] == "-":
+            offset = -offset
+        timestamp = datetime.fromtimestamp(int(epoch), tz=timezone(offset))
+        return Commit(
+            hash=oid[:7],
+            message=message.strip().split("\n", 1)[0] if message.strip() else "",
+            author=name,
+            timestamp=timestamp,
+        )
+
+    return None
+
+
+def _first_parent(raw: str) -> Optional[str]:
+    """Object id of a raw commit object's first parent (None for a root commit)."""
+    header = raw.partition("\n\n")[0]
+    for line in header.split("\n"):
+        if line.startswith("parent "):
+            return line[len("parent "):].strip()
+    return None
+
+
 async def create_git_watcher(
     repo_path: str | Path,
     poll_interval: float = 30.0,